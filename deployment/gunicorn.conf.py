@@ -0,0 +1,25 @@
+# deployment/gunicorn.conf.py
+"""
+Gunicorn settings for the container (see the Dockerfile CMD).
+
+/api/v1/slack/stream/<channel> is an endless Server-Sent Events response, and
+the streamed AI summaries hold their request through the model queue wait
+(OLLAMA_QUEUE_TIMEOUT) plus the generation, so the app must not run on the
+default sync worker: it serves one request per process and kills it after
+`timeout` seconds. gthread workers serve every request on its own thread and
+`timeout` only watches the worker's main loop, so an open stream costs one
+thread and is never killed.
+
+One worker by default: core.pubsub delivers live events only inside the
+process that published them. Keep GUNICORN_THREADS well above
+BROKER_MAX_SUBSCRIBERS (100) so open streams never take every thread.
+"""
+import os
+
+bind = "0.0.0.0:5000"
+worker_class = "gthread"
+workers = int(os.getenv("GUNICORN_WORKERS", 1))
+threads = int(os.getenv("GUNICORN_THREADS", 150))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 120))
+graceful_timeout = 30
+keepalive = 5
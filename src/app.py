@@ -17,6 +17,7 @@ from controllers.file_attachment_controller import file_attachment_bp
 from controllers.auth_controller import auth_bp
 from controllers.documentation_controller import documentation_bp
 from controllers.slack_integration_controller import slack_bp
+from controllers.job_controller import job_bp
 
 
 from extensions import mail
@@ -24,6 +25,8 @@ from controllers.profile_controller import profile_bp
 from controllers.dashboard_controller import dashboard_bp
 # from controllers.time_controller import time_bp  # Commented out - not registered
 from data.db_session import get_db
+from core import unit_of_work, jobs
+from clients import ollama_gateway
 from controllers.view_controller import view_bp  
 from flask import Blueprint
 from services.task_service import TaskService
@@ -36,9 +39,16 @@ def create_app():
     app.url_map.strict_slashes = False
     app.secret_key = os.getenv('SECRET_KEY', 'fallback_secret_key_for_local_dev')
     from repositories.repository_factory import RepositoryFactory
-    db = get_db() 
+    # Probe the shared pool once at startup; the connection goes straight back
+    get_db().close()
     print("Project Sentinel Application and SQL Server connection pool initialized.")
     mail.init_app(app)
+    # One connection + one transaction per request, shared by all repositories
+    unit_of_work.init_app(app)
+    # Background workers for mail / AI / GitHub jobs (polled at /api/v1/jobs/<id>)
+    jobs.init_app(app)
+    # One queue in front of the local model (OLLAMA_MAX_CONCURRENCY, OLLAMA_WARM_UP)
+    ollama_gateway.init_app(app)
     # app.py or extensions.py
     base_url = os.getenv('BASE_URL', 'https://nonfossiliferous-laughingly-malaya.ngrok-free.dev')
     app.config.update(
@@ -73,6 +83,7 @@ def create_app():
     app.register_blueprint(profile_bp)
     app.register_blueprint(dashboard_bp)
     app.register_blueprint(note_bp)  
+    app.register_blueprint(job_bp)
     # In your main controller or app.py where the page is served
 
     # ✅ LANGUAGE SETUP - Runs before every request
@@ -119,9 +130,8 @@ def create_app():
         return render_template("admin.html")
     @app.route("/home")
     def home():
-        task_service = TaskService()
-        tasks = task_service.get_all_tasks()
-        return render_template("home.html", tasks=tasks)
+        # home.js fetches tasks page by page from /api/v1/tasks
+        return render_template("home.html")
 
     @app.route("/repositories")
     def repositories():
@@ -211,6 +221,11 @@ def create_app():
         for rule in app.url_map.iter_rules():
             routes.append(f"{rule} -> {rule.endpoint}")
         return "<br>".join(sorted(routes))
+
+    @app.route("/__db_pool__")
+    def show_db_pool():
+        from core.db_pool import get_pool
+        return jsonify(get_pool().stats())
     @app.route("/whiteboard")
     def whiteboard():
         return render_template("whiteboard.html")
@@ -0,0 +1,39 @@
+"""
+Backfills the local GitHub store (commits, pull requests, branches) for every
+repo linked to a project, e.g. repos linked before the webhook was installed.
+
+Usage (from src/):
+    GITHUB_BACKFILL_TOKEN=<token> python backfill_github.py [owner/repo ...]
+"""
+import os
+import sys
+from repositories.repository_factory import RepositoryFactory
+from services.github_service import GitHubService
+
+
+def backfill_github(token, repos=None):
+    repos = repos or RepositoryFactory.get_repository("project").get_linked_repos()
+    if not repos:
+        print("No linked repositories to backfill.")
+        return True
+
+    print(f"🔨 Backfilling {len(repos)} repo(s)...")
+    report = GitHubService.backfill_repos(token, repos)
+    ok = True
+    for repo, result in report.items():
+        if result['stored']:
+            print(f" - {repo}: {len(result['commits'])} commits, {len(result['pull_requests'])} PRs, "
+                  f"{len(result['branches'])} branches OK.")
+        else:
+            ok = False
+            print(f" - ❌ {repo}: not stored ({', '.join(result['errors']) or 'store unavailable'})")
+    return ok
+
+
+if __name__ == '__main__':
+    token = os.getenv('GITHUB_BACKFILL_TOKEN')
+    if not token:
+        print("❌ Set GITHUB_BACKFILL_TOKEN to a token that can read the linked repos.")
+        sys.exit(1)
+    if not backfill_github(token, sys.argv[1:]):
+        sys.exit(1)
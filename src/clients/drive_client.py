@@ -1,17 +1,65 @@
+import os
 import os.path
 import io
+import json
 import logging
-from google.auth.transport.requests import Request
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import httplib2
+import requests
+import google_auth_httplib2
+from google.auth.transport.requests import Request, AuthorizedSession
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseUpload, MediaIoBaseDownload
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.http import MediaIoBaseUpload
 from googleapiclient.errors import HttpError
+from werkzeug.http import parse_range_header
+from core.ttl_cache import TTLCache
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: in-process locking only
+    fcntl = None
 
 logger = logging.getLogger(__name__)
 
 SCOPES = ['https://www.googleapis.com/auth/drive']
 
+# Refresh the access token this long before it expires, so requests never hit a 401
+REFRESH_AHEAD = timedelta(seconds=int(os.getenv('DRIVE_TOKEN_REFRESH_AHEAD', 300)))
+HTTP_TIMEOUT = int(os.getenv('DRIVE_HTTP_TIMEOUT', 60))
+# Bytes read from Drive (and written to the client) per chunk when streaming downloads
+DOWNLOAD_CHUNK_SIZE = int(os.getenv('DRIVE_DOWNLOAD_CHUNK_SIZE', 1024 * 1024))
+# Where ranged exports are spooled (None = system temp dir)
+SPOOL_DIR = os.getenv('DRIVE_SPOOL_DIR') or None
+# Resumable upload chunk size; Drive requires a multiple of 256 KiB (except the last chunk)
+UPLOAD_CHUNK_GRANULARITY = 256 * 1024
+UPLOAD_CHUNK_SIZE = max(UPLOAD_CHUNK_GRANULARITY,
+                        int(os.getenv('DRIVE_UPLOAD_CHUNK_SIZE', 4 * 1024 * 1024))
+                        // UPLOAD_CHUNK_GRANULARITY * UPLOAD_CHUNK_GRANULARITY)
+# Consecutive transient failures (network, 5xx, 429) tolerated per chunk, with exponential backoff
+UPLOAD_RETRIES = int(os.getenv('DRIVE_UPLOAD_RETRIES', 5))
+UPLOAD_RETRY_DELAY = float(os.getenv('DRIVE_UPLOAD_RETRY_DELAY', 1.0))
+UPLOAD_RETRY_STATUSES = (429, 500, 502, 503, 504)
+FILE_FIELDS = "id, name, mimeType, modifiedTime, size, parents, webViewLink, owners, ownedByMe, capabilities"
+# Drive accepts at most 100 calls in one batch request
+BATCH_LIMIT = 100
+BATCH_OPERATIONS = ('delete', 'rename', 'move', 'metadata')
+
+# Normalized file metadata (incl. capabilities) from recent list/get calls, so
+# permission pre-checks and downloads don't need their own GET
+metadata_cache = TTLCache(int(os.getenv('DRIVE_METADATA_TTL', 60)), max_entries=5000)
+
+# Listing pages fetched ahead of the UI asking for them: (query, page token) -> Future
+page_cache = TTLCache(int(os.getenv('DRIVE_PAGE_CACHE_TTL', 60)), max_entries=256)
+_prefetch_executor = ThreadPoolExecutor(max_workers=int(os.getenv('DRIVE_PREFETCH_WORKERS', 2)),
+                                        thread_name_prefix="drive-prefetch")
+
 class DriveClientError(Exception):
     """Custom exception for Drive Client errors"""
     pass
@@ -20,47 +68,238 @@ class InsufficientPermissionsError(DriveClientError):
     """Exception for permission-related errors"""
     pass
 
+class ChangesTokenError(DriveClientError):
+    """The stored Changes API page token is no longer valid; a full resync is needed"""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+class RangeNotSatisfiableError(DriveClientError):
+    """The requested byte range lies outside the file (HTTP 416)"""
+
+    def __init__(self, message, size=None):
+        super().__init__(message)
+        self.size = size
+
+
+class UploadSessionExpiredError(DriveClientError):
+    """The resumable upload session is gone (404/410); the upload must start over"""
+    pass
+
+
+class DriveDownload:
+    """
+    An open download, consumed by iterating over it (chunks of bytes).
+
+    status is 200 for the whole file or 206 for a byte range; content_length
+    and content_range are set when known. Reaching the end or calling close()
+    releases the Drive connection / spool file, so a Flask Response closing
+    early (client went away) cleans up too.
+    """
+
+    def __init__(self, chunks, metadata, status=200, content_length=None, content_range=None, on_close=None):
+        self.metadata = metadata
+        self.status = status
+        self.content_length = content_length
+        self.content_range = content_range
+        self._chunks = chunks
+        self._on_close = on_close
+
+    def __iter__(self):
+        try:
+            for chunk in self._chunks:
+                if chunk:
+                    yield chunk
+        finally:
+            self.close()
+
+    def close(self):
+        on_close, self._on_close = self._on_close, None
+        if on_close:
+            on_close()
+
+
+def _size_from_content_range(content_range):
+    # "bytes */1234" or "bytes 0-99/1234"
+    total = (content_range or '').rpartition('/')[2]
+    return int(total) if total.isdigit() else None
+
+
+_discovery_doc = None
+_discovery_lock = threading.Lock()
+
+
+def _drive_discovery_doc():
+    """Drive v3 discovery document bundled with google-api-python-client, parsed once."""
+    global _discovery_doc
+    if _discovery_doc is None:
+        with _discovery_lock:
+            if _discovery_doc is None:
+                _discovery_doc = json.loads(get_static_doc('drive', 'v3'))
+    return _discovery_doc
+
+
+class _TokenFileLock:
+    """
+    Exclusive lock around token.json shared by every gunicorn worker on the host
+    (flock on a sibling .lock file), plus a thread lock within the process.
+    """
+    _thread_lock = threading.RLock()
+
+    def __init__(self, token_path):
+        self.lock_path = token_path + '.lock'
+        self._fd = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if fcntl is not None:
+            try:
+                self._fd = open(self.lock_path, 'a')
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            except OSError as e:
+                logger.warning(f"Could not lock {self.lock_path}: {e}")
+                self._fd = None
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if self._fd is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+                self._fd.close()
+        finally:
+            self._fd = None
+            self._thread_lock.release()
+
+
+class DriveCredentials:
+    """
+    OAuth credentials shared by every DriveClient in the process.
+
+    token.json is read once; the access token is refreshed shortly before it
+    expires (REFRESH_AHEAD) under a cross-process file lock. Before refreshing,
+    the token file is re-read, so when several workers race only the first one
+    talks to Google and the rest adopt its token.
+    """
+
+    def __init__(self, credentials_path, token_path):
+        self.credentials_path = credentials_path
+        self.token_path = token_path
+        self.generation = 0     # bumped whenever the Credentials object is replaced
+        self._creds = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Valid credentials, refreshed ahead of expiry."""
+        creds = self._creds
+        if creds is not None and not self._needs_refresh(creds):
+            return creds
+        with self._lock:
+            if self._creds is None or self._needs_refresh(self._creds):
+                self._renew()
+            return self._creds
+
+    @staticmethod
+    def _needs_refresh(creds):
+        if not creds.token:
+            return True
+        if creds.expiry is None:
+            return False
+        # google-auth keeps expiry as naive UTC
+        return creds.expiry - REFRESH_AHEAD <= datetime.utcnow()
+
+    def _renew(self):
+        with _TokenFileLock(self.token_path):
+            # Another worker may have refreshed while we waited for the lock
+            creds = self._read_token_file()
+            if creds is None or self._needs_refresh(creds):
+                if creds and creds.refresh_token:
+                    creds.refresh(Request())
+                else:
+                    creds = self._interactive_login()
+                self._write_token_file(creds)
+        self._creds = creds
+        self.generation += 1
+
+    def _read_token_file(self):
+        if not os.path.exists(self.token_path):
+            return None
+        return Credentials.from_authorized_user_file(self.token_path, SCOPES)
+
+    def _write_token_file(self, creds):
+        # Write-then-rename so other workers never read a half-written file
+        directory = os.path.dirname(self.token_path) or '.'
+        fd, tmp_path = tempfile.mkstemp(prefix='.token-', dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as tmp:
+                tmp.write(creds.to_json())
+            os.replace(tmp_path, self.token_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _interactive_login(self):
+        if not os.path.exists(self.credentials_path):
+            raise DriveClientError(
+                f"credentials.json not found at {self.credentials_path}. "
+                f"Please download it from Google Cloud Console and place it in the project root."
+            )
+        flow = InstalledAppFlow.from_client_secrets_file(self.credentials_path, SCOPES)
+        return flow.run_local_server(port=0)
+
+
+_shared_credentials = {}
+_shared_credentials_lock = threading.Lock()
+
+
+def _get_shared_credentials(credentials_path, token_path):
+    key = (credentials_path, token_path)
+    with _shared_credentials_lock:
+        if key not in _shared_credentials:
+            _shared_credentials[key] = DriveCredentials(credentials_path, token_path)
+        return _shared_credentials[key]
+
+
 class DriveClient:
+    # httplib2.Http is not thread-safe: each thread gets its own transport + service
+    _local = threading.local()
+
     def __init__(self):
-        """Initialize the Drive API client"""
-        self.creds = None
-        self.service = None
-        
+        """Initialize the Drive API client (cheap: credentials and transports are shared)"""
         self.base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.credentials_path = os.path.join(self.base_dir, 'credentials.json')
         self.token_path = os.path.join(self.base_dir, 'token.json')
-        
+        self._credentials = _get_shared_credentials(self.credentials_path, self.token_path)
+
         self._authenticate()
 
     def _authenticate(self):
-        """Handle OAuth2 authentication"""
+        """Make sure usable credentials exist (fails fast like the old per-request client)"""
         try:
-            if os.path.exists(self.token_path):
-                self.creds = Credentials.from_authorized_user_file(self.token_path, SCOPES)
-            
-            if not self.creds or not self.creds.valid:
-                if self.creds and self.creds.expired and self.creds.refresh_token:
-                    self.creds.refresh(Request())
-                else:
-                    if not os.path.exists(self.credentials_path):
-                        raise DriveClientError(
-                            f"credentials.json not found at {self.credentials_path}. "
-                            f"Please download it from Google Cloud Console and place it in the project root."
-                        )
-                        
-                    flow = InstalledAppFlow.from_client_secrets_file(
-                        self.credentials_path, SCOPES)
-                    self.creds = flow.run_local_server(port=0)
-                
-                with open(self.token_path, 'w') as token:
-                    token.write(self.creds.to_json())
-
-            self.service = build('drive', 'v3', credentials=self.creds)
-
+            self._credentials.get()
+        except DriveClientError:
+            raise
         except Exception as e:
             logger.error(f"Authentication failed: {e}")
             raise DriveClientError(f"Authentication failed: {e}")
 
+    @property
+    def creds(self):
+        return self._credentials.get()
+
+    @property
+    def service(self):
+        """Drive v3 service for the calling thread, built from the static discovery document."""
+        creds = self._credentials.get()
+        local = DriveClient._local
+        key = (id(self._credentials), self._credentials.generation)
+        if getattr(local, 'key', None) != key:
+            http = google_auth_httplib2.AuthorizedHttp(creds, http=httplib2.Http(timeout=HTTP_TIMEOUT))
+            local.service = build_from_document(_drive_discovery_doc(), http=http)
+            local.key = key
+        return local.service
+
     def check_file_permissions(self, file_id):
         """
         Check what permissions the current user has on a file
@@ -96,29 +335,77 @@ class DriveClient:
         try:
             file = self.service.files().get(
                 fileId=file_id,
-                fields="id, name, mimeType, modifiedTime, size, parents, webViewLink, owners, ownedByMe, capabilities"
+                fields=FILE_FIELDS
             ).execute()
             
-            capabilities = file.get('capabilities', {})
-            
-            return {
-                'id': file.get('id'),
-                'name': file.get('name'),
-                'mime_type': file.get('mimeType'),
-                'modified_at': file.get('modifiedTime'),
-                'size': file.get('size'),
-                'type': self._map_mime_to_type(file.get('mimeType')),
-                'owners': [o.get('emailAddress') for o in file.get('owners', [])],
-                'is_owner': file.get('ownedByMe', False),
-                'can_edit': capabilities.get('canEdit', False),
-                'can_delete': capabilities.get('canDelete', False),
-                'can_rename': capabilities.get('canRename', False)
-            }
+            metadata = self.normalize_file(file)
+            metadata_cache.set(file_id, metadata)
+            return dict(metadata)
         except HttpError as error:
             raise DriveClientError(f"An error occurred getting metadata: {error}")
 
+    def _known_metadata(self, file_id):
+        """Metadata from a recent list_files / get_file_metadata call, else a fresh GET"""
+        cached = metadata_cache.get(file_id)
+        return dict(cached) if cached else self.get_file_metadata(file_id)
+
+    def normalize_file(self, item):
+        capabilities = item.get('capabilities', {})
+        return {
+            'id': item.get('id'),
+            'name': item.get('name'),
+            'mime_type': item.get('mimeType'),
+            'modified_at': item.get('modifiedTime'),
+            'size': item.get('size'),
+            'type': self._map_mime_to_type(item.get('mimeType')),
+            'parents': item.get('parents', []),
+            'web_link': item.get('webViewLink'),
+            'owners': [o.get('emailAddress') for o in item.get('owners', [])],
+            'is_owner': item.get('ownedByMe', False),
+            'can_edit': capabilities.get('canEdit', False),
+            'can_delete': capabilities.get('canDelete', False),
+            'can_rename': capabilities.get('canRename', False),
+            'can_move': capabilities.get('canMoveItemWithinDrive', capabilities.get('canEdit', False))
+        }
+
     def list_files(self, limit=50, order_by='modifiedTime desc', mime_type=None, folder_id=None):
-        """List files from Drive with permission info"""
+        """List files from Drive with permission info (first page only, see iter_file_pages)"""
+        files, _ = self.list_files_page(limit, order_by, mime_type, folder_id)
+        return files
+
+    def iter_file_pages(self, limit=50, order_by='modifiedTime desc', mime_type=None, folder_id=None,
+                        page_token=None):
+        """Yield (files, next_page_token) lazily, one Drive request per page, until the listing ends"""
+        while True:
+            files, page_token = self.list_files_page(limit, order_by, mime_type, folder_id, page_token)
+            yield files, page_token
+            if not page_token:
+                return
+
+    def list_files_page(self, limit=50, order_by='modifiedTime desc', mime_type=None, folder_id=None,
+                        page_token=None, prefetch=False):
+        """
+        One page of a listing: (files, next_page_token or None).
+        With prefetch=True the following page is requested in the background, so
+        asking for next_page_token soon after is answered without waiting on Drive.
+        """
+        key = (limit, order_by, mime_type, folder_id, page_token)
+        future = page_cache.get(key)
+        if future is not None:
+            page_cache.invalidate(key)
+            try:
+                files, next_token = future.result()
+            except DriveClientError:
+                files, next_token = self._fetch_page(*key)
+        else:
+            files, next_token = self._fetch_page(*key)
+
+        if prefetch and next_token:
+            next_key = (limit, order_by, mime_type, folder_id, next_token)
+            page_cache.set(next_key, _prefetch_executor.submit(self._fetch_page, *next_key))
+        return files, next_token
+
+    def _fetch_page(self, limit, order_by, mime_type, folder_id, page_token):
         try:
             query = "trashed = false"
             
@@ -130,7 +417,8 @@ class DriveClient:
 
             results = self.service.files().list(
                 pageSize=limit,
-                fields="nextPageToken, files(id, name, mimeType, modifiedTime, size, parents, webContentLink, webViewLink, ownedByMe, capabilities)",
+                pageToken=page_token,
+                fields=f"nextPageToken, files({FILE_FIELDS})",
                 q=query,
                 orderBy=order_by
             ).execute()
@@ -139,40 +427,30 @@ class DriveClient:
             
             normalized = []
             for item in items:
-                capabilities = item.get('capabilities', {})
-                normalized.append({
-                    'id': item.get('id'),
-                    'name': item.get('name'),
-                    'mime_type': item.get('mimeType'),
-                    'modified_at': item.get('modifiedTime'),
-                    'size': item.get('size'),
-                    'type': self._map_mime_to_type(item.get('mimeType')),
-                    'web_link': item.get('webViewLink'),
-                    'is_owner': item.get('ownedByMe', False),
-                    'can_edit': capabilities.get('canEdit', False),
-                    'can_delete': capabilities.get('canDelete', False),
-                    'can_rename': capabilities.get('canRename', False)
-                })
+                metadata = self.normalize_file(item)
+                metadata_cache.set(metadata['id'], metadata)
+                normalized.append(dict(metadata))
             
-            return normalized
+            return normalized, results.get('nextPageToken')
 
         except HttpError as error:
             raise DriveClientError(f"An error occurred listing files: {error}")
 
     def delete_file(self, file_id):
-        """Delete a file - checks permissions first"""
+        """Delete a file - checks permissions first (from the metadata cache when possible)"""
         try:
             # Check permissions before attempting delete
-            perms = self.check_file_permissions(file_id)
+            perms = self._known_metadata(file_id)
             
             if not perms['can_delete']:
                 raise InsufficientPermissionsError(
-                    f"Cannot delete '{perms['file_name']}'. "
+                    f"Cannot delete '{perms['name']}'. "
                     f"You don't have delete permissions. "
                     f"Owner status: {perms['is_owner']}"
                 )
             
             self.service.files().delete(fileId=file_id).execute()
+            metadata_cache.invalidate(file_id)
             return True
             
         except HttpError as error:
@@ -184,14 +462,14 @@ class DriveClient:
             raise DriveClientError(f"An error occurred deleting: {error}")
 
     def rename_file(self, file_id, new_name):
-        """Rename a file - checks permissions first"""
+        """Rename a file - checks permissions first (from the metadata cache when possible)"""
         try:
             # Check permissions before attempting rename
-            perms = self.check_file_permissions(file_id)
+            perms = self._known_metadata(file_id)
             
             if not perms['can_rename']:
                 raise InsufficientPermissionsError(
-                    f"Cannot rename '{perms['file_name']}'. "
+                    f"Cannot rename '{perms['name']}'. "
                     f"You don't have edit permissions."
                 )
             
@@ -199,8 +477,9 @@ class DriveClient:
             file = self.service.files().update(
                 fileId=file_id,
                 body=file_metadata,
-                fields='id, name, mimeType'
+                fields=FILE_FIELDS
             ).execute()
+            metadata_cache.invalidate(file_id)
             return file
             
         except HttpError as error:
@@ -211,6 +490,183 @@ class DriveClient:
                 )
             raise DriveClientError(f"An error occurred renaming: {error}")
 
+    # ===== BATCH OPERATIONS =====
+
+    def batch(self, operations):
+        """
+        Run many delete / rename / move / metadata operations through Drive's
+        batch endpoint (up to BATCH_LIMIT calls per HTTP round trip).
+
+        operations: dicts like {'op': 'rename', 'id': ..., 'name': ...} or
+        {'op': 'move', 'id': ..., 'folder_id': ...}. Capabilities come from the
+        metadata cache filled by list_files; only files not seen recently are
+        fetched, in one extra batch. Returns one result per operation, in order.
+        """
+        results = [None] * len(operations)
+        for index, op in enumerate(operations):
+            error = self._invalid_operation(op)
+            if error:
+                results[index] = self._batch_result(op, error=error)
+        pending = [index for index, result in enumerate(results) if result is None]
+
+        # 1. Metadata + capabilities, fetched only for files we haven't seen
+        known, fetch_errors = {}, {}
+        for index in pending:
+            file_id = operations[index]['id']
+            cached = metadata_cache.get(file_id)
+            if cached:
+                known[file_id] = cached
+        missing = {operations[index]['id'] for index in pending} - set(known)
+        fetched = self._execute_batch({
+            file_id: self.service.files().get(fileId=file_id, fields=FILE_FIELDS) for file_id in missing
+        })
+        for file_id, (response, error) in fetched.items():
+            if error is not None:
+                fetch_errors[file_id] = error
+                continue
+            known[file_id] = self.normalize_file(response)
+            metadata_cache.set(file_id, known[file_id])
+
+        # 2. Permission pre-check, then all mutations in one batch
+        mutations = {}
+        for index in pending:
+            op = operations[index]
+            metadata = known.get(op['id'])
+            if metadata is None:
+                results[index] = self._batch_result(op, http_error=fetch_errors.get(op['id']))
+            elif op['op'] == 'metadata':
+                results[index] = self._batch_result(op, file=dict(metadata))
+            elif not metadata.get(f"can_{op['op']}"):
+                results[index] = self._batch_result(
+                    op, error=f"You don't have permission to {op['op']} '{metadata['name']}'.",
+                    error_type='permissions')
+            else:
+                mutations[index] = self._mutation_request(op, metadata)
+
+        for index, (response, error) in self._execute_batch(mutations).items():
+            op = operations[index]
+            metadata_cache.invalidate(op['id'])
+            if error is not None:
+                results[index] = self._batch_result(op, http_error=error)
+            else:
+                results[index] = self._batch_result(op, file=self.normalize_file(response) if response else None)
+        return results
+
+    @staticmethod
+    def _invalid_operation(op):
+        if not isinstance(op, dict) or op.get('op') not in BATCH_OPERATIONS:
+            return f"Unknown operation (expected one of: {', '.join(BATCH_OPERATIONS)})"
+        if not op.get('id'):
+            return "File ID is required"
+        if op['op'] == 'rename' and not (op.get('name') or '').strip():
+            return "New name is required"
+        if op['op'] == 'move' and not op.get('folder_id'):
+            return "Target folder_id is required"
+        return None
+
+    @staticmethod
+    def _batch_result(op, file=None, error=None, error_type=None, http_error=None):
+        op = op if isinstance(op, dict) else {}
+        result = {'op': op.get('op'), 'id': op.get('id'), 'success': error is None and http_error is None}
+        if http_error is not None:
+            status = http_error.resp.status if getattr(http_error, 'resp', None) is not None else None
+            if status == 403:
+                error, error_type = "Insufficient permissions. You may only have view access to this file.", 'permissions'
+            elif status == 404:
+                error = f"File not found: {op.get('id')}"
+            else:
+                error = str(http_error)
+        if result['success']:
+            result['file'] = file
+        else:
+            result['error'] = error
+            if error_type:
+                result['error_type'] = error_type
+        return result
+
+    def _mutation_request(self, op, metadata):
+        files = self.service.files()
+        if op['op'] == 'delete':
+            return files.delete(fileId=op['id'])
+        if op['op'] == 'rename':
+            return files.update(fileId=op['id'], body={'name': op['name'].strip()}, fields=FILE_FIELDS)
+        return files.update(fileId=op['id'], addParents=op['folder_id'],
+                            removeParents=','.join(metadata.get('parents') or []),
+                            fields=FILE_FIELDS)
+
+    def _execute_batch(self, requests_by_key):
+        """
+        Send {key: HttpRequest} through new_batch_http_request, BATCH_LIMIT at a time.
+        Returns {key: (response, HttpError or None)}.
+        """
+        items = list(requests_by_key.items())
+        outcome = {}
+        for start in range(0, len(items), BATCH_LIMIT):
+            chunk = items[start:start + BATCH_LIMIT]
+
+            def callback(request_id, response, exception, chunk=chunk):
+                outcome[chunk[int(request_id)][0]] = (response, exception)
+
+            batch = self.service.new_batch_http_request(callback=callback)
+            for position, (_, request) in enumerate(chunk):
+                batch.add(request, request_id=str(position))
+            try:
+                batch.execute()
+            except HttpError as error:
+                raise DriveClientError(f"An error occurred in batch request: {error}")
+        return outcome
+
+    # ===== CHANGES API (local mirror sync) =====
+
+    def get_start_page_token(self):
+        """Changes page token for "now"; changes after this point are reported by list_changes"""
+        try:
+            return self.service.changes().getStartPageToken().execute()['startPageToken']
+        except HttpError as error:
+            raise DriveClientError(f"An error occurred getting start page token: {error}")
+
+    def iter_all_files(self, page_size=1000):
+        """Every non-trashed file, normalized, page by page (full mirror sync)"""
+        for files, _ in self.iter_file_pages(limit=page_size, order_by=None):
+            yield from files
+
+    def list_changes(self, page_token, page_size=1000):
+        """
+        Everything that changed since page_token.
+        Returns (changed_files, removed_ids, new_page_token); trashed files count as removed.
+        Raises ChangesTokenError when the token has expired (full resync needed).
+        """
+        changed, removed = {}, set()
+        while True:
+            try:
+                results = self.service.changes().list(
+                    pageToken=page_token,
+                    pageSize=page_size,
+                    includeRemoved=True,
+                    fields=f"nextPageToken, newStartPageToken, changes(fileId, removed, file({FILE_FIELDS}, trashed))"
+                ).execute()
+            except HttpError as error:
+                if error.resp.status in (404, 410):
+                    raise ChangesTokenError(f"Changes page token expired: {error}", error.resp.status)
+                raise DriveClientError(f"An error occurred listing changes: {error}")
+
+            for change in results.get('changes', []):
+                file_id = change.get('fileId')
+                if not file_id:
+                    continue    # shared-drive level change
+                item = change.get('file')
+                if change.get('removed') or not item or item.get('trashed'):
+                    removed.add(file_id)
+                    changed.pop(file_id, None)
+                else:
+                    changed[file_id] = self.normalize_file(item)
+                    removed.discard(file_id)
+                    metadata_cache.invalidate(file_id)
+
+            if 'newStartPageToken' in results:
+                return list(changed.values()), sorted(removed), results['newStartPageToken']
+            page_token = results['nextPageToken']
+
     def upload_text(self, filename, content, folder_id=None):
         """Upload a text string as a file"""
         try:
@@ -227,7 +683,7 @@ class DriveClient:
             file = self.service.files().create(
                 body=file_metadata,
                 media_body=media,
-                fields='id, name, mimeType'
+                fields=FILE_FIELDS
             ).execute()
             
             return file
@@ -259,6 +715,106 @@ class DriveClient:
         except HttpError as error:
             raise DriveClientError(f"An error occurred uploading file: {error}")
 
+    # --------------------------------------------------
+    # RESUMABLE UPLOADS
+    # --------------------------------------------------
+    def start_resumable_upload(self, filename, mime_type, total_bytes, folder_id=None):
+        """Open a resumable upload session. Returns the session URI that chunks are PUT to."""
+        file_metadata = {'name': filename}
+        if folder_id:
+            file_metadata['parents'] = [folder_id]
+        headers = {
+            'Content-Type': 'application/json; charset=UTF-8',
+            'X-Upload-Content-Type': mime_type,
+            'X-Upload-Content-Length': str(total_bytes)
+        }
+        try:
+            resp = self._session().post(self._upload_url(),
+                                        params={'uploadType': 'resumable', 'fields': FILE_FIELDS},
+                                        data=json.dumps(file_metadata), headers=headers,
+                                        timeout=HTTP_TIMEOUT)
+        except requests.RequestException as e:
+            raise DriveClientError(f"An error occurred starting the upload: {e}")
+
+        if resp.status_code != 200 or not resp.headers.get('Location'):
+            raise DriveClientError(f"An error occurred starting the upload: HTTP {resp.status_code}")
+        return resp.headers['Location']
+
+    def query_upload(self, session_uri, total_bytes):
+        """
+        Ask Drive how much of a session it has stored.
+        Returns (bytes_received, file) where file is set once the upload is complete.
+        """
+        try:
+            resp = self._put_chunk(session_uri, b'', f"bytes */{total_bytes}")
+        except requests.RequestException as e:
+            raise DriveClientError(f"An error occurred checking the upload: {e}")
+        return self._upload_status(resp)
+
+    def upload_chunks(self, session_uri, stream, total_bytes, offset=0, chunk_size=None, on_progress=None):
+        """
+        PUT a seekable stream to a resumable session, starting at `offset`.
+        on_progress(bytes_received) runs after every chunk Drive acknowledges.
+        Transient failures ask Drive where it got to and carry on from there.
+        Returns the created file.
+        """
+        chunk_size = chunk_size or UPLOAD_CHUNK_SIZE
+        failures = 0
+        while True:
+            if offset is None:
+                # After a failure we don't know what Drive kept: ask, don't guess
+                data, content_range = b'', f"bytes */{total_bytes}"
+            else:
+                stream.seek(offset)
+                data = stream.read(chunk_size)
+                if not data and offset < total_bytes:
+                    raise DriveClientError(f"Upload source ended at {offset} of {total_bytes} bytes")
+                content_range = (f"bytes {offset}-{offset + len(data) - 1}/{total_bytes}" if data
+                                 else f"bytes */{total_bytes}")
+            try:
+                resp = self._put_chunk(session_uri, data, content_range)
+                error = None if resp.status_code not in UPLOAD_RETRY_STATUSES else f"HTTP {resp.status_code}"
+            except requests.RequestException as e:
+                error = str(e)
+
+            if error is None:
+                received, file = self._upload_status(resp)
+                if file is not None:
+                    return file
+                failures = 0
+                offset = received
+                if on_progress:
+                    on_progress(received)
+                continue
+
+            failures += 1
+            if failures > UPLOAD_RETRIES:
+                raise DriveClientError(f"Upload failed after {failures} attempts: {error}")
+            logger.warning(f"Upload chunk failed ({error}), retrying ({failures}/{UPLOAD_RETRIES})")
+            time.sleep(min(UPLOAD_RETRY_DELAY * 2 ** (failures - 1), 30))
+            offset = None
+
+    def _put_chunk(self, session_uri, data, content_range):
+        return self._session().put(session_uri, data=data, headers={'Content-Range': content_range},
+                                   timeout=HTTP_TIMEOUT)
+
+    @staticmethod
+    def _upload_status(resp):
+        if resp.status_code in (200, 201):
+            return None, resp.json()
+        if resp.status_code == 308:
+            # 'Range: bytes=0-N' is what Drive has; no header means nothing yet
+            received = resp.headers.get('Range')
+            return (int(received.rsplit('-', 1)[1]) + 1 if received else 0), None
+        if resp.status_code in (404, 410):
+            raise UploadSessionExpiredError("Upload session expired")
+        raise DriveClientError(f"An error occurred uploading file: HTTP {resp.status_code}")
+
+    def _upload_url(self):
+        doc = _drive_discovery_doc()
+        path = doc['resources']['files']['methods']['create']['mediaUpload']['protocols']['simple']['path']
+        return doc['rootUrl'].rstrip('/') + path
+
     def _is_google_doc(self, mime_type):
         """Check if the file is a Google Workspace document"""
         google_doc_types = [
@@ -290,44 +846,121 @@ class DriveClient:
         return extension_map.get(google_mime_type, '.pdf')
 
     def download_file(self, file_id):
-        """Download file content - handles both regular files and Google Docs"""
+        """Download a whole file into memory - handles both regular files and Google Docs"""
+        download = self.open_download(file_id)
+        return b''.join(download), download.metadata
+
+    def open_download(self, file_id, range_header=None, chunk_size=None):
+        """
+        Start streaming a file as a DriveDownload.
+
+        Regular files are streamed straight from get_media and a Range header
+        is passed through to Drive. Google Workspace files are exported; the
+        export endpoint ignores Range, so a ranged export is spooled to a temp
+        file first and the range is served from disk.
+        """
+        chunk_size = chunk_size or DOWNLOAD_CHUNK_SIZE
+        metadata = self._known_metadata(file_id)
+        mime_type = metadata['mime_type']
+
+        if self._is_google_doc(mime_type):
+            export_mime_type = self._get_export_mime_type(mime_type)
+            extension = self._get_export_extension(mime_type)
+            if not metadata['name'].endswith(extension):
+                metadata['name'] = metadata['name'] + extension
+            metadata['mime_type'] = export_mime_type
+
+            url = self._media_url(file_id, export_mime_type)
+            if range_header:
+                return self._spooled_download(url, metadata, range_header, chunk_size)
+            resp = self._get_stream(url)
+            return DriveDownload(resp.iter_content(chunk_size), metadata,
+                                 content_length=resp.headers.get('Content-Length'),
+                                 on_close=resp.close)
+
+        resp = self._get_stream(self._media_url(file_id), range_header)
+        return DriveDownload(resp.iter_content(chunk_size), metadata,
+                             status=resp.status_code,
+                             content_length=resp.headers.get('Content-Length'),
+                             content_range=resp.headers.get('Content-Range'),
+                             on_close=resp.close)
+
+    def _session(self):
+        """Authorized requests session for media streams (per thread, like the service)"""
+        creds = self._credentials.get()
+        local = DriveClient._local
+        key = (id(self._credentials), self._credentials.generation)
+        if getattr(local, 'session_key', None) != key:
+            local.session = AuthorizedSession(creds)
+            local.session_key = key
+        return local.session
+
+    def _media_url(self, file_id, export_mime_type=None):
+        files = self.service.files()
+        if export_mime_type:
+            return files.export_media(fileId=file_id, mimeType=export_mime_type).uri
+        return files.get_media(fileId=file_id).uri
+
+    def _get_stream(self, url, range_header=None):
+        # identity encoding keeps Content-Length / Content-Range valid for the bytes we relay
+        headers = {'Accept-Encoding': 'identity'}
+        if range_header:
+            headers['Range'] = range_header
         try:
-            metadata = self.get_file_metadata(file_id)
-            mime_type = metadata['mime_type']
-            
-            if self._is_google_doc(mime_type):
-                export_mime_type = self._get_export_mime_type(mime_type)
-                request = self.service.files().export_media(
-                    fileId=file_id,
-                    mimeType=export_mime_type
-                )
-                
-                file_io = io.BytesIO()
-                downloader = MediaIoBaseDownload(file_io, request)
-                
-                done = False
-                while not done:
-                    status, done = downloader.next_chunk()
-                
-                extension = self._get_export_extension(mime_type)
-                if not metadata['name'].endswith(extension):
-                    metadata['name'] = metadata['name'] + extension
-                    metadata['mime_type'] = export_mime_type
-                
-                return file_io.getvalue(), metadata
-            else:
-                request = self.service.files().get_media(fileId=file_id)
-                file_io = io.BytesIO()
-                downloader = MediaIoBaseDownload(file_io, request)
-                
-                done = False
-                while not done:
-                    status, done = downloader.next_chunk()
-                
-                return file_io.getvalue(), metadata
-            
-        except HttpError as error:
-            raise DriveClientError(f"An error occurred downloading: {error}")
+            resp = self._session().get(url, headers=headers, stream=True, timeout=HTTP_TIMEOUT)
+        except requests.RequestException as e:
+            raise DriveClientError(f"An error occurred downloading: {e}")
+
+        if resp.status_code == 416:
+            resp.close()
+            raise RangeNotSatisfiableError("Requested range not satisfiable",
+                                           _size_from_content_range(resp.headers.get('Content-Range')))
+        if resp.status_code not in (200, 206):
+            resp.close()
+            if resp.status_code == 404:
+                raise DriveClientError("File not found")
+            raise DriveClientError(f"An error occurred downloading: HTTP {resp.status_code}")
+        return resp
+
+    def _spooled_download(self, url, metadata, range_header, chunk_size):
+        spool = tempfile.TemporaryFile(prefix='drive-export-', dir=SPOOL_DIR)
+        try:
+            resp = self._get_stream(url)
+            try:
+                for chunk in resp.iter_content(chunk_size):
+                    spool.write(chunk)
+            finally:
+                resp.close()
+            size = spool.tell()
+
+            requested = parse_range_header(range_header)
+            bounds = requested.range_for_length(size) if requested else None
+            if requested and bounds is None:
+                raise RangeNotSatisfiableError("Requested range not satisfiable", size)
+        except Exception:
+            spool.close()
+            raise
+
+        if bounds is None:
+            # Unparseable Range header: serve the whole file, as HTTP allows
+            return DriveDownload(self._read_spool(spool, 0, size, chunk_size), metadata,
+                                 content_length=size, on_close=spool.close)
+        start, stop = bounds
+        return DriveDownload(self._read_spool(spool, start, stop, chunk_size), metadata,
+                             status=206, content_length=stop - start,
+                             content_range=f"bytes {start}-{stop - 1}/{size}",
+                             on_close=spool.close)
+
+    @staticmethod
+    def _read_spool(spool, start, stop, chunk_size):
+        spool.seek(start)
+        remaining = stop - start
+        while remaining > 0:
+            chunk = spool.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
 
     def create_folder(self, folder_name, parent_id=None):
         """Create a new folder"""
@@ -341,7 +974,7 @@ class DriveClient:
 
             file = self.service.files().create(
                 body=file_metadata,
-                fields='id, name, mimeType'
+                fields=FILE_FIELDS
             ).execute()
             return file
         except HttpError as error:
@@ -362,4 +995,18 @@ class DriveClient:
         }
         if mime_type and mime_type.startswith('image/'):
             return 'Image'
-        return mapping.get(mime_type, 'File')
\ No newline at end of file
+        return mapping.get(mime_type, 'File')
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_drive_client():
+    """Process-wide DriveClient (safe to share between threads)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = DriveClient()
+    return _client
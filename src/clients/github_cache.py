@@ -0,0 +1,198 @@
+import os
+import json
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import closing, contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse:
+    """Validators + decoded body of a previous 200 response."""
+
+    def __init__(self, etag=None, last_modified=None, body=None, size=0):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+        self.size = size
+
+
+class GitHubHTTPCache:
+    """
+    Conditional-request cache for GitHub GETs.
+
+    Entries are keyed by (token fingerprint, URL) so one user's private data is
+    never served to another, and hold the ETag / Last-Modified validators with
+    the decoded JSON. The client revalidates with If-None-Match /
+    If-Modified-Since; a 304 costs no rate limit and reuses the stored body.
+
+    The in-memory tier is an LRU bounded by entry count and total body bytes.
+    If `db_path` is set (GITHUB_CACHE_DB) entries are also written to SQLite,
+    which survives restarts and is shared by every worker on the host.
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None, db_path=None):
+        self.max_entries = max_entries or int(os.getenv('GITHUB_CACHE_MAX_ENTRIES', 2000))
+        self.max_bytes = max_bytes or int(os.getenv('GITHUB_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+        self.db_path = db_path if db_path is not None else os.getenv('GITHUB_CACHE_DB')
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+
+        self._hits = 0            # 304 Not Modified, body served from cache
+        self._misses = 0          # full 200 download
+        self._evictions = 0
+        self._rate_limit = {"limit": None, "remaining": None, "reset": None, "used": None}
+
+        if self.db_path:
+            self._init_db()
+
+    @staticmethod
+    def make_key(access_token, url):
+        # Never keep raw tokens around: key on a fingerprint
+        fingerprint = hashlib.sha256((access_token or "").encode()).hexdigest()[:16]
+        return f"{fingerprint} {url}"
+
+    # --------------------------------------------------
+    # LOOKUP / STORE
+    # --------------------------------------------------
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+        entry = self._db_get(key)
+        if entry is not None:
+            with self._lock:
+                self._store(key, entry)
+        return entry
+
+    def put(self, key, etag, last_modified, body, raw_size):
+        if not etag and not last_modified:
+            return
+        entry = CachedResponse(etag, last_modified, body, raw_size)
+        with self._lock:
+            self._store(key, entry)
+        self._db_put(key, entry)
+
+    def _store(self, key, entry):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old.size
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self._evictions += 1
+
+    # --------------------------------------------------
+    # METRICS
+    # --------------------------------------------------
+    def record_hit(self):
+        with self._lock:
+            self._hits += 1
+
+    def record_miss(self):
+        with self._lock:
+            self._misses += 1
+
+    def record_rate_limit(self, headers):
+        """Keep the latest X-RateLimit-* values GitHub reported."""
+        if "X-RateLimit-Remaining" not in headers:
+            return
+        with self._lock:
+            for name in ("limit", "remaining", "reset", "used"):
+                value = headers.get(f"X-RateLimit-{name.capitalize()}")
+                if value is not None:
+                    self._rate_limit[name] = int(value)
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "evictions": self._evictions,
+                "rate_limit": dict(self._rate_limit),
+                "persistent": bool(self.db_path)
+            }
+
+    # --------------------------------------------------
+    # SQLITE TIER
+    # --------------------------------------------------
+    @contextmanager
+    def _connect(self):
+        """Connection that commits (or rolls back) and is closed on exit"""
+        with closing(sqlite3.connect(self.db_path, timeout=5)) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+
+    def _init_db(self):
+        try:
+            with self._connect() as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS github_http_cache (
+                        cache_key TEXT PRIMARY KEY,
+                        etag TEXT,
+                        last_modified TEXT,
+                        body TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        last_used REAL NOT NULL DEFAULT (julianday('now'))
+                    )
+                """)
+        except sqlite3.Error as e:
+            logger.warning(f"GitHub cache DB disabled: {e}")
+            self.db_path = None
+
+    def _db_get(self, key):
+        if not self.db_path:
+            return None
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT etag, last_modified, body, size FROM github_http_cache WHERE cache_key = ?",
+                    (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                conn.execute("UPDATE github_http_cache SET last_used = julianday('now') WHERE cache_key = ?",
+                             (key,))
+            return CachedResponse(row[0], row[1], json.loads(row[2]), row[3])
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"GitHub cache read failed: {e}")
+            return None
+
+    def _db_put(self, key, entry):
+        if not self.db_path:
+            return
+        try:
+            with self._connect() as conn:
+                conn.execute("""
+                    INSERT OR REPLACE INTO github_http_cache (cache_key, etag, last_modified, body, size)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (key, entry.etag, entry.last_modified, json.dumps(entry.body), entry.size))
+                # Same size budget as memory: drop least recently used rows beyond it
+                conn.execute("""
+                    DELETE FROM github_http_cache WHERE cache_key IN (
+                        SELECT cache_key FROM (
+                            SELECT cache_key,
+                                   SUM(size) OVER (ORDER BY last_used DESC) AS running_bytes,
+                                   ROW_NUMBER() OVER (ORDER BY last_used DESC) AS position
+                            FROM github_http_cache
+                        ) WHERE running_bytes > ? OR position > ?
+                    )
+                """, (self.max_bytes, self.max_entries))
+        except sqlite3.Error as e:
+            logger.warning(f"GitHub cache write failed: {e}")
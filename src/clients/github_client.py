@@ -0,0 +1,124 @@
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from clients.github_cache import GitHubHTTPCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_URL = "https://api.github.com"
+
+
+class GitHubClientError(Exception):
+    """Raised for a failed GitHub API call (network error, timeout or non-2xx status)"""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class GitHubClient:
+    """
+    Thin GitHub REST client shared by the whole process.
+
+    One keep-alive requests.Session is reused for every call (its connection
+    pool is sized for `max_workers` parallel requests), every call has a
+    timeout, and get_many() fans independent GETs out over a bounded thread pool.
+    GETs are revalidated through a GitHubHTTPCache (ETag / Last-Modified).
+    """
+
+    def __init__(self, base_url=None, timeout=None, max_workers=None, cache=None):
+        self.base_url = (base_url or os.getenv('GITHUB_API_URL', DEFAULT_API_URL)).rstrip('/')
+        self.timeout = timeout if timeout is not None else float(os.getenv('GITHUB_TIMEOUT', 5))
+        self.max_workers = max_workers if max_workers is not None else int(os.getenv('GITHUB_MAX_WORKERS', 8))
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="github")
+        self.cache = cache if cache is not None else GitHubHTTPCache()
+
+    def url(self, path):
+        return path if path.startswith("http") else f"{self.base_url}{path}"
+
+    @staticmethod
+    def headers(access_token):
+        return {
+            "Authorization": f"token {access_token}",
+            "Accept": "application/json"
+        }
+
+    def get(self, path, access_token, timeout=None):
+        """GET a GitHub API path and return the decoded JSON; raises GitHubClientError."""
+        url = self.url(path)
+        key = self.cache.make_key(access_token, url)
+        cached = self.cache.get(key)
+
+        headers = self.headers(access_token)
+        if cached is not None:
+            # Conditional request: a 304 does not count against the rate limit
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        try:
+            resp = self.session.get(url, headers=headers, timeout=timeout or self.timeout)
+        except requests.RequestException as e:
+            raise GitHubClientError(f"GET {path} failed: {e}") from e
+        self.cache.record_rate_limit(resp.headers)
+
+        if resp.status_code == 304 and cached is not None:
+            self.cache.record_hit()
+            return cached.body
+        if resp.status_code != 200:
+            raise GitHubClientError(f"GET {path} returned {resp.status_code}", resp.status_code)
+
+        body = resp.json()
+        self.cache.record_miss()
+        self.cache.put(key, resp.headers.get("ETag"), resp.headers.get("Last-Modified"),
+                       body, len(resp.content))
+        return body
+
+    def get_many(self, paths, access_token, timeout=None):
+        """
+        Fetch several paths concurrently.
+        Returns {path: json} for the calls that succeeded and {path: error message}
+        for the ones that did not, so callers can degrade to partial results.
+        """
+        futures = {path: self._executor.submit(self.get, path, access_token, timeout) for path in paths}
+        results, errors = {}, {}
+        for path, future in futures.items():
+            try:
+                results[path] = future.result()
+            except Exception as e:
+                logger.warning(f"GitHub call failed: {e}")
+                errors[path] = str(e)
+        return results, errors
+
+    def post(self, path, access_token, payload, timeout=None):
+        resp = self.session.post(self.url(path), json=payload, headers=self.headers(access_token),
+                                 timeout=timeout or self.timeout)
+        self.cache.record_rate_limit(resp.headers)
+        return resp
+
+    def stats(self):
+        """Cache hit/miss counters and the last rate-limit headers GitHub sent."""
+        return self.cache.stats()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_github_client():
+    """Process-wide client (one Session, one worker pool)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = GitHubClient()
+    return _client
@@ -0,0 +1,193 @@
+import os
+import time
+import json
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import closing, contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache:
+    """
+    Content-addressed cache of LLM completions.
+
+    The key is a hash of (model, prompt, options), so an unchanged chat or
+    sprint produces the same key and its summary comes back without calling
+    the model; any change to the prompt is a new key, so nothing needs to be
+    invalidated by hand. Entries expire after `ttl_seconds`.
+
+    The in-memory tier is an LRU bounded by entry count and total text size.
+    If `db_path` is set (LLM_CACHE_DB) entries are also written to SQLite,
+    which survives restarts and is shared by every worker on the host.
+    """
+
+    def __init__(self, ttl_seconds=None, max_entries=None, max_bytes=None, db_path=None, clock=time.time):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else int(os.getenv('LLM_CACHE_TTL', 24 * 3600))
+        self.max_entries = max_entries or int(os.getenv('LLM_CACHE_MAX_ENTRIES', 500))
+        self.max_bytes = max_bytes or int(os.getenv('LLM_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+        self.db_path = db_path if db_path is not None else os.getenv('LLM_CACHE_DB')
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> (expires_at, text)
+        self._bytes = 0
+
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._refreshes = 0
+        self._evictions = 0
+
+        if self.db_path:
+            self._init_db()
+
+    @staticmethod
+    def make_key(model, prompt, options=None):
+        material = json.dumps({"model": model, "prompt": prompt, "options": options or {}},
+                              sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    # --------------------------------------------------
+    # LOOKUP / STORE
+    # --------------------------------------------------
+    def get(self, key):
+        """Cached completion text, or None (counted as a miss)."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[1]
+            if entry is not None:
+                self._drop(key)
+
+        entry = self._db_get(key, now)
+        with self._lock:
+            if entry is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._disk_hits += 1
+            self._store(key, *entry)
+        return entry[1]
+
+    def put(self, key, text):
+        if self.ttl_seconds <= 0 or not text:
+            return
+        expires_at = self._clock() + self.ttl_seconds
+        with self._lock:
+            self._store(key, expires_at, text)
+        self._db_put(key, expires_at, text)
+
+    def record_refresh(self):
+        """A caller skipped the cache on purpose (force refresh)."""
+        with self._lock:
+            self._refreshes += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _store(self, key, expires_at, text):
+        self._drop(key)
+        self._entries[key] = (expires_at, text)
+        self._bytes += len(text)
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self._evictions += 1
+
+    def _drop(self, key):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old[1])
+
+    # --------------------------------------------------
+    # METRICS
+    # --------------------------------------------------
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "refreshes": self._refreshes,
+                "evictions": self._evictions,
+                "persistent": bool(self.db_path)
+            }
+
+    # --------------------------------------------------
+    # SQLITE TIER
+    # --------------------------------------------------
+    @contextmanager
+    def _connect(self):
+        """Connection that commits (or rolls back) and is closed on exit"""
+        with closing(sqlite3.connect(self.db_path, timeout=5)) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+
+    def _init_db(self):
+        try:
+            with self._connect() as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS llm_response_cache (
+                        cache_key TEXT PRIMARY KEY,
+                        response TEXT NOT NULL,
+                        expires_at REAL NOT NULL,
+                        last_used REAL NOT NULL
+                    )
+                """)
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache DB disabled: {e}")
+            self.db_path = None
+
+    def _db_get(self, key, now):
+        if not self.db_path:
+            return None
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT expires_at, response FROM llm_response_cache WHERE cache_key = ? AND expires_at > ?",
+                    (key, now)
+                ).fetchone()
+                if row is None:
+                    return None
+                conn.execute("UPDATE llm_response_cache SET last_used = ? WHERE cache_key = ?", (now, key))
+            return row[0], row[1]
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache read failed: {e}")
+            return None
+
+    def _db_put(self, key, expires_at, text):
+        if not self.db_path:
+            return
+        try:
+            with self._connect() as conn:
+                now = self._clock()
+                conn.execute("""
+                    INSERT OR REPLACE INTO llm_response_cache (cache_key, response, expires_at, last_used)
+                    VALUES (?, ?, ?, ?)
+                """, (key, text, expires_at, now))
+                # Expired rows go first, then least recently used ones beyond the entry budget
+                conn.execute("DELETE FROM llm_response_cache WHERE expires_at <= ?", (now,))
+                conn.execute("""
+                    DELETE FROM llm_response_cache WHERE cache_key IN (
+                        SELECT cache_key FROM llm_response_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                    )
+                """, (self.max_entries,))
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache write failed: {e}")
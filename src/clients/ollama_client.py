@@ -0,0 +1,181 @@
+import os
+import json
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from clients.llm_cache import LLMResponseCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GENERATE_URL = "http://localhost:11434/api/generate"
+DEFAULT_MODEL = "llama3.2"
+
+
+class OllamaClientError(Exception):
+    """Raised when Ollama is unreachable, times out or returns an error"""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class OllamaUnavailableError(OllamaClientError):
+    """Ollama is not running / not reachable"""
+    pass
+
+
+class OllamaTimeoutError(OllamaClientError):
+    """Ollama accepted the request but stopped answering"""
+    pass
+
+
+class OllamaClient:
+    """
+    Ollama /api/generate client shared by the whole process.
+
+    One keep-alive requests.Session is reused for every call. Every call has
+    a connect timeout and a read timeout; while streaming, the read timeout
+    applies between two chunks, so a long generation is fine as long as
+    tokens keep coming. Closing a stream closes its connection, which is how
+    Ollama learns that nobody is listening and stops generating.
+
+    Completions are cached by (model, prompt, options) in an LLMResponseCache;
+    pass refresh=True to regenerate and overwrite the cached text.
+
+    Every request carries keep_alive (OLLAMA_KEEP_ALIVE, e.g. "30m" or -1 for
+    forever) so the model stays loaded between summaries instead of being
+    reloaded after Ollama's 5 minute default.
+    """
+
+    def __init__(self, generate_url=None, model=None, connect_timeout=None, read_timeout=None, pool_size=None,
+                 cache=None, keep_alive=None):
+        self.generate_url = generate_url or os.getenv("OLLAMA_URL", DEFAULT_GENERATE_URL)
+        self.model = model or os.getenv("OLLAMA_MODEL", DEFAULT_MODEL)
+        self.connect_timeout = connect_timeout if connect_timeout is not None else \
+            float(os.getenv("OLLAMA_CONNECT_TIMEOUT", 3))
+        self.read_timeout = read_timeout if read_timeout is not None else float(os.getenv("OLLAMA_TIMEOUT", 30))
+        keep_alive = keep_alive if keep_alive is not None else os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+        # Ollama takes a duration string or a number of seconds (-1 = never unload)
+        self.keep_alive = int(keep_alive) if str(keep_alive).lstrip("-").isdigit() else keep_alive
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1,
+                              pool_maxsize=pool_size or int(os.getenv("OLLAMA_POOL_SIZE", 8)))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.cache = cache if cache is not None else LLMResponseCache()
+
+    def generate(self, prompt, options=None, refresh=False):
+        """Whole completion in one response (used by background jobs)."""
+        cached = self.lookup(prompt, options, refresh)
+        if cached is not None:
+            return cached
+
+        resp = self._post(prompt, options, stream=False)
+        try:
+            text = resp.json().get("response", "")
+        except ValueError as e:
+            raise OllamaClientError(f"Invalid response from Ollama: {e}")
+        finally:
+            resp.close()
+        self.cache.put(self.cache.make_key(self.model, prompt, options), text)
+        return text
+
+    def stream(self, prompt, options=None, refresh=False):
+        """
+        Yield response fragments as Ollama produces them (its NDJSON stream).
+        A cached completion comes back as a single fragment. Closing the
+        generator early closes the upstream connection (and caches nothing).
+        """
+        cached = self.lookup(prompt, options, refresh)
+        if cached is not None:
+            yield cached
+            return
+        yield from self.stream_and_store(prompt, options)
+
+    def lookup(self, prompt, options=None, refresh=False):
+        """Cached completion or None. refresh=True skips the cache (counted as a refresh)."""
+        if refresh:
+            self.cache.record_refresh()
+            return None
+        return self.cache.get(self.cache.make_key(self.model, prompt, options))
+
+    def stream_and_store(self, prompt, options=None):
+        """Always asks Ollama; the text is cached once the stream completes."""
+        fragments = self._stream(prompt, options)
+        parts = []
+        try:
+            for fragment in fragments:
+                parts.append(fragment)
+                yield fragment
+        finally:
+            fragments.close()
+        self.cache.put(self.cache.make_key(self.model, prompt, options), "".join(parts))
+
+    def warm_up(self):
+        """Load the model (a request without a prompt) so the first summary does not pay for it."""
+        try:
+            resp = self.session.post(self.generate_url, json={"model": self.model, "keep_alive": self.keep_alive},
+                                     timeout=(self.connect_timeout, self.read_timeout))
+            resp.close()
+            return resp.status_code == 200
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Ollama warm-up failed: {e}")
+            return False
+
+    def cache_stats(self):
+        return self.cache.stats()
+
+    def _stream(self, prompt, options):
+        resp = self._post(prompt, options, stream=True)
+        try:
+            for line in resp.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("error"):
+                    raise OllamaClientError(chunk["error"])
+                if chunk.get("response"):
+                    yield chunk["response"]
+                if chunk.get("done"):
+                    return
+            raise OllamaClientError("Ollama stream ended before the answer was complete")
+        except requests.exceptions.ConnectionError as e:
+            raise OllamaTimeoutError(f"Ollama stream interrupted: {e}")
+        except ValueError as e:
+            raise OllamaClientError(f"Invalid response from Ollama: {e}")
+        finally:
+            resp.close()
+
+    def _post(self, prompt, options, stream):
+        payload = {"model": self.model, "prompt": prompt, "stream": stream, "keep_alive": self.keep_alive}
+        if options:
+            payload["options"] = options
+        try:
+            resp = self.session.post(self.generate_url, json=payload, stream=stream,
+                                     timeout=(self.connect_timeout, self.read_timeout))
+        except requests.exceptions.ConnectionError as e:
+            # includes ConnectTimeout
+            raise OllamaUnavailableError(f"Could not reach Ollama: {e}")
+        except requests.exceptions.Timeout as e:
+            raise OllamaTimeoutError(f"Ollama timed out: {e}")
+
+        if resp.status_code != 200:
+            resp.close()
+            raise OllamaClientError(f"Ollama returned {resp.status_code}", resp.status_code)
+        return resp
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_ollama_client():
+    """Process-wide client (one pooled Session)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OllamaClient()
+    return _client
@@ -0,0 +1,224 @@
+import os
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from clients.ollama_client import get_ollama_client, OllamaClientError, OllamaTimeoutError
+
+logger = logging.getLogger(__name__)
+
+OLLAMA_MAX_CONCURRENCY = int(os.getenv("OLLAMA_MAX_CONCURRENCY", 1))
+OLLAMA_MAX_QUEUE = int(os.getenv("OLLAMA_MAX_QUEUE", 20))
+OLLAMA_QUEUE_TIMEOUT = float(os.getenv("OLLAMA_QUEUE_TIMEOUT", 120))
+
+
+class OllamaBusyError(OllamaClientError):
+    """Too many summaries are already waiting for the model"""
+    pass
+
+
+class _Flight:
+    """One generation, shared by every caller that asked for the same prompt"""
+
+    def __init__(self, key, prompt, options):
+        self.key = key
+        self.prompt = prompt
+        self.options = options
+        self.fragments = []
+        self.done = False
+        self.error = None
+        self.subscribers = 0
+        self.cancelled = False
+
+
+class OllamaGateway:
+    """
+    The only way AIChatService and AIService reach the model.
+
+    A single local model gets slower for everybody when it generates several
+    answers at once, so at most `max_concurrent` generations run together
+    (the worker pool is the semaphore); the rest wait in FIFO order and
+    stream ('queued', {'position': n}) while they wait. Identical prompts
+    that are already queued or running are coalesced: later callers follow
+    the same generation instead of starting another one. A generation is
+    cancelled, and its slot freed, once every caller following it has gone.
+
+    Cached completions (see LLMResponseCache) are answered without queueing.
+    """
+
+    def __init__(self, client=None, max_concurrent=None, max_queue=None, queue_timeout=None):
+        self.client = client or get_ollama_client()
+        self.max_concurrent = max_concurrent or OLLAMA_MAX_CONCURRENCY
+        self.max_queue = max_queue if max_queue is not None else OLLAMA_MAX_QUEUE
+        self.queue_timeout = queue_timeout if queue_timeout is not None else OLLAMA_QUEUE_TIMEOUT
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent, thread_name_prefix="ollama")
+        self._cond = threading.Condition()
+        self._flights = {}          # key -> _Flight (queued or running)
+        self._waiting = deque()     # queued flights, oldest first
+        self._active = 0
+
+        self._started = 0
+        self._coalesced = 0
+        self._cancelled = 0
+        self._rejected = 0
+
+    def generate(self, prompt, options=None, refresh=False):
+        """Whole completion (background jobs); waits for a free slot."""
+        return "".join(f for f in self.stream(prompt, options, refresh) if isinstance(f, str))
+
+    def stream(self, prompt, options=None, refresh=False):
+        """
+        Yield ('queued', {'position': n}) while waiting for a slot, then the
+        text fragments. Closing the generator leaves the queue, or cancels
+        the generation if nobody else is following it.
+        """
+        cached = self.client.lookup(prompt, options, refresh)
+        if cached is not None:
+            yield cached
+            return
+        yield from self._follow(self._join(prompt, options))
+
+    def stats(self):
+        with self._cond:
+            return {
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "active": self._active,
+                "queued": len(self._waiting),
+                "started": self._started,
+                "coalesced": self._coalesced,
+                "cancelled": self._cancelled,
+                "rejected": self._rejected,
+                "keep_alive": self.client.keep_alive
+            }
+
+    # --------------------------------------------------
+    # QUEUE
+    # --------------------------------------------------
+    def _join(self, prompt, options):
+        key = self.client.cache.make_key(self.client.model, prompt, options)
+        with self._cond:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self._coalesced += 1
+            else:
+                if len(self._waiting) >= self.max_queue:
+                    self._rejected += 1
+                    raise OllamaBusyError(f"AI is busy ({len(self._waiting)} summaries waiting), try again shortly")
+                flight = _Flight(key, prompt, options)
+                self._flights[key] = flight
+                self._waiting.append(flight)
+                self._executor.submit(self._run, flight)
+            flight.subscribers += 1
+            return flight
+
+    def _position(self, flight):
+        """1-based place in line for a slot; 0 once running or about to start in a free slot."""
+        try:
+            ahead = self._waiting.index(flight)
+        except ValueError:
+            return 0
+        return max(0, self._active + ahead - self.max_concurrent + 1)
+
+    def _follow(self, flight):
+        index, reported = 0, None
+        deadline = time.monotonic() + self.queue_timeout
+        try:
+            while True:
+                with self._cond:
+                    position = self._position(flight)
+                    while index >= len(flight.fragments) and not flight.done and position == reported:
+                        if position:
+                            remaining = deadline - time.monotonic()
+                            if remaining <= 0:
+                                raise OllamaTimeoutError(f"Still queued for the AI model (position {position})")
+                            self._cond.wait(remaining)
+                        else:
+                            self._cond.wait()
+                        position = self._position(flight)
+                    fragments = flight.fragments[index:]
+                    index += len(fragments)
+                    done, error = flight.done, flight.error
+
+                if position != reported:
+                    reported = position
+                    if position:
+                        yield "queued", {"position": position}
+                yield from fragments
+                if done:
+                    if error is not None:
+                        raise error
+                    return
+        finally:
+            self._leave(flight)
+
+    def _leave(self, flight):
+        with self._cond:
+            flight.subscribers -= 1
+            if flight.subscribers or flight.done:
+                return
+            # Nobody is listening any more: drop it from the queue or stop generating
+            flight.cancelled = True
+            self._cancelled += 1
+            if flight in self._waiting:
+                self._waiting.remove(flight)
+            if self._flights.get(flight.key) is flight:
+                del self._flights[flight.key]
+            self._cond.notify_all()
+
+    def _run(self, flight):
+        with self._cond:
+            if flight.cancelled:
+                return
+            self._waiting.remove(flight)
+            self._active += 1
+            self._started += 1
+            self._cond.notify_all()
+
+        error = None
+        fragments = self.client.stream_and_store(flight.prompt, flight.options)
+        try:
+            for fragment in fragments:
+                with self._cond:
+                    if flight.cancelled:
+                        break
+                    flight.fragments.append(fragment)
+                    self._cond.notify_all()
+        except Exception as e:
+            logger.warning(f"Ollama generation failed: {e}")
+            error = e
+        finally:
+            # Closing the stream closes the connection, which stops a cancelled generation
+            fragments.close()
+            with self._cond:
+                flight.done = True
+                flight.error = error
+                self._active -= 1
+                if self._flights.get(flight.key) is flight:
+                    del self._flights[flight.key]
+                self._cond.notify_all()
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_ollama_gateway():
+    """Process-wide gateway (one queue in front of the model)."""
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                _gateway = OllamaGateway()
+    return _gateway
+
+
+def init_app(app):
+    """With OLLAMA_WARM_UP=1, load the model in the background at startup."""
+    gateway = get_ollama_gateway()
+    app.extensions['ollama'] = gateway
+    if os.getenv("OLLAMA_WARM_UP", "0") == "1":
+        threading.Thread(target=gateway.client.warm_up, name="ollama-warm-up", daemon=True).start()
+    return gateway
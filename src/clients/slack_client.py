@@ -0,0 +1,265 @@
+import os
+import json
+import time
+import logging
+import threading
+from concurrent.futures import Future
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
+
+logger = logging.getLogger(__name__)
+
+# Slack Web API rate-limit tiers, in calls per minute (per method and workspace)
+TIERS = {1: 1, 2: 20, 3: 50, 4: 100}
+METHOD_TIERS = {
+    "users.list": 2,
+    "conversations.list": 2,
+    "conversations.history": 3,
+    "conversations.replies": 3,
+    "conversations.info": 3,
+    "users.info": 4,
+}
+DEFAULT_TIER = 3
+# chat.postMessage has its own limit: about one message per second per channel
+SPECIAL_LIMITS = {"chat.postMessage": 60}
+# Only reads are coalesced: two identical posts are still two messages
+COALESCED_METHODS = set(METHOD_TIERS)
+
+SLACK_MAX_WAIT = float(os.getenv('SLACK_MAX_WAIT', 30))
+SLACK_MAX_RETRIES = int(os.getenv('SLACK_MAX_RETRIES', 3))
+
+
+def _limit_overrides():
+    """SLACK_RATE_LIMITS="conversations.history=1,users.list=20" (calls per minute)."""
+    limits = {}
+    for item in os.getenv('SLACK_RATE_LIMITS', '').split(','):
+        if '=' in item:
+            method, per_minute = item.split('=', 1)
+            limits[method.strip()] = int(per_minute)
+    return limits
+
+
+class SlackRateLimitError(SlackApiError):
+    """A method's budget is used up for longer than the caller is willing to wait"""
+
+    def __init__(self, method, retry_after):
+        super().__init__(f"{method} is rate limited for another {retry_after:.0f}s",
+                         {"ok": False, "error": "ratelimited"})
+        self.method = method
+        self.retry_after = retry_after
+
+
+class _Budget:
+    """Token bucket for one API method, plus the Retry-After block Slack last gave it."""
+
+    def __init__(self, per_minute, now):
+        self.per_minute = per_minute
+        self.tokens = float(per_minute)
+        self.updated = now
+        self.blocked_until = 0.0
+
+        self.calls = 0
+        self.waited = 0
+        self.rate_limited = 0
+        self.retries = 0
+        self.coalesced = 0
+        self.rejected = 0
+
+    def refill(self, now):
+        self.tokens = min(self.per_minute, self.tokens + (now - self.updated) * self.per_minute / 60)
+        self.updated = now
+
+
+class SlackClient:
+    """
+    WebClient wrapper that stays inside Slack's rate limits instead of hitting them.
+
+    Drop-in for slack_sdk's WebClient: `client.users_list(...)` goes through
+    `users.list`'s budget. Every method has a token bucket sized by its tier
+    (SLACK_RATE_LIMITS overrides it); a call waits for a token, or fails fast
+    with SlackRateLimitError if that would take more than `max_wait`
+    seconds. A 429 blocks the method for Retry-After seconds for every caller
+    and the call is retried after that, up to `max_retries` times.
+
+    Identical read calls already in flight are coalesced: later callers get
+    the first caller's response instead of spending another token.
+    """
+
+    def __init__(self, token=None, base_url=None, client=None, limits=None, max_wait=None, max_retries=None,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.client = client or WebClient(token=token, base_url=base_url or WebClient.BASE_URL)
+        self.limits = {**SPECIAL_LIMITS, **_limit_overrides(), **(limits or {})}
+        self.max_wait = max_wait if max_wait is not None else SLACK_MAX_WAIT
+        self.max_retries = max_retries if max_retries is not None else SLACK_MAX_RETRIES
+        self._clock = clock
+        self._sleep = sleep
+
+        self._lock = threading.Lock()
+        self._budgets = {}
+        self._inflight = {}     # (method, params) -> Future of the leader's call
+
+    def __getattr__(self, name):
+        """users_list -> users.list, chat_postMessage -> chat.postMessage, ..."""
+        if name.startswith('_') or name == 'client':
+            raise AttributeError(name)
+        func = getattr(self.client, name)
+        method = name.replace('_', '.', 1)
+
+        def call(**kwargs):
+            return self.call(method, func, **kwargs)
+
+        return call
+
+    def call(self, method, func, **kwargs):
+        if method not in COALESCED_METHODS:
+            return self._call_with_retries(method, func, kwargs)
+
+        key = (method, json.dumps(kwargs, sort_keys=True, default=str))
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+            else:
+                self._budget(method).coalesced += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = self._call_with_retries(method, func, kwargs)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def stats(self):
+        """Remaining budget and counters per method."""
+        with self._lock:
+            now = self._clock()
+            report = {}
+            for method, budget in sorted(self._budgets.items()):
+                budget.refill(now)
+                report[method] = {
+                    "per_minute": budget.per_minute,
+                    "remaining": max(0, int(budget.tokens)),
+                    "blocked_for": round(max(0.0, budget.blocked_until - now), 1),
+                    "calls": budget.calls,
+                    "waited": budget.waited,
+                    "rate_limited": budget.rate_limited,
+                    "retries": budget.retries,
+                    "coalesced": budget.coalesced,
+                    "rejected": budget.rejected
+                }
+            return report
+
+    # --------------------------------------------------
+    # BUDGETS
+    # --------------------------------------------------
+    def _budget(self, method):
+        budget = self._budgets.get(method)
+        if budget is None:
+            per_minute = self.limits.get(method) or TIERS[METHOD_TIERS.get(method, DEFAULT_TIER)]
+            budget = self._budgets[method] = _Budget(per_minute, self._clock())
+        return budget
+
+    def _acquire(self, method):
+        """Reserve the next token (waiting for it) or raise SlackRateLimitError."""
+        with self._lock:
+            budget = self._budget(method)
+            now = self._clock()
+            budget.refill(now)
+            token_wait = 0.0 if budget.tokens >= 1 else (1 - budget.tokens) * 60 / budget.per_minute
+            wait = max(token_wait, budget.blocked_until - now)
+            if wait > self.max_wait:
+                budget.rejected += 1
+                raise SlackRateLimitError(method, wait)
+            # The token is ours even while we sleep, so callers queue up behind each other
+            budget.tokens -= 1
+            budget.calls += 1
+            if wait > 0:
+                budget.waited += 1
+        if wait > 0:
+            self._sleep(wait)
+
+    def _call_with_retries(self, method, func, kwargs):
+        attempt = 0
+        while True:
+            self._acquire(method)
+            try:
+                return func(**kwargs)
+            except SlackApiError as e:
+                retry_after = self._retry_after(e)
+                if retry_after is None:
+                    raise
+                with self._lock:
+                    budget = self._budget(method)
+                    budget.rate_limited += 1
+                    budget.blocked_until = max(budget.blocked_until, self._clock() + retry_after)
+                    budget.tokens = min(budget.tokens, 0)
+                    if attempt >= self.max_retries or retry_after > self.max_wait:
+                        raise
+                    attempt += 1
+                    budget.retries += 1
+                logger.warning(f"Slack {method} rate limited, retrying in {retry_after:.0f}s")
+
+    @staticmethod
+    def _retry_after(error):
+        """Seconds from a 429's Retry-After header, or None for other errors."""
+        response = error.response
+        status = getattr(response, 'status_code', None)
+        if status != 429 and response.get('error') != 'ratelimited':
+            return None
+        headers = getattr(response, 'headers', None) or {}
+        value = headers.get('Retry-After') or headers.get('retry-after')
+        try:
+            return float(value) if value else 1.0
+        except ValueError:
+            return 1.0
+
+
+def paginate(call, **params):
+    """
+    Pages of a cursor-paginated Web API method, fetched one at a time as the
+    caller iterates: `for page in paginate(client.users_list, limit=200)`.
+    Pass `cursor=` to resume; the next page's cursor is in each page's
+    response_metadata.next_cursor.
+    """
+    cursor = params.pop('cursor', None)
+    while True:
+        if cursor:
+            params['cursor'] = cursor
+        page = call(**params)
+        yield page
+        cursor = next_cursor(page)
+        if not cursor:
+            return
+
+
+def next_cursor(page):
+    return (page.get('response_metadata') or {}).get('next_cursor') or None
+
+
+def iter_items(call, key, **params):
+    """Every item of a paginated list, e.g. iter_items(client.conversations_list, "channels")."""
+    for page in paginate(call, **params):
+        yield from page.get(key) or []
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_slack_client(token=None):
+    """Process-wide client per bot token, so every request shares the same budgets."""
+    token = token or os.getenv('SLACK_BOT_TOKEN')
+    client = _clients.get(token)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(token)
+            if client is None:
+                client = _clients[token] = SlackClient(token=token)
+    return client
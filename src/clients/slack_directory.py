@@ -0,0 +1,348 @@
+import os
+import time
+import json
+import sqlite3
+import logging
+import threading
+from contextlib import closing, contextmanager
+from slack_sdk.errors import SlackApiError
+from clients.slack_client import paginate
+
+logger = logging.getLogger(__name__)
+
+SLACK_DIRECTORY_TTL = int(os.getenv('SLACK_DIRECTORY_TTL', 3600))
+SLACK_DIRECTORY_PAGE_SIZE = int(os.getenv('SLACK_DIRECTORY_PAGE_SIZE', 200))
+# How often a worker checks the SQLite tier for changes written by other workers
+DISK_SYNC_INTERVAL = 30
+# How long one worker may hold the right to call users_list / conversations_list
+LOAD_LEASE_SECONDS = 120
+
+KINDS = ("users", "channels")
+
+
+def user_summary(user):
+    """The fields the app uses from a Slack user object (users_list, users_info, user_change)."""
+    profile = user.get('profile', {})
+    return {
+        'real_name': user.get('real_name', user.get('name', 'Unknown')),
+        'email': profile.get('email', ''),
+        'avatar': profile.get('image_72', ''),
+        'display_name': profile.get('display_name', ''),
+    }
+
+
+def channel_summary(channel):
+    return {
+        'id': channel['id'],
+        'name': channel.get('name', ''),
+        'is_member': channel.get('is_member', False)
+    }
+
+
+class SlackDirectory:
+    """
+    Users and channels of the workspace, shared by every request in the process.
+
+    The first lookup loads the full list (users_list / conversations_list,
+    following next_cursor page by page); concurrent first lookups wait for
+    that one load. Once the list is older than `ttl_seconds` it is still
+    served while a background thread reloads it. user_change / team_join
+    and channel_* events update single entries in between.
+
+    If `db_path` is set (SLACK_DIRECTORY_DB) the directory is also kept in
+    SQLite, so gunicorn workers share one copy: a worker picks up what
+    another one loaded, and a lease makes sure only one of them calls the
+    rate-limited list methods at a time.
+    """
+
+    def __init__(self, ttl_seconds=None, db_path=None, page_size=None, clock=time.time):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else SLACK_DIRECTORY_TTL
+        self.db_path = db_path if db_path is not None else os.getenv('SLACK_DIRECTORY_DB')
+        self.page_size = page_size or SLACK_DIRECTORY_PAGE_SIZE
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._load_locks = {kind: threading.Lock() for kind in KINDS}
+        self._data = {kind: {} for kind in KINDS}
+        self._loaded_at = {kind: None for kind in KINDS}    # when the full list was last fetched
+        self._versions = {kind: 0 for kind in KINDS}        # SQLite version this copy reflects
+        self._synced_at = {kind: 0 for kind in KINDS}
+        self._refreshing = set()
+
+        self._loads = 0
+        self._pages = 0
+        self._updates = 0
+        self._background_refreshes = 0
+
+        if self.db_path:
+            self._init_db()
+
+    # --------------------------------------------------
+    # LOOKUP
+    # --------------------------------------------------
+    def user(self, user_id):
+        """Cached user info, or None if the user is not known (yet)."""
+        with self._lock:
+            return self._data["users"].get(user_id)
+
+    def channels(self):
+        with self._lock:
+            return sorted(self._data["channels"].values(), key=lambda c: c['name'])
+
+    def ensure_users(self, client):
+        self.ensure("users", client)
+
+    def ensure_channels(self, client):
+        self.ensure("channels", client)
+
+    def ensure(self, kind, client):
+        """
+        Make sure `kind` is loaded: the first call loads it (once, even under
+        concurrency); later calls return at once and refresh stale data in
+        the background.
+        """
+        self._sync_from_disk(kind)
+        if self._loaded_at[kind] is None:
+            with self._load_locks[kind]:
+                self._sync_from_disk(kind)
+                if self._loaded_at[kind] is None:
+                    self.refresh(kind, client)
+        elif self._clock() - self._loaded_at[kind] >= self.ttl_seconds:
+            self._refresh_in_background(kind, client)
+
+    def refresh(self, kind, client):
+        """Reload the full list from Slack. False if it failed or another worker is loading it."""
+        if not self._take_lease(kind):
+            return False
+        try:
+            items = {}
+            for item in self._fetch_all(kind, client):
+                if kind == "users":
+                    items[item['id']] = user_summary(item)
+                else:
+                    items[item['id']] = channel_summary(item)
+        except SlackApiError as e:
+            logger.warning(f"Slack {kind} load failed: {e.response.get('error')}")
+            return False
+        finally:
+            self._release_lease(kind)
+
+        now = self._clock()
+        with self._lock:
+            self._data[kind] = items
+            self._loaded_at[kind] = now
+            self._loads += 1
+        self._db_replace(kind, items, now)
+        logger.info(f"Slack directory loaded {len(items)} {kind}")
+        return True
+
+    def _fetch_all(self, kind, client):
+        """Every item of the list, following response_metadata.next_cursor."""
+        if kind == "users":
+            pages, key = paginate(client.users_list, limit=self.page_size), "members"
+        else:
+            pages, key = paginate(client.conversations_list, types="public_channel,private_channel",
+                                  limit=self.page_size), "channels"
+        for page in pages:
+            with self._lock:
+                self._pages += 1
+            yield from page[key]
+
+    def _refresh_in_background(self, kind, client):
+        with self._lock:
+            if kind in self._refreshing:
+                return
+            self._refreshing.add(kind)
+            self._background_refreshes += 1
+
+        def run():
+            try:
+                self.refresh(kind, client)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(kind)
+
+        threading.Thread(target=run, name=f"slack-directory-{kind}", daemon=True).start()
+
+    # --------------------------------------------------
+    # INCREMENTAL UPDATES (Events API)
+    # --------------------------------------------------
+    def apply_user(self, user):
+        """user_change / team_join, or a users_info result."""
+        if not user or not user.get('id'):
+            return
+        self._apply("users", user['id'], user_summary(user))
+
+    def apply_channel(self, channel):
+        """channel_created / channel_rename (only id and name are sent)."""
+        if not channel or not channel.get('id'):
+            return
+        with self._lock:
+            current = self._data["channels"].get(channel['id'], {})
+        self._apply("channels", channel['id'], channel_summary({**current, **channel}))
+
+    def remove_channel(self, channel_id):
+        self._apply("channels", channel_id, None)
+
+    def _apply(self, kind, item_id, value):
+        with self._lock:
+            if value is None:
+                self._data[kind].pop(item_id, None)
+            else:
+                self._data[kind][item_id] = value
+            self._updates += 1
+        self._db_upsert(kind, item_id, value)
+
+    # --------------------------------------------------
+    # METRICS
+    # --------------------------------------------------
+    def stats(self):
+        with self._lock:
+            return {
+                "users": len(self._data["users"]),
+                "channels": len(self._data["channels"]),
+                "users_loaded_at": self._loaded_at["users"],
+                "channels_loaded_at": self._loaded_at["channels"],
+                "ttl_seconds": self.ttl_seconds,
+                "loads": self._loads,
+                "pages": self._pages,
+                "updates": self._updates,
+                "background_refreshes": self._background_refreshes,
+                "persistent": bool(self.db_path)
+            }
+
+    # --------------------------------------------------
+    # SQLITE TIER
+    # --------------------------------------------------
+    @contextmanager
+    def _connect(self):
+        """Connection that commits (or rolls back) and is closed on exit"""
+        with closing(sqlite3.connect(self.db_path, timeout=5)) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+
+    def _init_db(self):
+        try:
+            with self._connect() as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS slack_directory (
+                        kind TEXT NOT NULL,
+                        item_id TEXT NOT NULL,
+                        data TEXT NOT NULL,
+                        PRIMARY KEY (kind, item_id)
+                    )
+                """)
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS slack_directory_meta (
+                        kind TEXT PRIMARY KEY,
+                        loaded_at REAL,
+                        version INTEGER NOT NULL DEFAULT 0,
+                        lease_until REAL NOT NULL DEFAULT 0
+                    )
+                """)
+                conn.executemany("INSERT OR IGNORE INTO slack_directory_meta (kind) VALUES (?)",
+                                 [(kind,) for kind in KINDS])
+        except sqlite3.Error as e:
+            logger.warning(f"Slack directory DB disabled: {e}")
+            self.db_path = None
+
+    def _sync_from_disk(self, kind):
+        """Adopt the SQLite copy if another worker changed it since we last looked."""
+        if not self.db_path:
+            return
+        now = self._clock()
+        if self._loaded_at[kind] is not None and now - self._synced_at[kind] < DISK_SYNC_INTERVAL:
+            return
+        self._synced_at[kind] = now
+        try:
+            with self._connect() as conn:
+                loaded_at, version = conn.execute(
+                    "SELECT loaded_at, version FROM slack_directory_meta WHERE kind = ?", (kind,)
+                ).fetchone()
+                if loaded_at is None or version == self._versions[kind]:
+                    return
+                rows = conn.execute("SELECT item_id, data FROM slack_directory WHERE kind = ?", (kind,)).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Slack directory read failed: {e}")
+            return
+        with self._lock:
+            self._data[kind] = {item_id: json.loads(data) for item_id, data in rows}
+            self._loaded_at[kind] = loaded_at
+            self._versions[kind] = version
+
+    def _db_replace(self, kind, items, loaded_at):
+        if not self.db_path:
+            return
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM slack_directory WHERE kind = ?", (kind,))
+                conn.executemany("INSERT INTO slack_directory (kind, item_id, data) VALUES (?, ?, ?)",
+                                 [(kind, item_id, json.dumps(value)) for item_id, value in items.items()])
+                self._bump_version(conn, kind, loaded_at)
+        except sqlite3.Error as e:
+            logger.warning(f"Slack directory write failed: {e}")
+
+    def _db_upsert(self, kind, item_id, value):
+        if not self.db_path:
+            return
+        try:
+            with self._connect() as conn:
+                if value is None:
+                    conn.execute("DELETE FROM slack_directory WHERE kind = ? AND item_id = ?", (kind, item_id))
+                else:
+                    conn.execute("INSERT OR REPLACE INTO slack_directory (kind, item_id, data) VALUES (?, ?, ?)",
+                                 (kind, item_id, json.dumps(value)))
+                self._bump_version(conn, kind)
+        except sqlite3.Error as e:
+            logger.warning(f"Slack directory write failed: {e}")
+
+    def _bump_version(self, conn, kind, loaded_at=None):
+        if loaded_at is not None:
+            conn.execute("UPDATE slack_directory_meta SET version = version + 1, loaded_at = ? WHERE kind = ?",
+                         (loaded_at, kind))
+        else:
+            conn.execute("UPDATE slack_directory_meta SET version = version + 1 WHERE kind = ?", (kind,))
+        version = conn.execute("SELECT version FROM slack_directory_meta WHERE kind = ?", (kind,)).fetchone()[0]
+        with self._lock:
+            # Only skip the next sync if nobody else wrote in between
+            if version == self._versions[kind] + 1:
+                self._versions[kind] = version
+
+    def _take_lease(self, kind):
+        if not self.db_path:
+            return True
+        now = self._clock()
+        try:
+            with self._connect() as conn:
+                cur = conn.execute(
+                    "UPDATE slack_directory_meta SET lease_until = ? WHERE kind = ? AND lease_until < ?",
+                    (now + LOAD_LEASE_SECONDS, kind, now)
+                )
+                return cur.rowcount == 1
+        except sqlite3.Error as e:
+            logger.warning(f"Slack directory lease failed: {e}")
+            return True
+
+    def _release_lease(self, kind):
+        if not self.db_path:
+            return
+        try:
+            with self._connect() as conn:
+                conn.execute("UPDATE slack_directory_meta SET lease_until = 0 WHERE kind = ?", (kind,))
+        except sqlite3.Error as e:
+            logger.warning(f"Slack directory lease release failed: {e}")
+
+
+_directory = None
+_directory_lock = threading.Lock()
+
+
+def get_slack_directory():
+    """Process-wide directory (shared by every SlackService)."""
+    global _directory
+    if _directory is None:
+        with _directory_lock:
+            if _directory is None:
+                _directory = SlackDirectory()
+    return _directory
@@ -80,10 +80,8 @@ def update_password():
         return jsonify({"message": "Password updated successfully"}), 200
     return jsonify({"message": "Error updating database"}), 500
 
-from flask_mail import Message
-from extensions import mail
-
-import socket
+from core.jobs import get_job_queue
+import services.background_jobs  # registers the mail.send job
 
 @auth_bp.route("/forgot-password", methods=["POST"])
 def forgot_password():
@@ -98,22 +96,19 @@ def forgot_password():
         # We always print to terminal so you can use the system even if email fails
         print(f"\n[TERMINAL RESET LINK]: {reset_url}\n")
 
-        msg = Message(
-            subject="Password Reset - AIPMS",
-            recipients=[email],
-            body=f"Click here to reset: {reset_url}"
-        )
-        
         try:
-            # Set a socket timeout so the web app doesn't wait forever
-            socket.setdefaulttimeout(10) 
-            mail.send(msg)
-            return jsonify({"message": "Email sent! Check your inbox."}), 200
+            # SMTP runs on a background worker (retried with backoff), not on this request
+            job_id = get_job_queue().enqueue("mail.send", {
+                "subject": "Password Reset - AIPMS",
+                "recipients": [email],
+                "body": f"Click here to reset: {reset_url}"
+            })
+            return jsonify({"message": "Email on its way! Check your inbox.", "job_id": job_id}), 202
         except Exception as e:
-            print(f"SMTP Connection Failed: {e}")
+            print(f"Queueing reset email failed: {e}")
             # If email fails, we tell the user the link is in the console for dev purposes
             return jsonify({
-                "message": "Mail server timeout. The reset link has been printed to the developer terminal."
+                "message": "Mail server unavailable. The reset link has been printed to the developer terminal."
             }), 200 
             
     return jsonify({"message": message}), 404
@@ -15,24 +15,18 @@ def get_all_projects():
 
 @dashboard_bp.route("/project/<int:project_id>", methods=["GET"])
 def get_project_dashboard(project_id):
-    """Get complete dashboard data for a project."""
+    """Get complete dashboard data for a project (one cached aggregate query)."""
     repo = RepositoryFactory.get_repository("project")
 
-    project = repo.get_by_id(project_id)
-    if not project:
+    snapshot = repo.get_dashboard_snapshot(project_id)
+    if not snapshot:
         return jsonify({"error": "Project not found"}), 404
 
-    # Get project stats
-    stats = repo.get_project_stats(project_id)
-
-    # Get critical unassigned tasks
-    critical_tasks = repo.get_critical_tasks(project_id)
-
-    # Get recent activities
-    activities = repo.get_recent_activities(project_id)
+    project = snapshot["project"]
+    stats = snapshot["stats"]
+    critical_tasks = snapshot["critical_tasks"]
 
     # Determine project status based on dates
-    from datetime import date
     today = date.today()
     if project.end_date and project.end_date < today:
         status = "COMPLETED"
@@ -47,15 +41,24 @@ def get_project_dashboard(project_id):
     # Calculate stress index (based on workload)
     stress_index = calculate_stress_index(stats)
 
+    # Burndown of the active sprint, so the page does not need a second request
+    sprint = snapshot["sprint"]
+    if sprint:
+        burndown = build_burndown(sprint["name"], sprint["start_date"], sprint["end_date"],
+                                  sprint["total_tasks"], sprint["completed_tasks"])
+    else:
+        burndown = {"labels": [], "ideal": [], "actual": [], "sprintName": "No Sprint"}
+
     return jsonify({
         "project": project.to_dict(),
         "status": status,
         "stats": stats,
         "criticalTasks": critical_tasks,
-        "activities": activities,
+        "activities": snapshot["activities"],
         "recommendations": recommendations,
         "stressIndex": stress_index["value"],
-        "stressDetail": stress_index["detail"]
+        "stressDetail": stress_index["detail"],
+        "burndown": burndown
     }), 200
 
 
@@ -195,28 +198,29 @@ def get_burndown_data(project_id):
 
     # Get tasks for the sprint
     tasks = task_repo.get_by_sprint_id(active_sprint.sprint_id)
+    completed_tasks = sum(1 for t in tasks if t.status and t.status.value == 'DONE')
+
+    return jsonify(build_burndown(active_sprint.name, active_sprint.start_date, active_sprint.end_date,
+                                  len(tasks), completed_tasks)), 200
 
-    # Calculate burndown data
-    total_tasks = len(tasks)
+
+def build_burndown(sprint_name, start_date, end_date, total_tasks, completed_tasks):
+    """Calculate burndown chart data from a sprint's dates and task counts."""
     if total_tasks == 0:
-        return jsonify({
+        return {
             "labels": [],
             "ideal": [],
             "actual": [],
-            "sprintName": active_sprint.name
-        }), 200
-
-    # Calculate sprint duration
-    start_date = active_sprint.start_date
-    end_date = active_sprint.end_date
+            "sprintName": sprint_name
+        }
 
     if not start_date or not end_date:
-        return jsonify({
+        return {
             "labels": ["Day 1"],
             "ideal": [total_tasks],
             "actual": [total_tasks],
-            "sprintName": active_sprint.name
-        }), 200
+            "sprintName": sprint_name
+        }
 
     # Generate burndown data
     days = (end_date - start_date).days + 1
@@ -227,10 +231,7 @@ def get_burndown_data(project_id):
     # Calculate ideal burndown (linear)
     daily_burn = total_tasks / days if days > 0 else 0
 
-    # Count completed tasks up to each day
     today = date.today()
-    completed_tasks = sum(1 for t in tasks if t.status and t.status.value == 'DONE')
-
     for i in range(days):
         current_day = start_date + timedelta(days=i)
         labels.append(f"Day {i + 1}")
@@ -239,20 +240,19 @@ def get_burndown_data(project_id):
         # For actual data, show remaining tasks
         if current_day <= today:
             # Simplified: Show current remaining for past/present days
-            remaining = total_tasks - completed_tasks
-            actual.append(remaining)
+            actual.append(total_tasks - completed_tasks)
         else:
             # Future days have no actual data yet
             actual.append(None)
 
-    return jsonify({
+    return {
         "labels": labels,
         "ideal": ideal,
         "actual": actual,
-        "sprintName": active_sprint.name,
+        "sprintName": sprint_name,
         "totalTasks": total_tasks,
         "completedTasks": completed_tasks
-    }), 200
+    }
 
 
 @dashboard_bp.route("/project/<int:project_id>/sprints", methods=["GET"])
@@ -1,9 +1,10 @@
 # controllers/docs_controller.py
-from flask import Blueprint, render_template, request, jsonify, send_file, flash, redirect, url_for
+from flask import Blueprint, Response, render_template, request, jsonify, send_file, flash, redirect, url_for
 from services.docs_service import DocsService, DocsServiceError
 from werkzeug.utils import secure_filename
 import io
 import logging
+from urllib.parse import quote
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +35,7 @@ def list_documents():
         - sort_by: recent|name|size (default: recent)
         - type: filter by file type
         - folder_id: filter by folder (optional)
+        - cursor: next_cursor from the previous page (optional)
     """
     try:
         # Get query parameters
@@ -41,6 +43,7 @@ def list_documents():
         sort_by = request.args.get('sort_by', 'recent')
         file_type = request.args.get('type')
         folder_id = request.args.get('folder_id')
+        cursor = request.args.get('cursor')
         
         # Validate limit
         if limit < 1 or limit > 100:
@@ -55,9 +58,12 @@ def list_documents():
             limit=limit,
             sort_by=sort_by,
             file_type=file_type,
-            folder_id=folder_id
+            folder_id=folder_id,
+            cursor=cursor
         )
         
+        if result.get('error_type') == 'cursor':
+            return jsonify(result), 400
         return jsonify(result), 200 if result['success'] else 500
         
     except DocsServiceError as e:
@@ -156,7 +162,8 @@ def create_document():
 @docs_bp.route('/api/documents/upload', methods=['POST'])
 def upload_file():
     """
-    Upload a file
+    Upload a file. The file is sent to Drive in the background;
+    poll GET /api/documents/upload/<upload_id> for progress.
     Form data:
         - file: file to upload (required)
         - folder_id: parent folder ID (optional)
@@ -188,7 +195,7 @@ def upload_file():
             folder_id=folder_id
         )
         
-        return jsonify(result), 201 if result['success'] else 400
+        return jsonify(result), 202 if result['success'] else 400
         
     except DocsServiceError as e:
         logger.error(f"Service error uploading file: {e}")
@@ -204,9 +211,72 @@ def upload_file():
         }), 500
 
 
+@docs_bp.route('/api/documents/upload/<upload_id>', methods=['GET'])
+def get_upload(upload_id):
+    """
+    Progress of a background upload
+    Returns status (queued / uploading / completed / failed), bytes_sent and total_bytes
+    """
+    try:
+        service = DocsService()
+        result = service.get_upload(upload_id)
+        
+        if not result['success']:
+            return jsonify(result), 404 if result.get('error_type') == 'not_found' else 500
+        return jsonify(result), 200
+        
+    except DocsServiceError as e:
+        logger.error(f"Service error reading upload: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+    except Exception as e:
+        logger.error(f"Unexpected error reading upload: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@docs_bp.route('/api/documents/upload/<upload_id>/resume', methods=['POST'])
+def resume_upload(upload_id):
+    """Continue a failed upload from the last chunk Drive acknowledged"""
+    try:
+        service = DocsService()
+        result = service.resume_upload(upload_id)
+        
+        return jsonify(result), 202 if result['success'] else 400
+        
+    except DocsServiceError as e:
+        logger.error(f"Service error resuming upload: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+    except Exception as e:
+        logger.error(f"Unexpected error resuming upload: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+def _attachment_disposition(filename):
+    """Content-Disposition for a download, with an RFC 5987 fallback for non-ASCII names"""
+    try:
+        filename.encode('ascii')
+        return 'attachment; filename="{}"'.format(filename.replace('"', ''))
+    except UnicodeEncodeError:
+        return "attachment; filename*=UTF-8''{}".format(quote(filename))
+
+
 @docs_bp.route('/api/documents/<file_id>/download', methods=['GET'])
 def download_document(file_id):
-    """Download a document"""
+    """
+    Download a document, streamed from Drive chunk by chunk
+    (Range requests are honoured, e.g. for resuming a download)
+    """
     try:
         if not file_id:
             return jsonify({
@@ -215,18 +285,29 @@ def download_document(file_id):
             }), 400
         
         service = DocsService()
-        result = service.download_document(file_id)
+        result = service.stream_document(file_id, request.headers.get('Range'))
         
         if not result['success']:
+            if result.get('range_not_satisfiable'):
+                headers = {'Content-Range': f"bytes */{result['size']}"} if result.get('size') is not None else {}
+                return Response(status=416, headers=headers)
             return jsonify(result), 404
         
-        # Send file
-        return send_file(
-            io.BytesIO(result['content']),
-            as_attachment=True,
-            download_name=result['metadata']['name'],
-            mimetype=result['metadata'].get('mime_type', 'application/octet-stream')
+        # Stream the file
+        download = result['download']
+        response = Response(
+            download,
+            status=download.status,
+            mimetype=result['metadata'].get('mime_type') or 'application/octet-stream',
+            direct_passthrough=True
         )
+        response.headers['Content-Disposition'] = _attachment_disposition(result['metadata']['name'])
+        response.headers['Accept-Ranges'] = 'bytes'
+        if download.content_length is not None:
+            response.headers['Content-Length'] = str(download.content_length)
+        if download.content_range:
+            response.headers['Content-Range'] = download.content_range
+        return response
         
     except DocsServiceError as e:
         logger.error(f"Service error downloading document: {e}")
@@ -318,6 +399,54 @@ def delete_document(file_id):
         }), 500
 
 
+# Upper bound on operations per batch call (Drive itself takes 100 per HTTP request)
+MAX_BATCH_OPERATIONS = 500
+
+
+@docs_bp.route('/api/documents/batch', methods=['POST'])
+def batch_documents():
+    """
+    Apply many operations in one call
+    Body: {"operations": [{"op": "delete", "id": "..."},
+                          {"op": "rename", "id": "...", "name": "..."},
+                          {"op": "move", "id": "...", "folder_id": "..."},
+                          {"op": "metadata", "id": "..."}]}
+    Returns one result per operation, in order
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        operations = data.get('operations')
+        
+        if not isinstance(operations, list) or not operations:
+            return jsonify({
+                'success': False,
+                'error': 'operations must be a non-empty list'
+            }), 400
+        if len(operations) > MAX_BATCH_OPERATIONS:
+            return jsonify({
+                'success': False,
+                'error': f'At most {MAX_BATCH_OPERATIONS} operations per batch'
+            }), 400
+        
+        service = DocsService()
+        result = service.batch_documents(operations)
+        
+        return jsonify(result), 200 if result['success'] else 500
+        
+    except DocsServiceError as e:
+        logger.error(f"Service error in batch operation: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+    except Exception as e:
+        logger.error(f"Unexpected error in batch operation: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @docs_bp.route('/api/folders', methods=['POST'])
 def create_folder():
     """
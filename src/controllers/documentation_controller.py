@@ -1,6 +1,12 @@
 from flask import Blueprint, jsonify, request
 from services.documentation_service import DocumentationService
 from services.ai_prediction_service import AIService
+from clients.ollama_client import get_ollama_client
+from clients.ollama_gateway import get_ollama_gateway
+from core.jobs import get_job_queue
+from core.sse import wants_event_stream, sse_response, completion_events
+from controllers.job_controller import accepted
+import services.background_jobs  # registers the ai.sprint_summary job
 
 documentation_bp = Blueprint(
     "documentation",
@@ -17,6 +23,31 @@ def get_sprint_documentation(sprint_id):
 
 @documentation_bp.route("/sprint/<int:sprint_id>/ai-summary", methods=["POST"])
 def generate_ai_summary(sprint_id):
+    """
+    Streams the summary as Server-Sent Events when asked for text/event-stream;
+    otherwise runs on a background worker: poll the returned job for {"summary"}.
+    An unchanged prompt returns the cached summary; send "refresh": true
+    (or ?refresh=1) to regenerate it.
+    """
     data = request.get_json()
-    summary = AIService.generate_summary(data["prompt"])
-    return jsonify({"summary": summary}), 200
+    if not data or not data.get("prompt"):
+        return jsonify({"error": "prompt is required"}), 400
+    refresh = bool(data.get("refresh")) or request.args.get("refresh") == "1"
+    if wants_event_stream(request):
+        return sse_response(completion_events(AIService.stream_summary(data["prompt"], refresh=refresh),
+                                              sprint_id=sprint_id))
+    job_id = get_job_queue().enqueue("ai.sprint_summary",
+                                     {"sprint_id": sprint_id, "prompt": data["prompt"], "refresh": refresh})
+    return accepted(job_id)
+
+
+@documentation_bp.route("/ai/cache-metrics", methods=["GET"])
+def get_ai_cache_metrics():
+    """Hit rate, size and evictions of the LLM response cache"""
+    return jsonify(get_ollama_client().cache_stats()), 200
+
+
+@documentation_bp.route("/ai/queue", methods=["GET"])
+def get_ai_queue():
+    """Generations running and waiting for the model, plus coalescing counters"""
+    return jsonify(get_ollama_gateway().stats()), 200
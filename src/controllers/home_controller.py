@@ -8,13 +8,23 @@ task_service = TaskService()
 @home_bp.route("/dashboard", methods=["GET"])
 def dashboard():
     """
-    Provide dashboard data for the home page calendar widget.
-    Returns upcoming tasks ordered by due date.
+    Provide dashboard data for the home page widgets.
+    Query params:
+        - project_id: only tasks of this project (optional)
+        - user_id: only deadlines of this assignee (optional)
+        - limit: number of deadlines (default 5)
+    Returns the next open deadlines ordered by due date, and the number of
+    tasks per assignee (team widget).
     """
-    user_id = request.args.get("user_id", type=int)
-    limit = request.args.get("limit", default=5, type=int)
+    try:
+        summary = task_service.get_dashboard_summary(
+            project_id=request.args.get("project_id", type=int),
+            user_id=request.args.get("user_id", type=int),
+            limit=request.args.get("limit", default=5, type=int)
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    tasks = task_service.get_upcoming_tasks(user_id=user_id, limit=limit)
     deadlines = [
         {
             "task_id": t.task_id,
@@ -25,8 +35,8 @@ def dashboard():
             "sprint_id": t.sprint_id,
             "assigned_id": t.assigned_id,
         }
-        for t in tasks
+        for t in summary["upcoming"]
     ]
+    assignees = [{"user_id": user_id, "task_count": count} for user_id, count in summary["assignees"].items()]
 
-    return jsonify({"deadlines": deadlines}), 200
-
+    return jsonify({"deadlines": deadlines, "assignees": assignees}), 200
@@ -4,6 +4,9 @@ import requests
 from flask import Blueprint, redirect, request, session, url_for, jsonify, current_app, render_template
 from services.github_service import GitHubService
 from repositories.repository_factory import RepositoryFactory
+from core.jobs import get_job_queue
+from controllers.job_controller import accepted
+import services.background_jobs  # registers the github.backfill job
 integration_bp = Blueprint('integration', __name__, url_prefix='/integration')
 
 # =========================================================
@@ -88,6 +91,27 @@ def get_repos():
             })
         
     return jsonify({'connected': True, 'repositories': formatted_repos})
+
+@integration_bp.route('/api/github/metrics', methods=['GET'])
+def github_metrics():
+    """Conditional-request cache hit/miss counts and remaining GitHub rate limit."""
+    from clients.github_client import get_github_client
+    return jsonify(get_github_client().stats())
+
+@integration_bp.route('/api/github/backfill', methods=['POST'])
+def backfill_github():
+    """
+    Copy recent commits / PRs / branches of every linked repo into the local store.
+    Runs as a background job; the per-repo report is the job's result.
+    """
+    token = session.get('github_token')
+    if not token:
+        return jsonify({'success': False, 'message': 'GitHub not connected'}), 401
+
+    repos = RepositoryFactory.get_repository("project").get_linked_repos()
+    job_id = get_job_queue().enqueue("github.backfill", {'repos': repos}, secrets={'access_token': token})
+    return accepted(job_id, success=True)
+
 # In controllers/integration_controller.py
 
 @integration_bp.route('/api/repos/link', methods=['POST'])
@@ -201,12 +225,15 @@ def github_webhook():
     if event_type == 'ping':
         return jsonify({'success': True, 'message': 'Ping received!'}), 200
 
-    elif event_type == 'push':
-        # Push logic here
-        pass
-    
-    elif event_type == 'pull_request':
-        # PR logic here
-        pass
+    elif event_type in ('push', 'pull_request'):
+        # Persist into the local store; redeliveries (same delivery ID) are no-ops
+        delivery_id = request.headers.get('X-GitHub-Delivery')
+        try:
+            stored = GitHubService.handle_webhook_event(event_type, delivery_id, payload or {})
+        except Exception as e:
+            print(f"Error storing GitHub {event_type} event: {e}")
+            # A 5xx makes GitHub retry the delivery later
+            return jsonify({'success': False, 'message': 'Could not store event'}), 500
+        return jsonify({'success': True, 'stored': stored}), 200
         
     return jsonify({'success': True}), 200
\ No newline at end of file
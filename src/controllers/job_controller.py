@@ -0,0 +1,31 @@
+from flask import Blueprint, jsonify, url_for
+from core.jobs import get_job_queue, current_requester
+
+job_bp = Blueprint("jobs", __name__, url_prefix="/api/v1/jobs")
+
+
+def accepted(job_id, **extra):
+    """202 response for an enqueued job: where to poll for its result."""
+    return jsonify({
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": url_for("jobs.get_job", job_id=job_id),
+        **extra
+    }), 202
+
+
+# ====================================
+# Poll a background job
+# ====================================
+@job_bp.route("/<job_id>", methods=["GET"])
+def get_job(job_id):
+    """Status and result of a job queued by this browser session (any other job is 404)"""
+    try:
+        requester = current_requester()
+        job = get_job_queue().get(job_id, requester=requester) if requester else None
+        if job is None:
+            return jsonify({"error": "Job not found"}), 404
+        return jsonify(job), 200
+    except Exception as e:
+        print(f"[ERROR] Reading job {job_id} failed: {e}")
+        return jsonify({"error": str(e)}), 500
@@ -23,13 +23,13 @@ def project_dashboard(project_id):
     if not project:
         return render_template('404.html'), 404
 
-    # Fetch Live GitHub Data if linked
+    # GitHub commits if linked and visible to the user's GitHub token
+    # (local store while fresh, live API otherwise)
     github_commits = []
-    if project.github_repo and 'github_token' in session:
+    if project.github_repo:
         try:
-            # We will define this method in Step 2
             github_commits = GitHubService.get_project_commits(
-                session['github_token'], 
+                session.get('github_token'),
                 project.github_repo
             )
         except Exception as e:
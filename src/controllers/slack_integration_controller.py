@@ -1,6 +1,15 @@
 from flask import Blueprint, jsonify, request
 from services.slack_integration_service import SlackService
 from services.ai_chat_service import AIChatService
+from clients.slack_client import get_slack_client
+from clients.slack_directory import get_slack_directory
+from core.jobs import get_job_queue
+from core.sse import wants_event_stream, sse_response, completion_events, subscription_events
+from core.pubsub import get_broker, BrokerFullError
+from controllers.job_controller import accepted
+from core.pagination import decode_cursor
+import services.background_jobs  # registers the ai.summarize_chat job
+import re
 import hmac
 import hashlib
 import time
@@ -8,6 +17,12 @@ import os
 
 slack_bp = Blueprint("slack", __name__, url_prefix="/api/v1/slack")
 
+SLACK_TS = re.compile(r"^\d+\.\d+$")
+MAX_MESSAGES_PAGE = 200
+# Seconds between keep-alive comments on an idle /stream, and before a refused client retries
+STREAM_HEARTBEAT = int(os.getenv('SLACK_STREAM_HEARTBEAT', 15))
+STREAM_RETRY_AFTER = 5
+
 def verify_slack_signature(request):
     """Verify that the request came from Slack"""
     slack_signing_secret = os.getenv('SLACK_SIGNING_SECRET')
@@ -54,18 +69,73 @@ def get_channels():
 
 @slack_bp.route("/messages/<channel_id>", methods=["GET"])
 def get_messages(channel_id):
-    """Get recent messages from a specific channel"""
+    """
+    Page of a channel's messages, newest first.
+    Query params:
+        - limit: page size (default 50, max 200)
+        - cursor: next_cursor from the previous page (older messages)
+        - before: ts of the oldest message already shown (alternative to cursor)
+    A channel without local history gets a backfill job queued on first view.
+    """
     try:
-        limit = request.args.get('limit', 50, type=int)
+        limit = max(1, min(request.args.get('limit', 50, type=int), MAX_MESSAGES_PAGE))
+        cursor = request.args.get('cursor')
+        before = request.args.get('before')
+        if before and not SLACK_TS.match(before):
+            return jsonify({"error": "before must be a Slack ts"}), 400
+        try:
+            position = decode_cursor(cursor)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        if position.get('before') and not SLACK_TS.match(str(position['before'])):
+            return jsonify({"error": "Invalid cursor"}), 400
+        
         slack_service = SlackService()
-        messages = slack_service.get_channel_messages(channel_id, limit)
-        return jsonify(messages), 200
+        if slack_service.needs_backfill(channel_id):
+            get_job_queue().enqueue("slack.backfill", {"channels": [channel_id]})
+        messages, next_cursor = slack_service.get_channel_messages_page(channel_id, limit, before=before,
+                                                                        cursor=cursor)
+        return jsonify({
+            "messages": messages,
+            "next_cursor": next_cursor,
+            "count": len(messages)
+        }), 200
     except ValueError as e:
         return jsonify({"error": str(e)}), 500
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+@slack_bp.route("/messages/<channel_id>/thread/<thread_ts>", methods=["GET"])
+def get_thread(channel_id, thread_ts):
+    """Replies of a thread, oldest first"""
+    if not SLACK_TS.match(thread_ts):
+        return jsonify({"error": "thread_ts must be a Slack ts"}), 400
+    try:
+        limit = request.args.get('limit', 100, type=int)
+        return jsonify(SlackService().get_thread_replies(channel_id, thread_ts, limit)), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@slack_bp.route("/backfill", methods=["POST"])
+def backfill_channels():
+    """
+    Copy channel history into the local store in the background.
+    Body: {"channels": [...]} (default: every channel the bot is a member of).
+    Poll the returned job for the number of messages stored per channel.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        channels = data.get('channels') or [c['id'] for c in SlackService().get_channels() if c['is_member']]
+        if not channels:
+            return jsonify({"error": "No channels to backfill"}), 400
+        job_id = get_job_queue().enqueue("slack.backfill", {"channels": channels})
+        return accepted(job_id, channels=channels)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
 @slack_bp.route("/send", methods=["POST"])
 def send_message():
     """Send a message to a Slack channel"""
@@ -109,9 +179,51 @@ def get_user(user_id):
         return jsonify({"error": str(e)}), 500
 
 
+@slack_bp.route("/directory", methods=["GET"])
+def get_directory_stats():
+    """Size, age and load counters of the shared users / channels cache"""
+    return jsonify(get_slack_directory().stats()), 200
+
+
+@slack_bp.route("/rate-limits", methods=["GET"])
+def get_rate_limits():
+    """Remaining budget, waits and 429s per Slack API method"""
+    return jsonify(get_slack_client().stats()), 200
+
+
+@slack_bp.route("/stream/<channel_id>", methods=["GET"])
+def stream_channel(channel_id):
+    """
+    Live messages of a channel as Server-Sent Events: 'message', 'reply',
+    'edited' and 'deleted' (data shaped like /messages), plus 'reset' when
+    the client must reload /messages because it missed events. Resumes
+    from the Last-Event-ID header that EventSource sends on reconnect.
+    """
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        subscription = get_broker().subscribe(channel_id, last_event_id)
+    except BrokerFullError as e:
+        response = jsonify({"error": str(e)})
+        response.headers["Retry-After"] = str(STREAM_RETRY_AFTER)
+        return response, 503
+    return sse_response(subscription_events(subscription, heartbeat=STREAM_HEARTBEAT))
+
+
+@slack_bp.route("/stream", methods=["GET"])
+def get_stream_stats():
+    """Open live subscriptions and fan-out counters of this process"""
+    return jsonify(get_broker().stats()), 200
+
+
 @slack_bp.route("/summarize-chat", methods=["POST"])
 def summarize_chat():
-    """Generate AI summary of chat messages"""
+    """
+    Generate AI summary of chat messages.
+    With "Accept: text/event-stream" the summary streams as it is generated
+    ('token' events, then 'done' with the text and sentiment). Otherwise it
+    runs in the background: 202 with a job id whose result holds summary and sentiment.
+    A conversation summarized before comes from the cache unless "refresh": true is sent.
+    """
     try:
         data = request.get_json()
         messages = data.get('messages', [])
@@ -119,14 +231,14 @@ def summarize_chat():
         if not messages:
             return jsonify({"error": "No messages provided"}), 400
         
-        ai_service = AIChatService()
-        summary = ai_service.summarize_chat(messages)
-        sentiment = ai_service.analyze_sentiment(messages)
+        refresh = bool(data.get('refresh')) or request.args.get('refresh') == '1'
         
-        return jsonify({
-            "summary": summary,
-            "sentiment": sentiment
-        }), 200
+        if wants_event_stream(request):
+            return sse_response(completion_events(AIChatService.stream_summary(messages, refresh=refresh),
+                                                  sentiment=AIChatService.analyze_sentiment(messages)))
+        
+        job_id = get_job_queue().enqueue("ai.summarize_chat", {"messages": messages, "refresh": refresh})
+        return accepted(job_id)
         
     except Exception as e:
         print(f"[ERROR] Summarize chat failed: {e}")
@@ -147,17 +259,30 @@ def slack_events():
         return jsonify({"challenge": data["challenge"]})
 
     event = data.get("event", {})
+    event_type = event.get("type")
 
-    # 2. Ignore bot messages
-    if event.get("type") == "message" and "bot_id" not in event:
-        text = event.get("text")
-        user_id = event.get("user")
-        channel_id = event.get("channel")
-        ts = event.get("ts")
+    # 2. Keep the shared users / channels directory current between full reloads
+    if event_type in ("user_change", "team_join"):
+        get_slack_directory().apply_user(event.get("user"))
+    elif event_type in ("channel_created", "channel_rename"):
+        get_slack_directory().apply_channel(event.get("channel"))
+    elif event_type == "channel_deleted":
+        get_slack_directory().remove_channel(event.get("channel"))
 
-        print("[SLACK EVENT]", channel_id, user_id, text)
+    # 3. Messages (including the bot's own posts) go to the local store
+    if event_type == "message":
+        try:
+            SlackService.store_event(event)
+        except Exception as e:
+            # A non-2xx answer makes Slack retry the delivery; the upsert is idempotent
+            print(f"[ERROR] Storing Slack event failed: {e}")
+            return jsonify({"error": "Could not store event"}), 500
 
-        # TODO: Save to DB
-        # TODO: Trigger AI analysis
+        # Browsers on /stream/<channel> get it without refetching the history
+        # (published once the store write above has committed)
+        try:
+            SlackService().publish_event(event)
+        except ValueError as e:
+            print(f"[ERROR] Publishing Slack event failed: {e}")
 
     return jsonify({"ok": True})
\ No newline at end of file
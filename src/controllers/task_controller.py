@@ -10,8 +10,31 @@ task_service = TaskService()
 @task_bp.route("", methods=["GET"])
 @task_bp.route("/", methods=["GET"])
 def list_all_tasks():
-    tasks = task_service.get_all_tasks()
-    return jsonify([t.to_dict() for t in tasks]), 200
+    """
+    Keyset-paginated task listing.
+    Query params:
+        - limit: page size (default 100, max 500)
+        - cursor: next_cursor from the previous page
+        - project_id, sprint_id, assigned_id, status, priority: server-side filters
+    """
+    try:
+        tasks, next_cursor = task_service.get_tasks_page(
+            limit=request.args.get("limit", 100, type=int),
+            cursor=request.args.get("cursor"),
+            project_id=request.args.get("project_id", type=int),
+            sprint_id=request.args.get("sprint_id", type=int),
+            assigned_id=request.args.get("assigned_id", type=int),
+            status=request.args.get("status"),
+            priority=request.args.get("priority")
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({
+        "tasks": [t.to_dict() for t in tasks],
+        "next_cursor": next_cursor,
+        "count": len(tasks)
+    }), 200
 
 
 @task_bp.route("/<int:task_id>", methods=["GET"])
@@ -167,8 +190,8 @@ def tasks_by_status(status):
 
 @task_bp.route("/page", methods=["GET"])
 def task_page():
-    tasks = task_service.get_all_tasks()
-    return render_template("home.html", tasks=tasks)
+    # home.html loads its tasks page by page from /api/v1/tasks
+    return render_template("home.html")
 
 
 @task_bp.route("/backlog", methods=["GET"])
@@ -46,13 +46,10 @@ def delete_user_account(user_id):
             cursor.execute("DELETE FROM useractivity WHERE user_id=%s", (user_id,))
             print(f"[DELETE] Deleted {cursor.rowcount} activities for user {user_id}")
 
-            # 3. Unassign tasks (set assigned_id to NULL instead of deleting)
-            cursor.execute("UPDATE Task SET assigned_id=NULL WHERE assigned_id=%s", (user_id,))
-            print(f"[DELETE] Unassigned {cursor.rowcount} tasks from user {user_id}")
-
-            # 4. Update tasks created by this user (set created_by to NULL)
-            cursor.execute("UPDATE Task SET created_by=NULL WHERE created_by=%s", (user_id,))
-            print(f"[DELETE] Updated {cursor.rowcount} tasks created by user {user_id}")
+            # 3-4. Unassign tasks and clear created_by (through TaskRepository so the
+            # task counters and cached dashboards follow)
+            unassigned = RepositoryFactory.get_repository("task").release_user(user_id)
+            print(f"[DELETE] Unassigned {unassigned} tasks from user {user_id}")
 
             # 5. Delete user project associations
             cursor.execute("DELETE FROM user_project WHERE user_id=%s", (user_id,))
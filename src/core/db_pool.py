@@ -0,0 +1,290 @@
+import os
+import time
+import threading
+from collections import deque
+import mysql.connector
+
+# Upper bounds (in milliseconds) of the checkout wait-time histogram buckets
+WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+class PoolExhaustedError(Exception):
+    """Raised when no connection became free within the checkout timeout"""
+    pass
+
+
+class _PoolEntry:
+    """A raw MySQL connection plus the bookkeeping the pool needs for it."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class PooledConnection:
+    """
+    Proxy handed out by the pool.
+    Behaves like a normal mysql.connector connection, except that close()
+    returns it to the pool instead of tearing down the socket.
+    """
+
+    def __init__(self, pool, entry):
+        self._pool = pool
+        self._entry = entry
+        self._released = False
+
+    def __getattr__(self, name):
+        return getattr(self._entry.raw, name)
+
+    def close(self):
+        if self._released:
+            return
+        self._released = True
+        self._pool._release(self._entry)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ConnectionPool:
+    """
+    Thread-safe MySQL connection pool shared by every repository in the process.
+
+    Unlike mysql.connector's MySQLConnectionPool it waits (up to `timeout`
+    seconds) for a free connection instead of failing immediately, recycles
+    connections that are too old or fail a health ping, and keeps counters
+    that can be read with stats().
+    """
+
+    def __init__(self, min_size=None, max_size=None, timeout=None,
+                 recycle_seconds=None, ping_after=None, connect=None):
+        # 1. Sizing / timing (env vars win over the defaults)
+        self.min_size = min_size if min_size is not None else int(os.getenv('DB_POOL_MIN', 2))
+        self.max_size = max_size if max_size is not None else int(os.getenv('DB_POOL_MAX', 20))
+        self.timeout = timeout if timeout is not None else float(os.getenv('DB_POOL_TIMEOUT', 10))
+        self.recycle_seconds = (recycle_seconds if recycle_seconds is not None
+                                else float(os.getenv('DB_POOL_RECYCLE', 1800)))
+        self.ping_after = ping_after if ping_after is not None else float(os.getenv('DB_POOL_PING_AFTER', 30))
+        if self.max_size < 1:
+            raise ValueError("DB_POOL_MAX must be at least 1")
+        self.min_size = max(0, min(self.min_size, self.max_size))
+
+        # 2. Connection factory (overridable for tests)
+        self._connect = connect or self._default_connect
+        self.pid = os.getpid()
+
+        # 3. State, all guarded by _cond
+        self._cond = threading.Condition(threading.Lock())
+        self._idle = deque()
+        self._size = 0
+        self._checked_out = 0
+        self._waiting = 0
+
+        # 4. Counters
+        self._checkouts = 0
+        self._created = 0
+        self._recycled = 0
+        self._discarded = 0
+        self._timeouts = 0
+        self._wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self._wait_sum_ms = 0.0
+
+    @staticmethod
+    def _default_connect():
+        return mysql.connector.connect(
+            host=os.getenv('DB_HOST', 'localhost'),
+            port=int(os.getenv('DB_PORT', 3306)),
+            user=os.getenv('DB_USER', 'root'),
+            password=os.getenv('DB_PASSWORD', 'ali2005'),
+            database=os.getenv('DB_NAME', 'AIPMS'),
+            connection_timeout=int(os.getenv('DB_CONNECT_TIMEOUT', 10))
+        )
+
+    # --------------------------------------------------
+    # CHECKOUT / RELEASE
+    # --------------------------------------------------
+    def warm_up(self):
+        """Open connections until the pool holds at least `min_size`."""
+        while True:
+            with self._cond:
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                entry = self._open()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                raise
+            with self._cond:
+                self._idle.append(entry)
+                self._cond.notify()
+
+    def get_connection(self, timeout=None):
+        """
+        Borrow a connection. Blocks up to `timeout` seconds (default: the
+        pool timeout) when all `max_size` connections are checked out.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        entry = None
+
+        with self._cond:
+            self._waiting += 1
+            try:
+                while True:
+                    if self._idle:
+                        # LIFO: the most recently used connection is the most likely to be alive
+                        entry = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolExhaustedError(
+                            f"No database connection available after {timeout:.1f}s "
+                            f"(max_size={self.max_size}, checked_out={self._checked_out})"
+                        )
+                    self._cond.wait(remaining)
+            finally:
+                self._waiting -= 1
+            self._checked_out += 1
+
+        # Network work happens outside the lock
+        try:
+            entry = self._open() if entry is None else self._validate(entry)
+        except Exception:
+            with self._cond:
+                self._checked_out -= 1
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+        self._record_wait((time.monotonic() - started) * 1000)
+        return PooledConnection(self, entry)
+
+    def _release(self, entry):
+        healthy = True
+        try:
+            # End any open transaction so the next borrower gets a fresh snapshot
+            if entry.raw.in_transaction:
+                entry.raw.rollback()
+        except Exception:
+            healthy = False
+            self._close_quietly(entry)
+
+        with self._cond:
+            self._checked_out -= 1
+            if healthy:
+                entry.last_used = time.monotonic()
+                self._idle.append(entry)
+            else:
+                self._size -= 1
+                self._discarded += 1
+            self._cond.notify()
+
+    def _open(self):
+        entry = _PoolEntry(self._connect())
+        with self._cond:
+            self._created += 1
+        return entry
+
+    def _validate(self, entry):
+        """Replace connections that are too old or fail a ping."""
+        now = time.monotonic()
+        if self.recycle_seconds and now - entry.created_at > self.recycle_seconds:
+            self._close_quietly(entry)
+            with self._cond:
+                self._recycled += 1
+            return self._open()
+
+        if now - entry.last_used > self.ping_after:
+            try:
+                entry.raw.ping(reconnect=False)
+            except Exception:
+                self._close_quietly(entry)
+                with self._cond:
+                    self._discarded += 1
+                return self._open()
+        return entry
+
+    @staticmethod
+    def _close_quietly(entry):
+        try:
+            entry.raw.close()
+        except Exception:
+            pass
+
+    def close_all(self):
+        """Close idle connections (checked-out ones are dropped when released)."""
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+            self._size -= len(idle)
+        for entry in idle:
+            self._close_quietly(entry)
+
+    # --------------------------------------------------
+    # METRICS
+    # --------------------------------------------------
+    def _record_wait(self, wait_ms):
+        index = len(WAIT_BUCKETS_MS)
+        for i, bound in enumerate(WAIT_BUCKETS_MS):
+            if wait_ms <= bound:
+                index = i
+                break
+        with self._cond:
+            self._checkouts += 1
+            self._wait_buckets[index] += 1
+            self._wait_sum_ms += wait_ms
+
+    def stats(self):
+        """Snapshot of pool counters (safe to serialise as JSON)."""
+        with self._cond:
+            histogram = {f"le_{bound}ms": count for bound, count in zip(WAIT_BUCKETS_MS, self._wait_buckets)}
+            histogram["le_inf"] = self._wait_buckets[-1]
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "checked_out": self._checked_out,
+                "waiting": self._waiting,
+                "checkouts": self._checkouts,
+                "created": self._created,
+                "recycled": self._recycled,
+                "discarded": self._discarded,
+                "timeouts": self._timeouts,
+                "wait_time_ms_sum": round(self._wait_sum_ms, 3),
+                "wait_time_ms_histogram": histogram
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """
+    Returns the process-wide pool, creating it on first use.
+    A new pool is built after a fork (gunicorn workers) so sockets are never shared.
+    """
+    global _pool
+    if _pool is None or _pool.pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool.pid != os.getpid():
+                pool = ConnectionPool()
+                try:
+                    pool.warm_up()
+                    print(f"Connection pool initialized (min={pool.min_size}, max={pool.max_size})")
+                except Exception as e:
+                    # Not fatal: connections are opened lazily on checkout
+                    print(f"Error warming up connection pool: {e}")
+                _pool = pool
+    return _pool
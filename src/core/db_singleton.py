@@ -1,48 +1,24 @@
-import os
-import mysql.connector
-from mysql.connector import pooling, Error
+from core.db_pool import get_pool
+from core import unit_of_work
 
 class DatabaseConnection:
     _instance = None
-    _pool = None
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(DatabaseConnection, cls).__new__(cls)
-            try:
-                # 1. READ DOCKER ENV VARS (Force it to use 'mysql-db')
-                db_host = os.getenv('DB_HOST', 'localhost')
-                db_user = os.getenv('DB_USER', 'root')
-                db_password = os.getenv('DB_PASSWORD', 'ali2005')
-                db_name = os.getenv('DB_NAME', 'AIPMS')
-
-                print(f"DEBUG (Core Singleton): Connecting to {db_host}...")
-
-                # 2. Initialize the pool
-                cls._pool = pooling.MySQLConnectionPool(
-                    pool_name="mypool_core", # Unique name for this pool
-                    pool_size=5,
-                    pool_reset_session=True,
-                    host=db_host,
-                    user=db_user,
-                    password=db_password,
-                    database=db_name
-                )
-                print("Core Connection pool initialized successfully")
-            except Error as e:
-                print(f"Error creating core connection pool: {e}")
-                cls._pool = None
+            # The pool itself lives in core.db_pool and is shared with data/db_session,
+            # so every repository draws from one configurable pool (DB_POOL_MIN / DB_POOL_MAX).
+            get_pool()
         return cls._instance
 
     def get_connection(self):
-        """Returns a connection from the pool."""
-        # 3. SELF-HEALING: If pool is dead, try to restart it
-        if self._pool is None:
-             print("Core Pool was None, attempting to re-initialize...")
-             self.__new__(self.__class__)
-             
-        # 4. SAFETY CHECK: Don't crash with AttributeError, give a real error
-        if self._pool is None:
-             raise Exception("CRITICAL ERROR: Core Database pool failed to initialize. Check DB_HOST.")
-             
-        return self._pool.get_connection()
\ No newline at end of file
+        """
+        Returns a connection from the shared pool (close() gives it back).
+        During a request all repositories share the request's connection.
+        """
+        return unit_of_work.get_connection()
+
+    def pool_stats(self):
+        """Returns the shared pool's counters."""
+        return get_pool().stats()
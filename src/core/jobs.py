@@ -0,0 +1,236 @@
+"""
+In-process background jobs.
+
+Slow outbound work (SMTP, Ollama, GitHub fan-outs) is recorded as a row in
+background_job and run by a small worker pool, so the request can return
+202 straight away and the client polls GET /api/v1/jobs/<job_id>.
+
+Handlers are registered with @job_handler("type") and called with the job's
+payload dict; whatever they return (JSON-serializable) becomes the result.
+A failed attempt is retried with exponential backoff; a poller thread runs
+retries once they are due and picks up jobs a dead process left behind.
+
+Secrets (e.g. OAuth tokens) passed to enqueue() stay in this process's memory
+and are never written to the table, so such a job is recorded with this
+queue's owner id and other processes' pollers do not claim it or its retries.
+
+A job queued during a request records the browser session that queued it
+(a random id kept in the signed session cookie); GET /api/v1/jobs/<job_id>
+only shows a job to that session.
+"""
+import os
+import json
+import uuid
+import socket
+import logging
+import threading
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from flask import has_request_context, current_app, session
+from core import unit_of_work
+from repositories.repository_factory import RepositoryFactory
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', 4))
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 3))
+# Seconds before the first retry; doubled for every further attempt, up to JOB_RETRY_MAX_DELAY
+JOB_RETRY_DELAY = int(os.getenv('JOB_RETRY_DELAY', 5))
+JOB_RETRY_MAX_DELAY = int(os.getenv('JOB_RETRY_MAX_DELAY', 300))
+JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', 2))
+# A job 'running' for longer than this is assumed to have lost its worker (process restart)
+JOB_STALE_AFTER = int(os.getenv('JOB_STALE_AFTER', 600))
+
+# job_type -> (handler, max_attempts)
+_handlers = {}
+
+
+class JobError(Exception):
+    """A job that cannot be enqueued (e.g. unknown type)"""
+    pass
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler for failures a retry cannot fix"""
+    pass
+
+
+def job_handler(job_type, max_attempts=None):
+    """Register fn(payload) -> result as the handler for job_type."""
+    def register(fn):
+        _handlers[job_type] = (fn, max_attempts or JOB_MAX_ATTEMPTS)
+        return fn
+    return register
+
+
+def current_requester():
+    """
+    Id of the browser session making the current request, created on first
+    use; None outside a request or when the app has no secret key for sessions.
+    """
+    if not has_request_context() or not current_app.secret_key:
+        return None
+    return session.setdefault('job_requester', uuid.uuid4().hex)
+
+
+def retry_delay(attempts):
+    """Backoff before the next attempt, after `attempts` failed ones."""
+    return min(JOB_RETRY_DELAY * 2 ** (attempts - 1), JOB_RETRY_MAX_DELAY)
+
+
+class JobQueue:
+    def __init__(self, repository=None, workers=None, app=None):
+        self._repository = repository
+        self.app = app
+        self.executor = ThreadPoolExecutor(max_workers=workers or JOB_WORKERS, thread_name_prefix="job-worker")
+        self._in_flight = set()
+        self._lock = threading.Lock()
+        # job_id -> values (e.g. OAuth tokens) handed to the handler but never written to the job table
+        self._secrets = {}
+        # Recorded on jobs with secrets: only this process can run them
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._poller = None
+        self._stopped = threading.Event()
+
+    @property
+    def repository(self):
+        if self._repository is None:
+            self._repository = RepositoryFactory.get_repository("job")
+        return self._repository
+
+    def enqueue(self, job_type, payload=None, secrets=None, max_attempts=None):
+        """Record a job and hand it to a worker. Returns the job id to poll."""
+        if job_type not in _handlers:
+            raise JobError(f"Unknown job type: {job_type}")
+        job_id = uuid.uuid4().hex
+        self.repository.create(job_id, job_type, json.dumps(payload or {}),
+                               max_attempts or _handlers[job_type][1],
+                               owner=self.owner if secrets else None,
+                               requester=current_requester())
+        if secrets:
+            self._secrets[job_id] = secrets
+        # Inside a request the row only exists for the worker's connection once the request commits
+        unit_of_work.after_commit(lambda: self._dispatch(job_id))
+        self.start()
+        return job_id
+
+    def get(self, job_id, requester=None):
+        """
+        Status of a job as returned by /api/v1/jobs/<job_id>, or None.
+        With a requester, a job queued by anyone else is None as well.
+        """
+        job = self.repository.get(job_id)
+        if job is None or (requester is not None and job.get('requester') != requester):
+            return None
+        return {
+            'job_id': job['job_id'],
+            'type': job['job_type'],
+            'status': job['status'],
+            'attempts': job['attempts'],
+            'max_attempts': job['max_attempts'],
+            'result': json.loads(job['result']) if job['result'] else None,
+            'error': job['error'],
+            'created_at': job['created_at'].isoformat() if job['created_at'] else None,
+            'updated_at': job['updated_at'].isoformat() if job['updated_at'] else None
+        }
+
+    # --------------------------------------------------
+    # WORKERS
+    # --------------------------------------------------
+    def start(self):
+        """Start the poller that runs due retries and orphaned jobs (idempotent)."""
+        with self._lock:
+            if self._poller is None:
+                self._poller = threading.Thread(target=self._poll, name="job-poller", daemon=True)
+                self._poller.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def _poll(self):
+        while not self._stopped.wait(JOB_POLL_INTERVAL):
+            try:
+                for job_id in self.repository.list_due(JOB_WORKERS * 2, JOB_STALE_AFTER, self.owner):
+                    self._dispatch(job_id)
+            except Exception as e:
+                # e.g. database down: try again on the next tick
+                logger.warning(f"Job poller failed: {e}")
+
+    def _dispatch(self, job_id):
+        with self._lock:
+            if job_id in self._in_flight:
+                return
+            self._in_flight.add(job_id)
+        try:
+            self.executor.submit(self._run_and_release, job_id)
+        except Exception:
+            with self._lock:
+                self._in_flight.discard(job_id)
+            raise
+
+    def _run_and_release(self, job_id):
+        try:
+            self.run(job_id)
+        except Exception as e:
+            logger.error(f"Job {job_id} could not be recorded: {e}")
+        finally:
+            with self._lock:
+                self._in_flight.discard(job_id)
+
+    def run(self, job_id):
+        """Run one attempt of a job if it is due and nobody else has it."""
+        if not self.repository.claim(job_id, JOB_STALE_AFTER, self.owner):
+            return
+        job = self.repository.get(job_id)
+        handler, _ = _handlers.get(job['job_type'], (None, None))
+        if handler is None:
+            self._finish(job_id, error=f"No handler registered for '{job['job_type']}'")
+            return
+
+        payload = dict(json.loads(job['payload']), **self._secrets.get(job_id, {}))
+        try:
+            with self.app.app_context() if self.app else nullcontext():
+                result = handler(payload)
+        except PermanentJobError as e:
+            self._finish(job_id, error=str(e))
+            return
+        except Exception as e:
+            if job['attempts'] >= job['max_attempts']:
+                logger.error(f"Job {job_id} ({job['job_type']}) failed after {job['attempts']} attempts: {e}")
+                self._finish(job_id, error=str(e))
+            else:
+                delay = retry_delay(job['attempts'])
+                logger.warning(f"Job {job_id} ({job['job_type']}) failed, retrying in {delay}s: {e}")
+                self.repository.schedule_retry(job_id, delay, str(e))
+            return
+        self._finish(job_id, result=result)
+
+    def _finish(self, job_id, result=None, error=None):
+        self._secrets.pop(job_id, None)
+        if error is not None:
+            self.repository.mark_failed(job_id, error)
+        else:
+            self.repository.mark_succeeded(job_id, json.dumps(result))
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue():
+    """Process-wide JobQueue."""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = JobQueue()
+    return _queue
+
+
+def init_app(app):
+    """Run job handlers inside this app's context and start picking up due jobs."""
+    queue = get_job_queue()
+    queue.app = app
+    app.extensions['jobs'] = queue
+    queue.start()
+    return queue
@@ -0,0 +1,22 @@
+import base64
+import json
+
+
+def encode_cursor(values: dict) -> str:
+    """Pack keyset values into an opaque, URL-safe continuation token."""
+    raw = json.dumps(values, separators=(',', ':'), default=str).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: str) -> dict:
+    """Unpack a token made by encode_cursor(). Raises ValueError on garbage."""
+    if not token:
+        return {}
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, dict):
+        raise ValueError("Invalid cursor")
+    return values
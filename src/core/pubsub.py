@@ -0,0 +1,174 @@
+"""
+In-process publish/subscribe for live updates pushed to browsers over SSE.
+
+Publishers call get_broker().publish(topic, event_type, data); every open
+subscription on that topic gets the event. Events get ids of the form
+"<epoch>-<seq>" (seq counts per topic, epoch changes with every process
+start), and the last BROKER_HISTORY events per topic are kept so a client
+reconnecting with Last-Event-ID gets what it missed replayed.
+
+Publishing never blocks. A subscriber whose queue is full (a slow or stuck
+client) has its backlog dropped and gets one 'reset' event instead, telling
+it to reload from the API; the same happens when a Last-Event-ID is too old
+to replay or comes from another process.
+
+Only events published in this process are seen: with several gunicorn
+workers a client is told to reset when it reconnects to a different one.
+"""
+import os
+import uuid
+import queue
+import threading
+from collections import deque, namedtuple
+
+BROKER_HISTORY = int(os.getenv('BROKER_HISTORY', 200))
+BROKER_QUEUE_SIZE = int(os.getenv('BROKER_QUEUE_SIZE', 100))
+BROKER_MAX_SUBSCRIBERS = int(os.getenv('BROKER_MAX_SUBSCRIBERS', 100))
+
+Event = namedtuple("Event", ["id", "seq", "type", "data"])
+
+
+class BrokerFullError(Exception):
+    """Too many open subscriptions in this process"""
+    pass
+
+
+class Subscription:
+    """One client's view of a topic: a bounded queue filled by the broker."""
+
+    def __init__(self, broker, topic, queue_size):
+        self.topic = topic
+        self.dropped = 0
+        self._broker = broker
+        self._queue = queue.Queue(maxsize=queue_size)
+
+    def get(self, timeout=None):
+        """Next event, or None if none arrived within `timeout` seconds."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self._broker._unsubscribe(self)
+
+    def _offer(self, event):
+        """Called by the broker with its lock held; never blocks."""
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            # The client can't keep up: replace its backlog with one reset
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._queue.put_nowait(self._broker._reset_event(self.topic))
+            self.dropped += 1
+            return False
+        return True
+
+
+class MessageBroker:
+    def __init__(self, history=None, queue_size=None, max_subscribers=None):
+        self.history = history or BROKER_HISTORY
+        self.queue_size = queue_size or BROKER_QUEUE_SIZE
+        self.max_subscribers = max_subscribers or BROKER_MAX_SUBSCRIBERS
+        self.epoch = uuid.uuid4().hex[:8]
+
+        self._lock = threading.Lock()
+        self._seq = {}              # topic -> seq of the last published event
+        self._history = {}          # topic -> deque of recent events
+        self._subscribers = {}      # topic -> set of Subscription
+
+        self._published = 0
+        self._replayed = 0
+        self._resets = 0
+
+    def publish(self, topic, event_type, data):
+        """Fan an event out to the topic's subscribers. Returns its id."""
+        with self._lock:
+            seq = self._seq.get(topic, 0) + 1
+            self._seq[topic] = seq
+            event = Event(f"{self.epoch}-{seq}", seq, event_type, data)
+            self._history.setdefault(topic, deque(maxlen=self.history)).append(event)
+            self._published += 1
+            for subscription in self._subscribers.get(topic, ()):
+                if not subscription._offer(event):
+                    self._resets += 1
+            return event.id
+
+    def subscribe(self, topic, last_event_id=None):
+        """
+        Open a subscription. With `last_event_id` (the SSE Last-Event-ID),
+        events published after it are queued first, or a single 'reset'
+        if they can no longer be replayed.
+        Raises BrokerFullError when max_subscribers are already open.
+        """
+        with self._lock:
+            if sum(len(s) for s in self._subscribers.values()) >= self.max_subscribers:
+                raise BrokerFullError(f"{self.max_subscribers} live subscriptions already open")
+            subscription = Subscription(self, topic, self.queue_size)
+            if last_event_id:
+                missed = self._missed_since(topic, last_event_id)
+                if missed is None or len(missed) > self.queue_size:
+                    subscription._offer(self._reset_event(topic))
+                    self._resets += 1
+                else:
+                    for event in missed:
+                        subscription._offer(event)
+                    self._replayed += len(missed)
+            self._subscribers.setdefault(topic, set()).add(subscription)
+            return subscription
+
+    def stats(self):
+        with self._lock:
+            return {
+                "topics": len(self._history),
+                "subscribers": sum(len(s) for s in self._subscribers.values()),
+                "max_subscribers": self.max_subscribers,
+                "published": self._published,
+                "replayed": self._replayed,
+                "resets": self._resets
+            }
+
+    def _missed_since(self, topic, last_event_id):
+        """Events after last_event_id, or None if they are not all in the history."""
+        epoch, _, seq = str(last_event_id).partition("-")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        seq = int(seq)
+        current = self._seq.get(topic, 0)
+        if seq > current:
+            return None
+        recent = self._history.get(topic) or deque()
+        if seq < current and recent[0].seq > seq + 1:
+            return None
+        return [event for event in recent if event.seq > seq]
+
+    def _reset_event(self, topic):
+        # Carries the current id, so resuming after the reload starts from here
+        seq = self._seq.get(topic, 0)
+        return Event(f"{self.epoch}-{seq}", seq, "reset", {})
+
+    def _unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.topic)
+            if subscribers:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.topic]
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Process-wide broker."""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = MessageBroker()
+    return _broker
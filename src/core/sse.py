@@ -0,0 +1,80 @@
+"""
+Server-Sent Events helpers.
+
+An SSE endpoint returns sse_response(events) where `events` yields strings
+built with format_event(). When the client disconnects, the WSGI server
+closes the response iterable; that close() reaches the `events` generator
+(GeneratorExit at its current yield), so upstream work can be cancelled
+in its finally block.
+"""
+import json
+from flask import Response
+
+
+def format_event(data, event=None, event_id=None):
+    """One SSE frame. `data` is sent as JSON unless it is already a string."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    payload = data if isinstance(data, str) else json.dumps(data)
+    lines.extend(f"data: {line}" for line in payload.split("\n"))
+    return "\n".join(lines) + "\n\n"
+
+
+def wants_event_stream(request):
+    """True when the client asked for text/event-stream (Accept header)."""
+    return request.accept_mimetypes.best_match(["application/json", "text/event-stream"]) == "text/event-stream"
+
+
+def sse_response(events):
+    return Response(events, mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        # Stop nginx (and similar proxies) from buffering the stream
+        "X-Accel-Buffering": "no"
+    })
+
+
+def completion_events(fragments, **done_fields):
+    """
+    Relay a streamed completion: a 'token' event per fragment, then 'done'
+    with the full text (plus done_fields), or 'error' if generation failed.
+    Non-text items are (event, data) pairs, e.g. the gateway's ('queued',
+    {'position': n}), and are sent as they are.
+    A client disconnect closes `fragments` too, cancelling it upstream.
+    """
+    text = []
+    try:
+        for fragment in fragments:
+            if not isinstance(fragment, str):
+                yield format_event(fragment[1], event=fragment[0])
+                continue
+            text.append(fragment)
+            yield format_event({"text": fragment}, event="token")
+        yield format_event({"text": "".join(text), **done_fields}, event="done")
+    except Exception as e:
+        yield format_event({"error": str(e)}, event="error")
+    finally:
+        close = getattr(fragments, "close", None)
+        if close:
+            close()
+
+
+def subscription_events(subscription, heartbeat=15, retry_ms=3000):
+    """
+    Relay a core.pubsub subscription, one frame per event with its id (so
+    the browser's EventSource resumes with Last-Event-ID). A comment line
+    every `heartbeat` idle seconds keeps proxies from closing the stream
+    and lets a dead client be noticed. Closing the stream unsubscribes.
+    """
+    try:
+        yield f"retry: {retry_ms}\n\n"
+        while True:
+            event = subscription.get(timeout=heartbeat)
+            if event is None:
+                yield ": heartbeat\n\n"
+            else:
+                yield format_event(event.data, event=event.type, event_id=event.id)
+    finally:
+        subscription.close()
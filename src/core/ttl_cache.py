@@ -0,0 +1,83 @@
+import time
+import threading
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Small thread-safe in-process cache with a per-entry time-to-live.
+
+    get_or_load() only stores a freshly loaded value if the key was not
+    invalidated while the loader was running, so a slow read that started
+    before a write can never put pre-write data back into the cache.
+    """
+
+    def __init__(self, ttl_seconds, max_entries=1024, clock=time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> (expires_at, value)
+        self._generations = {}          # key -> invalidation counter
+        self._epoch = 0                 # bumped by clear()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self._misses += 1
+            return default
+
+    def set(self, key, value):
+        with self._lock:
+            self._store(key, value)
+
+    def get_or_load(self, key, loader):
+        """Return the cached value, or call loader() and cache its result (None is not cached)."""
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+
+        with self._lock:
+            generation = (self._epoch, self._generations.get(key, 0))
+        value = loader()
+        if value is not None:
+            with self._lock:
+                if (self._epoch, self._generations.get(key, 0)) == generation:
+                    self._store(key, value)
+        return value
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "ttl_seconds": self.ttl_seconds
+            }
+
+    def _store(self, key, value):
+        if self.ttl_seconds <= 0:
+            return
+        self._entries[key] = (self._clock() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,187 @@
+from flask import g, has_request_context, current_app, jsonify, make_response
+from core.db_pool import get_pool
+
+
+class RequestConnection:
+    """
+    Connection proxy lent to repositories while a request is running.
+    commit(), rollback() and close() are deferred to the UnitOfWork so that
+    every repository call in the request shares one connection and one transaction.
+    Each borrow starts at its own savepoint, so rollback() only undoes the
+    writes made through this borrow.
+    """
+
+    def __init__(self, uow, conn, savepoint=None):
+        self._uow = uow
+        self._conn = conn
+        self._savepoint = savepoint
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def commit(self):
+        # Committed once, when the request finishes successfully
+        self._uow.dirty = True
+
+    def rollback(self):
+        # Undo this repository call only; if the savepoint is gone (MySQL
+        # already rolled back the whole transaction, e.g. on a deadlock) the
+        # request fails
+        try:
+            self._uow.rollback_to(self._savepoint)
+        except Exception as e:
+            print(f"[UNIT OF WORK] Rollback to savepoint failed, rolling back the request: {e}")
+            self._uow.rollback_only = True
+
+    def close(self):
+        # The connection goes back to the pool at teardown
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class UnitOfWork:
+    """
+    One pooled connection + one transaction for the lifetime of a request.
+
+    The transaction (and its consistent snapshot) starts at the request's
+    first database access and stays open until the response is sent,
+    including through any Drive / GitHub / Slack / Ollama call made after
+    that point, holding the pooled connection and InnoDB's undo history
+    meanwhile. Make slow outbound calls before the first repository call,
+    or hand them to a background job.
+    """
+
+    def __init__(self, pool=None):
+        self._pool = pool
+        self._conn = None
+        self.dirty = False
+        self.rollback_only = False
+        self.borrows = 0
+        self._after_commit = []
+
+    def connection(self):
+        if self._conn is None:
+            self._conn = (self._pool or get_pool()).get_connection()
+            try:
+                # All reads in the request see the same point-in-time snapshot
+                self._conn.start_transaction(consistent_snapshot=True)
+            except Exception:
+                conn, self._conn = self._conn, None
+                conn.close()
+                raise
+        self.borrows += 1
+        savepoint = f"uow_{self.borrows}"
+        self._execute(f"SAVEPOINT {savepoint}")
+        return RequestConnection(self, self._conn, savepoint)
+
+    def rollback_to(self, savepoint):
+        """Undo everything done since `savepoint`, keeping the rest of the request's writes."""
+        if savepoint is None:
+            raise RuntimeError("No savepoint to roll back to")
+        self._execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+
+    def _execute(self, statement):
+        cursor = self._conn.cursor()
+        try:
+            cursor.execute(statement)
+        finally:
+            cursor.close()
+
+    def after_commit(self, callback):
+        """Run callback() once the request's transaction has committed (dropped on rollback)."""
+        self._after_commit.append(callback)
+
+    def complete(self, success=True):
+        """Commit (or roll back) the request's transaction and return the connection to the pool."""
+        callbacks, self._after_commit = self._after_commit, []
+        if self._conn is None:
+            return
+        conn, self._conn = self._conn, None
+        committed = False
+        try:
+            if success and not self.rollback_only:
+                conn.commit()
+                committed = True
+            else:
+                conn.rollback()
+        finally:
+            conn.close()
+
+        if committed:
+            for callback in callbacks:
+                try:
+                    callback()
+                except Exception as e:
+                    print(f"[UNIT OF WORK] after_commit callback failed: {e}")
+
+
+def current_unit_of_work():
+    """Returns the request's UnitOfWork, or None outside a request / when not installed."""
+    if not has_request_context():
+        return None
+    settings = current_app.extensions.get('unit_of_work')
+    if settings is None or not current_app.config.get('DB_UNIT_OF_WORK', True):
+        return None
+    uow = g.get('_unit_of_work')
+    if uow is None:
+        uow = g._unit_of_work = UnitOfWork(settings['pool'])
+    return uow
+
+
+def get_connection():
+    """
+    Connection used by DatabaseConnection.get_connection().
+    Inside a request every call gets the same connection; elsewhere
+    (scripts, background threads) it is a normal pool checkout.
+    """
+    uow = current_unit_of_work()
+    if uow is None:
+        return get_pool().get_connection()
+    return uow.connection()
+
+
+def after_commit(callback):
+    """
+    Defer callback() (e.g. a cache invalidation) until the current request
+    commits. Outside a request the caller has already committed, so it runs now.
+    """
+    uow = current_unit_of_work()
+    if uow is None:
+        callback()
+    else:
+        uow.after_commit(callback)
+
+
+def init_app(app, pool=None):
+    """Install the per-request unit of work on a Flask app."""
+    app.extensions['unit_of_work'] = {'pool': pool}
+
+    @app.after_request
+    def _complete_unit_of_work(response):
+        uow = g.pop('_unit_of_work', None)
+        if uow is None:
+            return response
+        if uow.rollback_only and response.status_code < 400:
+            # The transaction was lost mid-request: don't report success for writes that were undone
+            print(f"[UNIT OF WORK] Transaction rolled back during a {response.status_code} response")
+            uow.complete(success=False)
+            return make_response(jsonify({"error": "Database transaction was rolled back"}), 500)
+        try:
+            uow.complete(success=response.status_code < 500)
+        except Exception as e:
+            print(f"[UNIT OF WORK] Commit failed: {e}")
+            # after_request must return a response object, not a (body, status) tuple
+            return make_response(jsonify({"error": "Database commit failed"}), 500)
+        return response
+
+    @app.teardown_request
+    def _release_unit_of_work(exc):
+        # Only reached with a live unit of work when the request raised
+        uow = g.pop('_unit_of_work', None)
+        if uow is not None:
+            uow.complete(success=False)
@@ -0,0 +1,168 @@
+"""
+Prints the MySQL EXPLAIN plan of every hot repository query.
+
+The SQL is captured by running the real repository methods against a
+recording connection, so the plans always match what the code sends.
+Rows with a full table scan (type=ALL) or a filesort are flagged.
+
+Usage (from src/):
+    python explain_queries.py            # print plans
+    python explain_queries.py --strict   # exit 1 if anything is flagged
+"""
+import sys
+from datetime import date
+
+from core.db_pool import get_pool
+from repositories.task_repository import TaskRepository
+from repositories.sprint_repository import SprintRepository
+from repositories.project_repository import ProjectRepository
+from repositories.note_repository import NoteRepository
+from repositories.time_repository import TimeTrackingRepository
+from repositories.user_activity_repository import UserActivityRepository
+from repositories.user_skill_repository import UserSkillRepository
+from repositories.user_repository import UserRepository
+
+
+class _EmptyRow(dict):
+    """fetchone() result: every column reads as 0 so aggregate code paths keep going."""
+
+    def __getitem__(self, key):
+        return self.get(key, 0)
+
+    def __bool__(self):
+        return False
+
+
+class _RecordingCursor:
+    def __init__(self, statements):
+        self._statements = statements
+        self.rowcount = 0
+        self.lastrowid = None
+
+    def execute(self, query, params=None):
+        self._statements.append((query, tuple(params) if params else ()))
+
+    def fetchall(self):
+        return []
+
+    def fetchone(self):
+        return _EmptyRow()
+
+    def close(self):
+        pass
+
+
+class _RecordingConnection:
+    def __init__(self, statements):
+        self._statements = statements
+
+    def cursor(self, *args, **kwargs):
+        return _RecordingCursor(self._statements)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class _RecordingDB:
+    """Stand-in for DatabaseConnection that records SQL instead of running it."""
+
+    def __init__(self):
+        self.statements = []
+
+    def get_connection(self):
+        return _RecordingConnection(self.statements)
+
+
+def _capture(repo_class, method, *args, **kwargs):
+    repo = repo_class()
+    recorder = _RecordingDB()
+    repo.db_manager = recorder
+    try:
+        getattr(repo, method)(*args, **kwargs)
+    except Exception:
+        # Result post-processing may choke on empty rows; the SQL is already recorded
+        pass
+    return recorder.statements
+
+
+# (label, repository class, method, args, kwargs)
+QUERIES = [
+    ("task.get_page", TaskRepository, "get_page", (), {"limit": 100, "after_id": 1}),
+    ("task.get_page(project)", TaskRepository, "get_page", (), {"project_id": 1, "status": "TODO"}),
+    ("task.get_page(assignee)", TaskRepository, "get_page", (), {"assigned_id": 1}),
+    ("task.get_user_recent_tasks", TaskRepository, "get_user_recent_tasks", (1,), {}),
+    ("task.get_user_overdue_tasks", TaskRepository, "get_user_overdue_tasks", (1,), {}),
+    ("task.get_backlog_tasks", TaskRepository, "get_backlog_tasks", (), {"limit": 20}),
+    ("task.get_by_sprint_id", TaskRepository, "get_by_sprint_id", (1,), {}),
+    ("task.get_by_project", TaskRepository, "get_by_project", (1,), {}),
+    ("task.get_upcoming(project)", TaskRepository, "get_upcoming", (), {"project_id": 1}),
+    ("task.get_assignee_task_counts(project)", TaskRepository, "get_assignee_task_counts", (), {"project_id": 1}),
+    ("sprint.get_by_project_id", SprintRepository, "get_by_project_id", (1,), {}),
+    ("project.get_user_projects", ProjectRepository, "get_user_projects", (1,), {}),
+    ("project.get_project_stats", ProjectRepository, "get_project_stats", (1,), {}),
+    ("project.get_critical_tasks", ProjectRepository, "get_critical_tasks", (1,), {}),
+    ("project.get_recent_activities", ProjectRepository, "get_recent_activities", (1,), {}),
+    ("note.get_by_entity", NoteRepository, "get_by_entity", ("task", 1), {}),
+    ("time.get_by_user", TimeTrackingRepository, "get_by_user", (1,), {}),
+    ("time.get_by_project", TimeTrackingRepository, "get_by_project", (1,), {}),
+    ("time.get_by_task", TimeTrackingRepository, "get_by_task", (1,), {}),
+    ("time.get_by_date_range", TimeTrackingRepository, "get_by_date_range",
+     (date(2024, 1, 1), date(2024, 12, 31)), {"user_id": 1}),
+    ("time.get_total_hours_by_user", TimeTrackingRepository, "get_total_hours_by_user",
+     (1, date(2024, 1, 1), date(2024, 12, 31)), {}),
+    ("activity.get_by_user_id", UserActivityRepository, "get_by_user_id", (1,), {}),
+    ("skill.get_by_user_id", UserSkillRepository, "get_by_user_id", (1,), {}),
+    ("user.get_user_stats", UserRepository, "get_user_stats", (1,), {}),
+]
+
+
+def _flags(plan_row):
+    flags = []
+    if (plan_row.get("type") or "").upper() == "ALL":
+        flags.append("FULL SCAN")
+    if "filesort" in (plan_row.get("Extra") or ""):
+        flags.append("FILESORT")
+    return flags
+
+
+def explain_all():
+    """Prints the plans and returns the number of flagged plan rows."""
+    conn = get_pool().get_connection()
+    cursor = conn.cursor(dictionary=True)
+    flagged = 0
+    try:
+        for label, repo_class, method, args, kwargs in QUERIES:
+            for query, params in _capture(repo_class, method, *args, **kwargs):
+                if not query.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+                    continue
+                print(f"\n=== {label} ===")
+                try:
+                    cursor.execute("EXPLAIN " + query, params)
+                    plan = cursor.fetchall()
+                except Exception as e:
+                    print(f"  ❌ EXPLAIN failed: {e}")
+                    continue
+                for row in plan:
+                    flags = _flags(row)
+                    flagged += 1 if flags else 0
+                    print(f"  {row.get('table')!s:<16} type={row.get('type')!s:<7} "
+                          f"key={row.get('key')!s:<30} rows={row.get('rows')!s:<8} "
+                          f"{row.get('Extra') or ''}"
+                          f"{'  ⚠️  ' + ', '.join(flags) if flags else ''}")
+    finally:
+        cursor.close()
+        conn.close()
+    return flagged
+
+
+if __name__ == '__main__':
+    flagged = explain_all()
+    print(f"\n{flagged} plan row(s) flagged.")
+    if "--strict" in sys.argv[1:] and flagged:
+        sys.exit(1)
@@ -0,0 +1,42 @@
+"""
+Composite indexes for the repository hot paths.
+Each index is shaped after the WHERE + ORDER BY of the queries listed next to it,
+so MySQL can seek and read rows already in order instead of scanning and sorting.
+"""
+from migrations.schema_helpers import create_index, first_existing_table
+
+VERSION = 2
+NAME = "hot_path_indexes"
+
+INDEXES = [
+    # TaskRepository.get_user_recent_tasks / get_user_overdue_tasks:
+    #   WHERE assigned_id = ? [AND due_date < ?] ORDER BY due_date
+    ("task", "idx_task_assigned_due", ["assigned_id", "due_date"]),
+    # TaskRepository.get_backlog_tasks: WHERE sprint_id IS NULL ORDER BY due_date
+    ("task", "idx_task_sprint_due", ["sprint_id", "due_date"]),
+    # TaskRepository.get_by_sprint_id: WHERE sprint_id = ? ORDER BY priority DESC, due_date
+    ("task", "idx_task_sprint_priority_due", ["sprint_id", "priority DESC", "due_date"]),
+    # TaskRepository.get_page status/priority filters (InnoDB appends task_id, keeping keyset order)
+    ("task", "idx_task_status_priority", ["status", "priority"]),
+    # SprintRepository.get_by_project_id: WHERE project_id = ? ORDER BY start_date DESC
+    # (also the sprint side of every task JOIN sprint ... WHERE s.project_id = ?)
+    ("sprint", "idx_sprint_project_start", ["project_id", "start_date"]),
+    # (the time_tracking indexes are created with the table, in m0009)
+    # NoteRepository.get_by_entity: WHERE entity_type = ? AND entity_id = ? ORDER BY created_at DESC
+    ("note", "idx_note_entity_created", ["entity_type", "entity_id", "created_at"]),
+]
+
+
+def upgrade(cursor):
+    for table, index_name, columns in INDEXES:
+        create_index(cursor, table, index_name, columns)
+
+    # UserActivityRepository.get_by_user_id: WHERE user_id = ? ORDER BY timestamp DESC LIMIT ?
+    activity_table = first_existing_table(cursor, "useractivity", "user_activity")
+    if activity_table:
+        create_index(cursor, activity_table, "idx_activity_user_time", ["user_id", "`timestamp`"])
+
+    # UserSkillRepository.get_by_user_id: WHERE user_id = ? ORDER BY skill_level DESC
+    skill_table = first_existing_table(cursor, "userskill", "user_skills")
+    if skill_table:
+        create_index(cursor, skill_table, "idx_skill_user_level", ["user_id", "skill_level"])
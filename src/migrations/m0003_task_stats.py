@@ -0,0 +1,54 @@
+"""
+Materialised per-project / per-user task counters, kept up to date by
+TaskRepository and rebuilt with `python rebuild_stats.py`.
+"""
+
+VERSION = 3
+NAME = "task_stats"
+
+
+def upgrade(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS project_stats (
+            project_id INT PRIMARY KEY,
+            total_tasks INT NOT NULL DEFAULT 0,
+            completed_tasks INT NOT NULL DEFAULT 0,
+            unassigned_critical INT NOT NULL DEFAULT 0,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        )
+    """)
+    print(" - Table 'project_stats' OK.")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS user_stats (
+            user_id INT PRIMARY KEY,
+            total_tasks INT NOT NULL DEFAULT 0,
+            completed_tasks INT NOT NULL DEFAULT 0,
+            ai_tasks INT NOT NULL DEFAULT 0,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        )
+    """)
+    print(" - Table 'user_stats' OK.")
+
+    # Seed from the existing tasks
+    cursor.execute("""
+        INSERT IGNORE INTO project_stats (project_id, total_tasks, completed_tasks, unassigned_critical)
+        SELECT s.project_id,
+               COUNT(*),
+               SUM(CASE WHEN t.status = 'DONE' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN t.priority = 'HIGH' AND t.assigned_id IS NULL THEN 1 ELSE 0 END)
+        FROM task t
+        INNER JOIN sprint s ON t.sprint_id = s.sprint_id
+        GROUP BY s.project_id
+    """)
+    cursor.execute("""
+        INSERT IGNORE INTO user_stats (user_id, total_tasks, completed_tasks, ai_tasks)
+        SELECT assigned_id,
+               COUNT(*),
+               SUM(CASE WHEN status = 'DONE' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN title LIKE '%AI%' THEN 1 ELSE 0 END)
+        FROM task
+        WHERE assigned_id IS NOT NULL
+        GROUP BY assigned_id
+    """)
+    print(" - Stats seeded from existing tasks.")
@@ -0,0 +1,75 @@
+"""
+Local copy of GitHub activity (commits, pull requests, branches) fed by the
+webhook and a backfill job, so dashboards stop calling the GitHub API.
+Rows are keyed by repo full name ('owner/repo'), the value stored in project.github_repo.
+"""
+
+VERSION = 4
+NAME = "github_store"
+
+
+def upgrade(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS github_webhook_delivery (
+            delivery_id VARCHAR(64) PRIMARY KEY,
+            event VARCHAR(50) NOT NULL,
+            repo_full_name VARCHAR(255),
+            received_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    print(" - Table 'github_webhook_delivery' OK.")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS github_repo_sync (
+            repo_full_name VARCHAR(255) PRIMARY KEY,
+            backfilled_at DATETIME NULL,
+            last_event_at DATETIME NULL
+        )
+    """)
+    print(" - Table 'github_repo_sync' OK.")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS github_commit (
+            repo_full_name VARCHAR(255) NOT NULL,
+            sha CHAR(40) NOT NULL,
+            message TEXT,
+            author_name VARCHAR(255),
+            author_login VARCHAR(255),
+            committed_at DATETIME,
+            url VARCHAR(500),
+            branch VARCHAR(255),
+            delivery_id VARCHAR(64),
+            PRIMARY KEY (repo_full_name, sha),
+            INDEX idx_github_commit_repo_time (repo_full_name, committed_at)
+        )
+    """)
+    print(" - Table 'github_commit' OK.")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS github_pull_request (
+            repo_full_name VARCHAR(255) NOT NULL,
+            number INT NOT NULL,
+            title VARCHAR(500),
+            user_login VARCHAR(255),
+            state VARCHAR(20),
+            merged_at DATETIME NULL,
+            created_at DATETIME,
+            updated_at DATETIME,
+            url VARCHAR(500),
+            delivery_id VARCHAR(64),
+            PRIMARY KEY (repo_full_name, number),
+            INDEX idx_github_pr_repo_created (repo_full_name, created_at)
+        )
+    """)
+    print(" - Table 'github_pull_request' OK.")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS github_branch (
+            repo_full_name VARCHAR(255) NOT NULL,
+            name VARCHAR(255) NOT NULL,
+            sha CHAR(40),
+            protected BOOLEAN DEFAULT FALSE,
+            PRIMARY KEY (repo_full_name, name)
+        )
+    """)
+    print(" - Table 'github_branch' OK.")
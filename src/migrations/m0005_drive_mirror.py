@@ -0,0 +1,53 @@
+"""
+Local mirror of Google Drive file metadata, kept current through the Drive
+Changes API, so the documents page lists, sorts and searches without calling Drive.
+Parents live in their own table so folder browsing is an indexed join.
+"""
+
+VERSION = 5
+NAME = "drive_mirror"
+
+
+def upgrade(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS drive_file (
+            file_id VARCHAR(128) PRIMARY KEY,
+            name VARCHAR(512) NOT NULL,
+            mime_type VARCHAR(255),
+            file_type VARCHAR(50),
+            modified_at DATETIME(3) NULL,
+            size BIGINT NULL,
+            web_link VARCHAR(1000),
+            owners TEXT,
+            is_owner BOOLEAN DEFAULT FALSE,
+            can_edit BOOLEAN DEFAULT FALSE,
+            can_delete BOOLEAN DEFAULT FALSE,
+            can_rename BOOLEAN DEFAULT FALSE,
+            can_move BOOLEAN DEFAULT FALSE,
+            synced_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            INDEX idx_drive_file_modified (modified_at),
+            INDEX idx_drive_file_name (name(191)),
+            INDEX idx_drive_file_mime_modified (mime_type, modified_at)
+        )
+    """)
+    print(" - Table 'drive_file' OK.")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS drive_file_parent (
+            parent_id VARCHAR(128) NOT NULL,
+            file_id VARCHAR(128) NOT NULL,
+            PRIMARY KEY (parent_id, file_id),
+            INDEX idx_drive_parent_file (file_id)
+        )
+    """)
+    print(" - Table 'drive_file_parent' OK.")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS drive_sync_state (
+            sync_key VARCHAR(64) PRIMARY KEY,
+            page_token VARCHAR(255),
+            synced_at DATETIME NULL,
+            full_sync_at DATETIME NULL
+        )
+    """)
+    print(" - Table 'drive_sync_state' OK.")
@@ -0,0 +1,30 @@
+"""
+Resumable Drive uploads. Each row is one upload job: the spooled file on
+local disk, the Drive resumable session URI once opened, and how many bytes
+Drive has acknowledged, so an interrupted transfer continues where it stopped.
+"""
+
+VERSION = 6
+NAME = "drive_upload"
+
+
+def upgrade(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS drive_upload (
+            upload_id CHAR(32) PRIMARY KEY,
+            filename VARCHAR(512) NOT NULL,
+            mime_type VARCHAR(255) NOT NULL,
+            folder_id VARCHAR(128) NULL,
+            spool_path VARCHAR(1024) NOT NULL,
+            total_bytes BIGINT NOT NULL,
+            bytes_sent BIGINT NOT NULL DEFAULT 0,
+            session_uri TEXT NULL,
+            status VARCHAR(20) NOT NULL DEFAULT 'queued',
+            error TEXT NULL,
+            file_id VARCHAR(128) NULL,
+            created_at DATETIME NOT NULL,
+            updated_at DATETIME NOT NULL,
+            INDEX idx_drive_upload_status (status, updated_at)
+        )
+    """)
+    print(" - Table 'drive_upload' OK.")
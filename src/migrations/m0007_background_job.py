@@ -0,0 +1,28 @@
+"""
+Background jobs (mail, AI summaries, GitHub backfills) run by the in-process
+worker pool in core/jobs.py. Rows outlive the process, so a job that was due
+for a retry, or was cut off by a restart, is picked up again by any worker.
+"""
+
+VERSION = 7
+NAME = "background_job"
+
+
+def upgrade(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS background_job (
+            job_id CHAR(32) PRIMARY KEY,
+            job_type VARCHAR(64) NOT NULL,
+            payload MEDIUMTEXT NOT NULL,
+            status VARCHAR(20) NOT NULL DEFAULT 'queued',
+            attempts INT NOT NULL DEFAULT 0,
+            max_attempts INT NOT NULL DEFAULT 3,
+            run_after DATETIME NOT NULL,
+            result MEDIUMTEXT NULL,
+            error TEXT NULL,
+            created_at DATETIME NOT NULL,
+            updated_at DATETIME NOT NULL,
+            INDEX idx_background_job_due (status, run_after)
+        )
+    """)
+    print(" - Table 'background_job' OK.")
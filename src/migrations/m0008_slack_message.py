@@ -0,0 +1,45 @@
+"""
+Local copy of Slack channel history, fed by the Events API and a backfill
+job, so the chat page reads messages from MySQL instead of calling
+conversations_history on every open. Messages are keyed by (channel, ts);
+replies carry their parent's thread_ts.
+
+Slack ts values ('1712345678.123456') have a fixed width, so ordering them
+as strings is chronological; pages are keyset ranges on ts.
+"""
+
+VERSION = 8
+NAME = "slack_message"
+
+
+def upgrade(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS slack_message (
+            channel_id VARCHAR(32) NOT NULL,
+            ts VARCHAR(20) NOT NULL,
+            thread_ts VARCHAR(20) NULL,
+            user_id VARCHAR(32) NULL,
+            username VARCHAR(255) NULL,
+            text MEDIUMTEXT,
+            subtype VARCHAR(50) NULL,
+            reply_count INT NOT NULL DEFAULT 0,
+            latest_reply VARCHAR(20) NULL,
+            edited_ts VARCHAR(20) NULL,
+            deleted BOOLEAN NOT NULL DEFAULT FALSE,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            PRIMARY KEY (channel_id, ts),
+            INDEX idx_slack_message_thread (channel_id, thread_ts, ts)
+        )
+    """)
+    print(" - Table 'slack_message' OK.")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS slack_channel_sync (
+            channel_id VARCHAR(32) PRIMARY KEY,
+            backfill_requested_at DATETIME NULL,
+            backfill_cursor VARCHAR(255) NULL,
+            backfilled_at DATETIME NULL,
+            last_event_at DATETIME NULL
+        )
+    """)
+    print(" - Table 'slack_channel_sync' OK.")
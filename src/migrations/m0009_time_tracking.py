@@ -0,0 +1,54 @@
+"""
+The time_tracking table used by TimeTrackingRepository (no earlier migration
+created it, so m0002 could not index it), with its hot-path indexes.
+
+Also rebuilds idx_task_sprint_priority_due with priority descending where
+m0002 created it all-ascending: get_by_sprint_id orders by
+priority DESC, due_date, which a mixed-direction index reads in order.
+"""
+from migrations.schema_helpers import create_index, drop_index, index_columns
+
+VERSION = 9
+NAME = "time_tracking"
+
+INDEXES = [
+    # TimeTrackingRepository.get_by_user / get_by_date_range(user) / get_total_hours_by_user:
+    #   WHERE user_id = ? [AND date_worked BETWEEN ? AND ?] ORDER BY date_worked DESC, start_time DESC
+    ("time_tracking", "idx_time_user_date", ["user_id", "date_worked", "start_time"]),
+    # TimeTrackingRepository.get_by_project / get_total_hours_by_project
+    ("time_tracking", "idx_time_project_date", ["project_id", "date_worked", "start_time"]),
+    # TimeTrackingRepository.get_by_date_range without a user
+    ("time_tracking", "idx_time_date", ["date_worked", "start_time"]),
+]
+
+SPRINT_PRIORITY_INDEX = ("task", "idx_task_sprint_priority_due", ["sprint_id", "priority DESC", "due_date"])
+
+
+def upgrade(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS time_tracking (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            user_id INT NOT NULL,
+            project_id INT NULL,
+            task_id INT NULL,
+            date_worked DATE NOT NULL,
+            start_time TIME NULL,
+            end_time TIME NULL,
+            duration_hours DECIMAL(5, 2) NOT NULL DEFAULT 0.00,
+            description TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES userr(user_id) ON DELETE CASCADE,
+            FOREIGN KEY (project_id) REFERENCES project(project_id) ON DELETE SET NULL,
+            FOREIGN KEY (task_id) REFERENCES task(task_id) ON DELETE SET NULL
+        )
+    """)
+    print(" - Table 'time_tracking' OK.")
+
+    for table, index_name, columns in INDEXES:
+        create_index(cursor, table, index_name, columns)
+
+    table, index_name, columns = SPRINT_PRIORITY_INDEX
+    if ("priority", "A") in index_columns(cursor, table, index_name):
+        drop_index(cursor, table, index_name)
+        print(f" - Rebuilding {index_name} with priority descending.")
+    create_index(cursor, table, index_name, columns)
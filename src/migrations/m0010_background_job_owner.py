@@ -0,0 +1,17 @@
+"""
+background_job.owner: the JobQueue (process) that holds a job's secrets.
+Jobs with an owner are only claimed by that process until they are overdue,
+so a retry never lands on a worker without the token it needs.
+"""
+from migrations.schema_helpers import column_exists
+
+VERSION = 10
+NAME = "background_job_owner"
+
+
+def upgrade(cursor):
+    if column_exists(cursor, "background_job", "owner"):
+        print(" - Column 'background_job.owner' already exists.")
+        return
+    cursor.execute("ALTER TABLE background_job ADD COLUMN owner VARCHAR(100) NULL AFTER max_attempts")
+    print(" - Column 'background_job.owner' OK.")
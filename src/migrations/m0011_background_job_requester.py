@@ -0,0 +1,17 @@
+"""
+background_job.requester: the browser session that queued a job (see
+core.jobs.current_requester). /api/v1/jobs/<job_id> only returns a job's
+result to that session.
+"""
+from migrations.schema_helpers import column_exists
+
+VERSION = 11
+NAME = "background_job_requester"
+
+
+def upgrade(cursor):
+    if column_exists(cursor, "background_job", "requester"):
+        print(" - Column 'background_job.requester' already exists.")
+        return
+    cursor.execute("ALTER TABLE background_job ADD COLUMN requester VARCHAR(32) NULL AFTER owner")
+    print(" - Column 'background_job.requester' OK.")
@@ -0,0 +1,118 @@
+"""
+Versioned schema migrations.
+
+Each migration is a module in this package exposing VERSION, NAME and
+upgrade(cursor). Applied versions are recorded in `schema_migrations`, so
+running the runner again only applies what is new.
+
+Usage (from src/):
+    python -m migrations.runner          # apply pending migrations
+    python -m migrations.runner --list   # show applied / pending
+"""
+import sys
+from migrations import (
+    m0001_base_schema, m0002_hot_path_indexes, m0003_task_stats, m0004_github_store,
+    m0005_drive_mirror, m0006_drive_upload, m0007_background_job, m0008_slack_message,
+    m0009_time_tracking, m0010_background_job_owner, m0011_background_job_requester
+)
+
+# Ordered list of every migration; append new modules here
+MIGRATIONS = [
+    m0001_base_schema,
+    m0002_hot_path_indexes,
+    m0003_task_stats,
+    m0004_github_store,
+    m0005_drive_mirror,
+    m0006_drive_upload,
+    m0007_background_job,
+    m0008_slack_message,
+    m0009_time_tracking,
+    m0010_background_job_owner,
+    m0011_background_job_requester,
+]
+
+
+def _ensure_migrations_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def applied_versions(cursor):
+    _ensure_migrations_table(cursor)
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def pending_migrations(applied, migrations=None):
+    """Migrations not yet applied, in version order. Rejects duplicate versions."""
+    migrations = MIGRATIONS if migrations is None else migrations
+    versions = [m.VERSION for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError(f"Duplicate migration versions: {sorted(versions)}")
+    return sorted((m for m in migrations if m.VERSION not in applied), key=lambda m: m.VERSION)
+
+
+def migrate(conn=None):
+    """Apply every pending migration. Returns the list of versions applied."""
+    owns_conn = conn is None
+    if owns_conn:
+        from core.db_pool import get_pool
+        conn = get_pool().get_connection()
+    cursor = conn.cursor()
+    applied_now = []
+    try:
+        pending = pending_migrations(applied_versions(cursor))
+        if not pending:
+            print("✅ Schema is up to date.")
+            return applied_now
+
+        for migration in pending:
+            print(f"🔨 Applying migration {migration.VERSION:04d} ({migration.NAME})...")
+            # MySQL DDL auto-commits, so each migration is recorded as soon as it finishes
+            migration.upgrade(cursor)
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                (migration.VERSION, migration.NAME)
+            )
+            conn.commit()
+            applied_now.append(migration.VERSION)
+
+        print(f"✅ Applied {len(applied_now)} migration(s).")
+        return applied_now
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        if owns_conn:
+            conn.close()
+
+
+def list_migrations():
+    from core.db_pool import get_pool
+    conn = get_pool().get_connection()
+    cursor = conn.cursor()
+    try:
+        applied = applied_versions(cursor)
+        for migration in MIGRATIONS:
+            state = "applied" if migration.VERSION in applied else "pending"
+            print(f"{migration.VERSION:04d}  {migration.NAME:<30} {state}")
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == '__main__':
+    if "--list" in sys.argv[1:]:
+        list_migrations()
+    else:
+        try:
+            migrate()
+        except Exception:
+            sys.exit(1)
@@ -0,0 +1,66 @@
+"""
+Idempotent DDL helpers for migrations (MySQL has no CREATE INDEX IF NOT EXISTS).
+"""
+
+
+def table_exists(cursor, table):
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.tables
+        WHERE table_schema = DATABASE() AND table_name = %s
+    """, (table,))
+    return cursor.fetchone()[0] > 0
+
+
+def first_existing_table(cursor, *tables):
+    """Some tables exist under two spellings (e.g. useractivity / user_activity)."""
+    for table in tables:
+        if table_exists(cursor, table):
+            return table
+    return None
+
+
+def column_exists(cursor, table, column):
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+    """, (table, column))
+    return cursor.fetchone()[0] > 0
+
+
+def index_exists(cursor, table, index_name):
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+    """, (table, index_name))
+    return cursor.fetchone()[0] > 0
+
+
+def create_index(cursor, table, index_name, columns):
+    """
+    Create `index_name` on `table(columns)` unless it already exists.
+    A missing table is an error, so the migration is not recorded as applied
+    without its index; check optional tables with first_existing_table first.
+    """
+    if not table_exists(cursor, table):
+        raise RuntimeError(f"Cannot create {index_name}: table '{table}' does not exist")
+    if index_exists(cursor, table, index_name):
+        print(f" - Index {index_name} already exists.")
+        return False
+    cursor.execute(f"CREATE INDEX {index_name} ON {table} ({', '.join(columns)})")
+    print(f" - Index {index_name} on {table}({', '.join(columns)}) OK.")
+    return True
+
+
+def drop_index(cursor, table, index_name):
+    if table_exists(cursor, table) and index_exists(cursor, table, index_name):
+        cursor.execute(f"DROP INDEX {index_name} ON {table}")
+
+
+def index_columns(cursor, table, index_name):
+    """[(column, 'A' | 'D'), ...] of an index in key order ('D' = descending, MySQL 8+)."""
+    cursor.execute("""
+        SELECT column_name, collation FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+        ORDER BY seq_in_index
+    """, (table, index_name))
+    return [(row[0], row[1]) for row in cursor.fetchall()]
@@ -0,0 +1,27 @@
+"""
+Rebuilds the project_stats / user_stats summaries from the task table.
+Run it if the counters ever drift (e.g. after manual SQL edits to `task`).
+
+Usage (from src/):
+    python rebuild_stats.py
+"""
+import sys
+from repositories.stats_repository import StatsRepository
+from repositories.project_repository import dashboard_cache
+
+
+def rebuild_stats():
+    print("🔨 Rebuilding task stats...")
+    try:
+        counts = StatsRepository().rebuild()
+        dashboard_cache.clear()
+        print(f"✅ Rebuilt stats for {counts['projects']} project(s) and {counts['users']} user(s).")
+        return True
+    except Exception as e:
+        print(f"❌ Error rebuilding stats: {e}")
+        return False
+
+
+if __name__ == '__main__':
+    if not rebuild_stats():
+        sys.exit(1)
@@ -0,0 +1,264 @@
+import json
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from core.db_singleton import DatabaseConnection
+
+SYNC_KEY = "drive"
+# MySQL named lock held while a sync runs, shared by every process on the database
+SYNC_LOCK = f"aipms.drive_sync.{SYNC_KEY}"
+
+# sort_by -> (sort key expression, direction). file_id breaks ties so keyset pages never overlap.
+SORT_KEYS = {
+    'recent': ("COALESCE(f.modified_at, TIMESTAMP('1970-01-01'))", "DESC"),
+    'name': ("f.name", "ASC"),
+    'size': ("COALESCE(f.size, -1)", "DESC")
+}
+
+
+def parse_drive_time(value):
+    """Drive RFC 3339 timestamp ('2024-05-01T10:00:00.123Z') -> naive UTC datetime."""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def format_drive_time(value):
+    """Inverse of parse_drive_time, so mirrored rows look like Drive API output."""
+    if value is None:
+        return None
+    return value.strftime('%Y-%m-%dT%H:%M:%S.') + f"{value.microsecond // 1000:03d}Z"
+
+
+class DriveFileRepository:
+    """
+    Local mirror of Drive file metadata (one shared Drive account, as in token.json).
+    Rows use the same dict shape as DriveClient.normalize_file(), so callers
+    cannot tell a mirrored listing from a live one.
+    """
+
+    def __init__(self):
+        self.db_manager = DatabaseConnection()
+
+    # --------------------------------------------------
+    # WRITES
+    # --------------------------------------------------
+    def replace_all(self, files):
+        """Full resync: swap the whole mirror in one transaction."""
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("DELETE FROM drive_file_parent")
+            cursor.execute("DELETE FROM drive_file")
+            self._insert(cursor, files)
+            conn.commit()
+            return len(files)
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+
+    def apply_changes(self, changed_files, removed_ids):
+        """Upsert changed files and drop removed / trashed ones, atomically."""
+        if not changed_files and not removed_ids:
+            return 0
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        try:
+            stale_ids = list(removed_ids) + [f['id'] for f in changed_files]
+            self._delete(cursor, stale_ids)
+            self._insert(cursor, changed_files)
+            conn.commit()
+            return len(changed_files) + len(removed_ids)
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+
+    @staticmethod
+    def _delete(cursor, file_ids):
+        for start in range(0, len(file_ids), 500):
+            chunk = file_ids[start:start + 500]
+            placeholders = ", ".join(["%s"] * len(chunk))
+            cursor.execute(f"DELETE FROM drive_file_parent WHERE file_id IN ({placeholders})", tuple(chunk))
+            cursor.execute(f"DELETE FROM drive_file WHERE file_id IN ({placeholders})", tuple(chunk))
+
+    @staticmethod
+    def _insert(cursor, files):
+        if not files:
+            return
+        cursor.executemany("""
+            INSERT INTO drive_file
+            (file_id, name, mime_type, file_type, modified_at, size, web_link, owners,
+             is_owner, can_edit, can_delete, can_rename, can_move)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """, [(
+            f['id'], f['name'], f.get('mime_type'), f.get('type'), parse_drive_time(f.get('modified_at')),
+            int(f['size']) if f.get('size') else None, f.get('web_link'), json.dumps(f.get('owners') or []),
+            bool(f.get('is_owner')), bool(f.get('can_edit')), bool(f.get('can_delete')),
+            bool(f.get('can_rename')), bool(f.get('can_move'))
+        ) for f in files])
+        parents = [(parent, f['id']) for f in files for parent in (f.get('parents') or [])]
+        if parents:
+            cursor.executemany("INSERT IGNORE INTO drive_file_parent (parent_id, file_id) VALUES (%s, %s)",
+                               parents)
+
+    # --------------------------------------------------
+    # SYNC STATE
+    # --------------------------------------------------
+    def get_sync_state(self):
+        """{'page_token', 'synced_at', 'full_sync_at'} or None before the first full sync."""
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute("""
+                SELECT page_token, synced_at, full_sync_at FROM drive_sync_state WHERE sync_key = %s
+            """, (SYNC_KEY,))
+            return cursor.fetchone()
+        finally:
+            cursor.close()
+            conn.close()
+
+    def save_sync_state(self, page_token, full=False):
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                INSERT INTO drive_sync_state (sync_key, page_token, synced_at, full_sync_at)
+                VALUES (%s, %s, UTC_TIMESTAMP(), IF(%s, UTC_TIMESTAMP(), NULL))
+                ON DUPLICATE KEY UPDATE
+                    page_token = VALUES(page_token),
+                    synced_at = VALUES(synced_at),
+                    full_sync_at = IF(%s, VALUES(full_sync_at), full_sync_at)
+            """, (SYNC_KEY, page_token, full, full))
+            conn.commit()
+        finally:
+            cursor.close()
+            conn.close()
+
+    @contextmanager
+    def sync_lock(self, timeout=0):
+        """
+        Hold the cross-process sync lock (GET_LOCK) for the with-block.
+        Yields False if another process holds it for more than `timeout` seconds.
+        """
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT GET_LOCK(%s, %s)", (SYNC_LOCK, timeout))
+            acquired = cursor.fetchone()[0] == 1
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    cursor.execute("SELECT RELEASE_LOCK(%s)", (SYNC_LOCK,))
+                    cursor.fetchone()
+        finally:
+            cursor.close()
+            conn.close()
+
+    def mark_stale(self):
+        """Force the next read (in any worker) to pull changes first, e.g. after a write."""
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("UPDATE drive_sync_state SET synced_at = NULL WHERE sync_key = %s", (SYNC_KEY,))
+            conn.commit()
+        finally:
+            cursor.close()
+            conn.close()
+
+    # --------------------------------------------------
+    # READS
+    # --------------------------------------------------
+    def list_files(self, limit=50, sort_by='recent', mime_type=None, folder_id=None, after=None):
+        """
+        Keyset page of the mirror.
+        `after` is the next_after of the previous page ([sort value, file_id]).
+        Returns (files, next_after) where next_after is None on the final page.
+        """
+        sort_expr, direction = SORT_KEYS.get(sort_by, SORT_KEYS['recent'])
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            query = f"SELECT f.*, {sort_expr} AS sort_key FROM drive_file f"
+            conditions, params = [], []
+            if folder_id:
+                query += " JOIN drive_file_parent p ON p.file_id = f.file_id AND p.parent_id = %s"
+                params.append(folder_id)
+            if mime_type:
+                conditions.append("f.mime_type = %s"); params.append(mime_type)
+            if after:
+                op = "<" if direction == "DESC" else ">"
+                conditions.append(f"({sort_expr} {op} %s OR ({sort_expr} = %s AND f.file_id {op} %s))")
+                params.extend([after[0], after[0], after[1]])
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
+            # One extra row tells us whether another page exists
+            query += f" ORDER BY {sort_expr} {direction}, f.file_id {direction} LIMIT %s"
+            params.append(limit + 1)
+
+            cursor.execute(query, tuple(params))
+            rows = cursor.fetchall()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+            next_after = None
+            if has_more:
+                last = rows[-1]['sort_key']
+                next_after = [str(last) if hasattr(last, 'isoformat') else last, rows[-1]['file_id']]
+            return self._with_parents(cursor, rows), next_after
+        finally:
+            cursor.close()
+            conn.close()
+
+    def search(self, text, limit=20):
+        """Case-insensitive name search, newest first."""
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            cursor.execute("""
+                SELECT f.* FROM drive_file f
+                WHERE f.name LIKE %s
+                ORDER BY f.modified_at DESC
+                LIMIT %s
+            """, (f"%{escaped}%", limit))
+            return self._with_parents(cursor, cursor.fetchall())
+        finally:
+            cursor.close()
+            conn.close()
+
+    @staticmethod
+    def _with_parents(cursor, rows):
+        if not rows:
+            return []
+        ids = [row['file_id'] for row in rows]
+        placeholders = ", ".join(["%s"] * len(ids))
+        cursor.execute(f"SELECT file_id, parent_id FROM drive_file_parent WHERE file_id IN ({placeholders})",
+                       tuple(ids))
+        parents = {}
+        for link in cursor.fetchall():
+            parents.setdefault(link['file_id'], []).append(link['parent_id'])
+
+        return [{
+            'id': row['file_id'],
+            'name': row['name'],
+            'mime_type': row['mime_type'],
+            'modified_at': format_drive_time(row['modified_at']),
+            'size': str(row['size']) if row['size'] is not None else None,
+            'type': row['file_type'],
+            'parents': parents.get(row['file_id'], []),
+            'web_link': row['web_link'],
+            'owners': json.loads(row['owners'] or '[]'),
+            'is_owner': bool(row['is_owner']),
+            'can_edit': bool(row['can_edit']),
+            'can_delete': bool(row['can_delete']),
+            'can_rename': bool(row['can_rename']),
+            'can_move': bool(row['can_move'])
+        } for row in rows]
@@ -0,0 +1,101 @@
+from core.db_singleton import DatabaseConnection
+
+# Statuses a worker may (re)start from; 'uploading' only once its heartbeat is stale
+RESTARTABLE_STATUSES = ('queued', 'failed')
+
+
+class DriveUploadRepository:
+    """
+    Upload jobs for resumable Drive uploads.
+    Every progress write also bumps updated_at, which doubles as the worker's
+    heartbeat: an 'uploading' row that stops moving belongs to a dead worker.
+    """
+
+    def __init__(self):
+        self.db_manager = DatabaseConnection()
+
+    def create(self, upload_id, filename, mime_type, folder_id, spool_path, total_bytes):
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                INSERT INTO drive_upload
+                (upload_id, filename, mime_type, folder_id, spool_path, total_bytes, status,
+                 created_at, updated_at)
+                VALUES (%s, %s, %s, %s, %s, %s, 'queued', UTC_TIMESTAMP(), UTC_TIMESTAMP())
+            """, (upload_id, filename, mime_type, folder_id, spool_path, total_bytes))
+            conn.commit()
+        finally:
+            cursor.close()
+            conn.close()
+
+    def get(self, upload_id):
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute("SELECT * FROM drive_upload WHERE upload_id = %s", (upload_id,))
+            return cursor.fetchone()
+        finally:
+            cursor.close()
+            conn.close()
+
+    def claim(self, upload_id, stale_after_seconds):
+        """
+        Atomically move an upload to 'uploading' for this worker.
+        Returns False if another worker is actively running it or it already finished.
+        """
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                UPDATE drive_upload
+                SET status = 'uploading', error = NULL, updated_at = UTC_TIMESTAMP()
+                WHERE upload_id = %s
+                  AND (status IN (%s, %s)
+                       OR (status = 'uploading' AND updated_at < UTC_TIMESTAMP() - INTERVAL %s SECOND))
+            """, (upload_id, *RESTARTABLE_STATUSES, stale_after_seconds))
+            conn.commit()
+            return cursor.rowcount == 1
+        finally:
+            cursor.close()
+            conn.close()
+
+    def save_session(self, upload_id, session_uri):
+        self._update(upload_id, "session_uri = %s, bytes_sent = 0", (session_uri,))
+
+    def update_progress(self, upload_id, bytes_sent):
+        self._update(upload_id, "bytes_sent = %s", (bytes_sent,))
+
+    def mark_completed(self, upload_id, file_id):
+        self._update(upload_id, "status = 'completed', bytes_sent = total_bytes, file_id = %s, session_uri = NULL",
+                     (file_id,))
+
+    def mark_failed(self, upload_id, error):
+        self._update(upload_id, "status = 'failed', error = %s", (error,))
+
+    def list_interrupted(self, stale_after_seconds):
+        """Failed uploads and 'uploading' ones whose worker stopped reporting progress."""
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute("""
+                SELECT * FROM drive_upload
+                WHERE status = 'failed'
+                   OR (status IN ('queued', 'uploading') AND updated_at < UTC_TIMESTAMP() - INTERVAL %s SECOND)
+                ORDER BY created_at
+            """, (stale_after_seconds,))
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+            conn.close()
+
+    def _update(self, upload_id, assignments, params):
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f"UPDATE drive_upload SET {assignments}, updated_at = UTC_TIMESTAMP() "
+                           f"WHERE upload_id = %s", (*params, upload_id))
+            conn.commit()
+        finally:
+            cursor.close()
+            conn.close()
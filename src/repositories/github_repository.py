@@ -0,0 +1,235 @@
+from datetime import datetime, timezone
+from core.db_singleton import DatabaseConnection
+
+
+def parse_github_time(value):
+    """GitHub ISO-8601 timestamp ('...Z' or with an offset) -> naive UTC datetime for DATETIME columns."""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+class GitHubRepository:
+    """
+    Local store of GitHub activity per repository ('owner/repo', as in project.github_repo).
+    Writes are idempotent upserts, so replayed webhooks and re-run backfills are harmless.
+    """
+
+    def __init__(self):
+        self.db_manager = DatabaseConnection()
+
+    # --------------------------------------------------
+    # WEBHOOK DELIVERIES
+    # --------------------------------------------------
+    def record_delivery(self, delivery_id, event, repo_full_name):
+        """
+        Remember a webhook delivery. Returns False if it was already processed
+        (GitHub retries / manual redeliveries), True for a new one.
+        """
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                INSERT IGNORE INTO github_webhook_delivery (delivery_id, event, repo_full_name)
+                VALUES (%s, %s, %s)
+            """, (delivery_id, event, repo_full_name))
+            is_new = cursor.rowcount == 1
+            if is_new and repo_full_name:
+                cursor.execute("""
+                    INSERT INTO github_repo_sync (repo_full_name, last_event_at)
+                    VALUES (%s, UTC_TIMESTAMP())
+                    ON DUPLICATE KEY UPDATE last_event_at = VALUES(last_event_at)
+                """, (repo_full_name,))
+            conn.commit()
+            return is_new
+        finally:
+            cursor.close()
+            conn.close()
+
+    # --------------------------------------------------
+    # UPSERTS
+    # --------------------------------------------------
+    def upsert_commits(self, repo_full_name, commits, branch=None, delivery_id=None):
+        """commits: dicts with sha, message, author_name, author_login, committed_at, url."""
+        if not commits:
+            return 0
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.executemany("""
+                INSERT INTO github_commit
+                (repo_full_name, sha, message, author_name, author_login, committed_at, url, branch, delivery_id)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    message = VALUES(message),
+                    branch = COALESCE(branch, VALUES(branch))
+            """, [(
+                repo_full_name, c['sha'], c.get('message'), c.get('author_name'), c.get('author_login'),
+                c.get('committed_at'), c.get('url'), branch, delivery_id
+            ) for c in commits])
+            conn.commit()
+            return len(commits)
+        finally:
+            cursor.close()
+            conn.close()
+
+    def upsert_pull_requests(self, repo_full_name, pull_requests, delivery_id=None):
+        """pull_requests: dicts with number, title, user_login, state, merged_at, created_at, updated_at, url."""
+        if not pull_requests:
+            return 0
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        try:
+            # Deliveries can arrive out of order: only move forward in updated_at
+            cursor.executemany("""
+                INSERT INTO github_pull_request
+                (repo_full_name, number, title, user_login, state, merged_at, created_at, updated_at, url, delivery_id)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    title = IF(VALUES(updated_at) >= updated_at, VALUES(title), title),
+                    state = IF(VALUES(updated_at) >= updated_at, VALUES(state), state),
+                    merged_at = IF(VALUES(updated_at) >= updated_at, VALUES(merged_at), merged_at),
+                    delivery_id = IF(VALUES(updated_at) >= updated_at, VALUES(delivery_id), delivery_id),
+                    updated_at = GREATEST(updated_at, VALUES(updated_at))
+            """, [(
+                repo_full_name, pr['number'], pr.get('title'), pr.get('user_login'), pr.get('state'),
+                pr.get('merged_at'), pr.get('created_at'), pr.get('updated_at'), pr.get('url'), delivery_id
+            ) for pr in pull_requests])
+            conn.commit()
+            return len(pull_requests)
+        finally:
+            cursor.close()
+            conn.close()
+
+    def upsert_branch(self, repo_full_name, name, sha, protected=None):
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                INSERT INTO github_branch (repo_full_name, name, sha, protected)
+                VALUES (%s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    sha = VALUES(sha),
+                    protected = COALESCE(%s, protected)
+            """, (repo_full_name, name, sha, bool(protected), protected))
+            conn.commit()
+        finally:
+            cursor.close()
+            conn.close()
+
+    def delete_branch(self, repo_full_name, name):
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("DELETE FROM github_branch WHERE repo_full_name = %s AND name = %s",
+                           (repo_full_name, name))
+            conn.commit()
+        finally:
+            cursor.close()
+            conn.close()
+
+    def mark_backfilled(self, repo_full_name):
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                INSERT INTO github_repo_sync (repo_full_name, backfilled_at)
+                VALUES (%s, UTC_TIMESTAMP())
+                ON DUPLICATE KEY UPDATE backfilled_at = VALUES(backfilled_at)
+            """, (repo_full_name,))
+            conn.commit()
+        finally:
+            cursor.close()
+            conn.close()
+
+    # --------------------------------------------------
+    # READS (already shaped like the GitHubService output)
+    # --------------------------------------------------
+    def get_fresh_repos(self, repo_full_names, max_age_seconds):
+        """
+        Subset of repos whose history is in the local store and known to be current:
+        backfilled, and backfilled or updated by a webhook within max_age_seconds.
+        """
+        if not repo_full_names:
+            return set()
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        try:
+            placeholders = ", ".join(["%s"] * len(repo_full_names))
+            cursor.execute(f"""
+                SELECT repo_full_name FROM github_repo_sync
+                WHERE backfilled_at IS NOT NULL
+                  AND GREATEST(backfilled_at, COALESCE(last_event_at, backfilled_at))
+                      >= UTC_TIMESTAMP() - INTERVAL %s SECOND
+                  AND repo_full_name IN ({placeholders})
+            """, (max_age_seconds, *repo_full_names))
+            return {row[0] for row in cursor.fetchall()}
+        finally:
+            cursor.close()
+            conn.close()
+
+    def get_commits(self, repo_full_name, limit=10):
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute("""
+                SELECT sha, message, author_name, committed_at, url
+                FROM github_commit
+                WHERE repo_full_name = %s
+                ORDER BY committed_at DESC
+                LIMIT %s
+            """, (repo_full_name, limit))
+            return [{
+                'message': row['message'],
+                'author': row['author_name'],
+                'date': row['committed_at'].strftime('%Y-%m-%d') if row['committed_at'] else '',
+                'url': row['url'],
+                'sha': row['sha'][:7]
+            } for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+            conn.close()
+
+    def get_pull_requests(self, repo_full_name, limit=10):
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute("""
+                SELECT number, title, user_login, state, merged_at, created_at, url
+                FROM github_pull_request
+                WHERE repo_full_name = %s
+                ORDER BY created_at DESC
+                LIMIT %s
+            """, (repo_full_name, limit))
+            return [{
+                'title': row['title'],
+                'user': row['user_login'],
+                'state': row['state'],
+                'status': 'merged' if row['merged_at'] else row['state'],
+                'url': row['url'],
+                'created_at': row['created_at'].strftime('%Y-%m-%d') if row['created_at'] else ''
+            } for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+            conn.close()
+
+    def get_branches(self, repo_full_name):
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute("""
+                SELECT name, sha, protected FROM github_branch
+                WHERE repo_full_name = %s
+                ORDER BY name
+            """, (repo_full_name,))
+            return [{
+                'name': row['name'],
+                'protected': bool(row['protected']),
+                'sha': (row['sha'] or '')[:7]
+            } for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+            conn.close()
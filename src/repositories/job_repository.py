@@ -0,0 +1,104 @@
+from core.db_singleton import DatabaseConnection
+
+
+class JobRepository:
+    """
+    Persisted background jobs (see core/jobs.py).
+    Payloads and results are stored as JSON text; run_after holds back
+    retries, and updated_at of a 'running' row is when its worker claimed it.
+    A job with an owner (a JobQueue.owner) carries secrets only that process
+    holds, so other processes leave it alone until it is stale_after overdue.
+    """
+
+    def __init__(self):
+        self.db_manager = DatabaseConnection()
+
+    def create(self, job_id, job_type, payload, max_attempts, owner=None, requester=None):
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                INSERT INTO background_job
+                (job_id, job_type, payload, status, max_attempts, owner, requester,
+                 run_after, created_at, updated_at)
+                VALUES (%s, %s, %s, 'queued', %s, %s, %s, UTC_TIMESTAMP(), UTC_TIMESTAMP(), UTC_TIMESTAMP())
+            """, (job_id, job_type, payload, max_attempts, owner, requester))
+            conn.commit()
+        finally:
+            cursor.close()
+            conn.close()
+
+    def get(self, job_id):
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute("SELECT * FROM background_job WHERE job_id = %s", (job_id,))
+            return cursor.fetchone()
+        finally:
+            cursor.close()
+            conn.close()
+
+    # Claimable by `owner`: due jobs that are unowned or its own, jobs whose owner
+    # has not picked them up for stale_after seconds (it is gone), and jobs abandoned mid-run
+    _CLAIMABLE = """
+        ((status = 'queued' AND run_after <= UTC_TIMESTAMP()
+          AND (owner IS NULL OR owner = %s OR run_after < UTC_TIMESTAMP() - INTERVAL %s SECOND))
+         OR (status = 'running' AND updated_at < UTC_TIMESTAMP() - INTERVAL %s SECOND))
+    """
+
+    def claim(self, job_id, stale_after_seconds, owner=None):
+        """
+        Atomically take a due job (or one whose worker died) and count the attempt.
+        Returns False if it is not due, another worker has it, or another live
+        process owns it.
+        """
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f"""
+                UPDATE background_job
+                SET status = 'running', attempts = attempts + 1, updated_at = UTC_TIMESTAMP()
+                WHERE job_id = %s AND {self._CLAIMABLE}
+            """, (job_id, owner, stale_after_seconds, stale_after_seconds))
+            conn.commit()
+            return cursor.rowcount == 1
+        finally:
+            cursor.close()
+            conn.close()
+
+    def list_due(self, limit, stale_after_seconds, owner=None):
+        """Ids of jobs `owner` may claim now (see claim)."""
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute(f"""
+                SELECT job_id FROM background_job
+                WHERE {self._CLAIMABLE}
+                ORDER BY run_after
+                LIMIT %s
+            """, (owner, stale_after_seconds, stale_after_seconds, limit))
+            return [row['job_id'] for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+            conn.close()
+
+    def mark_succeeded(self, job_id, result):
+        self._update(job_id, "status = 'succeeded', result = %s, error = NULL", (result,))
+
+    def schedule_retry(self, job_id, delay_seconds, error):
+        self._update(job_id, "status = 'queued', error = %s, run_after = UTC_TIMESTAMP() + INTERVAL %s SECOND",
+                     (error, delay_seconds))
+
+    def mark_failed(self, job_id, error):
+        self._update(job_id, "status = 'failed', error = %s", (error,))
+
+    def _update(self, job_id, assignments, params):
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f"UPDATE background_job SET {assignments}, updated_at = UTC_TIMESTAMP() "
+                           f"WHERE job_id = %s", (*params, job_id))
+            conn.commit()
+        finally:
+            cursor.close()
+            conn.close()
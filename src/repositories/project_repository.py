@@ -1,7 +1,29 @@
+import os
+import json
 from models.project import Project
 from core.db_singleton import DatabaseConnection
+from core.ttl_cache import TTLCache
+from core import unit_of_work
 from datetime import date
 
+# Per-project dashboard snapshots; short TTL as a safety net, explicit invalidation on writes
+DASHBOARD_ACTIVITY_LIMIT = 10
+dashboard_cache = TTLCache(ttl_seconds=float(os.getenv('DASHBOARD_CACHE_TTL', 30)), max_entries=512)
+
+
+def invalidate_project_dashboard(*project_ids):
+    """Drop cached dashboards once the current transaction (if any) has committed."""
+    ids = {pid for pid in project_ids if pid}
+    if not ids:
+        return
+
+    def _invalidate():
+        for pid in ids:
+            dashboard_cache.invalidate(pid)
+
+    unit_of_work.after_commit(_invalidate)
+
+
 class ProjectRepository:
     def __init__(self):
         self.db_manager = DatabaseConnection()
@@ -89,45 +111,147 @@ class ProjectRepository:
         conn = self.db_manager.get_connection()
         cursor = conn.cursor(dictionary=True)
         try:
-            # Count total and completed tasks (join with Sprint to filter by project)
+            # O(1): counters are maintained by TaskRepository in project_stats
             cursor.execute("""
                 SELECT
-                    COUNT(*) as total_tasks,
-                    SUM(CASE WHEN t.status = 'DONE' THEN 1 ELSE 0 END) as completed_tasks,
-                    SUM(CASE WHEN t.status != 'DONE' THEN 1 ELSE 0 END) as remaining_tasks,
-                    SUM(CASE WHEN t.priority = 'HIGH' AND t.assigned_id IS NULL THEN 1 ELSE 0 END) as unassigned_critical
-                FROM Task t
-                INNER JOIN Sprint s ON t.sprint_id = s.sprint_id
-                WHERE s.project_id = %s
+                    p.budget,
+                    COALESCE(ps.total_tasks, 0) as total_tasks,
+                    COALESCE(ps.completed_tasks, 0) as completed_tasks,
+                    COALESCE(ps.total_tasks - ps.completed_tasks, 0) as remaining_tasks,
+                    COALESCE(ps.unassigned_critical, 0) as unassigned_critical
+                FROM project p
+                LEFT JOIN project_stats ps ON ps.project_id = p.project_id
+                WHERE p.project_id = %s
             """, (project_id,))
-            task_stats = cursor.fetchone()
-
-            # Calculate velocity
-            total = task_stats['total_tasks'] or 1
-            completed = task_stats['completed_tasks'] or 0
-            velocity = round((completed / total) * 100, 1)
-
-            # Get project budget
-            cursor.execute("SELECT budget FROM Project WHERE project_id = %s", (project_id,))
-            project = cursor.fetchone()
-            budget = project['budget'] if project else 0
-
-            # Calculate simple AI risk index (based on unassigned critical tasks and velocity)
-            unassigned = task_stats['unassigned_critical'] or 0
-            risk_index = min(100, (unassigned * 15) + max(0, (100 - velocity)))
-
-            return {
-                "velocity": f"{velocity}%",
-                "aiRiskIndex": int(risk_index),
-                "tasksRemaining": task_stats['remaining_tasks'] or 0,
-                "budgetForecast": f"${budget:,.0f}" if budget else "$0",
-                "unassignedCritical": unassigned,
-                "totalTasks": total
+            task_stats = cursor.fetchone() or {
+                "budget": 0, "total_tasks": 0, "completed_tasks": 0,
+                "remaining_tasks": 0, "unassigned_critical": 0
             }
+            budget = task_stats['budget']
+
+            return self._build_stats(task_stats, budget)
         finally:
             cursor.close()
             conn.close()
 
+    @staticmethod
+    def _build_stats(task_stats, budget):
+        # Calculate velocity
+        total = task_stats['total_tasks'] or 1
+        completed = task_stats['completed_tasks'] or 0
+        velocity = round((completed / total) * 100, 1)
+
+        # Calculate simple AI risk index (based on unassigned critical tasks and velocity)
+        unassigned = task_stats['unassigned_critical'] or 0
+        risk_index = min(100, (unassigned * 15) + max(0, (100 - velocity)))
+
+        return {
+            "velocity": f"{velocity}%",
+            "aiRiskIndex": int(risk_index),
+            "tasksRemaining": task_stats['remaining_tasks'] or 0,
+            "budgetForecast": f"${budget:,.0f}" if budget else "$0",
+            "unassignedCritical": unassigned,
+            "totalTasks": total
+        }
+
+    def get_dashboard_snapshot(self, project_id):
+        """
+        Everything the project dashboard needs (project, stats, critical tasks,
+        recent activity, active-sprint burndown counts), cached per project.
+        Returns None if the project does not exist.
+        """
+        return dashboard_cache.get_or_load(project_id, lambda: self._load_dashboard_snapshot(project_id))
+
+    def _load_dashboard_snapshot(self, project_id):
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            # One round-trip: counters come from project_stats, critical tasks and
+            # activities come back as JSON arrays built from the project's tasks
+            cursor.execute("""
+                WITH project_tasks AS (
+                    SELECT t.task_id, t.title, t.status, t.priority, t.assigned_id
+                    FROM task t
+                    INNER JOIN sprint s ON t.sprint_id = s.sprint_id
+                    WHERE s.project_id = %s
+                ),
+                latest_sprint AS (
+                    SELECT sprint_id, name, start_date, end_date
+                    FROM sprint
+                    WHERE project_id = %s
+                    ORDER BY start_date DESC
+                    LIMIT 1
+                )
+                SELECT
+                    p.project_id, p.name, p.description, p.start_date, p.end_date,
+                    p.budget, p.github_repo,
+                    COALESCE(ps.total_tasks, 0) AS total_tasks,
+                    COALESCE(ps.completed_tasks, 0) AS completed_tasks,
+                    COALESCE(ps.total_tasks - ps.completed_tasks, 0) AS remaining_tasks,
+                    COALESCE(ps.unassigned_critical, 0) AS unassigned_critical,
+                    (SELECT COUNT(*) FROM task WHERE sprint_id = ls.sprint_id) AS sprint_total_tasks,
+                    (SELECT COUNT(*) FROM task WHERE sprint_id = ls.sprint_id AND status = 'DONE') AS sprint_completed_tasks,
+                    ls.sprint_id AS sprint_id, ls.name AS sprint_name,
+                    ls.start_date AS sprint_start_date, ls.end_date AS sprint_end_date,
+                    (SELECT JSON_ARRAYAGG(JSON_OBJECT('id', c.task_id, 'title', c.title, 'priority', c.priority))
+                     FROM (SELECT task_id, title, priority FROM project_tasks
+                           WHERE priority = 'HIGH' AND assigned_id IS NULL AND status != 'DONE'
+                           ORDER BY task_id DESC
+                           LIMIT 10) c) AS critical_tasks,
+                    (SELECT JSON_ARRAYAGG(JSON_OBJECT('id', a.task_id, 'title', a.title, 'status', a.status))
+                     FROM (SELECT task_id, title, status FROM project_tasks
+                           ORDER BY task_id DESC
+                           LIMIT %s) a) AS recent_tasks
+                FROM project p
+                LEFT JOIN project_stats ps ON ps.project_id = p.project_id
+                LEFT JOIN latest_sprint ls ON TRUE
+                WHERE p.project_id = %s
+            """, (project_id, project_id, DASHBOARD_ACTIVITY_LIMIT, project_id))
+            row = cursor.fetchone()
+            if not row:
+                return None
+            return self._snapshot_from_row(row)
+        finally:
+            cursor.close()
+            conn.close()
+
+    def _snapshot_from_row(self, row):
+        project = Project(
+            project_id=row['project_id'], name=row['name'], description=row['description'],
+            start_date=row['start_date'], end_date=row['end_date'], budget=row['budget'],
+            github_repo=row['github_repo']
+        )
+
+        # JSON_ARRAYAGG does not promise an order, so re-sort newest first
+        critical_tasks = sorted(_json_list(row['critical_tasks']), key=lambda t: t['id'], reverse=True)
+        recent_tasks = sorted(_json_list(row['recent_tasks']), key=lambda t: t['id'], reverse=True)
+
+        from datetime import datetime
+        time_ago = self._format_time_ago(datetime.now())
+        activities = [{
+            "time": time_ago,
+            "detail": f'Task "{t["title"]}" status: {t["status"]}'
+        } for t in recent_tasks]
+
+        sprint = None
+        if row['sprint_id']:
+            sprint = {
+                "sprint_id": row['sprint_id'],
+                "name": row['sprint_name'],
+                "start_date": row['sprint_start_date'],
+                "end_date": row['sprint_end_date'],
+                "total_tasks": int(row['sprint_total_tasks'] or 0),
+                "completed_tasks": int(row['sprint_completed_tasks'] or 0)
+            }
+
+        return {
+            "project": project,
+            "stats": self._build_stats(row, row['budget']),
+            "critical_tasks": critical_tasks,
+            "activities": activities,
+            "sprint": sprint
+        }
+
     def get_critical_tasks(self, project_id):
         """Get unassigned critical tasks for a project."""
         conn = self.db_manager.get_connection()
@@ -213,6 +337,7 @@ class ProjectRepository:
             query = "UPDATE project SET github_repo = %s WHERE project_id = %s"
             cursor.execute(query, (repo_name, project_id))
             conn.commit()
+            invalidate_project_dashboard(project_id)
             return cursor.rowcount
         except Exception as e:
             print(f"[PROJECT_REPO] Error linking repo: {e}")
@@ -221,6 +346,20 @@ class ProjectRepository:
             cursor.close()
             conn.close()
 
+    def get_linked_repos(self):
+        """Distinct GitHub repos ('owner/repo') linked to any project."""
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                SELECT DISTINCT github_repo FROM project
+                WHERE github_repo IS NOT NULL AND github_repo != ''
+            """)
+            return [row[0] for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+            conn.close()
+
     def get_user_projects(self, user_id):
         """Get projects assigned to a specific user via user_project join"""
         conn = self.db_manager.get_connection()
@@ -242,4 +381,12 @@ class ProjectRepository:
             return []
         finally:
             cursor.close()
-            conn.close()
\ No newline at end of file
+            conn.close()
+
+def _json_list(value):
+    """mysql.connector hands JSON columns back as str/bytes (or None for an empty aggregate)."""
+    if not value:
+        return []
+    if isinstance(value, (bytes, bytearray)):
+        value = value.decode('utf-8')
+    return json.loads(value) if isinstance(value, str) else list(value)
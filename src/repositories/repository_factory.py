@@ -1,3 +1,4 @@
+import threading
 from repositories.user_repository import UserRepository
 from repositories.file_attachment_repository import FileAttachmentRepository
 from repositories.integration_repository import IntegrationRepository
@@ -9,34 +10,88 @@ from repositories.task_repository import TaskRepository
 from repositories.user_skill_repository import UserSkillRepository
 from repositories.user_activity_repository import UserActivityRepository
 from repositories.time_repository import TimeTrackingRepository
+from repositories.github_repository import GitHubRepository
+from repositories.drive_file_repository import DriveFileRepository
+from repositories.drive_upload_repository import DriveUploadRepository
+from repositories.job_repository import JobRepository
+from repositories.slack_message_repository import SlackMessageRepository
 
 
 class RepositoryFactory:
-    @staticmethod
-    def get_repository(entity_type: str):
-        entity_type = entity_type.lower()
-
-        if entity_type == "user":
-            return UserRepository()
-        elif entity_type == "file_attachment":
-            return FileAttachmentRepository()
-        elif entity_type == "integration":
-            return IntegrationRepository()
-        elif entity_type == "notification":
-            return NotificationRepository()
-        elif entity_type == "project":
-            return ProjectRepository()
-        elif entity_type == "report":
-            return ReportRepository()
-        elif entity_type == "sprint":
-            return SprintRepository()
-        elif entity_type == "task":
-            return TaskRepository()
-        elif entity_type == "user_skill":
-            return UserSkillRepository()
-        elif entity_type == "user_activity":
-            return UserActivityRepository()
-        elif entity_type == "time_tracking":
-            return TimeTrackingRepository()
-        else:
+    """
+    Registry of repository singletons keyed by entity type.
+    Repositories are stateless (they only hold the shared DatabaseConnection),
+    so one lazily built instance per type is shared by every request and thread.
+    """
+    _registry = {
+        "user": UserRepository,
+        "file_attachment": FileAttachmentRepository,
+        "integration": IntegrationRepository,
+        "notification": NotificationRepository,
+        "project": ProjectRepository,
+        "report": ReportRepository,
+        "sprint": SprintRepository,
+        "task": TaskRepository,
+        "user_skill": UserSkillRepository,
+        "user_activity": UserActivityRepository,
+        "time_tracking": TimeTrackingRepository,
+        "github": GitHubRepository,
+        "drive_file": DriveFileRepository,
+        "drive_upload": DriveUploadRepository,
+        "job": JobRepository,
+        "slack_message": SlackMessageRepository,
+    }
+    _instances = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_repository(cls, entity_type: str):
+        # Fast path: a plain dict read, no lock and no allocation
+        repo = cls._instances.get(entity_type)
+        if repo is not None:
+            return repo
+
+        key = entity_type.lower()
+        with cls._lock:
+            repo = cls._instances.get(key)
+            if repo is None:
+                builder = cls._registry.get(key)
+                if builder is None:
+                    raise ValueError(f"Unknown repository type: {entity_type}")
+                repo = builder()
+                cls._instances[key] = repo
+            # Remember the caller's spelling too so the next lookup hits the fast path
+            cls._instances[entity_type] = repo
+        return repo
+
+    @classmethod
+    def register(cls, entity_type: str, builder):
+        """Register (or replace) the class/callable used to build a repository type."""
+        key = entity_type.lower()
+        with cls._lock:
+            cls._registry[key] = builder
+            cls._drop_instances(key)
+
+    @classmethod
+    def override(cls, entity_type: str, repository):
+        """Use a ready-made instance (e.g. an in-memory fake for benchmarks/tests)."""
+        key = entity_type.lower()
+        if key not in cls._registry:
             raise ValueError(f"Unknown repository type: {entity_type}")
+        with cls._lock:
+            cls._drop_instances(key)
+            cls._instances[key] = repository
+
+    @classmethod
+    def reset(cls, entity_type: str = None):
+        """Forget built/overridden instances so they are rebuilt on next use."""
+        with cls._lock:
+            if entity_type is None:
+                cls._instances.clear()
+            else:
+                cls._drop_instances(entity_type.lower())
+
+    @classmethod
+    def _drop_instances(cls, key):
+        for name in [n for n in cls._instances if n.lower() == key]:
+            del cls._instances[name]
@@ -0,0 +1,212 @@
+from core.db_singleton import DatabaseConnection
+
+MESSAGE_COLUMNS = """channel_id, ts, thread_ts, user_id, username, text, subtype,
+                     reply_count, latest_reply, edited_ts"""
+
+
+class SlackMessageRepository:
+    """
+    Local store of Slack channel history, keyed by (channel_id, ts).
+    Writes are idempotent upserts (Slack retries event deliveries and backfills
+    overlap with events); an edit only replaces the text if it is newer.
+    """
+
+    def __init__(self):
+        self.db_manager = DatabaseConnection()
+
+    # --------------------------------------------------
+    # UPSERTS
+    # --------------------------------------------------
+    def upsert_messages(self, channel_id, messages):
+        """messages: dicts with ts, thread_ts, user_id, username, text, subtype, reply_count, latest_reply, edited_ts."""
+        if not messages:
+            return 0
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        try:
+            self._upsert(cursor, channel_id, messages)
+            conn.commit()
+            return len(messages)
+        finally:
+            cursor.close()
+            conn.close()
+
+    def upsert_event_message(self, channel_id, message):
+        """
+        Store one message from the Events API. A reply seen for the first
+        time also bumps its parent's reply_count / latest_reply.
+        Returns True if the message is new.
+        """
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        try:
+            self._upsert(cursor, channel_id, [message])
+            # 1 = inserted, 2 = updated, 0 = unchanged (MySQL ON DUPLICATE KEY semantics)
+            is_new = cursor.rowcount == 1
+            thread_ts = message.get('thread_ts')
+            if is_new and thread_ts and thread_ts != message['ts']:
+                cursor.execute("""
+                    UPDATE slack_message
+                    SET reply_count = reply_count + 1,
+                        latest_reply = GREATEST(COALESCE(latest_reply, ''), %s)
+                    WHERE channel_id = %s AND ts = %s
+                """, (message['ts'], channel_id, thread_ts))
+            cursor.execute("""
+                INSERT INTO slack_channel_sync (channel_id, last_event_at)
+                VALUES (%s, UTC_TIMESTAMP())
+                ON DUPLICATE KEY UPDATE last_event_at = VALUES(last_event_at)
+            """, (channel_id,))
+            conn.commit()
+            return is_new
+        finally:
+            cursor.close()
+            conn.close()
+
+    @staticmethod
+    def _upsert(cursor, channel_id, messages):
+        # Assignments run left to right: text must be compared before edited_ts changes
+        cursor.executemany(f"""
+            INSERT INTO slack_message ({MESSAGE_COLUMNS})
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                text = IF(COALESCE(VALUES(edited_ts), '') >= COALESCE(edited_ts, ''), VALUES(text), text),
+                edited_ts = NULLIF(GREATEST(COALESCE(edited_ts, ''), COALESCE(VALUES(edited_ts), '')), ''),
+                thread_ts = COALESCE(VALUES(thread_ts), thread_ts),
+                user_id = COALESCE(VALUES(user_id), user_id),
+                username = COALESCE(VALUES(username), username),
+                reply_count = GREATEST(reply_count, VALUES(reply_count)),
+                latest_reply = NULLIF(GREATEST(COALESCE(latest_reply, ''), COALESCE(VALUES(latest_reply), '')), '')
+        """, [(
+            channel_id, m['ts'], m.get('thread_ts'), m.get('user_id'), m.get('username'), m.get('text'),
+            m.get('subtype'), m.get('reply_count') or 0, m.get('latest_reply'), m.get('edited_ts')
+        ) for m in messages])
+
+    def mark_deleted(self, channel_id, ts):
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("UPDATE slack_message SET deleted = TRUE WHERE channel_id = %s AND ts = %s",
+                           (channel_id, ts))
+            conn.commit()
+        finally:
+            cursor.close()
+            conn.close()
+
+    # --------------------------------------------------
+    # READS
+    # --------------------------------------------------
+    def get_messages(self, channel_id, limit=50, before_ts=None):
+        """
+        Keyset page of top-level messages, newest first.
+        Returns (messages, next_before) where next_before is None on the last page.
+        """
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            query = f"""
+                SELECT {MESSAGE_COLUMNS} FROM slack_message
+                WHERE channel_id = %s AND deleted = FALSE
+                  AND (thread_ts IS NULL OR thread_ts = ts)
+            """
+            params = [channel_id]
+            if before_ts:
+                query += " AND ts < %s"
+                params.append(before_ts)
+            # One extra row tells us whether another page exists
+            query += " ORDER BY ts DESC LIMIT %s"
+            params.append(limit + 1)
+
+            cursor.execute(query, tuple(params))
+            rows = cursor.fetchall()
+            messages = rows[:limit]
+            return messages, (messages[-1]['ts'] if len(rows) > limit else None)
+        finally:
+            cursor.close()
+            conn.close()
+
+    def get_replies(self, channel_id, thread_ts, limit=100, after_ts=None):
+        """Keyset page of a thread's replies, oldest first. Returns (replies, next_after)."""
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            query = f"""
+                SELECT {MESSAGE_COLUMNS} FROM slack_message
+                WHERE channel_id = %s AND thread_ts = %s AND ts <> thread_ts AND deleted = FALSE
+            """
+            params = [channel_id, thread_ts]
+            if after_ts:
+                query += " AND ts > %s"
+                params.append(after_ts)
+            query += " ORDER BY ts ASC LIMIT %s"
+            params.append(limit + 1)
+
+            cursor.execute(query, tuple(params))
+            rows = cursor.fetchall()
+            replies = rows[:limit]
+            return replies, (replies[-1]['ts'] if len(rows) > limit else None)
+        finally:
+            cursor.close()
+            conn.close()
+
+    # --------------------------------------------------
+    # BACKFILL STATE
+    # --------------------------------------------------
+    def is_backfilled(self, channel_id):
+        sync = self.get_sync_state(channel_id)
+        return bool(sync and sync['backfilled_at'])
+
+    def get_sync_state(self, channel_id):
+        """{'backfill_requested_at', 'backfill_cursor', 'backfilled_at', 'last_event_at'} or None."""
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute("""
+                SELECT backfill_requested_at, backfill_cursor, backfilled_at, last_event_at
+                FROM slack_channel_sync WHERE channel_id = %s
+            """, (channel_id,))
+            return cursor.fetchone()
+        finally:
+            cursor.close()
+            conn.close()
+
+    def request_backfill(self, channel_id, retry_after_seconds):
+        """
+        Claim the right to queue a backfill for a channel that has none yet.
+        Returns False if it is already backfilled or another request queued
+        one less than retry_after_seconds ago.
+        """
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                INSERT INTO slack_channel_sync (channel_id, backfill_requested_at)
+                VALUES (%s, UTC_TIMESTAMP())
+                ON DUPLICATE KEY UPDATE backfill_requested_at = IF(
+                    backfilled_at IS NULL AND (backfill_requested_at IS NULL
+                        OR backfill_requested_at < UTC_TIMESTAMP() - INTERVAL %s SECOND),
+                    VALUES(backfill_requested_at), backfill_requested_at)
+            """, (channel_id, retry_after_seconds))
+            conn.commit()
+            return cursor.rowcount in (1, 2)
+        finally:
+            cursor.close()
+            conn.close()
+
+    def save_backfill_cursor(self, channel_id, next_cursor):
+        """Progress of a running backfill, so a retried job resumes where it stopped."""
+        self._update_sync(channel_id, "backfill_cursor = %s", (next_cursor,))
+
+    def mark_backfilled(self, channel_id):
+        self._update_sync(channel_id, "backfilled_at = UTC_TIMESTAMP(), backfill_cursor = NULL", ())
+
+    def _update_sync(self, channel_id, assignments, params):
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("INSERT IGNORE INTO slack_channel_sync (channel_id) VALUES (%s)", (channel_id,))
+            cursor.execute(f"UPDATE slack_channel_sync SET {assignments} WHERE channel_id = %s",
+                           params + (channel_id,))
+            conn.commit()
+        finally:
+            cursor.close()
+            conn.close()
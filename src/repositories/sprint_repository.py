@@ -1,5 +1,6 @@
 from core.db_singleton import DatabaseConnection
 from models.sprint import Sprint
+from repositories.project_repository import invalidate_project_dashboard
 
 class SprintRepository:
     def __init__(self):
@@ -27,6 +28,7 @@ class SprintRepository:
             
             cursor.execute(query, values)
             conn.commit()
+            invalidate_project_dashboard(sprint.project_id)
             return cursor.lastrowid
         finally:
             cursor.close()
@@ -89,8 +91,10 @@ class SprintRepository:
             """
             values = (data['name'], data['start_date'], data['end_date'], sprint_id)
             cursor.execute(query, values)
+            updated = cursor.rowcount > 0
             conn.commit()
-            return cursor.rowcount > 0
+            self._invalidate_dashboard(cursor, sprint_id)
+            return updated
         finally:
             cursor.close()
             conn.close()
@@ -102,8 +106,18 @@ class SprintRepository:
             # FIX: 'Sprint' -> 'sprint'
             query = "UPDATE sprint SET status = %s WHERE sprint_id = %s"
             cursor.execute(query, (new_status, sprint_id))
+            updated = cursor.rowcount > 0
             conn.commit()
-            return cursor.rowcount > 0
+            self._invalidate_dashboard(cursor, sprint_id)
+            return updated
         finally:
             cursor.close()
-            conn.close()
\ No newline at end of file
+            conn.close()
+
+    @staticmethod
+    def _invalidate_dashboard(cursor, sprint_id):
+        # Sprint dates/status feed the cached burndown on the project dashboard
+        cursor.execute("SELECT project_id FROM sprint WHERE sprint_id = %s", (sprint_id,))
+        row = cursor.fetchone()
+        if row:
+            invalidate_project_dashboard(row[0])
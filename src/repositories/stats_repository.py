@@ -0,0 +1,118 @@
+from core.db_singleton import DatabaseConnection
+
+
+def _is_ai_task(title):
+    # Same rule as the old `title LIKE '%AI%'` scan under MySQL's case-insensitive collation
+    return "ai" in (title or "").lower()
+
+
+def _contribution(state):
+    """What one task (as a state dict) adds to its project and assignee counters."""
+    if not state:
+        return {}, {}
+    done = 1 if state["status"] == "DONE" else 0
+    projects, users = {}, {}
+    if state.get("project_id"):
+        projects[state["project_id"]] = (
+            1,
+            done,
+            1 if state["priority"] == "HIGH" and state.get("assigned_id") is None else 0
+        )
+    if state.get("assigned_id"):
+        users[state["assigned_id"]] = (1, done, 1 if _is_ai_task(state.get("title")) else 0)
+    return projects, users
+
+
+def _diff(new, old):
+    deltas = {}
+    for key in set(new) | set(old):
+        n = new.get(key, (0, 0, 0))
+        o = old.get(key, (0, 0, 0))
+        delta = tuple(a - b for a, b in zip(n, o))
+        if any(delta):
+            deltas[key] = delta
+    return deltas
+
+
+def task_stats_deltas(old_state, new_state):
+    """
+    Counter changes for a task going from old_state to new_state
+    (either may be None for an insert / delete).
+    Returns (project_deltas, user_deltas), each {id: (d_total, d_completed, d_third)}.
+    """
+    old_projects, old_users = _contribution(old_state)
+    new_projects, new_users = _contribution(new_state)
+    return _diff(new_projects, old_projects), _diff(new_users, old_users)
+
+
+def apply_task_change(cursor, old_state, new_state):
+    """Apply the delta on the caller's cursor, i.e. inside the same transaction as the task write."""
+    project_deltas, user_deltas = task_stats_deltas(old_state, new_state)
+    for project_id, delta in project_deltas.items():
+        cursor.execute("""
+            INSERT INTO project_stats (project_id, total_tasks, completed_tasks, unassigned_critical)
+            VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                total_tasks = total_tasks + VALUES(total_tasks),
+                completed_tasks = completed_tasks + VALUES(completed_tasks),
+                unassigned_critical = unassigned_critical + VALUES(unassigned_critical)
+        """, (project_id, *delta))
+    for user_id, delta in user_deltas.items():
+        cursor.execute("""
+            INSERT INTO user_stats (user_id, total_tasks, completed_tasks, ai_tasks)
+            VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                total_tasks = total_tasks + VALUES(total_tasks),
+                completed_tasks = completed_tasks + VALUES(completed_tasks),
+                ai_tasks = ai_tasks + VALUES(ai_tasks)
+        """, (user_id, *delta))
+
+
+class StatsRepository:
+    """
+    Rebuilds the materialised project_stats / user_stats summaries.
+    They are read by ProjectRepository.get_project_stats and UserRepository.get_user_stats.
+    """
+
+    def __init__(self):
+        self.db_manager = DatabaseConnection()
+
+    def rebuild(self):
+        """Recompute both summaries from the task table (fixes any drift). Returns row counts."""
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("DELETE FROM project_stats")
+            cursor.execute("""
+                INSERT INTO project_stats (project_id, total_tasks, completed_tasks, unassigned_critical)
+                SELECT s.project_id,
+                       COUNT(*),
+                       SUM(CASE WHEN t.status = 'DONE' THEN 1 ELSE 0 END),
+                       SUM(CASE WHEN t.priority = 'HIGH' AND t.assigned_id IS NULL THEN 1 ELSE 0 END)
+                FROM task t
+                INNER JOIN sprint s ON t.sprint_id = s.sprint_id
+                GROUP BY s.project_id
+            """)
+            projects = cursor.rowcount
+
+            cursor.execute("DELETE FROM user_stats")
+            cursor.execute("""
+                INSERT INTO user_stats (user_id, total_tasks, completed_tasks, ai_tasks)
+                SELECT assigned_id,
+                       COUNT(*),
+                       SUM(CASE WHEN status = 'DONE' THEN 1 ELSE 0 END),
+                       SUM(CASE WHEN title LIKE '%AI%' THEN 1 ELSE 0 END)
+                FROM task
+                WHERE assigned_id IS NOT NULL
+                GROUP BY assigned_id
+            """)
+            users = cursor.rowcount
+
+            conn.commit()
+            return {"projects": projects, "users": users}
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            conn.close()
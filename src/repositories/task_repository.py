@@ -1,6 +1,8 @@
 from datetime import date
 from core.db_singleton import DatabaseConnection
 from models.task import Task
+from repositories.project_repository import invalidate_project_dashboard
+from repositories.stats_repository import apply_task_change
 
 class TaskRepository:
     def __init__(self):
@@ -25,6 +27,52 @@ class TaskRepository:
             cursor.close()
             conn.close()
 
+    def get_page(self, limit=100, after_id=None, project_id=None, sprint_id=None,
+                 assigned_id=None, status=None, priority=None):
+        """
+        Keyset page of tasks ordered by task_id.
+        Returns (tasks, last_task_id) where last_task_id is None on the final page.
+        """
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            query = """
+                SELECT t.task_id, t.sprint_id, t.title, t.status, t.priority,
+                       t.estimate_hours, t.due_date, t.created_by, t.assigned_id
+                FROM task t
+            """
+            conditions = []
+            params = []
+
+            if project_id:
+                query += " JOIN sprint s ON t.sprint_id = s.sprint_id"
+                conditions.append("s.project_id = %s"); params.append(project_id)
+            if after_id:
+                conditions.append("t.task_id > %s"); params.append(after_id)
+            if sprint_id:
+                conditions.append("t.sprint_id = %s"); params.append(sprint_id)
+            if assigned_id:
+                conditions.append("t.assigned_id = %s"); params.append(assigned_id)
+            if status:
+                conditions.append("t.status = %s"); params.append(status)
+            if priority:
+                conditions.append("t.priority = %s"); params.append(priority)
+
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
+            # One extra row tells us whether another page exists
+            query += " ORDER BY t.task_id ASC LIMIT %s"
+            params.append(limit + 1)
+
+            cursor.execute(query, tuple(params))
+            rows = cursor.fetchall()
+            has_more = len(rows) > limit
+            tasks = [Task(**row) for row in rows[:limit]]
+            return tasks, (tasks[-1].task_id if has_more else None)
+        finally:
+            cursor.close()
+            conn.close()
+
     def get_by_id(self, task_id):
         conn = self.db_manager.get_connection()
         cursor = conn.cursor(dictionary=True)
@@ -61,8 +109,12 @@ class TaskRepository:
                 task.created_by,
                 task.assigned_id
             ))
+            task_id = cursor.lastrowid
+            new_state = self._state_of(cursor, task)
+            apply_task_change(cursor, None, new_state)
             conn.commit()
-            return cursor.lastrowid
+            invalidate_project_dashboard(new_state["project_id"])
+            return task_id
         finally:
             cursor.close()
             conn.close()
@@ -71,6 +123,8 @@ class TaskRepository:
         conn = self.db_manager.get_connection()
         cursor = conn.cursor()
         try:
+            # Row lock + previous state, so the stats delta is exact under concurrent edits
+            old_state = self._locked_state(cursor, task.task_id)
             # FIX: 'Task' -> 'task'
             cursor.execute("""
                 UPDATE task
@@ -87,8 +141,14 @@ class TaskRepository:
                 task.assigned_id,
                 task.task_id
             ))
+            updated = cursor.rowcount
+            new_state = self._state_of(cursor, task) if old_state else None
+            apply_task_change(cursor, old_state, new_state)
             conn.commit()
-            return cursor.rowcount
+            # The task may be moving between projects: invalidate both sides
+            invalidate_project_dashboard(old_state and old_state["project_id"],
+                                         new_state and new_state["project_id"])
+            return updated
         finally:
             cursor.close()
             conn.close()
@@ -97,14 +157,82 @@ class TaskRepository:
         conn = self.db_manager.get_connection()
         cursor = conn.cursor()
         try:
+            old_state = self._locked_state(cursor, task_id)
             # FIX: 'Task' -> 'task'
             cursor.execute("DELETE FROM task WHERE task_id=%s", (task_id,))
+            deleted = cursor.rowcount
+            apply_task_change(cursor, old_state, None)
+            conn.commit()
+            invalidate_project_dashboard(old_state and old_state["project_id"])
+            return deleted
+        finally:
+            cursor.close()
+            conn.close()
+
+    def release_user(self, user_id):
+        """
+        Unassign a user's tasks and clear them as creator (before the user is deleted),
+        keeping project_stats / user_stats and the cached dashboards in step.
+        Returns the number of tasks unassigned.
+        """
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                SELECT t.status, t.priority, t.assigned_id, t.title, s.project_id
+                FROM task t
+                LEFT JOIN sprint s ON t.sprint_id = s.sprint_id
+                WHERE t.assigned_id = %s
+                FOR UPDATE
+            """, (user_id,))
+            old_states = [
+                {"status": status, "priority": priority, "assigned_id": assigned_id,
+                 "title": title, "project_id": project_id}
+                for status, priority, assigned_id, title, project_id in cursor.fetchall()
+            ]
+
+            cursor.execute("UPDATE task SET assigned_id=NULL WHERE assigned_id=%s", (user_id,))
+            unassigned = cursor.rowcount
+            cursor.execute("UPDATE task SET created_by=NULL WHERE created_by=%s", (user_id,))
+            for old_state in old_states:
+                apply_task_change(cursor, old_state, {**old_state, "assigned_id": None})
             conn.commit()
-            return cursor.rowcount
+            invalidate_project_dashboard(*{state["project_id"] for state in old_states})
+            return unassigned
         finally:
             cursor.close()
             conn.close()
 
+    # --------------------------------------------------
+    # STATS BOOKKEEPING
+    # --------------------------------------------------
+    @staticmethod
+    def _locked_state(cursor, task_id):
+        """Current counters-relevant state of a task (locked until commit), or None if it does not exist."""
+        cursor.execute("""
+            SELECT t.status, t.priority, t.assigned_id, t.title, s.project_id
+            FROM task t
+            LEFT JOIN sprint s ON t.sprint_id = s.sprint_id
+            WHERE t.task_id = %s
+            FOR UPDATE
+        """, (task_id,))
+        row = cursor.fetchone()
+        if not row:
+            return None
+        status, priority, assigned_id, title, project_id = row
+        return {"status": status, "priority": priority, "assigned_id": assigned_id,
+                "title": title, "project_id": project_id}
+
+    @staticmethod
+    def _state_of(cursor, task: Task):
+        project_id = None
+        if task.sprint_id:
+            cursor.execute("SELECT project_id FROM sprint WHERE sprint_id = %s", (task.sprint_id,))
+            row = cursor.fetchone()
+            project_id = row[0] if row else None
+        return {"status": task.status.value, "priority": task.priority.value,
+                "assigned_id": task.assigned_id, "title": task.title, "project_id": project_id}
+
     # --------------------------------------------------
     # USER-BASED QUERIES
     # --------------------------------------------------
@@ -145,6 +273,57 @@ class TaskRepository:
             cursor.close()
             conn.close()
 
+    # --------------------------------------------------
+    # HOME DASHBOARD
+    # --------------------------------------------------
+    def get_upcoming(self, limit=5, project_id=None, user_id=None):
+        """Open tasks due today or later (undated ones last), soonest first."""
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            query = """
+                SELECT t.task_id, t.sprint_id, t.title, t.status, t.priority,
+                       t.estimate_hours, t.due_date, t.created_by, t.assigned_id
+                FROM task t
+            """
+            conditions = ["t.status <> 'DONE'", "(t.due_date IS NULL OR t.due_date >= %s)"]
+            params = [date.today()]
+            if project_id:
+                query += " JOIN sprint s ON t.sprint_id = s.sprint_id"
+                conditions.append("s.project_id = %s"); params.append(project_id)
+            if user_id:
+                conditions.append("t.assigned_id = %s"); params.append(user_id)
+
+            query += " WHERE " + " AND ".join(conditions)
+            query += " ORDER BY t.due_date IS NULL, t.due_date ASC, t.task_id ASC LIMIT %s"
+            params.append(limit)
+
+            cursor.execute(query, tuple(params))
+            return [Task(**row) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+            conn.close()
+
+    def get_assignee_task_counts(self, project_id=None):
+        """{assigned_id: number of tasks}, optionally for one project only."""
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            query = "SELECT t.assigned_id, COUNT(*) AS task_count FROM task t"
+            params = []
+            if project_id:
+                query += " JOIN sprint s ON t.sprint_id = s.sprint_id WHERE s.project_id = %s AND"
+                params.append(project_id)
+            else:
+                query += " WHERE"
+            query += " t.assigned_id IS NOT NULL GROUP BY t.assigned_id"
+
+            cursor.execute(query, tuple(params))
+            return {row['assigned_id']: row['task_count'] for row in cursor.fetchall()}
+        finally:
+            cursor.close()
+            conn.close()
+
     # --------------------------------------------------
     # BACKLOG
     # --------------------------------------------------
@@ -102,31 +102,20 @@ class UserRepository:
         conn = self.db_manager.get_connection()
         cursor = conn.cursor(dictionary=True)
         try:
-            # Tasks completed this year
+            # One primary-key read: counters are maintained by TaskRepository in user_stats
             cursor.execute("""
-                SELECT COUNT(*) as count FROM Task
-                WHERE assigned_id = %s AND status = 'DONE'
-                AND YEAR(CURDATE()) = YEAR(CURDATE())
+                SELECT total_tasks, completed_tasks, ai_tasks
+                FROM user_stats
+                WHERE user_id = %s
             """, (user_id,))
-            tasks_completed = cursor.fetchone()['count']
-
-            # Total tasks assigned
-            cursor.execute("""
-                SELECT COUNT(*) as count FROM Task
-                WHERE assigned_id = %s
-            """, (user_id,))
-            total_tasks = cursor.fetchone()['count']
+            row = cursor.fetchone()
+            total_tasks = row['total_tasks'] if row else 0
+            tasks_completed = row['completed_tasks'] if row else 0
+            ai_tasks = row['ai_tasks'] if row else 0
 
             # Completion rate (as velocity proxy)
             completion_rate = round((tasks_completed / total_tasks * 100) if total_tasks > 0 else 0, 1)
 
-            # AI-related tasks
-            cursor.execute("""
-                SELECT COUNT(*) as count FROM Task
-                WHERE assigned_id = %s AND title LIKE '%AI%'
-            """, (user_id,))
-            ai_tasks = cursor.fetchone()['count']
-
             # Calculate AI risk exposure (percentage of AI tasks)
             risk_exposure = round((ai_tasks / total_tasks * 100) if total_tasks > 0 else 0, 1)
 
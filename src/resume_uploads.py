@@ -0,0 +1,30 @@
+"""
+Resumes Drive uploads that were interrupted (failed, or cut off by a restart)
+and whose spooled file is still on disk. Each continues from the last chunk
+Drive acknowledged. Polling an upload's progress resumes it too; run this
+after a deploy so nobody has to.
+
+Usage (from src/):
+    python resume_uploads.py
+"""
+import sys
+from clients.drive_client import get_drive_client
+from services.drive_upload_service import DriveUploadService, _upload_executor
+
+
+def resume_uploads():
+    print("🔨 Resuming interrupted Drive uploads...")
+    try:
+        resumed = DriveUploadService(get_drive_client()).resume_interrupted()
+        # Wait for the transfers: the workers die with this process
+        _upload_executor.shutdown(wait=True)
+        print(f"✅ {len(resumed)} upload(s) resumed.")
+        return True
+    except Exception as e:
+        print(f"❌ Error resuming uploads: {e}")
+        return False
+
+
+if __name__ == '__main__':
+    if not resume_uploads():
+        sys.exit(1)
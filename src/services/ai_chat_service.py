@@ -1,19 +1,22 @@
-import requests
-import os
+from clients.ollama_client import OllamaUnavailableError, OllamaTimeoutError
+from clients.ollama_gateway import get_ollama_gateway
 
-OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434/api/generate")
-MODEL = os.getenv("OLLAMA_MODEL", "llama3.2")
+UNAVAILABLE_MESSAGE = "⚠️ AI service is not available. Please ensure Ollama is running (http://localhost:11434)"
+TIMEOUT_MESSAGE = "⚠️ AI request timed out. Please try again."
 
 class AIChatService:
     """Service for AI-powered chat analysis and summarization"""
     
     @staticmethod
-    def summarize_chat(messages):
+    def summarize_chat(messages, raise_errors=False, refresh=False):
         """
         Generate an AI summary of chat messages
         
         Args:
             messages: List of dicts with 'user' and 'text' keys
+            raise_errors: Raise Ollama failures instead of returning a warning
+                          (background jobs retry them)
+            refresh: Regenerate even if this conversation was summarized before
         
         Returns:
             str: AI-generated summary
@@ -21,13 +24,43 @@ class AIChatService:
         if not messages:
             return "No messages to summarize."
         
+        try:
+            summary = get_ollama_gateway().generate(AIChatService._build_prompt(messages), refresh=refresh)
+            return summary or "Unable to generate summary."
+            
+        except OllamaUnavailableError:
+            if raise_errors:
+                raise
+            return UNAVAILABLE_MESSAGE
+        except OllamaTimeoutError:
+            if raise_errors:
+                raise
+            return TIMEOUT_MESSAGE
+        except Exception as e:
+            if raise_errors:
+                raise
+            print(f"[ERROR] AI summarization failed: {e}")
+            return f"⚠️ AI summarization failed: {str(e)}"
+
+    @staticmethod
+    def stream_summary(messages, refresh=False):
+        """
+        Same summary as summarize_chat, yielded fragment by fragment as Ollama
+        generates it (preceded by ('queued', {'position'}) while other
+        summaries hold the model). Raises OllamaClientError; closing the
+        generator cancels the generation upstream.
+        """
+        return get_ollama_gateway().stream(AIChatService._build_prompt(messages), refresh=refresh)
+
+    @staticmethod
+    def _build_prompt(messages):
         # Build the conversation context
         conversation = "\n".join([
             f"{msg['user']}: {msg['text']}" 
             for msg in messages[-20:]  # Last 20 messages
         ])
         
-        prompt = f"""You are an AI assistant analyzing a team chat conversation.
+        return f"""You are an AI assistant analyzing a team chat conversation.
 
 Conversation:
 {conversation}
@@ -39,27 +72,6 @@ Please provide a concise summary that includes:
 4. Any blockers or issues mentioned
 
 Keep the summary under 150 words."""
-        
-        try:
-            payload = {
-                "model": MODEL,
-                "prompt": prompt,
-                "stream": False
-            }
-            
-            response = requests.post(OLLAMA_URL, json=payload, timeout=30)
-            response.raise_for_status()
-            
-            result = response.json()
-            return result.get("response", "Unable to generate summary.")
-            
-        except requests.exceptions.ConnectionError:
-            return "⚠️ AI service is not available. Please ensure Ollama is running (http://localhost:11434)"
-        except requests.exceptions.Timeout:
-            return "⚠️ AI request timed out. Please try again."
-        except Exception as e:
-            print(f"[ERROR] AI summarization failed: {e}")
-            return f"⚠️ AI summarization failed: {str(e)}"
     
     @staticmethod
     def analyze_sentiment(messages):
@@ -1,18 +1,13 @@
-import requests
-
-OLLAMA_URL = "http://localhost:11434/api/generate"
-MODEL = "llama3.2"
+from clients.ollama_gateway import get_ollama_gateway
 
 class AIService:
 
     @staticmethod
-    def generate_summary(prompt: str) -> str:
-        payload = {
-            "model": MODEL,
-            "prompt": prompt,
-            "stream": False
-        }
+    def generate_summary(prompt: str, refresh: bool = False) -> str:
+        """Cached per prompt: an unchanged sprint gets its previous summary back unless refresh=True."""
+        return get_ollama_gateway().generate(prompt, refresh=refresh)
 
-        response = requests.post(OLLAMA_URL, json=payload)
-        response.raise_for_status()
-        return response.json().get("response", "")
+    @staticmethod
+    def stream_summary(prompt: str, refresh: bool = False):
+        """Yields queue positions, then the summary fragment by fragment; closing the generator cancels it."""
+        return get_ollama_gateway().stream(prompt, refresh=refresh)
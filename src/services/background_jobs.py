@@ -0,0 +1,58 @@
+"""
+Handlers for the background job queue (core/jobs.py).
+Controllers enqueue these by type and return 202 with the job id.
+"""
+from flask_mail import Message
+from extensions import mail
+from core.jobs import job_handler, PermanentJobError
+from services.ai_chat_service import AIChatService
+from services.ai_prediction_service import AIService
+from services.github_service import GitHubService
+from services.slack_integration_service import SlackService
+
+
+@job_handler("mail.send", max_attempts=5)
+def send_mail(payload):
+    """payload: subject, recipients, body"""
+    mail.send(Message(subject=payload['subject'], recipients=payload['recipients'], body=payload['body']))
+    return {'sent_to': payload['recipients']}
+
+
+@job_handler("ai.summarize_chat", max_attempts=2)
+def summarize_chat(payload):
+    """payload: messages ([{'user', 'text'}]), refresh"""
+    messages = payload['messages']
+    return {
+        'summary': AIChatService.summarize_chat(messages, raise_errors=True, refresh=payload.get('refresh', False)),
+        'sentiment': AIChatService.analyze_sentiment(messages)
+    }
+
+
+@job_handler("ai.sprint_summary", max_attempts=2)
+def sprint_summary(payload):
+    """payload: sprint_id, prompt, refresh"""
+    summary = AIService.generate_summary(payload['prompt'], refresh=payload.get('refresh', False))
+    return {'sprint_id': payload['sprint_id'], 'summary': summary}
+
+
+@job_handler("github.backfill")
+def backfill_github(payload):
+    """payload: repos; access_token is passed as a secret so it never reaches the job table"""
+    token = payload.get('access_token')
+    if not token:
+        # Only the process that enqueued the job holds the token; another process only
+        # runs it once that one is gone (e.g. restarted), and then the token is lost
+        raise PermanentJobError("GitHub token no longer available, start the backfill again")
+    report = GitHubService.backfill_repos(token, payload['repos'])
+    return {
+        'repos': {repo: {'commits': len(r['commits']), 'pull_requests': len(r['pull_requests']),
+                         'branches': len(r['branches']), 'stored': r['stored'], 'errors': r['errors']}
+                  for repo, r in report.items()}
+    }
+
+
+@job_handler("slack.backfill", max_attempts=5)
+def backfill_slack(payload):
+    """payload: channels; each run resumes from the saved history cursor"""
+    slack = SlackService()
+    return {'channels': {channel: slack.backfill_channel(channel) for channel in payload['channels']}}
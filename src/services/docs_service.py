@@ -1,6 +1,10 @@
 # services/docs_service.py
 import logging
-from clients.drive_client import DriveClient, DriveClientError, InsufficientPermissionsError
+from clients.drive_client import (get_drive_client, DriveClientError, InsufficientPermissionsError,
+                                  RangeNotSatisfiableError)
+from core.pagination import encode_cursor, decode_cursor
+from services.drive_sync_service import DriveSyncService
+from services.drive_upload_service import DriveUploadService, UploadError
 from werkzeug.utils import secure_filename
 
 logger = logging.getLogger(__name__)
@@ -11,27 +15,89 @@ class DocsServiceError(Exception):
     pass
 
 
+class InvalidCursorError(DocsServiceError):
+    """A listing cursor that is malformed or belongs to a different query"""
+    pass
+
+
+def _encode_cursor(source, position, query):
+    """Opaque continuation cursor: where the next page starts, bound to the query it came from"""
+    return encode_cursor({'s': source, 'p': position, 'q': query})
+
+
+def _decode_cursor(cursor, query):
+    try:
+        data = decode_cursor(cursor)
+        source, position, cursor_query = data['s'], data['p'], data['q']
+    except (ValueError, KeyError):
+        raise InvalidCursorError("Invalid listing cursor")
+    if cursor_query != query or source not in ('mirror', 'drive'):
+        raise InvalidCursorError("Listing cursor does not match this query")
+    return source, position
+
+
 class DocsService:
     def __init__(self):
-        """Initialize the DocsService with a DriveClient"""
+        """Initialize the DocsService with the shared DriveClient"""
         try:
-            self.client = DriveClient()
+            self.client = get_drive_client()
         except Exception as e:
             logger.error(f"Failed to initialize DriveClient: {e}")
             raise DocsServiceError(f"Failed to initialize Google Drive client: {e}")
+        self._sync = None
+        self._uploads = None
+
+    # ===== LOCAL MIRROR =====
 
-    def list_documents(self, limit=50, sort_by='recent', file_type=None, folder_id=None):
+    @property
+    def sync(self):
+        if self._sync is None:
+            self._sync = DriveSyncService(self.client)
+        return self._sync
+
+    def _from_mirror(self, read):
+        """
+        Run read(repository) against the local Drive mirror (a stale mirror is
+        still read while a background sync catches it up).
+        Returns None when the mirror is unavailable or not built yet, so callers
+        fall back to live Drive.
         """
-        List documents from Google Drive
+        try:
+            self.sync.ensure_fresh()
+            return read(self.sync.repository)
+        except Exception as e:
+            logger.warning(f"Drive mirror unavailable, using live Drive: {e}")
+            return None
+
+    def _mirror_changed(self, changed=(), removed=()):
+        """Record a write in the mirror (changed: normalized files, removed: file ids)"""
+        try:
+            self.sync.record_write(changed, removed)
+        except Exception as e:
+            logger.warning(f"Drive mirror unavailable: {e}")
+
+    @property
+    def uploads(self):
+        if self._uploads is None:
+            self._uploads = DriveUploadService(self.client, on_complete=self._upload_completed)
+        return self._uploads
+
+    def _upload_completed(self, file):
+        self._mirror_changed(changed=[self.client.normalize_file(file)])
+
+    def list_documents(self, limit=50, sort_by='recent', file_type=None, folder_id=None, cursor=None):
+        """
+        List one page of documents from Google Drive
         
         Args:
             limit: Maximum number of documents to return
             sort_by: Sort order (recent, name, size)
             file_type: Filter by file type (optional)
             folder_id: Filter by folder ID (optional)
+            cursor: next_cursor of the previous page (optional)
         
         Returns:
-            dict with success status and documents list
+            dict with success status, documents list and next_cursor (None on the last page)
         """
         try:
             # Map sort_by to Drive API orderBy format
@@ -53,20 +119,51 @@ class DocsService:
                 }
                 mime_type = mime_type_map.get(file_type)
             
-            # Get files from Drive
-            documents = self.client.list_files(
-                limit=limit,
-                order_by=order_by,
-                mime_type=mime_type,
-                folder_id=folder_id
-            )
+            query = [limit, sort_by, file_type, folder_id]
+            source, position = _decode_cursor(cursor, query) if cursor else (None, None)
+            
+            # Served from the local mirror; live Drive only if the mirror is down
+            documents = None
+            if source in (None, 'mirror'):
+                page = self._from_mirror(lambda repo: repo.list_files(
+                    limit=limit,
+                    sort_by=sort_by,
+                    mime_type=mime_type,
+                    folder_id=folder_id,
+                    after=position
+                ))
+                if page is not None:
+                    source = 'mirror'
+                    documents, next_position = page
+                elif source == 'mirror':
+                    raise InvalidCursorError("Listing cursor expired, reload the list")
+            if documents is None:
+                # Live listing: the next page is prefetched while this one is rendered
+                source = 'drive'
+                documents, next_position = self.client.list_files_page(
+                    limit=limit,
+                    order_by=order_by,
+                    mime_type=mime_type,
+                    folder_id=folder_id,
+                    page_token=position,
+                    prefetch=True
+                )
             
             return {
                 'success': True,
                 'documents': documents,
-                'count': len(documents)
+                'count': len(documents),
+                'source': source,
+                'next_cursor': _encode_cursor(source, next_position, query) if next_position else None
             }
             
+        except InvalidCursorError as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'error_type': 'cursor',
+                'documents': []
+            }
         except DriveClientError as e:
             logger.error(f"Drive client error listing documents: {e}")
             return {
@@ -135,6 +232,7 @@ class DocsService:
                 content=content,
                 folder_id=folder_id
             )
+            self._mirror_changed(changed=[self.client.normalize_file(file)])
             
             return {
                 'success': True,
@@ -161,52 +259,70 @@ class DocsService:
 
     def upload_file(self, file_obj, folder_id=None):
         """
-        Upload a file to Google Drive
-        
+        Queue a file for a background resumable upload to Google Drive
+
         Args:
             file_obj: File object from Flask request.files
             folder_id: Parent folder ID (optional)
-        
+
         Returns:
-            dict with success status and file info
+            dict with success status and the upload job to poll
         """
         try:
-            # Secure the filename
-            filename = secure_filename(file_obj.filename)
-            
-            if not filename:
-                raise DocsServiceError("Invalid filename")
-            
-            # Get MIME type
-            mime_type = file_obj.content_type or 'application/octet-stream'
-            
-            # Upload file
-            file = self.client.upload_file(
-                file_stream=file_obj.stream,
-                filename=filename,
-                mime_type=mime_type,
-                folder_id=folder_id
-            )
-            
+            upload = self.uploads.start(file_obj, folder_id=folder_id)
             return {
                 'success': True,
-                'message': 'File uploaded successfully',
-                'file': {
-                    'id': file.get('id'),
-                    'name': file.get('name'),
-                    'mime_type': file.get('mimeType'),
-                    'size': file.get('size')
+                'message': 'Upload started',
+                'upload': upload
+            }
+        except UploadError as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
+        except Exception as e:
+            logger.error(f"Unexpected error starting upload: {e}")
+            return {
+                'success': False,
+                'error': f"An unexpected error occurred: {str(e)}"
+            }
+
+    def get_upload(self, upload_id):
+        """Progress of a background upload (bytes Drive has acknowledged)"""
+        try:
+            upload = self.uploads.get(upload_id)
+            if upload is None:
+                return {
+                    'success': False,
+                    'error': 'Upload not found',
+                    'error_type': 'not_found'
                 }
+            return {
+                'success': True,
+                'upload': upload
             }
-            
-        except DriveClientError as e:
-            logger.error(f"Drive client error uploading file: {e}")
+        except Exception as e:
+            logger.error(f"Unexpected error reading upload {upload_id}: {e}")
+            return {
+                'success': False,
+                'error': f"An unexpected error occurred: {str(e)}"
+            }
+
+    def resume_upload(self, upload_id):
+        """Continue a failed or interrupted upload from where Drive left off"""
+        try:
+            return {
+                'success': True,
+                'message': 'Upload resumed',
+                'upload': self.uploads.resume(upload_id)
+            }
+        except UploadError as e:
             return {
                 'success': False,
                 'error': str(e)
             }
         except Exception as e:
-            logger.error(f"Unexpected error uploading file: {e}")
+            logger.error(f"Unexpected error resuming upload {upload_id}: {e}")
             return {
                 'success': False,
                 'error': f"An unexpected error occurred: {str(e)}"
@@ -244,6 +360,46 @@ class DocsService:
                 'error': f"An unexpected error occurred: {str(e)}"
             }
 
+    def stream_document(self, file_id, range_header=None):
+        """
+        Open a streaming download of a document from Google Drive
+        
+        Args:
+            file_id: Google Drive file ID
+            range_header: the client's HTTP Range header, if any
+        
+        Returns:
+            dict with success status, a DriveDownload to iterate, and metadata
+        """
+        try:
+            download = self.client.open_download(file_id, range_header=range_header)
+            
+            return {
+                'success': True,
+                'download': download,
+                'metadata': download.metadata
+            }
+            
+        except RangeNotSatisfiableError as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'range_not_satisfiable': True,
+                'size': e.size
+            }
+        except DriveClientError as e:
+            logger.error(f"Drive client error downloading document: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+        except Exception as e:
+            logger.error(f"Unexpected error downloading document: {e}")
+            return {
+                'success': False,
+                'error': f"An unexpected error occurred: {str(e)}"
+            }
+
     def rename_document(self, file_id, new_name):
         """
         Rename a document
@@ -257,6 +413,7 @@ class DocsService:
         """
         try:
             file = self.client.rename_file(file_id, new_name)
+            self._mirror_changed(changed=[self.client.normalize_file(file)])
             
             return {
                 'success': True,
@@ -300,6 +457,7 @@ class DocsService:
         """
         try:
             self.client.delete_file(file_id)
+            self._mirror_changed(removed=[file_id])
             
             return {
                 'success': True,
@@ -326,6 +484,43 @@ class DocsService:
                 'error': f"An unexpected error occurred: {str(e)}"
             }
 
+    def batch_documents(self, operations):
+        """
+        Delete / rename / move / fetch metadata of many documents at once
+        
+        Args:
+            operations: list of {'op', 'id', ...} dicts (see DriveClient.batch)
+        
+        Returns:
+            dict with success status, per-operation results and counts
+        """
+        try:
+            results = self.client.batch(operations)
+            succeeded = sum(1 for r in results if r['success'])
+            written = [r for r in results if r['success'] and r['op'] != 'metadata']
+            self._mirror_changed(changed=[r['file'] for r in written if r['op'] != 'delete' and r.get('file')],
+                                 removed=[r['id'] for r in written if r['op'] == 'delete'])
+            
+            return {
+                'success': True,
+                'results': results,
+                'succeeded': succeeded,
+                'failed': len(results) - succeeded
+            }
+            
+        except DriveClientError as e:
+            logger.error(f"Drive client error in batch operation: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+        except Exception as e:
+            logger.error(f"Unexpected error in batch operation: {e}")
+            return {
+                'success': False,
+                'error': f"An unexpected error occurred: {str(e)}"
+            }
+
     def create_folder(self, name, parent_id=None):
         """
         Create a new folder in Google Drive
@@ -339,6 +534,7 @@ class DocsService:
         """
         try:
             folder = self.client.create_folder(name, parent_id)
+            self._mirror_changed(changed=[self.client.normalize_file(folder)])
             
             return {
                 'success': True,
@@ -432,19 +628,19 @@ class DocsService:
             drive_query = f"fullText contains '{query}' or name contains '{query}'"
             drive_query += " and trashed = false"
             
-            # Use list_files with a custom query
-            # Note: This is a simplified implementation
-            # You may want to add a search method to DriveClient for better control
-            documents = self.client.list_files(
-                limit=limit,
-                order_by='modifiedTime desc'
-            )
-            
-            # Filter documents by query (client-side filtering as fallback)
-            filtered = [
-                doc for doc in documents 
-                if query.lower() in doc['name'].lower()
-            ][:limit]
+            # Name search runs against the local mirror
+            filtered = self._from_mirror(lambda repo: repo.search(query, limit))
+            if filtered is None:
+                documents = self.client.list_files(
+                    limit=limit,
+                    order_by='modifiedTime desc'
+                )
+                
+                # Filter documents by query (client-side filtering as fallback)
+                filtered = [
+                    doc for doc in documents 
+                    if query.lower() in doc['name'].lower()
+                ][:limit]
             
             return {
                 'success': True,
@@ -0,0 +1,139 @@
+import os
+import logging
+import threading
+from datetime import datetime, timedelta
+from clients.drive_client import ChangesTokenError
+from repositories.repository_factory import RepositoryFactory
+
+logger = logging.getLogger(__name__)
+
+# How stale the mirror may get before a read pulls changes from Drive first
+SYNC_INTERVAL = timedelta(seconds=int(os.getenv('DRIVE_SYNC_INTERVAL', 30)))
+
+
+class DriveMirrorNotReady(Exception):
+    """The first full sync has not finished yet: read live Drive meanwhile"""
+    pass
+
+
+class DriveSyncService:
+    """
+    Keeps the drive_file mirror current.
+
+    Reads call ensure_fresh(), which never syncs inline: when the mirror is
+    stale (older than DRIVE_SYNC_INTERVAL, or marked stale by a write) it
+    starts a background sync and the read is served from the current mirror.
+    The first sync is a full listing, later ones apply changes().list from
+    the stored page token. Syncs run outside any request, so every write
+    commits on its own, under a MySQL named lock so only one process syncs
+    at a time; the sync state lives in MySQL, so every worker shares one
+    page token.
+    """
+    # One background sync per process; the named lock covers the others
+    _lock = threading.Lock()
+    _running = False
+
+    def __init__(self, client, repository=None):
+        self.client = client
+        self.repository = repository or RepositoryFactory.get_repository("drive_file")
+        self.background = None      # thread of the last background sync started here
+
+    def ensure_fresh(self):
+        """
+        Start a background sync if the mirror is stale. Returns True if one was started.
+        Raises DriveMirrorNotReady until the first full sync has been stored.
+        """
+        state = self.repository.get_sync_state()
+        started = self._is_stale(state) and self._start_background_sync()
+        if not state or not state.get('page_token'):
+            raise DriveMirrorNotReady("The Drive mirror is still being built")
+        return started
+
+    def _start_background_sync(self):
+        with DriveSyncService._lock:
+            if DriveSyncService._running:
+                return False
+            DriveSyncService._running = True
+        try:
+            self.background = threading.Thread(target=self._background_sync, name="drive-sync", daemon=True)
+            self.background.start()
+        except Exception:
+            with DriveSyncService._lock:
+                DriveSyncService._running = False
+            raise
+        return True
+
+    def _background_sync(self):
+        try:
+            self.sync_exclusive()
+        except Exception as e:
+            logger.warning(f"Background Drive sync failed: {e}")
+        finally:
+            with DriveSyncService._lock:
+                DriveSyncService._running = False
+
+    def sync_exclusive(self, full=False, wait=0):
+        """
+        sync() (or full_sync()) holding the cross-process sync lock.
+        Returns the sync's result, or None if another process was syncing
+        (for longer than `wait` seconds) or the mirror turned out to be fresh.
+        """
+        with self.repository.sync_lock(timeout=wait) as acquired:
+            if not acquired:
+                return None
+            if full:
+                return self.full_sync()
+            state = self.repository.get_sync_state()
+            if not self._is_stale(state):
+                return None
+            return self.sync(state)
+
+    @staticmethod
+    def _is_stale(state):
+        if not state or not state.get('page_token'):
+            return True
+        synced_at = state.get('synced_at')
+        return synced_at is None or datetime.utcnow() - synced_at >= SYNC_INTERVAL
+
+    def sync(self, state=None):
+        """Incremental sync from the stored page token (full sync if there is none)."""
+        state = state if state is not None else self.repository.get_sync_state()
+        if not state or not state.get('page_token'):
+            return self.full_sync()
+        try:
+            changed, removed, page_token = self.client.list_changes(state['page_token'])
+        except ChangesTokenError as e:
+            logger.warning(f"Drive changes token expired, resyncing: {e}")
+            return self.full_sync()
+
+        self.repository.apply_changes(changed, removed)
+        self.repository.save_sync_state(page_token)
+        return {'mode': 'changes', 'changed': len(changed), 'removed': len(removed)}
+
+    def full_sync(self):
+        # Token first: anything changed while we list is replayed by the next changes() call
+        page_token = self.client.get_start_page_token()
+        files = list(self.client.iter_all_files())
+        self.repository.replace_all(files)
+        self.repository.save_sync_state(page_token, full=True)
+        return {'mode': 'full', 'files': len(files)}
+
+    def record_write(self, changed_files=(), removed_ids=()):
+        """
+        After a write through this app: store the files Drive returned for it
+        (normalized) and drop the removed ids, so the very next listing shows
+        the write. The mirror is also marked stale, so that read pulls in
+        whatever else Drive changed meanwhile.
+        """
+        try:
+            self.repository.apply_changes(list(changed_files), list(removed_ids))
+        except Exception as e:
+            logger.warning(f"Could not apply write to Drive mirror: {e}")
+        self.mark_stale()
+
+    def mark_stale(self):
+        """The next read pulls changes first."""
+        try:
+            self.repository.mark_stale()
+        except Exception as e:
+            logger.warning(f"Could not mark Drive mirror stale: {e}")
@@ -0,0 +1,186 @@
+import os
+import uuid
+import logging
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.utils import secure_filename
+from clients.drive_client import UploadSessionExpiredError
+from core import unit_of_work
+from repositories.repository_factory import RepositoryFactory
+
+logger = logging.getLogger(__name__)
+
+# Incoming files are spooled here until Drive has all of them
+UPLOAD_DIR = os.getenv('DRIVE_UPLOAD_DIR') or os.path.join(tempfile.gettempdir(), 'aipms-uploads')
+# An 'uploading' job whose progress hasn't moved for this long is treated as interrupted
+STALE_AFTER = timedelta(seconds=int(os.getenv('DRIVE_UPLOAD_STALE_AFTER', 300)))
+
+_upload_executor = ThreadPoolExecutor(max_workers=int(os.getenv('DRIVE_UPLOAD_WORKERS', 2)),
+                                      thread_name_prefix="drive-upload")
+
+
+class UploadError(Exception):
+    """An upload job that cannot be started or resumed"""
+    pass
+
+
+class DriveUploadService:
+    """
+    Background, resumable uploads to Drive.
+
+    The request thread only spools the file to UPLOAD_DIR and records a job.
+    A worker opens a Drive resumable session, stores its URI, then PUTs the
+    file in chunks and records the bytes Drive acknowledged after each one.
+    If the worker or process dies, resume() re-attaches to the stored session
+    and Drive says where to carry on; only an expired session starts over.
+    on_complete(file) gets the Drive file each finished upload created.
+    """
+    # Jobs queued or running in this process, so polling never double-submits
+    _active = set()
+    _active_lock = threading.Lock()
+
+    def __init__(self, client, repository=None, executor=None, on_complete=None):
+        self.client = client
+        self.repository = repository or RepositoryFactory.get_repository("drive_upload")
+        self.executor = executor or _upload_executor
+        self.on_complete = on_complete
+
+    def start(self, file_obj, folder_id=None):
+        """Spool an uploaded werkzeug FileStorage and queue it. Returns the new job."""
+        filename = secure_filename(file_obj.filename or '')
+        if not filename:
+            raise UploadError("Invalid filename")
+        mime_type = file_obj.content_type or 'application/octet-stream'
+
+        upload_id = uuid.uuid4().hex
+        os.makedirs(UPLOAD_DIR, exist_ok=True)
+        spool_path = os.path.join(UPLOAD_DIR, upload_id)
+        file_obj.save(spool_path)
+        try:
+            self.repository.create(upload_id, filename, mime_type, folder_id, spool_path,
+                                   os.path.getsize(spool_path))
+        except Exception:
+            os.remove(spool_path)
+            raise
+
+        # Inside a request the row only exists for other connections once the request commits
+        unit_of_work.after_commit(lambda: self._submit(upload_id))
+        return self.get(upload_id)
+
+    def get(self, upload_id):
+        """Progress of one job; an interrupted job is resumed as a side effect of being polled."""
+        upload = self.repository.get(upload_id)
+        if upload is None:
+            return None
+        if self._is_interrupted(upload) and upload_id not in self._active:
+            logger.warning(f"Upload {upload_id} stopped making progress, resuming")
+            self._submit(upload_id)
+        return self._describe(upload)
+
+    def resume(self, upload_id):
+        """Re-queue a failed or interrupted upload."""
+        upload = self.repository.get(upload_id)
+        if upload is None:
+            raise UploadError("Upload not found")
+        if upload['status'] == 'completed':
+            raise UploadError("Upload already completed")
+        if not os.path.exists(upload['spool_path']):
+            raise UploadError("Uploaded file is no longer available, please upload it again")
+        self._submit(upload_id)
+        return self._describe(upload)
+
+    def resume_interrupted(self):
+        """Re-queue every interrupted upload whose spooled file still exists (e.g. after a restart)."""
+        resumed = []
+        for upload in self.repository.list_interrupted(int(STALE_AFTER.total_seconds())):
+            if os.path.exists(upload['spool_path']):
+                self._submit(upload['upload_id'])
+                resumed.append(upload['upload_id'])
+        return resumed
+
+    def _submit(self, upload_id):
+        with self._active_lock:
+            if upload_id in self._active:
+                return
+            self._active.add(upload_id)
+        try:
+            self.executor.submit(self._run_and_release, upload_id)
+        except Exception:
+            with self._active_lock:
+                self._active.discard(upload_id)
+            raise
+
+    def _run_and_release(self, upload_id):
+        try:
+            self.run(upload_id)
+        finally:
+            with self._active_lock:
+                self._active.discard(upload_id)
+
+    def run(self, upload_id):
+        """Transfer one upload to Drive (worker side). Safe to call again after any failure."""
+        if not self.repository.claim(upload_id, int(STALE_AFTER.total_seconds())):
+            return
+        upload = self.repository.get(upload_id)
+        try:
+            with open(upload['spool_path'], 'rb') as stream:
+                file = self._transfer(upload, stream)
+        except Exception as e:
+            logger.error(f"Upload {upload_id} failed: {e}")
+            self.repository.mark_failed(upload_id, str(e))
+            return
+
+        self.repository.mark_completed(upload_id, file.get('id'))
+        try:
+            os.remove(upload['spool_path'])
+        except OSError as e:
+            logger.warning(f"Could not remove spooled upload {upload['spool_path']}: {e}")
+        if self.on_complete:
+            self.on_complete(file)
+
+    def _transfer(self, upload, stream):
+        upload_id, total = upload['upload_id'], upload['total_bytes']
+        session_uri, offset = upload['session_uri'], 0
+        if session_uri:
+            try:
+                offset, file = self.client.query_upload(session_uri, total)
+                if file is not None:
+                    return file
+                logger.info(f"Resuming upload {upload_id} at {offset}/{total} bytes")
+            except UploadSessionExpiredError:
+                logger.warning(f"Upload session for {upload_id} expired, starting over")
+                session_uri = None
+
+        if not session_uri:
+            session_uri = self.client.start_resumable_upload(upload['filename'], upload['mime_type'], total,
+                                                             folder_id=upload['folder_id'])
+            self.repository.save_session(upload_id, session_uri)
+            offset = 0
+        else:
+            self.repository.update_progress(upload_id, offset)
+
+        return self.client.upload_chunks(session_uri, stream, total, offset=offset,
+                                         on_progress=lambda sent: self.repository.update_progress(upload_id, sent))
+
+    @staticmethod
+    def _is_interrupted(upload):
+        if upload['status'] not in ('queued', 'uploading'):
+            return False
+        return (datetime.utcnow() - upload['updated_at'] >= STALE_AFTER
+                and os.path.exists(upload['spool_path']))
+
+    @staticmethod
+    def _describe(upload):
+        total, sent = upload['total_bytes'], upload['bytes_sent']
+        return {
+            'upload_id': upload['upload_id'],
+            'filename': upload['filename'],
+            'status': upload['status'],
+            'bytes_sent': sent,
+            'total_bytes': total,
+            'percent': round(sent * 100 / total, 1) if total else (100 if upload['status'] == 'completed' else 0),
+            'file_id': upload['file_id'],
+            'error': upload['error']
+        }
@@ -1,5 +1,53 @@
+import os
 import requests
 from flask import current_app
+from clients.github_client import get_github_client, GitHubClientError
+from repositories.repository_factory import RepositoryFactory
+from repositories.github_repository import parse_github_time
+
+# How much history a backfill pulls per repo
+BACKFILL_COMMITS = 100
+BACKFILL_PULLS = 100
+DASHBOARD_PULLS_PER_REPO = 10
+# Stored history is served while the repo was backfilled or got a webhook event
+# this recently; older copies are re-backfilled (repos without a webhook never get events)
+GITHUB_STORE_TTL = int(os.getenv('GITHUB_STORE_TTL', 900))
+
+
+def _commit_from_api(c):
+    return {
+        'sha': c['sha'],
+        'message': c['commit']['message'],
+        'author_name': c['commit']['author']['name'],
+        'author_login': (c.get('author') or {}).get('login'),
+        'committed_at': parse_github_time(c['commit']['author']['date']),
+        'url': c['html_url']
+    }
+
+
+def _commit_from_push(c):
+    # Push payload commits have a different shape from the REST API's
+    return {
+        'sha': c['id'],
+        'message': c.get('message'),
+        'author_name': (c.get('author') or {}).get('name'),
+        'author_login': (c.get('author') or {}).get('username'),
+        'committed_at': parse_github_time(c.get('timestamp')),
+        'url': c.get('url')
+    }
+
+
+def _pull_request_from_api(pr):
+    return {
+        'number': pr['number'],
+        'title': pr['title'],
+        'user_login': pr['user']['login'],
+        'state': pr['state'],
+        'merged_at': parse_github_time(pr.get('merged_at')),
+        'created_at': parse_github_time(pr['created_at']),
+        'updated_at': parse_github_time(pr.get('updated_at') or pr['created_at']),
+        'url': pr['html_url']
+    }
 
 class GitHubService:
     @staticmethod
@@ -26,7 +74,8 @@ class GitHubService:
         }
         headers = {"Accept": "application/json"}
         
-        response = requests.post(token_url, data=payload, headers=headers)
+        response = requests.post(token_url, data=payload, headers=headers,
+                                 timeout=get_github_client().timeout)
         if response.status_code == 200:
             return response.json().get("access_token")
         return None
@@ -41,47 +90,34 @@ class GitHubService:
         if not access_token:
             return []
 
-        headers = {
-            "Authorization": f"token {access_token}",
-            "Accept": "application/json"
-        }
-        
         # Fetch up to 100 repos sorted by updated time
-        url = "https://api.github.com/user/repos?sort=updated&per_page=100"
+        url = "/user/repos?sort=updated&per_page=100"
         
         try:
-            resp = requests.get(url, headers=headers)
-            if resp.status_code == 200:
-                raw_repos = resp.json()
-                cleaned_repos = []
-                
-                for r in raw_repos:
-                    # We manually build the dict to ensure all keys exist
-                    cleaned_repos.append({
-                        'id': r.get('id'),
-                        'name': r.get('name'),
-                        'full_name': r.get('full_name'),   # Needed for Project Link
-                        'language': r.get('language') or 'N/A',
-                        'updated_at': r.get('updated_at'), # Needed for Repo Table
-                        'html_url': r.get('html_url'),     # Needed for links
-                        'private': r.get('private', False),
-                        'archived': r.get('archived', False),
-                        # Ensure 'owner' is a dictionary with 'login'
-                        'owner': r.get('owner', {'login': 'Unknown'}) 
-                    })
-                return cleaned_repos
-            return []
+            raw_repos = get_github_client().get(url, access_token)
+            cleaned_repos = []
+            
+            for r in raw_repos:
+                # We manually build the dict to ensure all keys exist
+                cleaned_repos.append({
+                    'id': r.get('id'),
+                    'name': r.get('name'),
+                    'full_name': r.get('full_name'),   # Needed for Project Link
+                    'language': r.get('language') or 'N/A',
+                    'updated_at': r.get('updated_at'), # Needed for Repo Table
+                    'html_url': r.get('html_url'),     # Needed for links
+                    'private': r.get('private', False),
+                    'archived': r.get('archived', False),
+                    # Ensure 'owner' is a dictionary with 'login'
+                    'owner': r.get('owner', {'login': 'Unknown'}) 
+                })
+            return cleaned_repos
         except Exception as e:
             print(f"GitHub API Error: {e}")
             return []
     @staticmethod
     def create_repository(access_token, name, description, is_private):
         """Creates a new repository on GitHub"""
-        api_url = "https://api.github.com/user/repos"
-        headers = {
-            "Authorization": f"token {access_token}",
-            "Accept": "application/json"
-        }
         payload = {
             "name": name,
             "description": description,
@@ -89,57 +125,163 @@ class GitHubService:
             "auto_init": True  # Automatically add a README
         }
         
-        response = requests.post(api_url, json=payload, headers=headers)
+        response = get_github_client().post("/user/repos", access_token, payload)
         return response
     # ... inside class GitHubService ...
     @staticmethod
     def get_project_commits(access_token, repo_full_name):
         """
-        Fetches the last 10 commits for a SPECIFIC repository.
+        Last 10 commits of a SPECIFIC repository.
         repo_full_name example: 'owner/repo-name'
+        Served from the local store while it is fresh (see GITHUB_STORE_TTL),
+        otherwise fetched from GitHub and stored. The caller's token must be able
+        to see the repo either way, so private history is not shown to anyone else.
         """
-        if not access_token or not repo_full_name:
+        if not repo_full_name or not access_token:
             return []
 
-        headers = {
-            "Authorization": f"token {access_token}",
-            "Accept": "application/json"
-        }
-        
-        # GitHub API URL for a specific repo's commits
-        url = f"https://api.github.com/repos/{repo_full_name}/commits?per_page=10"
-        
         try:
-            resp = requests.get(url, headers=headers)
-            if resp.status_code == 200:
-                commits = []
-                for c in resp.json():
-                    commits.append({
-                        'message': c['commit']['message'],
-                        'author': c['commit']['author']['name'],
-                        'date': c['commit']['author']['date'].split('T')[0],
-                        'url': c['html_url'],
-                        'sha': c['sha'][:7]
-                    })
-                return commits
+            # Conditional request through the per-token ETag cache: cheap on repeat views
+            get_github_client().get(f"/repos/{repo_full_name}", access_token)
+        except GitHubClientError as e:
+            print(f"GitHub access check failed for {repo_full_name}: {e}")
             return []
+
+        store = GitHubService._store()
+        try:
+            if store and store.get_fresh_repos([repo_full_name], GITHUB_STORE_TTL):
+                return store.get_commits(repo_full_name, limit=10)
         except Exception as e:
-            print(f"GitHub API Error: {e}")
-            return []
+            print(f"GitHub store error: {e}")
+
+        result = GitHubService.backfill_repo(access_token, repo_full_name)
+        return [GitHubService._format_commit(c) for c in result['commits'][:10]]
+
+    # --------------------------------------------------
+    # LOCAL STORE: webhook events + backfill
+    # --------------------------------------------------
+    @staticmethod
+    def _store():
+        try:
+            return RepositoryFactory.get_repository("github")
+        except Exception as e:
+            print(f"GitHub store unavailable: {e}")
+            return None
+
+    @staticmethod
+    def _format_commit(c):
+        return {
+            'message': c['message'],
+            'author': c['author_name'],
+            'date': c['committed_at'].strftime('%Y-%m-%d') if c['committed_at'] else '',
+            'url': c['url'],
+            'sha': c['sha'][:7]
+        }
+
+    @staticmethod
+    def _format_pull_request(pr):
+        return {
+            'title': pr['title'],
+            'user': pr['user_login'],
+            'state': pr['state'],
+            'status': 'merged' if pr['merged_at'] else pr['state'],
+            'url': pr['url'],
+            'created_at': pr['created_at'].strftime('%Y-%m-%d') if pr['created_at'] else ''
+        }
+
+    @staticmethod
+    def _backfill_paths(repo_full_name):
+        base = f"/repos/{repo_full_name}"
+        return (f"{base}/commits?per_page={BACKFILL_COMMITS}",
+                f"{base}/pulls?state=all&per_page={BACKFILL_PULLS}",
+                f"{base}/branches")
+
+    @staticmethod
+    def backfill_repos(access_token, repo_full_names):
+        """
+        Pull recent commits, PRs and branches of several repos from GitHub (concurrently)
+        and upsert them into the local store. Used for repos linked before the webhook
+        existed. Returns {repo: {'commits', 'pull_requests', 'branches', 'errors', 'stored'}}.
+        """
+        paths = [path for repo in repo_full_names for path in GitHubService._backfill_paths(repo)]
+        results, failed = get_github_client().get_many(paths, access_token)
+        store = GitHubService._store()
+
+        report = {}
+        for repo in repo_full_names:
+            commits_path, pulls_path, branches_path = GitHubService._backfill_paths(repo)
+            entry = {
+                'commits': [_commit_from_api(c) for c in results.get(commits_path, [])],
+                'pull_requests': [_pull_request_from_api(pr) for pr in results.get(pulls_path, [])],
+                'branches': results.get(branches_path, []),
+                'errors': [p for p in (commits_path, pulls_path, branches_path) if p in failed],
+                'stored': False
+            }
+            report[repo] = entry
+            if store is None:
+                continue
+            try:
+                store.upsert_commits(repo, entry['commits'])
+                store.upsert_pull_requests(repo, entry['pull_requests'])
+                for branch in entry['branches']:
+                    store.upsert_branch(repo, branch['name'], branch['commit']['sha'], branch.get('protected', False))
+                # Only a complete copy may be served from the store
+                if not entry['errors']:
+                    store.mark_backfilled(repo)
+                    entry['stored'] = True
+            except Exception as e:
+                print(f"GitHub store error while backfilling {repo}: {e}")
+        return report
+
+    @staticmethod
+    def backfill_repo(access_token, repo_full_name):
+        return GitHubService.backfill_repos(access_token, [repo_full_name])[repo_full_name]
+
+    @staticmethod
+    def handle_webhook_event(event_type, delivery_id, payload):
+        """
+        Persist a push / pull_request delivery. Idempotent: a delivery ID that was
+        already processed is ignored. Returns True if anything was written.
+        """
+        repo_full_name = (payload.get('repository') or {}).get('full_name')
+        if event_type not in ('push', 'pull_request') or not repo_full_name:
+            return False
+
+        store = RepositoryFactory.get_repository("github")
+        if delivery_id and not store.record_delivery(delivery_id, event_type, repo_full_name):
+            return False
+
+        if event_type == 'push':
+            ref = payload.get('ref') or ''
+            branch = ref[len('refs/heads/'):] if ref.startswith('refs/heads/') else None
+            store.upsert_commits(repo_full_name, [_commit_from_push(c) for c in payload.get('commits', [])],
+                                 branch=branch, delivery_id=delivery_id)
+            if branch:
+                if payload.get('deleted'):
+                    store.delete_branch(repo_full_name, branch)
+                elif payload.get('after'):
+                    store.upsert_branch(repo_full_name, branch, payload['after'])
+        else:
+            store.upsert_pull_requests(repo_full_name, [_pull_request_from_api(payload['pull_request'])],
+                                       delivery_id=delivery_id)
+        return True
+
     @staticmethod
     def get_dashboard_activity(access_token):
         if not access_token:
             return None
 
-        headers = {
-            "Authorization": f"token {access_token}",
-            "Accept": "application/json"
-        }
-        
-        # 1. Fetch User's Repos
-        repos_url = "https://api.github.com/user/repos?sort=updated&per_page=10"
-        repos_resp = requests.get(repos_url, headers=headers)
-        repos = repos_resp.json() if repos_resp.status_code == 200 else []
+        client = get_github_client()
+        errors = []
+
+        # 1. Fetch User's Repos (revalidated through the ETag cache)
+        repos_url = "/user/repos?sort=updated&per_page=10"
+        try:
+            repos = client.get(repos_url, access_token)
+        except GitHubClientError as e:
+            print(f"GitHub API Error: {e}")
+            repos = []
+            errors.append(repos_url)
 
         dashboard_data = {
             'repos_list': [],
@@ -147,12 +289,26 @@ class GitHubService:
             'commits': [],
             'pull_requests': [],
             'branches': [], # ✅ NEW: Store branches here
-            'languages': {} 
+            'languages': {},
+            'errors': errors  # Calls that failed; the rest of the page still renders
         }
 
-        for repo in repos:
+        # 2. Repos with a fresh copy in the local store are read from MySQL; the rest
+        # (new or stale) are fetched from GitHub concurrently and stored again
+        full_names = [f"{repo['owner']['login']}/{repo['name']}" for repo in repos]
+        store = GitHubService._store()
+        local = set()
+        try:
+            if store:
+                local = store.get_fresh_repos(full_names, GITHUB_STORE_TTL)
+        except Exception as e:
+            print(f"GitHub store error: {e}")
+
+        remote = GitHubService.backfill_repos(access_token, [n for n in full_names if n not in local])
+
+        # 3. Merge in repo order so the output does not depend on which call finished first
+        for repo, full_name in zip(repos, full_names):
             repo_name = repo['name']
-            owner = repo['owner']['login']
             dashboard_data['repos_list'].append(repo_name)
 
             # A. Languages
@@ -160,52 +316,40 @@ class GitHubService:
             if lang:
                 dashboard_data['languages'][lang] = dashboard_data['languages'].get(lang, 0) + 1
 
-            # B. Commits (Increased limit to 100 per repo)
-            commits_url = f"https://api.github.com/repos/{owner}/{repo_name}/commits?per_page=100"
-            c_resp = requests.get(commits_url, headers=headers)
-            if c_resp.status_code == 200:
-                for commit in c_resp.json():
-                    dashboard_data['commits'].append({
-                        'repo': repo_name,
-                        'message': commit['commit']['message'],
-                        'author': commit['commit']['author']['name'],
-                        'date': commit['commit']['author']['date'].split('T')[0],
-                        'url': commit['html_url'],
-                        'sha': commit['sha'][:7]
-                    })
-                    dashboard_data['stats']['recent_commits'] += 1
+            if full_name in local:
+                commits = store.get_commits(full_name, limit=BACKFILL_COMMITS)
+                pull_requests = store.get_pull_requests(full_name, limit=DASHBOARD_PULLS_PER_REPO)
+                branches = store.get_branches(full_name)
+            else:
+                fetched = remote[full_name]
+                errors.extend(fetched['errors'])
+                commits = [GitHubService._format_commit(c) for c in fetched['commits']]
+                pull_requests = [GitHubService._format_pull_request(pr)
+                                 for pr in fetched['pull_requests'][:DASHBOARD_PULLS_PER_REPO]]
+                branches = [{
+                    'name': b['name'],
+                    'protected': b.get('protected', False),
+                    'sha': b['commit']['sha'][:7]
+                } for b in fetched['branches']]
+
+            # B. Commits
+            for commit in commits:
+                dashboard_data['commits'].append({'repo': repo_name, **commit})
+                dashboard_data['stats']['recent_commits'] += 1
 
             # C. Pull Requests
-            prs_url = f"https://api.github.com/repos/{owner}/{repo_name}/pulls?state=all&per_page=10"
-            p_resp = requests.get(prs_url, headers=headers)
-            if p_resp.status_code == 200:
-                for pr in p_resp.json():
-                    status = 'merged' if pr.get('merged_at') else pr['state']
-                    dashboard_data['pull_requests'].append({
-                        'repo': repo_name,
-                        'title': pr['title'],
-                        'user': pr['user']['login'],
-                        'status': status,
-                        'url': pr['html_url'],
-                        'created_at': pr['created_at'].split('T')[0]
-                    })
-                    if pr['state'] == 'open':
-                        dashboard_data['stats']['open_prs'] += 1
-
-            # D. ✅ NEW: Fetch Branches
-            branches_url = f"https://api.github.com/repos/{owner}/{repo_name}/branches"
-            b_resp = requests.get(branches_url, headers=headers)
-            if b_resp.status_code == 200:
-                for branch in b_resp.json():
-                    dashboard_data['branches'].append({
-                        'repo': repo_name,
-                        'name': branch['name'],
-                        'protected': branch.get('protected', False),
-                        'sha': branch['commit']['sha'][:7]
-                    })
-                    dashboard_data['stats']['total_branches'] += 1
+            for pr in pull_requests:
+                state = pr.pop('state')
+                dashboard_data['pull_requests'].append({'repo': repo_name, **pr})
+                if state == 'open':
+                    dashboard_data['stats']['open_prs'] += 1
+
+            # D. ✅ NEW: Branches
+            for branch in branches:
+                dashboard_data['branches'].append({'repo': repo_name, **branch})
+                dashboard_data['stats']['total_branches'] += 1
 
         # Sort commits by date (newest first)
         dashboard_data['commits'].sort(key=lambda x: x['date'], reverse=True)
         
-        return dashboard_data
\ No newline at end of file
+        return dashboard_data
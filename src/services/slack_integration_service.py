@@ -1,7 +1,33 @@
 import os
-from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
-import time
+from clients.slack_client import get_slack_client, paginate, iter_items, next_cursor
+from clients.slack_directory import get_slack_directory
+from repositories.repository_factory import RepositoryFactory
+from core.pagination import encode_cursor, decode_cursor
+from core.pubsub import get_broker
+from core import unit_of_work
+
+# How far back a backfill goes per channel, and page size of history calls
+SLACK_BACKFILL_MAX_MESSAGES = int(os.getenv('SLACK_BACKFILL_MAX_MESSAGES', 2000))
+SLACK_HISTORY_PAGE_SIZE = 200
+# A channel whose backfill was queued but never finished is queued again after this
+BACKFILL_RETRY_AFTER = 600
+
+
+def _message_from_api(msg):
+    """conversations_history / Events API message -> slack_message row."""
+    return {
+        'ts': msg['ts'],
+        'thread_ts': msg.get('thread_ts'),
+        'user_id': msg.get('user'),
+        'username': msg.get('username') or (msg.get('bot_profile') or {}).get('name'),
+        'text': msg.get('text', ''),
+        'subtype': msg.get('subtype'),
+        'reply_count': msg.get('reply_count', 0),
+        'latest_reply': msg.get('latest_reply'),
+        'edited_ts': (msg.get('edited') or {}).get('ts')
+    }
+
 
 class SlackService:
     """Service for Slack integration with rate limit handling"""
@@ -14,21 +40,19 @@ class SlackService:
             integration_id: Optional integration ID to load from database
         """
         self.integration_id = integration_id
-        self._user_cache = {}
-        self._users_list_cache = None
-        self._users_list_cache_time = 0
-        self._cache_ttl = 3600  # Cache users list for 1 hour
+        # Users and channels are cached per process, not per service instance
+        self.directory = get_slack_directory()
         
         if integration_id:
             # Load from database (placeholder for future implementation)
-            self.client = WebClient(token=os.getenv('SLACK_BOT_TOKEN'))
+            self.client = get_slack_client(os.getenv('SLACK_BOT_TOKEN'))
             self.signing_secret = os.getenv('SLACK_SIGNING_SECRET')
         else:
-            # Use environment variables
+            # Use environment variables; the client (and its rate-limit budgets) is per process too
             bot_token = os.getenv('SLACK_BOT_TOKEN')
             if not bot_token:
                 raise ValueError("SLACK_BOT_TOKEN environment variable is not set. Please configure it in your .env file.")
-            self.client = WebClient(token=bot_token)
+            self.client = get_slack_client(bot_token)
             self.signing_secret = os.getenv('SLACK_SIGNING_SECRET')
         
         self.default_channel = os.getenv('SLACK_DEFAULT_CHANNEL', '#general')
@@ -51,6 +75,13 @@ class SlackService:
                 text=text,
                 username=user_name or "AIPMS Bot"
             )
+            # Show it from the local store and on open streams at once instead of waiting for the event
+            posted = {'channel': response['channel'], **(response.get('message') or {})}
+            try:
+                SlackService.store_event(posted)
+            except Exception as e:
+                print(f"[ERROR] Slack store write failed: {e}")
+            self.publish_event(posted)
             return {
                 "success": True,
                 "ts": response['ts'],  # Timestamp/Message ID
@@ -63,52 +94,235 @@ class SlackService:
                 "error": e.response['error']
             }
     
-    def get_channel_messages(self, channel, limit=50):
+    def get_channel_messages(self, channel, limit=50, before=None):
         """
         Get recent messages from a channel
         
         Args:
             channel: Channel ID or name
             limit: Number of messages to retrieve
+            before: Only messages older than this ts (keyset paging)
         
         Returns:
-            list: List of messages
+            list: List of messages, newest first
+        """
+        messages, _ = self.get_channel_messages_page(channel, limit, before=before)
+        return messages
+    
+    def get_channel_messages_page(self, channel, limit=50, before=None, cursor=None):
+        """
+        One page of a channel's messages, newest first, and the cursor of the
+        next (older) page or None.
+        
+        Served from the local store (fed by the Events API) once the channel
+        has been backfilled; until then straight from conversations_history.
+        The backfill stops at SLACK_BACKFILL_MAX_MESSAGES, so history older
+        than the store's oldest message is read live too.
+        The cursor is opaque to callers: it holds the oldest ts of the page,
+        and Slack's own next_cursor while the channel is served live, so it
+        stays valid if the channel gets backfilled in between.
+        
+        Raises ValueError on a cursor that was not made here.
         """
+        position = decode_cursor(cursor) if cursor else {}
+        before = position.get('before') or before
+        
+        store = SlackService._store()
         try:
-            response = self.client.conversations_history(
-                channel=channel,
-                limit=limit
-            )
-            
-            messages = []
-            user_ids = set()
-            
-            # Collect all unique user IDs first
-            for msg in response['messages']:
-                user_id = msg.get('user')
-                if user_id:
-                    user_ids.add(user_id)
+            if store and not position.get('live') and store.is_backfilled(channel):
+                rows, next_before = store.get_messages(channel, limit=limit, before_ts=before)
+                self._preload_users_cache()
+                messages = [self._format_message(row) for row in rows]
+                if next_before:
+                    return messages, encode_cursor({'before': next_before})
+                # The store ends here: continue with the older history from Slack
+                oldest = messages[-1]['timestamp'] if messages else before
+                if len(messages) == limit:
+                    return messages, encode_cursor({'before': oldest, 'live': True})
+                older, page_cursor = self._live_messages_page(channel, limit - len(messages), before=oldest)
+                return messages + older, page_cursor
+        except Exception as e:
+            print(f"[ERROR] Slack store read failed: {e}")
+        
+        return self._live_messages_page(channel, limit, before=before, slack_cursor=position.get('slack'))
+    
+    def _live_messages_page(self, channel, limit, before=None, slack_cursor=None):
+        """conversations_history page older than `before` (or from Slack's cursor), and the next page's cursor"""
+        try:
+            params = {'channel': channel, 'limit': limit}
+            if slack_cursor:
+                params['cursor'] = slack_cursor
+            elif before:
+                params['latest'] = before
+            response = self.client.conversations_history(**params)
             
             # Load all users once and cache them
             self._preload_users_cache()
             
             # Build messages with user info from cache
-            for msg in response['messages']:
-                user_id = msg.get('user', '')
-                user_info = self._get_user_from_cache(user_id)
-                
-                messages.append({
-                    'text': msg.get('text', ''),
-                    'user': user_info.get('real_name', 'Unknown'),
-                    'timestamp': msg.get('ts', ''),
-                    'time': self._format_timestamp(msg.get('ts', '')),
-                })
-            
-            return messages
+            messages = [self._format_message(_message_from_api(msg)) for msg in response['messages']]
+            next_page = next_cursor(response)
+            page_cursor = None
+            if next_page and messages:
+                page_cursor = encode_cursor({'before': messages[-1]['timestamp'], 'slack': next_page})
+            return messages, page_cursor
         except SlackApiError as e:
             print(f"[ERROR] Slack get messages failed: {e.response['error']}")
+            return [], None
+    
+    def get_thread_replies(self, channel, thread_ts, limit=100):
+        """Replies of one thread, oldest first (local store, or conversations_replies)"""
+        store = SlackService._store()
+        try:
+            if store and store.is_backfilled(channel):
+                rows, _ = store.get_replies(channel, thread_ts, limit=limit)
+                self._preload_users_cache()
+                return [self._format_message(row) for row in rows]
+        except Exception as e:
+            print(f"[ERROR] Slack store read failed: {e}")
+        
+        try:
+            response = self.client.conversations_replies(channel=channel, ts=thread_ts, limit=limit + 1)
+            self._preload_users_cache()
+            return [self._format_message(_message_from_api(msg)) for msg in response['messages']
+                    if msg['ts'] != thread_ts]
+        except SlackApiError as e:
+            print(f"[ERROR] Slack get replies failed: {e.response['error']}")
             return []
     
+    def _format_message(self, row):
+        """slack_message row (or _message_from_api output) -> API shape used by chats.js"""
+        if row.get('user_id'):
+            user = self._get_user_from_cache(row['user_id']).get('real_name', 'Unknown')
+        else:
+            user = row.get('username') or 'Unknown'
+        return {
+            'text': row.get('text') or '',
+            'user': user,
+            'user_id': row.get('user_id'),
+            'timestamp': row['ts'],
+            'time': self._format_timestamp(row['ts']),
+            'thread_ts': row.get('thread_ts'),
+            'reply_count': row.get('reply_count') or 0,
+        }
+    
+    # --------------------------------------------------
+    # LOCAL STORE: Events API + backfill
+    # --------------------------------------------------
+    @staticmethod
+    def _store():
+        try:
+            return RepositoryFactory.get_repository("slack_message")
+        except Exception as e:
+            print(f"[ERROR] Slack store unavailable: {e}")
+            return None
+    
+    @staticmethod
+    def store_event(event):
+        """
+        Persist a 'message' event (new, edited, deleted or a thread reply).
+        Idempotent, so Slack's retried deliveries are harmless.
+        Returns the stored row, or None if nothing was stored.
+        """
+        channel = event.get('channel')
+        if not channel:
+            return None
+        store = RepositoryFactory.get_repository("slack_message")
+        
+        subtype = event.get('subtype')
+        if subtype == 'message_deleted':
+            store.mark_deleted(channel, event['deleted_ts'])
+            return None
+        message = event.get('message') if subtype == 'message_changed' else event
+        if not message or not message.get('ts'):
+            return None
+        
+        row = _message_from_api(message)
+        store.upsert_event_message(channel, row)
+        return row
+    
+    def publish_event(self, event):
+        """
+        Push a 'message' event to browsers streaming its channel
+        (GET /api/v1/slack/stream/<channel>) as 'message', 'reply', 'edited'
+        or 'deleted', once the request's transaction has committed (so a
+        client reloading on it already finds the stored message).
+        Returns True if the event was queued for publishing.
+        """
+        channel = event.get('channel')
+        if not channel:
+            return False
+        subtype = event.get('subtype')
+        try:
+            if subtype == 'message_deleted':
+                kind, data = "deleted", {"timestamp": event['deleted_ts']}
+            else:
+                message = event.get('message') if subtype == 'message_changed' else event
+                if not message or not message.get('ts'):
+                    return False
+                
+                row = _message_from_api(message)
+                if subtype == 'message_changed':
+                    kind = "edited"
+                elif row['thread_ts'] and row['thread_ts'] != row['ts']:
+                    kind = "reply"
+                else:
+                    kind = "message"
+                data = self._format_message(row)
+        except Exception as e:
+            print(f"[ERROR] Slack live publish failed: {e}")
+            return False
+        unit_of_work.after_commit(lambda: get_broker().publish(channel, kind, data))
+        return True
+    
+    def needs_backfill(self, channel):
+        """
+        True (once per BACKFILL_RETRY_AFTER) if the channel has no local history yet.
+        Backfilled channels are answered by a read, so page views don't write.
+        """
+        store = SlackService._store()
+        try:
+            return (bool(store) and not store.is_backfilled(channel)
+                    and store.request_backfill(channel, BACKFILL_RETRY_AFTER))
+        except Exception as e:
+            print(f"[ERROR] Slack store unavailable: {e}")
+            return False
+    
+    def backfill_channel(self, channel):
+        """
+        Copy a channel's history (and its threads) into the local store, for
+        channels that existed before events were enabled. Progress is saved
+        after every page, so a retried job resumes where it stopped.
+        Raises SlackApiError (the job queue retries it).
+        """
+        store = RepositoryFactory.get_repository("slack_message")
+        resume = (store.get_sync_state(channel) or {}).get('backfill_cursor')
+        stored = 0
+        
+        for page in paginate(self.client.conversations_history, channel=channel,
+                             limit=SLACK_HISTORY_PAGE_SIZE, cursor=resume):
+            messages = [_message_from_api(msg) for msg in page['messages']]
+            store.upsert_messages(channel, messages)
+            stored += len(messages)
+            for msg in messages:
+                if msg['reply_count']:
+                    stored += store.upsert_messages(channel, self._fetch_replies(channel, msg['ts']))
+            
+            if not next_cursor(page) or stored >= SLACK_BACKFILL_MAX_MESSAGES:
+                break
+            store.save_backfill_cursor(channel, next_cursor(page))
+        
+        store.mark_backfilled(channel)
+        print(f"[INFO] Backfilled {stored} Slack messages for {channel}")
+        return stored
+    
+    def _fetch_replies(self, channel, thread_ts):
+        # The parent comes back as the first message of every page
+        return [_message_from_api(msg) for msg in
+                iter_items(self.client.conversations_replies, 'messages', channel=channel, ts=thread_ts,
+                           limit=SLACK_HISTORY_PAGE_SIZE)
+                if msg['ts'] != thread_ts]
+    
     def get_channels(self):
         """
         Get list of all channels the bot has access to
@@ -116,62 +330,15 @@ class SlackService:
         Returns:
             list: List of channels with id and name
         """
-        try:
-            response = self.client.conversations_list(
-                types="public_channel,private_channel",
-                limit=100
-            )
-            
-            channels = []
-            for channel in response['channels']:
-                channels.append({
-                    'id': channel['id'],
-                    'name': channel['name'],
-                    'is_member': channel.get('is_member', False)
-                })
-            
-            return channels
-        except SlackApiError as e:
-            print(f"[ERROR] Slack get channels failed: {e.response['error']}")
-            return []
+        self.directory.ensure_channels(self.client)
+        return self.directory.channels()
     
     def _preload_users_cache(self):
         """
-        Preload all users into cache to avoid multiple API calls
-        Only fetches if cache is expired or empty
+        Make sure the shared users directory is loaded (one paginated
+        users_list per TTL for the whole process, refreshed in the background)
         """
-        current_time = time.time()
-        
-        # Check if cache is still valid
-        if self._users_list_cache and (current_time - self._users_list_cache_time) < self._cache_ttl:
-            return
-        
-        try:
-            print("[INFO] Preloading users cache...")
-            response = self.client.users_list()
-            
-            # Clear existing cache
-            self._user_cache = {}
-            
-            # Cache all users
-            for user in response['members']:
-                user_id = user['id']
-                user_info = {
-                    'real_name': user.get('real_name', user.get('name', 'Unknown')),
-                    'email': user.get('profile', {}).get('email', ''),
-                    'avatar': user.get('profile', {}).get('image_72', ''),
-                    'display_name': user.get('profile', {}).get('display_name', ''),
-                }
-                self._user_cache[user_id] = user_info
-            
-            self._users_list_cache = True
-            self._users_list_cache_time = current_time
-            print(f"[INFO] Cached {len(self._user_cache)} users")
-            
-        except SlackApiError as e:
-            print(f"[ERROR] Failed to preload users: {e.response['error']}")
-            # Don't fail completely, just use empty cache
-            self._users_list_cache = False
+        self.directory.ensure_users(self.client)
     
     def _get_user_from_cache(self, user_id):
         """
@@ -187,8 +354,9 @@ class SlackService:
             return {'real_name': 'Unknown', 'email': '', 'avatar': ''}
         
         # Try to get from cache
-        if user_id in self._user_cache:
-            return self._user_cache[user_id]
+        user_info = self.directory.user(user_id)
+        if user_info:
+            return user_info
         
         # If not in cache, return default
         # Don't make individual API calls to avoid rate limiting
@@ -212,22 +380,16 @@ class SlackService:
             return {'real_name': 'Unknown', 'email': ''}
         
         # Check cache first
-        if user_id in self._user_cache:
-            return self._user_cache[user_id]
+        user_info = self.directory.user(user_id)
+        if user_info:
+            return user_info
         
         # If not in cache, try to fetch (with rate limit protection)
         try:
             response = self.client.users_info(user=user_id)
-            user = response['user']
-            user_info = {
-                'real_name': user.get('real_name', user.get('name', 'Unknown')),
-                'email': user.get('profile', {}).get('email', ''),
-                'avatar': user.get('profile', {}).get('image_72', ''),
-                'display_name': user.get('profile', {}).get('display_name', ''),
-            }
             # Cache the result
-            self._user_cache[user_id] = user_info
-            return user_info
+            self.directory.apply_user(response['user'])
+            return self.directory.user(user_id)
         except SlackApiError as e:
             if e.response['error'] == 'ratelimited':
                 print(f"[WARNING] Rate limited when fetching user {user_id}, using cache")
@@ -1,5 +1,8 @@
 from models import task
 from repositories import task_repository
+from core.pagination import encode_cursor, decode_cursor
+
+MAX_PAGE_SIZE = 500
 
 class TaskService:
     def __init__(self):
@@ -11,6 +14,36 @@ class TaskService:
     def get_all_tasks(self):
         return self.task_repo.get_all()
 
+    def get_tasks_page(self, limit: int = 100, cursor: str = None, project_id: int = None,
+                       sprint_id: int = None, assigned_id: int = None,
+                       status: str = None, priority: str = None):
+        """
+        Returns (tasks, next_cursor) for one keyset page.
+        next_cursor is None when there are no more tasks.
+        """
+        if limit < 1 or limit > MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+        if status and status not in task.Status.__members__:
+            raise ValueError(f"Invalid status: {status}")
+        if priority and priority not in task.Priority.__members__:
+            raise ValueError(f"Invalid priority: {priority}")
+
+        after_id = decode_cursor(cursor).get("after") if cursor else None
+        if after_id is not None and not isinstance(after_id, int):
+            raise ValueError("Invalid cursor")
+
+        tasks, last_id = self.task_repo.get_page(
+            limit=limit,
+            after_id=after_id,
+            project_id=project_id,
+            sprint_id=sprint_id,
+            assigned_id=assigned_id,
+            status=status,
+            priority=priority
+        )
+        next_cursor = encode_cursor({"after": last_id}) if last_id is not None else None
+        return tasks, next_cursor
+
     def get_task_by_id(self, task_id: int):
         task_obj = self.task_repo.get_by_id(task_id)
         if not task_obj:
@@ -54,6 +87,19 @@ class TaskService:
     def get_user_overdue_tasks(self, user_id: int):
         return self.task_repo.get_user_overdue_tasks(user_id)
 
+    def get_dashboard_summary(self, project_id: int = None, user_id: int = None, limit: int = 5):
+        """
+        What the home page widgets need, computed by the database instead of
+        shipping every task to the browser: the next `limit` open deadlines
+        and the task count of every assignee.
+        """
+        if limit < 1 or limit > MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+        return {
+            "upcoming": self.task_repo.get_upcoming(limit=limit, project_id=project_id, user_id=user_id),
+            "assignees": self.task_repo.get_assignee_task_counts(project_id=project_id)
+        }
+
     def get_upcoming_tasks(self, user_id: int = None, limit: int = 5):
         return self.task_repo.get_backlog_tasks(
             user_id=user_id,
@@ -506,19 +506,15 @@ document.addEventListener('DOMContentLoaded', () => {
             if (!docRes.ok) throw new Error('Failed to fetch sprint data');
             const docData = await docRes.json();
 
-            // Generate AI summary
-            const aiRes = await fetch(`${DOCUMENTATION_API_URL}/sprint/${sprintId}/ai-summary`, {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                credentials: 'include',
-                body: JSON.stringify({ prompt: docData.ai_summary_prompt })
-            });
-
-            if (!aiRes.ok) throw new Error('AI generation failed');
-            const aiData = await aiRes.json();
+            // Generate AI summary, rendered as it streams in
+            const summary = await requestSummary(
+                `${DOCUMENTATION_API_URL}/sprint/${sprintId}/ai-summary`,
+                { prompt: docData.ai_summary_prompt },
+                text => { docContent.innerHTML = `<h4>🤖 AI Summary</h4><div>${simpleMarkdown(text)}</div>`; }
+            );
 
             // Display results
-            let summaryHtml = simpleMarkdown(aiData.summary);
+            let summaryHtml = simpleMarkdown(summary);
             
             docContent.innerHTML = `
                 <h3>${docData.sprint_info.name}</h3>
@@ -89,16 +89,8 @@ document.addEventListener('DOMContentLoaded', () => {
                 console.log('[SPRINTS] Loaded', allSprints.length, 'sprints');
             }
             
-            // Load all tasks
-            const tasksResponse = await fetch(TASKS_API_URL, {
-                method: 'GET',
-                credentials: 'include'
-            });
-            
-            if (tasksResponse.ok) {
-                allTasks = await tasksResponse.json();
-                console.log('[TASKS] Loaded', allTasks.length, 'tasks');
-            }
+            // Load tasks (filtered by project on the server)
+            await loadTasks();
             
             // Now render the board
             await loadTasksToBoard();
@@ -108,6 +100,15 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
+    async function loadTasks() {
+        try {
+            allTasks = await fetchTaskPages({ project_id: currentProjectFilter });
+            console.log('[TASKS] Loaded', allTasks.length, 'tasks');
+        } catch (err) {
+            console.error('[TASKS] Error loading tasks:', err);
+        }
+    }
+
     async function handleProjectFilterChange() {
         const projectFilter = document.getElementById('project-filter');
         const projectId = projectFilter.value;
@@ -118,6 +119,7 @@ document.addEventListener('DOMContentLoaded', () => {
         showNotification('Filtering board...', 'info');
         
         clearBoard();
+        await loadTasks();
         await loadTasksToBoard();
         
         showNotification('✓ Board filtered', 'success');
@@ -132,11 +134,10 @@ document.addEventListener('DOMContentLoaded', () => {
             return allTasks;
         }
         
-        // Get sprints for the current project
+        // allTasks is already filtered by project on the server; this only
+        // drops tasks added locally (quick add) that belong to another project
         const projectSprints = allSprints.filter(s => s.project_id === currentProjectFilter);
         const sprintIds = projectSprints.map(s => s.sprint_id);
-        
-        // Filter tasks by sprint IDs
         return allTasks.filter(t => sprintIds.includes(t.sprint_id));
     }
 
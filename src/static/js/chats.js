@@ -16,6 +16,10 @@ document.addEventListener('DOMContentLoaded', () => {
     
     const CURRENT_USER = { name: 'You', avatar: 'https://placehold.co/35x35/4a90e2/ffffff?text=Y' };
     let activeChannelId = null;
+    let summaryAbort = null; // Cancels an in-flight summary stream (and the generation behind it)
+    let history = null; // Scroll-back state of the open channel: { channelId, nextCursor, prefetch, loading }
+    const SCROLL_LOAD_THRESHOLD = 150; // px from the top at which the next older page is shown
+    let liveStream = null; // { channelId, source }: EventSource pushing new messages of the open channel
 
     // Common Emojis
     const commonEmojis = [
@@ -41,6 +45,13 @@ document.addEventListener('DOMContentLoaded', () => {
             channelList.addEventListener('click', handleChannelChange);
         }
 
+        // Infinite scroll: older messages load when the top is reached
+        if (messageContainer) {
+            messageContainer.addEventListener('scroll', () => {
+                if (messageContainer.scrollTop < SCROLL_LOAD_THRESHOLD) loadOlder();
+            });
+        }
+
         // Send message
         if (sendBtn) {
             sendBtn.addEventListener('click', sendMessage);
@@ -187,46 +198,137 @@ document.addEventListener('DOMContentLoaded', () => {
         activeChannelId = target.dataset.channelId;
         currentChannelName.textContent = target.textContent.trim();
 
+        // A summary of the previous channel is no longer wanted
+        if (summaryAbort) summaryAbort.abort();
+
         loadMessages(activeChannelId);
     }
 
+    async function fetchMessagesPage(channelId, cursor) {
+        const params = new URLSearchParams({ limit: 50 });
+        if (cursor) params.set('cursor', cursor);
+        const res = await fetch(`/api/v1/slack/messages/${channelId}?${params}`);
+        if (!res.ok) throw new Error(`HTTP ${res.status}`);
+        return res.json();
+    }
+
     async function loadMessages(channelId) {
         console.log(`📬 Loading messages for channel: ${channelId}`);
         messageContainer.innerHTML = '<div class="loading">Loading messages...</div>';
+        if (!liveStream || liveStream.channelId !== channelId) openStream(channelId);
+        const state = { channelId, nextCursor: null, prefetch: null, loading: false };
+        history = state;
 
         try {
-            const res = await fetch(`/api/v1/slack/messages/${channelId}`);
-            if (!res.ok) throw new Error(`HTTP ${res.status}`);
-            
-            const messages = await res.json();
-            console.log(`✅ Loaded ${messages.length} messages`);
+            const page = await fetchMessagesPage(channelId);
+            if (history !== state) return; // Another channel was opened meanwhile
+            console.log(`✅ Loaded ${page.count} messages`);
 
             messageContainer.innerHTML = '';
 
-            if (messages.length === 0) {
+            if (page.messages.length === 0) {
                 messageContainer.innerHTML = '<div class="loading">No messages yet. Start the conversation!</div>';
                 return;
             }
 
-            messages.reverse().forEach(msg => {
-                renderMessage({
-                    user: msg.user,
-                    text: msg.text,
-                    timestamp: msg.time,
-                    sent: false
-                });
-            });
-
+            page.messages.reverse().forEach(msg => renderMessage(toRendered(msg)));
             scrollToBottom();
+
+            state.nextCursor = page.next_cursor;
+            prefetchOlder(state);
+            // A short first page leaves nothing to scroll: show the next one right away
+            if (messageContainer.scrollHeight <= messageContainer.clientHeight) loadOlder();
         } catch (error) {
             console.error('❌ Load messages failed:', error);
             messageContainer.innerHTML = '<div class="error">Failed to load messages</div>';
         }
     }
 
-    function renderMessage(msg) {
+    // Lookahead: the next older page is fetched while the user reads the current one
+    function prefetchOlder(state) {
+        if (!state.nextCursor || state.prefetch) return;
+        state.prefetch = fetchMessagesPage(state.channelId, state.nextCursor);
+        state.prefetch.catch(() => {}); // Reported when the page is actually shown
+    }
+
+    async function loadOlder() {
+        const state = history;
+        if (!state || state.loading || !state.nextCursor) return;
+        state.loading = true;
+        prefetchOlder(state);
+
+        try {
+            const page = await state.prefetch;
+            if (history !== state) return;
+
+            // Keep the message under the user's eyes in place while the page goes in above it
+            const previousHeight = messageContainer.scrollHeight;
+            page.messages.forEach(msg => renderMessage(toRendered(msg), true));
+            messageContainer.scrollTop += messageContainer.scrollHeight - previousHeight;
+
+            state.nextCursor = page.next_cursor;
+            state.prefetch = null;
+            prefetchOlder(state);
+        } catch (error) {
+            console.error('❌ Load older messages failed:', error);
+            state.prefetch = null; // Retried on the next scroll
+        } finally {
+            state.loading = false;
+        }
+    }
+
+    function toRendered(msg) {
+        return { user: msg.user, text: msg.text, timestamp: msg.time, ts: msg.timestamp, sent: false };
+    }
+
+    // New messages are pushed by the server; EventSource reconnects (with Last-Event-ID) on its own
+    function openStream(channelId) {
+        if (liveStream) liveStream.source.close();
+        liveStream = null;
+        if (!window.EventSource) return;
+
+        const source = new EventSource(`/api/v1/slack/stream/${channelId}`);
+        liveStream = { channelId, source };
+
+        source.addEventListener('message', (e) => showLiveMessage(JSON.parse(e.data)));
+        source.addEventListener('edited', (e) => {
+            const msg = JSON.parse(e.data);
+            const el = findMessage(msg.timestamp);
+            if (el) el.querySelector('.message-text').textContent = msg.text;
+        });
+        source.addEventListener('deleted', (e) => findMessage(JSON.parse(e.data).timestamp)?.remove());
+        // Events were missed (slow connection, server restart): reload the history
+        source.addEventListener('reset', () => loadMessages(channelId));
+    }
+
+    function showLiveMessage(msg) {
+        if (findMessage(msg.timestamp)) return; // Already shown (Slack retries, our own post)
+
+        // Our own message, shown before Slack gave it a ts
+        const pending = [...messageContainer.querySelectorAll('.message[data-pending]')]
+            .find(el => el.querySelector('.message-text').textContent === msg.text);
+        if (pending) {
+            pending.dataset.ts = msg.timestamp;
+            delete pending.dataset.pending;
+            return;
+        }
+
+        messageContainer.querySelector(':scope > .loading')?.remove();
+        const atBottom = messageContainer.scrollHeight - messageContainer.scrollTop - messageContainer.clientHeight
+            < SCROLL_LOAD_THRESHOLD;
+        renderMessage(toRendered(msg));
+        if (atBottom) scrollToBottom();
+    }
+
+    function findMessage(ts) {
+        return ts ? messageContainer.querySelector(`.message[data-ts="${CSS.escape(ts)}"]`) : null;
+    }
+
+    function renderMessage(msg, prepend = false) {
         const messageEl = document.createElement('div');
         messageEl.className = `message ${msg.sent ? 'sent' : 'received'}`;
+        if (msg.ts) messageEl.dataset.ts = msg.ts;
+        if (msg.pending) messageEl.dataset.pending = '1';
         
         const avatarUrl = msg.sent 
             ? CURRENT_USER.avatar 
@@ -241,7 +343,12 @@ document.addEventListener('DOMContentLoaded', () => {
                 <p class="message-text">${msg.user === 'AI Assistant' ? simpleMarkdown(msg.text) : escapeHtml(msg.text)}</p>
             </div>
         `;
-        messageContainer.appendChild(messageEl);
+        if (prepend) {
+            messageContainer.insertBefore(messageEl, messageContainer.firstChild);
+        } else {
+            messageContainer.appendChild(messageEl);
+        }
+        return messageEl;
     }
 
     async function sendMessage() {
@@ -250,11 +357,12 @@ document.addEventListener('DOMContentLoaded', () => {
 
         messageInput.value = '';
 
-        renderMessage({
+        const messageEl = renderMessage({
             user: CURRENT_USER.name,
             text: text,
             timestamp: new Date().toLocaleTimeString(),
-            sent: true
+            sent: true,
+            pending: true
         });
 
         scrollToBottom();
@@ -274,6 +382,11 @@ document.addEventListener('DOMContentLoaded', () => {
             });
 
             if (!res.ok) throw new Error(`HTTP ${res.status}`);
+            const sent = await res.json();
+            if (messageEl.dataset.pending) {
+                messageEl.dataset.ts = sent.ts;
+                delete messageEl.dataset.pending;
+            }
             console.log('✅ Message sent');
         } catch (error) {
             console.error('❌ Send failed:', error);
@@ -289,7 +402,9 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
-    async function summarizeChat() {
+    async function summarizeChat(event) {
+        // Shift+click regenerates instead of reusing the cached summary
+        const refresh = Boolean(event && event.shiftKey);
         console.log('🤖 Generating AI summary...');
         
         if (!activeChannelId) {
@@ -321,14 +436,26 @@ document.addEventListener('DOMContentLoaded', () => {
                 throw new Error('No messages to summarize');
             }
 
-            // Call the AI summary endpoint
+            const summaryResults = document.getElementById('ai-summary-results');
+            const summaryContent = document.getElementById('ai-summary-content');
+            const showSummary = (text) => {
+                if (summaryResults && summaryContent) {
+                    summaryContent.innerHTML = simpleMarkdown(text);
+                    summaryResults.style.display = 'block';
+                }
+            };
+
+            // Ask for a token stream; the summary is rendered as it is generated
+            summaryAbort = new AbortController();
             const res = await fetch('/api/v1/slack/summarize-chat', {
                 method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
+                headers: { 'Content-Type': 'application/json', 'Accept': 'text/event-stream' },
                 body: JSON.stringify({
                     channel_id: activeChannelId,
-                    messages: messages
-                })
+                    messages: messages,
+                    refresh: refresh
+                }),
+                signal: summaryAbort.signal
             });
 
             if (!res.ok) {
@@ -336,21 +463,36 @@ document.addEventListener('DOMContentLoaded', () => {
                 throw new Error(error.error || `HTTP ${res.status}`);
             }
 
-            const result = await res.json();
+            let summary = '';
+            if ((res.headers.get('Content-Type') || '').startsWith('text/event-stream')) {
+                await readEventStream(res, (event, data) => {
+                    if (event === 'queued') {
+                        aiSummaryBtn.innerHTML = `<i class="fas fa-hourglass-half"></i> Queued (#${data.position})...`;
+                    } else if (event === 'token') {
+                        aiSummaryBtn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Generating...';
+                        summary += data.text;
+                        showSummary(summary);
+                    } else if (event === 'done') {
+                        summary = data.text;
+                    } else if (event === 'error') {
+                        throw new Error(data.error);
+                    }
+                });
+            } else {
+                // Background job (202): poll until it finishes
+                const job = await res.json();
+                summary = (await waitForJob(job.status_url)).summary;
+            }
             console.log('✅ AI Summary generated');
 
             // Display summary in the AI context panel
-            const summaryResults = document.getElementById('ai-summary-results');
-            const summaryContent = document.getElementById('ai-summary-content');
-            
-            if (summaryResults && summaryContent) {
-                summaryContent.innerHTML = simpleMarkdown(result.summary);
-                summaryResults.style.display = 'block';
-                
+            showSummary(summary);
+            if (summaryResults) {
                 // Scroll to the summary results
                 summaryResults.scrollIntoView({ behavior: 'smooth', block: 'nearest' });
             }
         } catch (error) {
+            if (error.name === 'AbortError') return;
             console.error('❌ AI Summary failed:', error);
             
             // Display error in the AI context panel
@@ -21,6 +21,7 @@ document.addEventListener('DOMContentLoaded', () => {
 
     let burndownChart = null;
     let currentCriticalTasks = [];
+    let cachedUsers = null;   // user list for the assign modal, loaded once per page
 
     // Initialize
     loadProjects();
@@ -111,42 +112,31 @@ document.addEventListener('DOMContentLoaded', () => {
             // 4. Widgets
             renderActivityFeed(data.activities || []);
 
-            // 5. Chart
-            loadBurndownChart(projectId);
+            // 5. Chart (burndown comes with the dashboard payload)
+            showBurndownChart(data.burndown);
         } catch (error) {
             console.error('Error loading project data:', error);
             alert('Failed to load project data. Please try again.');
         }
     }
 
-    async function loadBurndownChart(projectId) {
+    function showBurndownChart(data) {
         const chartContainer = document.getElementById('burndown-chart');
         const noDataMessage = document.getElementById('chart-no-data');
         const sprintNameEl = document.getElementById('sprint-name');
 
-        try {
-            const response = await fetch(`${API_BASE_URL}/project/${projectId}/burndown`);
-            if (!response.ok) throw new Error('Failed to load burndown data');
-
-            const data = await response.json();
-
-            if (sprintNameEl) sprintNameEl.textContent = data.sprintName || 'Active Sprint';
-
-            if (!data.labels || data.labels.length === 0) {
-                chartContainer.style.display = 'none';
-                noDataMessage.style.display = 'flex';
-                return;
-            }
+        if (sprintNameEl) sprintNameEl.textContent = (data && data.sprintName) || 'Active Sprint';
 
-            chartContainer.style.display = 'block';
-            noDataMessage.style.display = 'none';
-
-            renderBurndownChart(data);
-        } catch (error) {
-            console.error('Error loading burndown chart:', error);
+        if (!data || !data.labels || data.labels.length === 0) {
             chartContainer.style.display = 'none';
             noDataMessage.style.display = 'flex';
+            return;
         }
+
+        chartContainer.style.display = 'block';
+        noDataMessage.style.display = 'none';
+
+        renderBurndownChart(data);
     }
 
     function renderBurndownChart(data) {
@@ -287,10 +277,13 @@ document.addEventListener('DOMContentLoaded', () => {
 
         // Populate Users from API
         try {
-            const response = await fetch(`${API_BASE_URL}/users`);
-            if (!response.ok) throw new Error('Failed to load users');
+            if (!cachedUsers) {
+                const response = await fetch(`${API_BASE_URL}/users`);
+                if (!response.ok) throw new Error('Failed to load users');
+                cachedUsers = await response.json();
+            }
 
-            const users = await response.json();
+            const users = cachedUsers;
             userSelect.innerHTML = '<option value="">-- Select a user --</option>';
             users.forEach(user => {
                 const option = document.createElement('option');
@@ -1,6 +1,7 @@
 // Documentation Page - Google Drive Integration
 const DOCS_API_URL = '/docs/api/documents';
 const PROJECTS_API_URL = '/api/v1/projects';
+const UPLOAD_POLL_INTERVAL = 1000; // ms between upload progress checks
 
 // Global state
 let currentProjectFilter = null;
@@ -8,6 +9,9 @@ let currentFolderId = null;
 let currentView = 'grid';
 let allDocuments = [];
 let folderHistory = []; // Track folder navigation
+let selectedIds = new Set(); // Files ticked for bulk actions
+let nextCursor = null; // Continuation cursor of the listing shown
+let prefetchedPage = null; // Promise of the next page, requested while the current one renders
 
 document.addEventListener('DOMContentLoaded', () => {
     console.log('[DOCS] Page loaded, initializing...');
@@ -98,6 +102,16 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     });
     
+    // Bulk actions (one batch request for all selected files)
+    const bulkDeleteBtn = document.getElementById('bulk-delete-btn');
+    const bulkMoveBtn = document.getElementById('bulk-move-btn');
+    if (bulkDeleteBtn) {
+        bulkDeleteBtn.addEventListener('click', bulkDelete);
+    }
+    if (bulkMoveBtn) {
+        bulkMoveBtn.addEventListener('click', bulkMove);
+    }
+    
     // Folder creation form
     const folderForm = document.getElementById('create-folder-form');
     if (folderForm) {
@@ -260,32 +274,10 @@ document.addEventListener('DOMContentLoaded', () => {
         `;
         emptyState.style.display = 'none';
         
+        setNextCursor(null);
+        
         try {
-            // Build query params
-            const params = new URLSearchParams({
-                limit: 50,
-                sort_by: 'recent'
-            });
-            
-            // Add folder filter
-            if (currentFolderId) {
-                params.append('folder_id', currentFolderId);
-            }
-            
-            const response = await fetch(`${DOCS_API_URL}?${params}`, {
-                method: 'GET',
-                credentials: 'include'
-            });
-            
-            if (!response.ok) {
-                throw new Error(`HTTP ${response.status}`);
-            }
-            
-            const result = await response.json();
-            
-            if (!result.success) {
-                throw new Error(result.error || 'Failed to load documents');
-            }
+            const result = await fetchDocumentsPage(null);
             
             allDocuments = result.documents || [];
             console.log('[DOCS] Loaded', allDocuments.length, 'documents');
@@ -293,6 +285,7 @@ document.addEventListener('DOMContentLoaded', () => {
             renderDocuments(allDocuments);
             updateStorageInfo(result);
             updateFolderInfo();
+            setNextCursor(result.next_cursor);
             
         } catch (err) {
             console.error('[DOCS] Error:', err);
@@ -306,6 +299,89 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
     
+    async function fetchDocumentsPage(cursor) {
+        // Build query params
+        const params = new URLSearchParams({
+            limit: 50,
+            sort_by: 'recent'
+        });
+        
+        // Add folder filter
+        if (currentFolderId) {
+            params.append('folder_id', currentFolderId);
+        }
+        if (cursor) {
+            params.append('cursor', cursor);
+        }
+        
+        const response = await fetch(`${DOCS_API_URL}?${params}`, {
+            method: 'GET',
+            credentials: 'include'
+        });
+        
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}`);
+        }
+        
+        const result = await response.json();
+        
+        if (!result.success) {
+            throw new Error(result.error || 'Failed to load documents');
+        }
+        return result;
+    }
+    
+    // ===== PAGINATION =====
+    
+    function setNextCursor(cursor) {
+        nextCursor = cursor;
+        // Start fetching the next page right away so "Load more" is instant
+        prefetchedPage = cursor ? fetchDocumentsPage(cursor) : null;
+        if (prefetchedPage) {
+            prefetchedPage.catch(() => {}); // reported if the user actually asks for it
+        }
+        updateLoadMoreButton();
+    }
+    
+    function updateLoadMoreButton() {
+        let loadMoreBtn = document.getElementById('load-more-btn');
+        if (!loadMoreBtn) {
+            const filesContainer = document.getElementById('files-container');
+            if (!filesContainer) return;
+            loadMoreBtn = document.createElement('button');
+            loadMoreBtn.id = 'load-more-btn';
+            loadMoreBtn.className = 'btn btn-styled load-more-btn';
+            loadMoreBtn.innerHTML = '<i class="fas fa-chevron-down"></i> Load more';
+            loadMoreBtn.addEventListener('click', loadMoreDocuments);
+            filesContainer.insertAdjacentElement('afterend', loadMoreBtn);
+        }
+        loadMoreBtn.style.display = nextCursor ? 'block' : 'none';
+    }
+    
+    async function loadMoreDocuments() {
+        if (!nextCursor) return;
+        
+        const loadMoreBtn = document.getElementById('load-more-btn');
+        loadMoreBtn.disabled = true;
+        
+        try {
+            const result = await (prefetchedPage || fetchDocumentsPage(nextCursor));
+            const documents = result.documents || [];
+            const filesContainer = document.getElementById('files-container');
+            
+            allDocuments = allDocuments.concat(documents);
+            documents.forEach(doc => filesContainer.appendChild(createDocumentCard(doc)));
+            setNextCursor(result.next_cursor);
+            
+        } catch (err) {
+            console.error('[DOCS] Load more error:', err);
+            prefetchedPage = null;
+            showNotification(`Error loading more documents: ${err.message}`, 'error');
+        } finally {
+            loadMoreBtn.disabled = false;
+        }
+    }
+    
     function updateFolderInfo() {
         // Update folder selector in upload modal
         const uploadFolderInfo = document.getElementById('current-folder-info');
@@ -332,6 +408,8 @@ document.addEventListener('DOMContentLoaded', () => {
         const emptyState = document.querySelector('.empty-state');
         
         filesContainer.innerHTML = '';
+        selectedIds.clear();
+        updateBulkActions();
         
         if (!documents || documents.length === 0) {
             emptyState.style.display = 'flex';
@@ -366,6 +444,7 @@ document.addEventListener('DOMContentLoaded', () => {
         const iconColor = isFolder ? 'folder' : '';
         
         card.innerHTML = `
+            <input type="checkbox" class="file-select" data-id="${doc.id}" title="Select">
             <i class="fas ${iconClass} fa-3x file-icon ${iconColor}"></i>
             <div class="file-info">
                 <h3 class="file-name">${escapeHtml(doc.name)}</h3>
@@ -391,6 +470,18 @@ document.addEventListener('DOMContentLoaded', () => {
         `;
         
         // Add event listeners
+        const selectBox = card.querySelector('.file-select');
+        selectBox.addEventListener('click', (e) => e.stopPropagation());
+        selectBox.addEventListener('change', () => {
+            if (selectBox.checked) {
+                selectedIds.add(doc.id);
+            } else {
+                selectedIds.delete(doc.id);
+            }
+            card.classList.toggle('selected', selectBox.checked);
+            updateBulkActions();
+        });
+        
         const downloadBtn = card.querySelector('.download-btn');
         const renameBtn = card.querySelector('.rename-btn');
         const deleteBtn = card.querySelector('.delete-btn');
@@ -513,43 +604,80 @@ document.addEventListener('DOMContentLoaded', () => {
             formData.append('folder_id', currentFolderId);
         }
         
-        // Simulate progress
-        const progressInterval = setInterval(() => {
-            const currentWidth = parseInt(progressBar.style.width) || 0;
-            if (currentWidth < 90) {
-                progressBar.style.width = (currentWidth + 10) + '%';
-            }
-        }, 200);
+        // First half of the bar: browser -> server, second half: server -> Drive
+        const result = await postWithProgress(`${DOCS_API_URL}/upload`, formData, (fraction) => {
+            progressBar.style.width = (fraction * 50) + '%';
+        });
         
-        try {
-            const response = await fetch(`${DOCS_API_URL}/upload`, {
-                method: 'POST',
-                credentials: 'include',
-                body: formData
+        if (!result.success) {
+            throw new Error(result.error || 'Upload failed');
+        }
+        
+        const upload = await pollUpload(result.upload.upload_id, (job) => {
+            progressBar.style.width = (50 + job.percent / 2) + '%';
+        });
+        
+        // Complete progress
+        progressBar.style.width = '100%';
+        progressBar.style.background = '#27ae60';
+        
+        showNotification(`✓ ${upload.filename} uploaded successfully`, 'success');
+    }
+    
+    function postWithProgress(url, formData, onProgress) {
+        // fetch() cannot report upload progress, XMLHttpRequest can
+        return new Promise((resolve, reject) => {
+            const xhr = new XMLHttpRequest();
+            xhr.open('POST', url);
+            xhr.withCredentials = true;
+            xhr.upload.onprogress = (e) => {
+                if (e.lengthComputable) onProgress(e.loaded / e.total);
+            };
+            xhr.onload = () => {
+                let body = {};
+                try {
+                    body = JSON.parse(xhr.responseText);
+                } catch (err) {
+                    body = { success: false, error: 'Upload failed' };
+                }
+                resolve(body);
+            };
+            xhr.onerror = () => reject(new Error('Network error during upload'));
+            xhr.send(formData);
+        });
+    }
+    
+    async function pollUpload(uploadId, onProgress) {
+        let resumed = false;
+        
+        while (true) {
+            const response = await fetch(`${DOCS_API_URL}/upload/${uploadId}`, {
+                credentials: 'include'
             });
-            
-            clearInterval(progressInterval);
-            
-            if (!response.ok) {
-                const error = await response.json();
-                throw new Error(error.error || 'Upload failed');
-            }
-            
             const result = await response.json();
             
             if (!result.success) {
                 throw new Error(result.error || 'Upload failed');
             }
             
-            // Complete progress
-            progressBar.style.width = '100%';
-            progressBar.style.background = '#27ae60';
+            const job = result.upload;
+            onProgress(job);
             
-            showNotification(`✓ ${file.name} uploaded successfully`, 'success');
+            if (job.status === 'completed') return job;
             
-        } catch (err) {
-            clearInterval(progressInterval);
-            throw err;
+            if (job.status === 'failed') {
+                // One automatic retry: it continues from the last chunk Drive received
+                if (resumed) throw new Error(job.error || 'Upload failed');
+                resumed = true;
+                const retry = await fetch(`${DOCS_API_URL}/upload/${uploadId}/resume`, {
+                    method: 'POST',
+                    credentials: 'include'
+                });
+                const retryResult = await retry.json();
+                if (!retryResult.success) throw new Error(retryResult.error || job.error || 'Upload failed');
+            }
+            
+            await new Promise(resolve => setTimeout(resolve, UPLOAD_POLL_INTERVAL));
         }
     }
     
@@ -703,6 +831,92 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
     
+    // ===== BULK ACTIONS =====
+    
+    function updateBulkActions() {
+        const bar = document.getElementById('bulk-actions');
+        const count = document.getElementById('bulk-count');
+        if (!bar) return;
+        bar.style.display = selectedIds.size > 0 ? 'flex' : 'none';
+        if (count) count.textContent = `${selectedIds.size} selected`;
+    }
+    
+    async function runBatch(operations) {
+        const response = await fetch(`${DOCS_API_URL}/batch`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            credentials: 'include',
+            body: JSON.stringify({ operations })
+        });
+        
+        const result = await response.json();
+        
+        if (!result.success) {
+            throw new Error(result.error || 'Batch request failed');
+        }
+        return result;
+    }
+    
+    function reportBatch(result, verb) {
+        if (result.failed === 0) {
+            showNotification(`✓ ${result.succeeded} item(s) ${verb}`, 'success');
+            return;
+        }
+        const firstError = result.results.find(r => !r.success);
+        showNotification(
+            `${result.succeeded} ${verb}, ${result.failed} failed: ${firstError.error}`,
+            result.succeeded > 0 ? 'info' : 'error'
+        );
+    }
+    
+    async function bulkDelete() {
+        const ids = Array.from(selectedIds);
+        if (ids.length === 0 || !confirm(`Delete ${ids.length} item(s)?`)) {
+            return;
+        }
+        
+        try {
+            const result = await runBatch(ids.map(id => ({ op: 'delete', id })));
+            reportBatch(result, 'deleted');
+            loadDocuments();
+        } catch (err) {
+            console.error('[BULK DELETE] Error:', err);
+            showNotification(`Error: ${err.message}`, 'error');
+        }
+    }
+    
+    async function bulkMove() {
+        const ids = Array.from(selectedIds);
+        const folders = allDocuments.filter(doc => doc.type === 'Folder' && !selectedIds.has(doc.id));
+        if (ids.length === 0) {
+            return;
+        }
+        
+        const folderName = prompt(
+            `Move ${ids.length} item(s) to which folder?\n` +
+            `Available: ${folders.map(f => f.name).join(', ') || '(none in this view)'}`
+        );
+        if (!folderName) {
+            return;
+        }
+        const target = folders.find(f => f.name.toLowerCase() === folderName.trim().toLowerCase());
+        if (!target) {
+            showNotification(`Folder "${folderName}" not found in this view`, 'error');
+            return;
+        }
+        
+        try {
+            const result = await runBatch(ids.map(id => ({ op: 'move', id, folder_id: target.id })));
+            reportBatch(result, 'moved');
+            loadDocuments();
+        } catch (err) {
+            console.error('[BULK MOVE] Error:', err);
+            showNotification(`Error: ${err.message}`, 'error');
+        }
+    }
+    
     // ===== SEARCH =====
     
     async function handleSearch(e) {
@@ -727,6 +941,7 @@ document.addEventListener('DOMContentLoaded', () => {
                 throw new Error(result.error || 'Search failed');
             }
             
+            setNextCursor(null);
             renderDocuments(result.documents || []);
             
         } catch (err) {
@@ -8,8 +8,8 @@ const PROJECTS_API_URL = '/api/v1/projects';
 
 // Global state for filtering
 let currentProjectFilter = null;
-let allTasks = [];
 let allNotes = [];
+let dashboardSummary = null; // Promise of /home/dashboard (deadlines, assignee task counts) for the current filter
 let allSprints = [];
 
 document.addEventListener('DOMContentLoaded', () => {
@@ -104,20 +104,6 @@ document.addEventListener('DOMContentLoaded', () => {
         showNotification('✓ Dashboard filtered', 'success');
     }
 
-    function getFilteredData(dataArray, projectIdField = 'project_id') {
-        if (!currentProjectFilter) {
-            return dataArray;
-        }
-        
-        return dataArray.filter(item => {
-            if (projectIdField === 'sprint.project_id' && item.sprint_id) {
-                const sprint = allSprints.find(s => s.sprint_id === item.sprint_id);
-                return sprint && sprint.project_id === currentProjectFilter;
-            }
-            return item[projectIdField] === currentProjectFilter;
-        });
-    }
-
     // ================================================
     // TODO LIST FUNCTIONS WITH FILTERING (KEEP ORIGINAL STYLES)
     // ================================================
@@ -126,32 +112,21 @@ document.addEventListener('DOMContentLoaded', () => {
         console.log('[TODO] Loading tasks...');
         
         try {
-            const [tasksResponse, sprintsResponse] = await Promise.all([
-                fetch(TASKS_API_URL, { method: 'GET', credentials: 'include' }),
+            // Status, user and project filters are applied by the server
+            const [userTasks, sprintsResponse] = await Promise.all([
+                fetchTaskPages({
+                    status: 'TODO',
+                    assigned_id: getCurrentUserId(),
+                    project_id: currentProjectFilter
+                }),
                 fetch(SPRINTS_API_URL, { method: 'GET', credentials: 'include' })
             ]);
             
-            if (!tasksResponse.ok) {
-                throw new Error(`HTTP ${tasksResponse.status}`);
-            }
-            
-            allTasks = await tasksResponse.json();
-            
             if (sprintsResponse.ok) {
                 allSprints = await sprintsResponse.json();
             }
             
-            console.log('[TODO] Received', allTasks.length, 'tasks');
-            
-            const currentUserId = getCurrentUserId();
-            let userTasks = currentUserId 
-                ? allTasks.filter(t => t.assigned_id === currentUserId) 
-                : allTasks;
-            
-            userTasks = getFilteredData(userTasks, 'sprint.project_id');
-            userTasks = userTasks.filter(t => t.status === 'TODO');
-            
-            console.log('[TODO] Filtered to TODO status:', userTasks.length, 'tasks');
+            console.log('[TODO] Received', userTasks.length, 'TODO tasks');
             
             userTasks.sort((a, b) => {
                 const priorityOrder = { 'HIGH': 0, 'MEDIUM': 1, 'LOW': 2 };
@@ -264,6 +239,11 @@ document.addEventListener('DOMContentLoaded', () => {
             let filteredNotes = allNotes;
             
             if (currentProjectFilter) {
+                // Task notes need the project's task ids; only that project's tasks are fetched
+                const projectTaskIds = allNotes.some(note => note.entity_type === 'task')
+                    ? new Set((await fetchTaskPages({ project_id: currentProjectFilter })).map(t => t.task_id))
+                    : new Set();
+                
                 filteredNotes = allNotes.filter(note => {
                     if (note.entity_type === 'project' && note.entity_id === currentProjectFilter) {
                         return true;
@@ -275,11 +255,7 @@ document.addEventListener('DOMContentLoaded', () => {
                     }
                     
                     if (note.entity_type === 'task') {
-                        const task = allTasks.find(t => t.task_id === note.entity_id);
-                        if (task) {
-                            const sprint = allSprints.find(s => s.sprint_id === task.sprint_id);
-                            return sprint && sprint.project_id === currentProjectFilter;
-                        }
+                        return projectTaskIds.has(note.entity_id);
                     }
                     
                     return false;
@@ -596,25 +572,21 @@ document.addEventListener('DOMContentLoaded', () => {
     // CALENDAR WIDGET WITH FILTERING (KEEP ORIGINAL)
     // ================================================
 
+    // Deadlines and per-assignee task counts are computed by the server for the current filter
+    function refreshDashboardSummary() {
+        const params = new URLSearchParams({ limit: 5 });
+        if (currentProjectFilter) params.set('project_id', currentProjectFilter);
+        dashboardSummary = fetch(`${DASHBOARD_API_URL}?${params}`, { credentials: 'include' }).then(res => {
+            if (!res.ok) throw new Error(`HTTP ${res.status}`);
+            return res.json();
+        });
+        return dashboardSummary;
+    }
+
     async function loadUpcomingTasks() {
         try {
-            const res = await fetch(TASKS_API_URL, { credentials: 'include' });
-            if (!res.ok) throw new Error('Failed');
-            
-            allTasks = await res.json();
-            let filteredTasks = getFilteredData(allTasks, 'sprint.project_id');
-            
-            const upcoming = filteredTasks
-                .filter(t => t.status !== 'DONE' && (!t.due_date || new Date(t.due_date) >= new Date()))
-                .sort((a, b) => {
-                    if (!a.due_date && !b.due_date) return 0;
-                    if (!a.due_date) return 1;
-                    if (!b.due_date) return -1;
-                    return new Date(a.due_date) - new Date(b.due_date);
-                })
-                .slice(0, 5);
-            
-            updateCalendarWidget(upcoming);
+            const summary = await refreshDashboardSummary();
+            updateCalendarWidget(summary.deadlines);
             
         } catch (err) {
             console.error('Calendar error:', err);
@@ -817,6 +789,7 @@ document.addEventListener('DOMContentLoaded', () => {
             closeModal(modal);
             await loadTodoList();
             await loadUpcomingTasks();
+            await updateTeamWidget();
             showNotification(`✓ Task "${title}" added`, 'success');
 
         } catch (err) {
@@ -877,11 +850,6 @@ document.addEventListener('DOMContentLoaded', () => {
                 allSprints = await sprintsRes.json();
             }
             
-            const tasksRes = await fetch(TASKS_API_URL, { credentials: 'include' });
-            if (tasksRes.ok) {
-                allTasks = await tasksRes.json();
-            }
-            
             await loadUpcomingTasks();
             updateTimeTracker();
             await updateTeamWidget();
@@ -935,13 +903,12 @@ document.addEventListener('DOMContentLoaded', () => {
             let users = await response.json();
             console.log('[TEAM] Received', users.length, 'users');
             
+            // Started by loadUpcomingTasks for the same filter
+            const summary = await (dashboardSummary || refreshDashboardSummary());
+            const taskCounts = new Map(summary.assignees.map(a => [a.user_id, a.task_count]));
+            
             if (currentProjectFilter) {
-                const projectSprints = allSprints.filter(s => s.project_id === currentProjectFilter);
-                const sprintIds = projectSprints.map(s => s.sprint_id);
-                const projectTasks = allTasks.filter(t => sprintIds.includes(t.sprint_id));
-                const projectUserIds = [...new Set(projectTasks.map(t => t.assigned_id))];
-                
-                users = users.filter(u => projectUserIds.includes(u.user_id));
+                users = users.filter(u => taskCounts.has(u.user_id));
                 console.log('[TEAM] Filtered to', users.length, 'users for project', currentProjectFilter);
             }
             
@@ -988,10 +955,7 @@ document.addEventListener('DOMContentLoaded', () => {
                 let tooltipText = `${displayName} - ${user.email || 'No email'}`;
                 
                 if (currentProjectFilter) {
-                    const userTaskCount = allTasks.filter(t => 
-                        t.assigned_id === user.user_id && 
-                        allSprints.some(s => s.sprint_id === t.sprint_id && s.project_id === currentProjectFilter)
-                    ).length;
+                    const userTaskCount = taskCounts.get(user.user_id) || 0;
                     tooltipText += `\n${userTaskCount} task${userTaskCount !== 1 ? 's' : ''}`;
                 }
                 
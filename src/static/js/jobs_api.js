@@ -0,0 +1,69 @@
+// Shared background job and AI streaming helpers (chats, backlog and reports pages)
+
+// Poll a job accepted with 202 ({job_id, status, status_url}) until it finishes.
+// Resolves with the job's result, rejects with its error.
+async function waitForJob(statusUrl, intervalMs = 1000) {
+    while (true) {
+        const res = await fetch(statusUrl, { credentials: 'include' });
+        const job = await res.json();
+        if (!res.ok) throw new Error(job.error || `HTTP ${res.status}`);
+        if (job.status === 'succeeded') return job.result;
+        if (job.status === 'failed') throw new Error(job.error || 'Job failed');
+        await new Promise(resolve => setTimeout(resolve, intervalMs));
+    }
+}
+
+// Minimal SSE parser for a fetch() body (EventSource cannot POST).
+// Calls onEvent(event, data) for every frame; data is parsed JSON.
+async function readEventStream(res, onEvent) {
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) return;
+        buffer += decoder.decode(value, { stream: true });
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const frame = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            let event = 'message';
+            const data = [];
+            frame.split('\n').forEach(line => {
+                if (line.startsWith('event: ')) event = line.slice(7);
+                else if (line.startsWith('data: ')) data.push(line.slice(6));
+            });
+            if (data.length) onEvent(event, JSON.parse(data.join('\n')));
+        }
+    }
+}
+
+// POST to an AI summary endpoint asking for a token stream; onText(textSoFar)
+// runs as tokens arrive. A 202 (background job) is polled instead.
+// Resolves with the full summary.
+async function requestSummary(url, body, onText = () => {}) {
+    const res = await fetch(url, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json', 'Accept': 'text/event-stream' },
+        credentials: 'include',
+        body: JSON.stringify(body)
+    });
+    if (!res.ok) throw new Error('AI generation failed');
+
+    if (!(res.headers.get('Content-Type') || '').startsWith('text/event-stream')) {
+        const job = await res.json();
+        return (await waitForJob(job.status_url)).summary;
+    }
+    let text = '';
+    await readEventStream(res, (event, data) => {
+        if (event === 'token') {
+            text += data.text;
+            onText(text);
+        } else if (event === 'done') {
+            text = data.text;
+        } else if (event === 'error') {
+            throw new Error(data.error);
+        }
+    });
+    return text;
+}
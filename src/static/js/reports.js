@@ -11,7 +11,6 @@ document.addEventListener('DOMContentLoaded', () => {
 
     // API URLs
     const SPRINT_API_URL = '/api/v1/sprints';
-    const TASK_API_URL = '/api/v1/tasks';
     const PROJECT_API_URL = '/api/v1/projects';
     const DOCUMENTATION_API_URL = '/api/v1/documentation';
 
@@ -198,22 +197,26 @@ document.addEventListener('DOMContentLoaded', () => {
 
         try {
             // Fetch comprehensive project data
-            const [sprintRes, tasksRes, allSprintsRes, projectsRes] = await Promise.all([
+            const [sprintRes, allSprintsRes, projectsRes] = await Promise.all([
                 fetch(`${DOCUMENTATION_API_URL}/sprint/${sprintId}`),
-                fetch(TASK_API_URL),
                 fetch(SPRINT_API_URL),
                 fetch(PROJECT_API_URL).catch(() => ({ ok: false, json: () => Promise.resolve([]) }))
             ]);
 
-            if (!sprintRes.ok || !tasksRes.ok || !allSprintsRes.ok) {
+            if (!sprintRes.ok || !allSprintsRes.ok) {
                 throw new Error('Failed to fetch required project data');
             }
 
             const sprintData = await sprintRes.json();
-            const allTasks = await tasksRes.json();
             const allSprints = await allSprintsRes.json();
             const allProjects = projectsRes.ok ? await projectsRes.json() : [];
 
+            // Every task of the sprint's project (all pages), or of the sprint if it has no project
+            const sprint = allSprints.find(s => String(s.sprint_id) === String(sprintId));
+            const allTasks = await fetchTaskPages(sprint && sprint.project_id
+                ? { project_id: sprint.project_id }
+                : { sprint_id: sprintId });
+
             // Build comprehensive context
             const context = {
                 currentSprint: sprintData,
@@ -238,18 +241,15 @@ ${JSON.stringify(context, null, 2)}
 
 Please analyze this data and provide a detailed, insightful report in Markdown format with sections, lists, and tables where appropriate.`;
 
-            // Generate AI report
-            const aiRes = await fetch(`${DOCUMENTATION_API_URL}/sprint/${sprintId}/ai-summary`, {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ prompt: enhancedPrompt })
-            });
-
-            if (!aiRes.ok) throw new Error('AI generation failed');
-            const aiData = await aiRes.json();
+            // Generate AI report, rendered as it streams in
+            const summary = await requestSummary(
+                `${DOCUMENTATION_API_URL}/sprint/${sprintId}/ai-summary`,
+                { prompt: enhancedPrompt },
+                text => { summaryOutput.innerHTML = simpleMarkdown(text); }
+            );
 
             // Render Results
-            let summaryHtml = simpleMarkdown(aiData.summary);
+            let summaryHtml = simpleMarkdown(summary);
             summaryOutput.innerHTML = summaryHtml;
 
             // Render Analysis Details
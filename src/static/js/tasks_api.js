@@ -0,0 +1,25 @@
+// Shared task list helper (board, home and reports pages)
+const TASK_LIST_API_URL = '/api/v1/tasks';
+const TASK_PAGE_SIZE = 200;
+
+// Fetch every page of tasks matching the filters (server-side keyset pagination).
+// Filters are applied by the server; without any, this pages through the whole task table.
+async function fetchTaskPages(filters = {}) {
+    const tasks = [];
+    let cursor = null;
+    do {
+        const params = new URLSearchParams({ limit: TASK_PAGE_SIZE });
+        Object.entries(filters).forEach(([key, value]) => {
+            if (value !== null && value !== undefined && value !== '') params.set(key, value);
+        });
+        if (cursor) params.set('cursor', cursor);
+
+        const response = await fetch(`${TASK_LIST_API_URL}?${params}`, { method: 'GET', credentials: 'include' });
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+
+        const page = await response.json();
+        tasks.push(...page.tasks);
+        cursor = page.next_cursor;
+    } while (cursor);
+    return tasks;
+}
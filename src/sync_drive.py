@@ -0,0 +1,37 @@
+"""
+Syncs the local Drive metadata mirror (drive_file) with Google Drive.
+Normally reads keep it current on their own; run this to warm it up after
+deploying, or with --full to rebuild it from scratch.
+
+Usage (from src/):
+    python sync_drive.py [--full]
+"""
+import sys
+from clients.drive_client import get_drive_client
+from services.drive_sync_service import DriveSyncService
+
+SYNC_LOCK_WAIT = 300
+
+
+def sync_drive(full=False):
+    print("🔨 Syncing Drive mirror...")
+    try:
+        sync = DriveSyncService(get_drive_client())
+        # Waits for a sync another process is running (then usually has nothing left to do)
+        result = sync.sync_exclusive(full=full, wait=SYNC_LOCK_WAIT)
+        if result is None:
+            print("✅ Drive mirror is already up to date.")
+            return True
+        if result['mode'] == 'full':
+            print(f"✅ Full sync: {result['files']} file(s) mirrored.")
+        else:
+            print(f"✅ Incremental sync: {result['changed']} changed, {result['removed']} removed.")
+        return True
+    except Exception as e:
+        print(f"❌ Error syncing Drive mirror: {e}")
+        return False
+
+
+if __name__ == '__main__':
+    if not sync_drive(full='--full' in sys.argv[1:]):
+        sys.exit(1)
@@ -0,0 +1,117 @@
+"""
+Local fake HTTP servers for tests that talk to external APIs
+(GitHub, Ollama, Slack) without leaving the machine.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+
+class FakeRequest:
+    def __init__(self, method, path, query, headers, body):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body or b"{}")
+
+
+class FakeServer:
+    """
+    Threaded HTTP server driven by a route table.
+
+    routes maps "METHOD /path" to a handler(FakeRequest) that returns
+    (status, body) or (status, body, headers). A dict/list body is sent as
+    JSON; a generator body is streamed chunk by chunk. `delay` simulates
+    network latency on every request. Requests are recorded in `requests`.
+    """
+
+    def __init__(self, routes, delay=0.0):
+        self.routes = routes
+        self.delay = delay
+        self.requests = []
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _handle(self):
+                parts = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                request = FakeRequest(self.command, parts.path, parse_qs(parts.query),
+                                      dict(self.headers), self.rfile.read(length) if length else b"")
+                with server._lock:
+                    server.requests.append(request)
+                if server.delay:
+                    time.sleep(server.delay)
+
+                handler = server.routes.get(f"{self.command} {parts.path}")
+                result = handler(request) if handler else (404, {"message": "Not Found"})
+                status, body = result[0], result[1]
+                headers = result[2] if len(result) > 2 else {}
+
+                if hasattr(body, "__next__"):
+                    self._stream(status, body, headers)
+                    return
+                if isinstance(body, (dict, list)):
+                    body = json.dumps(body)
+                    headers.setdefault("Content-Type", "application/json")
+                payload = body.encode() if isinstance(body, str) else (body or b"")
+
+                try:
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    # Client timed out and closed the socket
+                    pass
+
+            def _stream(self, status, chunks, headers):
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                try:
+                    for chunk in chunks:
+                        data = chunk.encode() if isinstance(chunk, str) else chunk
+                        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                        self.wfile.flush()
+                    self.wfile.write(b"0\r\n\r\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    # Client went away mid-stream
+                    pass
+
+            do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+        return Handler
@@ -0,0 +1,75 @@
+"""Test the cached project dashboard snapshot (no real database needed)"""
+from datetime import date
+from decimal import Decimal
+from core.ttl_cache import TTLCache
+from repositories.project_repository import ProjectRepository
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_expires_entries():
+    """Test cached values are served until the TTL runs out"""
+    clock = FakeClock()
+    cache = TTLCache(ttl_seconds=30, clock=clock)
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return {"project": 1}
+
+    cache.get_or_load(1, loader)
+    cache.get_or_load(1, loader)
+    assert len(loads) == 1
+
+    clock.now = 31
+    cache.get_or_load(1, loader)
+    assert len(loads) == 2
+    assert cache.stats()["hits"] == 1
+    print("✅ TTL cache expires entries")
+
+
+def test_invalidation_during_load_is_not_cached():
+    """Test a load that raced with an invalidation does not repopulate the cache"""
+    cache = TTLCache(ttl_seconds=30)
+
+    def loader():
+        # A task write commits while the dashboard query is still running
+        cache.invalidate(1)
+        return {"stale": True}
+
+    assert cache.get_or_load(1, loader) == {"stale": True}
+    assert cache.get(1) is None
+    print("✅ Invalidation during load is respected")
+
+
+def test_snapshot_built_from_single_row():
+    """Test the aggregate row is turned into stats, critical tasks and activities"""
+    repo = ProjectRepository.__new__(ProjectRepository)
+    row = {
+        "project_id": 1, "name": "Apollo", "description": None,
+        "start_date": date(2024, 1, 1), "end_date": None,
+        "budget": Decimal("5000"), "github_repo": None,
+        "total_tasks": 4, "completed_tasks": Decimal("2"), "remaining_tasks": Decimal("2"),
+        "unassigned_critical": Decimal("1"),
+        "sprint_total_tasks": Decimal("3"), "sprint_completed_tasks": Decimal("1"),
+        "sprint_id": 9, "sprint_name": "Sprint 9",
+        "sprint_start_date": date(2024, 1, 1), "sprint_end_date": date(2024, 1, 14),
+        "critical_tasks": '[{"id": 3, "title": "A", "priority": "HIGH"}, {"id": 7, "title": "B", "priority": "HIGH"}]',
+        "recent_tasks": b'[{"id": 7, "title": "B", "status": "TODO"}]',
+    }
+
+    snapshot = repo._snapshot_from_row(row)
+
+    assert snapshot["project"].name == "Apollo"
+    assert snapshot["stats"]["velocity"] == "50.0%"
+    assert snapshot["stats"]["budgetForecast"] == "$5,000"
+    assert [t["id"] for t in snapshot["critical_tasks"]] == [7, 3]
+    assert snapshot["activities"][0]["detail"] == 'Task "B" status: TODO'
+    assert snapshot["sprint"]["total_tasks"] == 3
+    print("✅ Dashboard snapshot built from one row")
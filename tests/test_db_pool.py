@@ -0,0 +1,103 @@
+"""Test the shared MySQL connection pool (no real database needed)"""
+import threading
+import time
+from core.db_pool import ConnectionPool, PoolExhaustedError
+
+
+class FakeConnection:
+    def __init__(self):
+        self.in_transaction = False
+        self.closed = False
+        self.ping_ok = True
+        self.rollbacks = 0
+
+    def ping(self, reconnect=False):
+        if not self.ping_ok:
+            raise Exception("MySQL server has gone away")
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = True
+
+
+def make_pool(**kwargs):
+    created = []
+
+    def connect():
+        conn = FakeConnection()
+        created.append(conn)
+        return conn
+
+    kwargs.setdefault("min_size", 0)
+    kwargs.setdefault("max_size", 2)
+    kwargs.setdefault("timeout", 0.2)
+    return ConnectionPool(connect=connect, **kwargs), created
+
+
+def test_pool_reuses_released_connection():
+    """Test close() returns the connection to the pool instead of closing it"""
+    pool, created = make_pool()
+    conn = pool.get_connection()
+    conn.close()
+    conn2 = pool.get_connection()
+
+    assert len(created) == 1
+    assert not created[0].closed
+    conn2.close()
+    assert pool.stats()["checked_out"] == 0
+    print("✅ Pool reuses released connections")
+
+
+def test_pool_waits_then_times_out():
+    """Test checkout blocks until timeout when the pool is exhausted"""
+    pool, _ = make_pool(max_size=1, timeout=0.05)
+    held = pool.get_connection()
+    try:
+        pool.get_connection()
+        assert False, "Should have raised PoolExhaustedError"
+    except PoolExhaustedError:
+        pass
+    held.close()
+    assert pool.stats()["timeouts"] == 1
+    print("✅ Pool times out when exhausted")
+
+
+def test_pool_waiter_gets_released_connection():
+    """Test a waiting thread receives a connection released by another thread"""
+    pool, created = make_pool(max_size=1, timeout=2)
+    held = pool.get_connection()
+    result = {}
+
+    def borrow():
+        conn = pool.get_connection()
+        result["conn"] = conn
+        conn.close()
+
+    worker = threading.Thread(target=borrow)
+    worker.start()
+    time.sleep(0.05)
+    held.close()
+    worker.join(2)
+
+    assert "conn" in result
+    assert len(created) == 1
+    print("✅ Waiting thread receives released connection")
+
+
+def test_pool_rolls_back_and_replaces_dead_connections():
+    """Test open transactions are rolled back and dead connections replaced"""
+    pool, created = make_pool(ping_after=0)
+    conn = pool.get_connection()
+    created[0].in_transaction = True
+    conn.close()
+    assert created[0].rollbacks == 1
+
+    created[0].ping_ok = False
+    conn = pool.get_connection()
+    conn.close()
+    assert len(created) == 2
+    assert created[0].closed
+    print("✅ Pool rolls back and replaces dead connections")
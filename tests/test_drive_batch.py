@@ -0,0 +1,167 @@
+"""Test batched Drive operations against a fake in-memory Drive transport"""
+import json
+from email.parser import BytesParser
+from urllib.parse import urlsplit, parse_qs, unquote
+import httplib2
+import pytest
+from googleapiclient.discovery import build_from_document
+from clients import drive_client
+from clients.drive_client import DriveClient, _drive_discovery_doc
+
+
+def drive_file(file_id, name, can_edit=True, parents=("root",)):
+    return {
+        "id": file_id, "name": name, "mimeType": "application/pdf", "parents": list(parents),
+        "ownedByMe": can_edit,
+        "capabilities": {"canEdit": can_edit, "canDelete": can_edit, "canRename": can_edit,
+                         "canMoveItemWithinDrive": can_edit}
+    }
+
+
+class FakeDriveHttp:
+    """Stands in for httplib2.Http: serves files.get/list/update/delete, singly or batched"""
+
+    def __init__(self, files):
+        self.files = {f["id"]: f for f in files}
+        self.round_trips = []      # one entry per HTTP request: 'batch' or 'METHOD /path'
+
+    def request(self, uri, method="GET", body=None, headers=None, redirections=5, connection_type=None):
+        path = urlsplit(uri).path
+        if path.endswith("/batch/drive/v3"):
+            self.round_trips.append("batch")
+            return self._batch(body, headers)
+        self.round_trips.append(f"{method} {path}")
+        status, payload = self._dispatch(method, uri, body)
+        return httplib2.Response({"status": status, "content-type": "application/json"}), payload
+
+    def _dispatch(self, method, uri, body):
+        parts = urlsplit(uri)
+        query = parse_qs(parts.query)
+        segments = parts.path.rstrip("/").split("/")
+        if segments[-1] == "files":
+            return 200, json.dumps({"files": list(self.files.values())}).encode()
+
+        file_id = unquote(segments[-1])
+        if file_id not in self.files:
+            return 404, json.dumps({"error": {"code": 404, "message": "File not found"}}).encode()
+        item = self.files[file_id]
+        if method == "DELETE":
+            del self.files[file_id]
+            return 204, b""
+        if method == "PATCH":
+            if body:
+                item.update(json.loads(body))
+            if "addParents" in query:
+                removed = set(query.get("removeParents", [""])[0].split(","))
+                item["parents"] = [p for p in item["parents"] if p not in removed] + query["addParents"]
+        return 200, json.dumps(item).encode()
+
+    def _batch(self, body, headers):
+        content_type = headers["content-type"]
+        message = BytesParser().parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode() + (body if isinstance(body, bytes) else body.encode()))
+
+        parts = []
+        for part in message.get_payload():
+            content_id = part["Content-ID"]
+            raw = part.get_payload()
+            head, _, inner_body = raw.partition("\r\n\r\n") if "\r\n\r\n" in raw else raw.partition("\n\n")
+            method, target, _ = head.splitlines()[0].split(" ", 2)
+            status, payload = self._dispatch(method, target, inner_body.strip() or None)
+            parts.append(
+                "--BOUNDARY\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <response-{content_id.strip('<>')}>\r\n\r\n"
+                f"HTTP/1.1 {status} OK\r\nContent-Type: application/json\r\n\r\n"
+                f"{payload.decode()}\r\n"
+            )
+        response = "".join(parts) + "--BOUNDARY--"
+        return httplib2.Response({"status": 200, "content-type": "multipart/mixed; boundary=BOUNDARY"}), \
+            response.encode()
+
+
+class LocalDriveClient(DriveClient):
+    """DriveClient whose service talks to FakeDriveHttp"""
+
+    def __init__(self, http):
+        self._service = build_from_document(_drive_discovery_doc(), http=http)
+
+    @property
+    def service(self):
+        return self._service
+
+
+@pytest.fixture
+def drive():
+    drive_client.metadata_cache.clear()
+    http = FakeDriveHttp([
+        drive_file("a", "a.pdf"), drive_file("b", "b.pdf"), drive_file("c", "c.pdf"),
+        drive_file("ro", "readonly.pdf", can_edit=False),
+    ])
+    yield LocalDriveClient(http), http
+    drive_client.metadata_cache.clear()
+
+
+def test_batch_reuses_listed_capabilities(drive):
+    """After list_files, a mixed batch is one HTTP round trip with no permission GETs"""
+    client, http = drive
+    client.list_files()
+    http.round_trips.clear()
+
+    results = client.batch([
+        {"op": "delete", "id": "a"},
+        {"op": "rename", "id": "b", "name": "renamed.pdf"},
+        {"op": "move", "id": "c", "folder_id": "folder1"},
+        {"op": "metadata", "id": "ro"},
+    ])
+
+    assert http.round_trips == ["batch"]
+    assert [r["success"] for r in results] == [True, True, True, True]
+    assert "a" not in http.files
+    assert results[1]["file"]["name"] == "renamed.pdf"
+    assert http.files["c"]["parents"] == ["folder1"]
+    assert results[3]["file"]["can_delete"] is False
+    print("✅ Batch served from listed capabilities in one round trip")
+
+
+def test_batch_fetches_unknown_metadata_in_one_batch(drive):
+    """Files not seen before are looked up together, then mutated together"""
+    client, http = drive
+    results = client.batch([{"op": "rename", "id": i, "name": f"{i}-new"} for i in ("a", "b", "c")])
+
+    assert http.round_trips == ["batch", "batch"]
+    assert all(r["success"] for r in results)
+    print("✅ Unknown files cost one extra batch, not one GET each")
+
+
+def test_batch_reports_per_operation_failures(drive):
+    """Permission denials, missing files and bad operations fail individually"""
+    client, http = drive
+    client.list_files()
+
+    results = client.batch([
+        {"op": "delete", "id": "ro"},
+        {"op": "delete", "id": "missing"},
+        {"op": "rename", "id": "a"},
+        {"op": "explode", "id": "a"},
+        {"op": "delete", "id": "b"},
+    ])
+
+    assert results[0]["error_type"] == "permissions"
+    assert "not found" in results[1]["error"]
+    assert results[2]["error"] == "New name is required"
+    assert results[3]["success"] is False
+    assert results[4]["success"] is True
+    assert "ro" in http.files and "b" not in http.files
+    print("✅ Per-operation errors")
+
+
+def test_delete_file_uses_cached_capabilities(drive):
+    """delete_file right after list_files skips the permission GET"""
+    client, http = drive
+    client.list_files()
+    http.round_trips.clear()
+
+    assert client.delete_file("a") is True
+    assert http.round_trips == ["DELETE /drive/v3/files/a"]
+    print("✅ delete_file without permission round trip")
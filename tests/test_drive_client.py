@@ -0,0 +1,107 @@
+"""Test the shared Drive credentials / per-thread service pool (no network)"""
+import json
+import threading
+from datetime import datetime, timedelta
+import pytest
+from google.oauth2.credentials import Credentials
+from clients import drive_client
+from clients.drive_client import DriveCredentials, DriveClient
+
+
+def write_token(path, token, expires_in):
+    expiry = datetime.utcnow() + timedelta(seconds=expires_in)
+    with open(path, "w") as f:
+        json.dump({
+            "token": token,
+            "refresh_token": "refresh-me",
+            "client_id": "client",
+            "client_secret": "secret",
+            "scopes": drive_client.SCOPES,
+            "expiry": expiry.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+        }, f)
+
+
+@pytest.fixture
+def refresh_calls(monkeypatch):
+    """Replace the Google token endpoint with a counter"""
+    calls = []
+
+    def fake_refresh(self, request):
+        calls.append(threading.get_ident())
+        self.token = f"refreshed-{len(calls)}"
+        self.expiry = datetime.utcnow() + timedelta(hours=1)
+
+    monkeypatch.setattr(Credentials, "refresh", fake_refresh)
+    return calls
+
+
+@pytest.fixture
+def shared(tmp_path, monkeypatch):
+    """DriveClient wired to a temp token.json"""
+    token_path = str(tmp_path / "token.json")
+    credentials = DriveCredentials(str(tmp_path / "credentials.json"), token_path)
+    monkeypatch.setattr(drive_client, "_get_shared_credentials", lambda *paths: credentials)
+    return credentials, token_path
+
+
+def test_valid_token_is_not_refreshed(shared, refresh_calls):
+    """A token far from expiry is used as-is"""
+    credentials, token_path = shared
+    write_token(token_path, "still-good", expires_in=3600)
+
+    assert credentials.get().token == "still-good"
+    assert refresh_calls == []
+    print("✅ Valid token reused without refresh")
+
+
+def test_token_refreshed_ahead_of_expiry_once(shared, refresh_calls):
+    """A token inside the refresh-ahead window is refreshed exactly once, even under concurrency"""
+    credentials, token_path = shared
+    write_token(token_path, "about-to-expire", expires_in=60)
+
+    tokens = []
+    threads = [threading.Thread(target=lambda: tokens.append(credentials.get().token)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(refresh_calls) == 1
+    assert set(tokens) == {"refreshed-1"}
+    with open(token_path) as f:
+        assert json.load(f)["token"] == "refreshed-1"
+    print("✅ Single refresh-ahead, token file rewritten")
+
+
+def test_token_refreshed_by_another_worker_is_adopted(shared, refresh_calls):
+    """If token.json was already refreshed by another process, no second refresh happens"""
+    credentials, token_path = shared
+    write_token(token_path, "old", expires_in=3600)
+    assert credentials.get().token == "old"
+
+    # Our copy is now about to expire, another worker already wrote a fresh one
+    credentials._creds.expiry = datetime.utcnow() + timedelta(seconds=10)
+    write_token(token_path, "from-other-worker", expires_in=3600)
+
+    assert credentials.get().token == "from-other-worker"
+    assert refresh_calls == []
+    print("✅ Refreshed token picked up from disk")
+
+
+def test_service_is_per_thread_and_reused(shared, refresh_calls):
+    """Each thread gets its own transport/service; the same thread reuses it"""
+    _, token_path = shared
+    write_token(token_path, "good", expires_in=3600)
+
+    client = DriveClient()
+    first = client.service
+    assert client.service is first
+    assert DriveClient().service is first
+
+    other = []
+    t = threading.Thread(target=lambda: other.append(client.service))
+    t.start()
+    t.join()
+    assert other[0] is not first
+    assert hasattr(first, "files")
+    print("✅ Per-thread Drive services")
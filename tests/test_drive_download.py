@@ -0,0 +1,154 @@
+"""Test streaming Drive downloads against a local fake Drive media endpoint"""
+import re
+import pytest
+import requests
+from clients.drive_client import DriveClient, RangeNotSatisfiableError
+from tests.fake_servers import FakeServer
+
+BINARY = bytes(range(256)) * 40          # 10 KB "pdf"
+EXPORT = b"exported-docx-" * 500         # what the Docs export returns
+
+FILES = {
+    "bin1": {"id": "bin1", "name": "report.pdf", "mime_type": "application/pdf", "size": str(len(BINARY))},
+    "doc1": {"id": "doc1", "name": "Notes", "mime_type": "application/vnd.google-apps.document"},
+}
+
+
+def drive_routes():
+    def media(request):
+        match = re.match(r"bytes=(\d+)-(\d*)$", request.headers.get("Range", ""))
+        if not match:
+            return 200, BINARY, {"Content-Type": "application/pdf"}
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else len(BINARY) - 1
+        if start >= len(BINARY):
+            return 416, b"", {"Content-Range": f"bytes */{len(BINARY)}"}
+        return 206, BINARY[start:end + 1], {"Content-Range": f"bytes {start}-{end}/{len(BINARY)}"}
+
+    def export(request):
+        # Export ignores Range and streams without a length, like Drive does
+        return 200, (EXPORT[i:i + 1000] for i in range(0, len(EXPORT), 1000))
+
+    return {"GET /files/bin1": media, "GET /files/doc1/export": export}
+
+
+class LocalDriveClient(DriveClient):
+    """DriveClient pointed at the fake server, without Google credentials"""
+
+    def __init__(self, server_url):
+        self.server_url = server_url
+
+    def get_file_metadata(self, file_id):
+        return dict(FILES[file_id])
+
+    def _session(self):
+        return requests.Session()
+
+    def _media_url(self, file_id, export_mime_type=None):
+        if export_mime_type:
+            return f"{self.server_url}/files/{file_id}/export"
+        return f"{self.server_url}/files/{file_id}"
+
+
+@pytest.fixture
+def drive():
+    with FakeServer(drive_routes()) as server:
+        yield LocalDriveClient(server.url), server
+
+
+def test_binary_file_streams_in_chunks(drive):
+    """Regular files arrive as a sequence of chunk_size pieces"""
+    client, _ = drive
+    download = client.open_download("bin1", chunk_size=1024)
+    chunks = list(download)
+
+    assert download.status == 200
+    assert download.content_length == str(len(BINARY))
+    assert max(len(c) for c in chunks) == 1024
+    assert b"".join(chunks) == BINARY
+    print("✅ Binary download streamed in chunks")
+
+
+def test_range_is_passed_through(drive):
+    """A Range header goes to Drive and the 206 comes back unchanged"""
+    client, server = drive
+    download = client.open_download("bin1", range_header="bytes=100-199")
+
+    assert download.status == 206
+    assert download.content_range == f"bytes 100-199/{len(BINARY)}"
+    assert b"".join(download) == BINARY[100:200]
+    assert server.requests[-1].headers["Range"] == "bytes=100-199"
+    print("✅ Range passthrough")
+
+
+def test_unsatisfiable_range(drive):
+    """A range past the end raises with the file size for the 416 response"""
+    client, _ = drive
+    with pytest.raises(RangeNotSatisfiableError) as exc:
+        client.open_download("bin1", range_header=f"bytes={len(BINARY) + 10}-")
+    assert exc.value.size == len(BINARY)
+    print("✅ 416 for unsatisfiable range")
+
+
+def test_export_streams_without_range(drive):
+    """Google Docs are exported and streamed; name/mime follow the export format"""
+    client, _ = drive
+    download = client.open_download("doc1")
+
+    assert b"".join(download) == EXPORT
+    assert download.metadata["name"] == "Notes.docx"
+    assert download.metadata["mime_type"].endswith("wordprocessingml.document")
+    print("✅ Export streamed")
+
+
+def test_ranged_export_is_spooled(drive):
+    """The export endpoint ignores Range, so the range is served from a spool file"""
+    client, _ = drive
+    download = client.open_download("doc1", range_header="bytes=-100", chunk_size=30)
+    chunks = list(download)
+
+    assert download.status == 206
+    assert download.content_range == f"bytes {len(EXPORT) - 100}-{len(EXPORT) - 1}/{len(EXPORT)}"
+    assert download.content_length == 100
+    assert b"".join(chunks) == EXPORT[-100:]
+    assert max(len(c) for c in chunks) == 30
+    print("✅ Ranged export served from spool")
+
+
+def test_download_file_still_returns_bytes(drive):
+    """The in-memory helper keeps its (content, metadata) contract"""
+    client, _ = drive
+    content, metadata = client.download_file("bin1")
+    assert content == BINARY
+    assert metadata["name"] == "report.pdf"
+    print("✅ download_file compatibility")
+
+
+def test_download_route_streams_with_range_headers(drive, monkeypatch):
+    """The route relays status, Content-Range and Content-Disposition from the stream"""
+    from flask import Flask
+    from controllers import docs_controller
+    from services.docs_service import DocsService
+
+    client, _ = drive
+
+    def local_service():
+        service = DocsService.__new__(DocsService)
+        service.client = client
+        return service
+
+    monkeypatch.setattr(docs_controller, "DocsService", local_service)
+    app = Flask(__name__)
+    app.register_blueprint(docs_controller.docs_bp)
+
+    with app.test_client() as http:
+        response = http.get("/docs/api/documents/bin1/download", headers={"Range": "bytes=0-9"})
+        assert response.status_code == 206
+        assert response.data == BINARY[:10]
+        assert response.headers["Content-Range"] == f"bytes 0-9/{len(BINARY)}"
+        assert response.headers["Content-Disposition"] == 'attachment; filename="report.pdf"'
+
+        response = http.get("/docs/api/documents/bin1/download", headers={"Range": "bytes=999999-"})
+        assert response.status_code == 416
+        assert response.headers["Content-Range"] == f"bytes */{len(BINARY)}"
+    print("✅ Streaming download route")
@@ -0,0 +1,261 @@
+"""Test the local Drive metadata mirror and its Changes API sync (no real database or Drive needed)"""
+import json
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlsplit, parse_qs
+from datetime import datetime
+import pytest
+from clients import drive_client
+from clients.drive_client import ChangesTokenError
+from services.docs_service import DocsService
+from services.drive_sync_service import DriveSyncService
+from tests.test_drive_batch import FakeDriveHttp, LocalDriveClient, drive_file
+
+
+def listed(file_id, name, parents=("root",), modified="2024-05-01T10:00:00.000Z"):
+    return {"id": file_id, "name": name, "mime_type": "application/pdf", "type": "PDF",
+            "modified_at": modified, "size": "10", "parents": list(parents),
+            "can_delete": True, "can_rename": True}
+
+
+class InMemoryDriveMirror:
+    """Same interface as DriveFileRepository, backed by a dict"""
+
+    def __init__(self):
+        self.files = {}
+        self.state = None
+        self.lock = threading.Lock()    # stands in for MySQL's GET_LOCK
+
+    def replace_all(self, files):
+        self.files = {f["id"]: f for f in files}
+
+    def apply_changes(self, changed_files, removed_ids):
+        for file_id in removed_ids:
+            self.files.pop(file_id, None)
+        for f in changed_files:
+            self.files[f["id"]] = f
+
+    def get_sync_state(self):
+        return dict(self.state) if self.state else None
+
+    def save_sync_state(self, page_token, full=False):
+        self.state = {"page_token": page_token, "synced_at": datetime.utcnow()}
+
+    @contextmanager
+    def sync_lock(self, timeout=0):
+        acquired = self.lock.acquire(timeout=timeout or -1) if timeout else self.lock.acquire(blocking=False)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                self.lock.release()
+
+    def mark_stale(self):
+        if self.state:
+            self.state["synced_at"] = None
+
+    def list_files(self, limit=50, sort_by="recent", mime_type=None, folder_id=None, after=None):
+        rows = [f for f in self.files.values() if not folder_id or folder_id in f["parents"]]
+        key = {"name": lambda f: (f["name"], f["id"])}.get(sort_by, lambda f: (f["modified_at"], f["id"]))
+        rows = sorted(rows, key=key, reverse=(sort_by != "name"))
+        if after:
+            rows = [f for f in rows if (list(key(f)) < after if sort_by != "name" else list(key(f)) > after)]
+        page = rows[:limit]
+        return page, (list(key(page[-1])) if len(rows) > limit else None)
+
+    def search(self, text, limit=20):
+        return [f for f in self.files.values() if text.lower() in f["name"].lower()][:limit]
+
+
+class FakeChangesClient:
+    """The DriveClient calls the sync service makes"""
+
+    def __init__(self, files):
+        self.files = files
+        self.pending_changes = ([], [])
+        self.token_expired = False
+        self.calls = []
+
+    def get_start_page_token(self):
+        self.calls.append("start_token")
+        return "t1"
+
+    def iter_all_files(self):
+        self.calls.append("list_all")
+        return iter(self.files)
+
+    def list_changes(self, page_token):
+        self.calls.append(f"changes:{page_token}")
+        if self.token_expired:
+            self.token_expired = False
+            raise ChangesTokenError("gone", 410)
+        changed, removed = self.pending_changes
+        self.pending_changes = ([], [])
+        return changed, removed, "t2"
+
+    def list_files(self, **kwargs):
+        self.calls.append("live_list")
+        return [listed("live", "live.pdf")]
+
+    def list_files_page(self, **kwargs):
+        return self.list_files(), None
+
+
+@pytest.fixture
+def mirror():
+    return InMemoryDriveMirror()
+
+
+@pytest.fixture
+def drive():
+    return FakeChangesClient([listed("a", "Alpha.pdf"), listed("b", "Beta.pdf", parents=("f1",))])
+
+
+def docs_service(client, mirror):
+    service = DocsService.__new__(DocsService)
+    service.client = client
+    service._sync = DriveSyncService(client, repository=mirror)
+    return service
+
+
+def settle(service):
+    """Wait for the background sync the last read started"""
+    if service.sync.background:
+        service.sync.background.join(5)
+
+
+def test_first_read_full_syncs_then_serves_locally(drive, mirror):
+    """The first listing reads live Drive while the mirror is built; later reads never call Drive"""
+    service = docs_service(drive, mirror)
+
+    assert service.list_documents()["source"] == "drive"
+    settle(service)
+    # The listing and the background full sync run concurrently
+    assert sorted(drive.calls) == ["list_all", "live_list", "start_token"]
+
+    drive.calls.clear()
+    result = service.list_documents()
+    assert result["source"] == "mirror"
+    assert {d["id"] for d in result["documents"]} == {"a", "b"}
+    assert [d["id"] for d in service.list_documents(folder_id="f1")["documents"]] == ["b"]
+    assert [d["id"] for d in service.search_documents("alp")["documents"]] == ["a"]
+    assert drive.calls == []
+    print("✅ Full sync once in the background, then local reads")
+
+
+def test_write_marks_mirror_stale_and_changes_are_applied(drive, mirror):
+    """After a write the next read is served from the mirror at once and pulls changes in the background"""
+    service = docs_service(drive, mirror)
+    service.sync.sync_exclusive(full=True)
+
+    drive.pending_changes = ([listed("a", "Renamed.pdf")], ["b"])
+    service._mirror_changed()
+    gate, list_changes = threading.Event(), drive.list_changes
+    drive.list_changes = lambda token: gate.wait(5) and list_changes(token)
+    assert len(service.list_documents()["documents"]) == 2     # not waiting for Drive
+    gate.set()
+    settle(service)
+    names = [d["name"] for d in service.list_documents()["documents"]]
+
+    assert names == ["Renamed.pdf"]
+    assert drive.calls[-1] == "changes:t1"
+    assert mirror.state["page_token"] == "t2"
+    print("✅ Incremental sync after a write")
+
+
+def test_app_writes_are_listed_before_the_next_sync(mirror):
+    """A rename, delete or batch move through the app shows in the very next listing, with the sync held back"""
+    drive_client.metadata_cache.clear()
+    client = LocalDriveClient(FakeChangesHttp(
+        [drive_file("a", "a.pdf"), drive_file("b", "b.pdf"), drive_file("c", "c.pdf")], []))
+    service = docs_service(client, mirror)
+    service.sync.sync_exclusive(full=True)
+    gate, list_changes = threading.Event(), client.list_changes
+    client.list_changes = lambda token: gate.wait(5) and list_changes(token)
+
+    assert service.rename_document("a", "renamed.pdf")["success"]
+    assert service.delete_document("b")["success"]
+    assert service.batch_documents([{"op": "move", "id": "c", "folder_id": "f1"}])["succeeded"] == 1
+    listing = service.list_documents(sort_by="name")
+    folder = service.list_documents(folder_id="f1")
+    gate.set()
+    settle(service)
+
+    assert listing["source"] == "mirror"
+    assert [d["name"] for d in listing["documents"]] == ["c.pdf", "renamed.pdf"]
+    assert [d["id"] for d in folder["documents"]] == ["c"]
+    print("✅ Own writes listed without waiting for a sync")
+
+
+def test_sync_is_skipped_while_another_process_holds_the_lock(drive, mirror):
+    """Only the holder of the cross-process lock syncs; the others keep serving the mirror"""
+    sync = DriveSyncService(drive, repository=mirror)
+    sync.sync_exclusive(full=True)
+    mirror.mark_stale()
+    drive.calls.clear()
+
+    with mirror.sync_lock() as acquired:
+        assert acquired
+        assert sync.sync_exclusive() is None
+    assert drive.calls == []
+    assert sync.sync_exclusive()["mode"] == "changes"
+    print("✅ One sync at a time across processes")
+
+
+def test_expired_token_triggers_full_resync(drive, mirror):
+    """A 410 from changes().list falls back to a full listing"""
+    sync = DriveSyncService(drive, repository=mirror)
+    sync.full_sync()
+    drive.token_expired = True
+
+    assert sync.sync()["mode"] == "full"
+    assert drive.calls == ["start_token", "list_all", "changes:t1", "start_token", "list_all"]
+    print("✅ Expired page token resyncs")
+
+
+def test_mirror_down_falls_back_to_live_drive(drive):
+    """Without the mirror (e.g. DB down) listing still works against Drive"""
+    class BrokenMirror(InMemoryDriveMirror):
+        def get_sync_state(self):
+            raise ConnectionError("no database")
+
+    result = docs_service(drive, BrokenMirror()).list_documents()
+    assert result["source"] == "drive"
+    assert result["documents"][0]["id"] == "live"
+    print("✅ Live Drive fallback")
+
+
+class FakeChangesHttp(FakeDriveHttp):
+    """FakeDriveHttp plus changes.getStartPageToken / changes.list"""
+
+    def __init__(self, files, changes):
+        super().__init__(files)
+        self.changes = changes
+
+    def _dispatch(self, method, uri, body):
+        if "/changes/startPageToken" in uri:
+            return 200, json.dumps({"startPageToken": "t1"}).encode()
+        if uri.split("?")[0].endswith("/changes"):
+            if parse_qs(urlsplit(uri).query)["pageToken"] == ["t1"]:
+                return 200, json.dumps({"changes": self.changes[:2], "nextPageToken": "t1b"}).encode()
+            return 200, json.dumps({"changes": self.changes[2:], "newStartPageToken": "t2"}).encode()
+        return super()._dispatch(method, uri, body)
+
+
+def test_list_changes_follows_pages_and_treats_trash_as_removal():
+    """changes().list pages are merged; removed and trashed files are reported as removed"""
+    drive_client.metadata_cache.clear()
+    http = FakeChangesHttp([], [
+        {"fileId": "a", "removed": False, "file": drive_file("a", "a.pdf")},
+        {"fileId": "gone", "removed": True},
+        {"fileId": "t", "removed": False, "file": dict(drive_file("t", "t.pdf"), trashed=True)},
+        {"fileId": "a", "removed": False, "file": drive_file("a", "a-v2.pdf")},
+    ])
+    client = LocalDriveClient(http)
+
+    assert client.get_start_page_token() == "t1"
+    changed, removed, token = client.list_changes("t1")
+    assert [f["name"] for f in changed] == ["a-v2.pdf"]
+    assert removed == ["gone", "t"]
+    assert token == "t2"
+    print("✅ Changes pages merged")
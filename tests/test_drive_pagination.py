@@ -0,0 +1,139 @@
+"""Test paginated Drive listings: lazy page generator, background prefetch and opaque cursors"""
+import json
+import threading
+import time
+from urllib.parse import urlsplit, parse_qs
+import pytest
+from clients import drive_client
+from services.docs_service import DocsService
+from services.drive_sync_service import DriveSyncService
+from tests.test_drive_batch import FakeDriveHttp, LocalDriveClient, drive_file
+from tests.test_drive_mirror import InMemoryDriveMirror, FakeChangesClient, listed
+
+
+class PagedDriveHttp(FakeDriveHttp):
+    """FakeDriveHttp whose files.list honours pageSize / pageToken (token = offset)"""
+
+    def __init__(self, files, latency=0.0):
+        super().__init__(files)
+        self.latency = latency
+        self.lock = threading.Lock()
+
+    def request(self, uri, method="GET", body=None, headers=None, redirections=5, connection_type=None):
+        with self.lock:
+            return super().request(uri, method, body, headers, redirections, connection_type)
+
+    def _dispatch(self, method, uri, body):
+        parts = urlsplit(uri)
+        if method == "GET" and parts.path.endswith("/files"):
+            time.sleep(self.latency)
+            query = parse_qs(parts.query)
+            size = int(query["pageSize"][0])
+            start = int(query.get("pageToken", ["0"])[0])
+            items = list(self.files.values())
+            body = {"files": items[start:start + size]}
+            if start + size < len(items):
+                body["nextPageToken"] = str(start + size)
+            return 200, json.dumps(body).encode()
+        return super()._dispatch(method, uri, body)
+
+
+@pytest.fixture
+def paged():
+    drive_client.metadata_cache.clear()
+    drive_client.page_cache.clear()
+    http = PagedDriveHttp([drive_file(f"f{i:02d}", f"file{i:02d}.pdf") for i in range(25)])
+    yield LocalDriveClient(http), http
+    drive_client.page_cache.clear()
+
+
+def test_page_generator_is_lazy(paged):
+    """iter_file_pages only calls Drive when the next page is pulled"""
+    client, http = paged
+    pages = client.iter_file_pages(limit=10)
+    assert http.round_trips == []
+
+    files, token = next(pages)
+    assert [f["id"] for f in files][:2] == ["f00", "f01"] and token == "10"
+    assert len(http.round_trips) == 1
+
+    rest = list(pages)
+    assert [len(files) for files, _ in rest] == [10, 5]
+    assert rest[-1][1] is None
+    assert len(http.round_trips) == 3
+    print("✅ Pages fetched lazily until the listing ends")
+
+
+def test_next_page_is_prefetched(paged):
+    """With prefetch the following page is fetched in the background and reused"""
+    client, http = paged
+    files, token = client.list_files_page(limit=10, prefetch=True)
+
+    deadline = time.time() + 2
+    while len(http.round_trips) < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert len(http.round_trips) == 2           # page 2 requested without being asked
+
+    second, _ = client.list_files_page(limit=10, page_token=token)
+    assert [f["id"] for f in second][0] == "f10"
+    assert len(http.round_trips) == 2           # served from the prefetched result
+    print("✅ Next page prefetched")
+
+
+def test_live_listing_cursor_walks_all_pages(paged):
+    """Without a mirror the API cursor wraps Drive page tokens"""
+    client, _ = paged
+
+    class NoMirror(InMemoryDriveMirror):
+        def get_sync_state(self):
+            raise ConnectionError("no database")
+
+    service = DocsService.__new__(DocsService)
+    service.client = client
+    service._sync = DriveSyncService(client, repository=NoMirror())
+
+    seen, cursor = [], None
+    while True:
+        result = service.list_documents(limit=10, cursor=cursor)
+        assert result["source"] == "drive"
+        seen += [d["id"] for d in result["documents"]]
+        cursor = result["next_cursor"]
+        if not cursor:
+            break
+    assert seen == [f"f{i:02d}" for i in range(25)]
+    print("✅ Live cursor pagination")
+
+
+def test_mirror_cursor_pages_without_overlap():
+    """Mirror pages are keyset pages: no duplicates, no gaps"""
+    files = [listed(f"m{i}", f"doc{i}.pdf", modified=f"2024-05-{1 + i % 3:02d}T10:00:00.000Z") for i in range(7)]
+    client = FakeChangesClient(files)
+    service = DocsService.__new__(DocsService)
+    service.client = client
+    service._sync = DriveSyncService(client, repository=InMemoryDriveMirror())
+    service.sync.sync_exclusive(full=True)
+
+    seen, cursor = [], None
+    while True:
+        result = service.list_documents(limit=3, cursor=cursor)
+        assert result["source"] == "mirror"
+        seen += [d["id"] for d in result["documents"]]
+        cursor = result["next_cursor"]
+        if not cursor:
+            break
+    assert sorted(seen) == sorted(f["id"] for f in files) and len(seen) == 7
+    print("✅ Mirror cursor pagination")
+
+
+def test_cursor_is_bound_to_its_query():
+    """A cursor replayed with other filters, or tampered with, is rejected"""
+    client = FakeChangesClient([listed(f"m{i}", f"doc{i}.pdf") for i in range(5)])
+    service = DocsService.__new__(DocsService)
+    service.client = client
+    service._sync = DriveSyncService(client, repository=InMemoryDriveMirror())
+    service.sync.sync_exclusive(full=True)
+
+    cursor = service.list_documents(limit=2)["next_cursor"]
+    assert service.list_documents(limit=2, sort_by="name", cursor=cursor)["error_type"] == "cursor"
+    assert service.list_documents(limit=2, cursor="not-a-cursor")["error_type"] == "cursor"
+    print("✅ Cursor bound to query")
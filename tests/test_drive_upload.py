@@ -0,0 +1,247 @@
+"""Test background resumable Drive uploads against a local fake resumable-upload endpoint"""
+import io
+import re
+import time
+from datetime import datetime
+import pytest
+import requests
+from werkzeug.datastructures import FileStorage
+from clients import drive_client
+from clients.drive_client import DriveClient, DriveClientError
+from services import drive_upload_service
+from services.drive_upload_service import DriveUploadService
+from tests.fake_servers import FakeServer
+
+CHUNK = drive_client.UPLOAD_CHUNK_GRANULARITY
+PAYLOAD = bytes(range(256)) * 2600          # ~650 KB: two full chunks and a short last one
+
+
+class FakeResumableDrive:
+    """Drive's resumable upload protocol: open a session, PUT ranges, 308 until complete"""
+
+    def __init__(self):
+        self.sessions = {}
+        self.failures = []          # statuses returned instead of handling the next PUTs
+        self.fail_after = None      # once a session holds this many bytes, every PUT gets a 503
+        self.url = None
+
+    def routes(self):
+        return {"POST /upload/drive/v3/files": self.open_session,
+                **{f"PUT /session/{n}": self.put for n in range(1, 4)}}
+
+    def open_session(self, request):
+        session_id = str(len(self.sessions) + 1)
+        self.sessions[session_id] = {"data": bytearray(),
+                                     "total": int(request.headers["X-Upload-Content-Length"]),
+                                     "name": request.json()["name"]}
+        return 200, b"", {"Location": f"{self.url}/session/{session_id}"}
+
+    def put(self, request):
+        session = self.sessions.get(request.path.rsplit("/", 1)[1])
+        if session is None:
+            return 404, {"error": {"code": 404, "message": "Session expired"}}
+        if self.failures:
+            return self.failures.pop(0), b""
+        if self.fail_after is not None and len(session["data"]) >= self.fail_after:
+            return 503, b""
+
+        match = re.match(r"bytes (\d+)-(\d+)/(\d+)", request.headers["Content-Range"])
+        if match and int(match.group(1)) == len(session["data"]):
+            session["data"] += request.body
+        if len(session["data"]) == session["total"]:
+            return 200, {"id": "drive-file-1", "name": session["name"], "size": str(session["total"])}
+        headers = {"Range": f"bytes=0-{len(session['data']) - 1}"} if session["data"] else {}
+        return 308, b"", headers
+
+
+class LocalDriveClient(DriveClient):
+    """DriveClient pointed at the fake server, without Google credentials"""
+
+    def __init__(self, server_url):
+        self.server_url = server_url
+
+    def _session(self):
+        return requests.Session()
+
+    def _upload_url(self):
+        return f"{self.server_url}/upload/drive/v3/files"
+
+
+class InMemoryUploads:
+    """Same interface as DriveUploadRepository, backed by a dict"""
+
+    def __init__(self):
+        self.rows = {}
+
+    def create(self, upload_id, filename, mime_type, folder_id, spool_path, total_bytes):
+        self.rows[upload_id] = {"upload_id": upload_id, "filename": filename, "mime_type": mime_type,
+                                "folder_id": folder_id, "spool_path": spool_path, "total_bytes": total_bytes,
+                                "bytes_sent": 0, "session_uri": None, "status": "queued", "error": None,
+                                "file_id": None, "updated_at": datetime.utcnow()}
+
+    def get(self, upload_id):
+        row = self.rows.get(upload_id)
+        return dict(row) if row else None
+
+    def claim(self, upload_id, stale_after_seconds):
+        row = self.rows[upload_id]
+        if row["status"] in ("completed", "uploading"):
+            return False
+        self._set(upload_id, status="uploading", error=None)
+        return True
+
+    def save_session(self, upload_id, session_uri):
+        self._set(upload_id, session_uri=session_uri, bytes_sent=0)
+
+    def update_progress(self, upload_id, bytes_sent):
+        self._set(upload_id, bytes_sent=bytes_sent)
+
+    def mark_completed(self, upload_id, file_id):
+        self._set(upload_id, status="completed", file_id=file_id, session_uri=None,
+                  bytes_sent=self.rows[upload_id]["total_bytes"])
+
+    def mark_failed(self, upload_id, error):
+        self._set(upload_id, status="failed", error=error)
+
+    def list_interrupted(self, stale_after_seconds):
+        return [dict(r) for r in self.rows.values() if r["status"] == "failed"]
+
+    def _set(self, upload_id, **values):
+        self.rows[upload_id].update(values, updated_at=datetime.utcnow())
+
+
+class InlineExecutor:
+    def submit(self, fn, *args):
+        fn(*args)
+
+
+@pytest.fixture
+def drive(monkeypatch, tmp_path):
+    monkeypatch.setattr(drive_client, "UPLOAD_RETRY_DELAY", 0)
+    monkeypatch.setattr(drive_upload_service, "UPLOAD_DIR", str(tmp_path))
+    fake = FakeResumableDrive()
+    with FakeServer(fake.routes()) as server:
+        fake.url = server.url
+        yield LocalDriveClient(server.url), fake, server
+
+
+def upload_form(data=PAYLOAD, name="report.pdf"):
+    return FileStorage(stream=io.BytesIO(data), filename=name, content_type="application/pdf")
+
+
+def test_chunks_report_acknowledged_bytes(drive):
+    """Each chunk Drive acknowledges is reported; the last one returns the file"""
+    client, fake, _ = drive
+    session_uri = client.start_resumable_upload("report.pdf", "application/pdf", len(PAYLOAD))
+    progress = []
+
+    file = client.upload_chunks(session_uri, io.BytesIO(PAYLOAD), len(PAYLOAD), chunk_size=CHUNK,
+                                on_progress=progress.append)
+
+    assert file["id"] == "drive-file-1"
+    assert progress == [CHUNK, 2 * CHUNK]
+    assert bytes(fake.sessions["1"]["data"]) == PAYLOAD
+    print("✅ Chunked upload with real progress")
+
+
+def test_transient_failure_asks_drive_where_to_continue(drive):
+    """A 503 mid-upload is followed by a status query, not a restart from zero"""
+    client, fake, server = drive
+    session_uri = client.start_resumable_upload("report.pdf", "application/pdf", len(PAYLOAD))
+
+    failed_at = []
+
+    def fail_next_put(sent):
+        if not failed_at:           # only the PUT after the first acknowledged chunk
+            failed_at.append(sent)
+            fake.failures = [503]
+
+    client.upload_chunks(session_uri, io.BytesIO(PAYLOAD), len(PAYLOAD), chunk_size=CHUNK,
+                         on_progress=fail_next_put)
+
+    ranges = [r.headers["Content-Range"] for r in server.requests if r.method == "PUT"]
+    assert f"bytes */{len(PAYLOAD)}" in ranges
+    assert not any(r.startswith("bytes 0-") for r in ranges[1:])
+    assert bytes(fake.sessions["1"]["data"]) == PAYLOAD
+    print("✅ Transient failure resumed in place")
+
+
+def test_interrupted_upload_resumes_saved_session(drive, monkeypatch):
+    """A failed job keeps its session URI; resume continues from Drive's offset"""
+    client, fake, server = drive
+    monkeypatch.setattr(drive_client, "UPLOAD_RETRIES", 0)
+    monkeypatch.setattr(drive_client, "UPLOAD_CHUNK_SIZE", CHUNK)
+    uploads = InMemoryUploads()
+    service = DriveUploadService(client, repository=uploads, executor=InlineExecutor())
+
+    fake.fail_after = CHUNK
+
+    job = service.start(upload_form())
+    row = uploads.get(job["upload_id"])
+    assert row["status"] == "failed" and row["bytes_sent"] == CHUNK and row["session_uri"]
+
+    fake.fail_after = None
+    seen = len(server.requests)
+    service.resume(job["upload_id"])
+
+    row = uploads.get(job["upload_id"])
+    resumed_puts = [r.headers["Content-Range"] for r in server.requests[seen:] if r.method == "PUT"]
+    assert row["status"] == "completed" and row["file_id"] == "drive-file-1"
+    assert len(fake.sessions) == 1                           # no second session
+    assert resumed_puts[1].startswith(f"bytes {CHUNK}-")     # after the status query
+    assert bytes(fake.sessions["1"]["data"]) == PAYLOAD
+    print("✅ Interrupted upload resumed from the saved session")
+
+
+def test_expired_session_starts_over(drive):
+    """If Drive forgot the session, the upload restarts in a new one"""
+    client, fake, _ = drive
+    uploads = InMemoryUploads()
+    service = DriveUploadService(client, repository=uploads, executor=InlineExecutor())
+    uploads.create("u1", "report.pdf", "application/pdf", None, "", len(PAYLOAD))
+    spool = drive_upload_service.UPLOAD_DIR + "/u1"
+    with open(spool, "wb") as f:
+        f.write(PAYLOAD)
+    uploads.rows["u1"].update(spool_path=spool, session_uri=f"{fake.url}/session/3", status="failed")
+
+    service.resume("u1")
+
+    assert uploads.get("u1")["status"] == "completed"
+    assert bytes(fake.sessions["1"]["data"]) == PAYLOAD
+    print("✅ Expired session restarted")
+
+
+def test_upload_runs_off_the_request_thread(drive):
+    """start() returns at once with a job id; polling shows progress through to completion"""
+    client, fake, server = drive
+    server.delay = 0.05
+    uploads, completed = InMemoryUploads(), []
+    service = DriveUploadService(client, repository=uploads, on_complete=lambda file: completed.append(file["id"]))
+
+    job = service.start(upload_form())
+    assert job["status"] in ("queued", "uploading") and job["bytes_sent"] == 0
+
+    deadline = time.time() + 10
+    while service.get(job["upload_id"])["status"] not in ("completed", "failed") and time.time() < deadline:
+        time.sleep(0.02)
+
+    final = service.get(job["upload_id"])
+    assert final["status"] == "completed" and final["percent"] == 100
+    assert completed == ["drive-file-1"]
+    assert not drive_upload_service.os.path.exists(uploads.get(job["upload_id"])["spool_path"])
+    print("✅ Background upload polled to completion")
+
+
+def test_upload_errors_are_reported(drive):
+    """A session that cannot be opened fails the job with the reason"""
+    client, fake, server = drive
+    server.routes["POST /upload/drive/v3/files"] = lambda request: (403, {"error": {"code": 403}})
+    uploads = InMemoryUploads()
+    service = DriveUploadService(client, repository=uploads, executor=InlineExecutor())
+
+    job = service.get(service.start(upload_form())["upload_id"])
+
+    assert job["status"] == "failed" and "HTTP 403" in job["error"]
+    with pytest.raises(DriveClientError):
+        client.start_resumable_upload("x", "text/plain", 1)
+    print("✅ Upload errors reported")
@@ -44,3 +44,21 @@ def test_factory_invalid_type_raises_error():
     except (ValueError, KeyError, Exception):
         assert True
         print("✅ Factory correctly raises error for invalid type")
+
+def test_factory_returns_same_instance():
+    """Test factory caches one repository instance per entity type"""
+    repo1 = RepositoryFactory.get_repository("task")
+    repo2 = RepositoryFactory.get_repository("TASK")
+    assert repo1 is repo2
+    print("✅ Factory reuses repository instances")
+
+def test_factory_override():
+    """Test factory override and reset"""
+    fake = object()
+    RepositoryFactory.override("project", fake)
+    try:
+        assert RepositoryFactory.get_repository("project") is fake
+    finally:
+        RepositoryFactory.reset("project")
+    assert isinstance(RepositoryFactory.get_repository("project"), ProjectRepository)
+    print("✅ Factory override works")
@@ -0,0 +1,158 @@
+"""Test the concurrent GitHub fetcher against a local fake GitHub server"""
+import time
+import pytest
+from clients import github_client
+from clients.github_client import GitHubClient
+from services.github_service import GitHubService
+from tests.fake_servers import FakeServer
+
+REPOS = [f"repo{i}" for i in range(5)]
+LATENCY = 0.1
+
+
+@pytest.fixture(autouse=True)
+def no_github_store():
+    """Without a database the local GitHub store is simply unavailable"""
+    from repositories.repository_factory import RepositoryFactory
+
+    class UnavailableStore:
+        def __getattr__(self, name):
+            raise ConnectionError("no database in tests")
+
+    RepositoryFactory.override("github", UnavailableStore())
+    yield
+    RepositoryFactory.reset("github")
+
+
+def fake_github_routes(failing=()):
+    def repos(request):
+        return 200, [{"name": name, "owner": {"login": "octo"}, "language": "Python"} for name in REPOS]
+
+    def commits(request):
+        return 200, [{"sha": "abcdef123", "html_url": "http://x",
+                      "commit": {"message": "fix", "author": {"name": "Ann", "date": "2024-05-01T10:00:00Z"}}}]
+
+    def pulls(request):
+        return 200, [{"number": 1, "title": "PR", "user": {"login": "ann"}, "state": "open", "merged_at": None,
+                      "html_url": "http://x", "created_at": "2024-05-01T10:00:00Z"}]
+
+    def branches(request):
+        return 200, [{"name": "main", "protected": True, "commit": {"sha": "abcdef123"}}]
+
+    def broken(request):
+        return 500, {"message": "boom"}
+
+    routes = {"GET /user/repos": repos}
+    for name in REPOS:
+        base = f"GET /repos/octo/{name}"
+        routes[f"{base}/commits"] = broken if f"{name}/commits" in failing else commits
+        routes[f"{base}/pulls"] = pulls
+        routes[f"{base}/branches"] = branches
+    return routes
+
+
+def use_client(monkeypatch, url, **kwargs):
+    client = GitHubClient(base_url=url, **kwargs)
+    monkeypatch.setattr(github_client, "_client", client)
+    return client
+
+
+def test_dashboard_activity_fetches_concurrently(monkeypatch):
+    """Test the 15 per-repo calls run in parallel instead of one after another"""
+    with FakeServer(fake_github_routes(), delay=LATENCY) as server:
+        use_client(monkeypatch, server.url, max_workers=8)
+
+        started = time.monotonic()
+        data = GitHubService.get_dashboard_activity("token")
+        elapsed = time.monotonic() - started
+
+    serial_estimate = LATENCY * (1 + 3 * len(REPOS))
+    assert data["stats"]["recent_commits"] == len(REPOS)
+    assert data["stats"]["total_branches"] == len(REPOS)
+    assert data["repos_list"] == REPOS
+    assert data["errors"] == []
+    assert elapsed < serial_estimate / 2, f"{elapsed:.2f}s vs ~{serial_estimate:.2f}s serial"
+    print(f"✅ Dashboard activity fetched in {elapsed:.2f}s (serial would be ~{serial_estimate:.2f}s)")
+
+
+def test_dashboard_activity_degrades_to_partial_results(monkeypatch):
+    """Test a failing call is reported while the other results are kept"""
+    with FakeServer(fake_github_routes(failing={"repo2/commits"})) as server:
+        use_client(monkeypatch, server.url)
+        data = GitHubService.get_dashboard_activity("token")
+
+    assert data["stats"]["recent_commits"] == len(REPOS) - 1
+    assert data["stats"]["open_prs"] == len(REPOS)
+    assert data["errors"] == ["/repos/octo/repo2/commits?per_page=100"]
+    print("✅ Failed GitHub calls degrade to partial results")
+
+
+def test_call_timeout(monkeypatch):
+    """Test a slow GitHub call times out instead of hanging the request"""
+    with FakeServer(fake_github_routes(), delay=0.5) as server:
+        use_client(monkeypatch, server.url, timeout=0.1)
+        started = time.monotonic()
+        repos = GitHubService.get_user_repos("token")
+        elapsed = time.monotonic() - started
+
+    assert repos == []
+    assert elapsed < 0.45
+    print("✅ Slow GitHub calls time out")
+
+
+def etag_routes():
+    def repos(request):
+        headers = {"ETag": '"v1"', "X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "4999"}
+        if request.headers.get("If-None-Match") == '"v1"':
+            return 304, b"", headers
+        return 200, [{"name": "repo0", "full_name": "octo/repo0", "owner": {"login": "octo"}}], headers
+    return {"GET /user/repos": repos}
+
+
+def test_conditional_requests_served_from_cache(monkeypatch):
+    """Test a repeated GET revalidates with If-None-Match and reuses the cached body on 304"""
+    from clients.github_cache import GitHubHTTPCache
+
+    with FakeServer(etag_routes()) as server:
+        client = use_client(monkeypatch, server.url, cache=GitHubHTTPCache(db_path=""))
+        first = GitHubService.get_user_repos("token")
+        second = GitHubService.get_user_repos("token")
+        other_user = GitHubService.get_user_repos("other-token")
+
+    assert first == second == other_user
+    sent = [r.headers.get("If-None-Match") for r in server.requests]
+    # The other user's token never reuses the first user's entry
+    assert sent == [None, '"v1"', None]
+
+    stats = client.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 2
+    assert stats["rate_limit"]["remaining"] == 4999
+    print("✅ Conditional GitHub requests served from cache")
+
+
+def test_cache_evicts_by_size():
+    """Test the cache stays within its byte budget, dropping least recently used entries"""
+    from clients.github_cache import GitHubHTTPCache
+
+    cache = GitHubHTTPCache(max_entries=10, max_bytes=100, db_path="")
+    cache.put("a", '"a"', None, ["a"], 60)
+    cache.put("b", '"b"', None, ["b"], 30)
+    cache.get("a")
+    cache.put("c", '"c"', None, ["c"], 30)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+    print("✅ GitHub cache evicts by size")
+
+
+def test_cache_persists_to_sqlite(tmp_path):
+    """Test entries written to the SQLite tier are visible to a fresh cache (e.g. after restart)"""
+    from clients.github_cache import GitHubHTTPCache
+
+    db_path = str(tmp_path / "github_cache.db")
+    GitHubHTTPCache(db_path=db_path).put("k", '"v1"', None, {"x": 1}, 10)
+
+    entry = GitHubHTTPCache(db_path=db_path).get("k")
+    assert entry.etag == '"v1"' and entry.body == {"x": 1}
+    print("✅ GitHub cache persists to SQLite")
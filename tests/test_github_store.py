@@ -0,0 +1,158 @@
+"""Test webhook-fed GitHub activity served from the local store (no real database needed)"""
+import time
+import pytest
+from clients import github_client
+from clients.github_client import GitHubClient
+from clients.github_cache import GitHubHTTPCache
+from repositories.repository_factory import RepositoryFactory
+from services.github_service import GitHubService
+from tests.fake_servers import FakeServer
+from tests.test_github_client import fake_github_routes, REPOS
+
+
+class InMemoryGitHubStore:
+    """Same interface as GitHubRepository, backed by dicts"""
+
+    def __init__(self):
+        self.deliveries = set()
+        self.backfilled = set()
+        self.synced_at = {}     # repo -> time of the last backfill or webhook event
+        self.commits = {}
+        self.pull_requests = {}
+        self.branches = {}
+
+    def record_delivery(self, delivery_id, event, repo_full_name):
+        if delivery_id in self.deliveries:
+            return False
+        self.deliveries.add(delivery_id)
+        self.synced_at[repo_full_name] = time.time()
+        return True
+
+    def upsert_commits(self, repo, commits, branch=None, delivery_id=None):
+        for c in commits:
+            self.commits[(repo, c['sha'])] = c
+
+    def upsert_pull_requests(self, repo, pull_requests, delivery_id=None):
+        for pr in pull_requests:
+            self.pull_requests[(repo, pr['number'])] = pr
+
+    def upsert_branch(self, repo, name, sha, protected=None):
+        self.branches[(repo, name)] = {'name': name, 'protected': bool(protected), 'sha': sha[:7]}
+
+    def delete_branch(self, repo, name):
+        self.branches.pop((repo, name), None)
+
+    def mark_backfilled(self, repo):
+        self.backfilled.add(repo)
+        self.synced_at[repo] = time.time()
+
+    def get_fresh_repos(self, repos, max_age_seconds):
+        return {r for r in repos if r in self.backfilled and time.time() - self.synced_at[r] <= max_age_seconds}
+
+    def get_commits(self, repo, limit=10):
+        rows = sorted((c for (r, _), c in self.commits.items() if r == repo),
+                      key=lambda c: c['committed_at'], reverse=True)
+        return [GitHubService._format_commit(c) for c in rows[:limit]]
+
+    def get_pull_requests(self, repo, limit=10):
+        rows = [pr for (r, _), pr in self.pull_requests.items() if r == repo]
+        return [GitHubService._format_pull_request(pr) for pr in rows[:limit]]
+
+    def get_branches(self, repo):
+        return [b for (r, _), b in self.branches.items() if r == repo]
+
+
+@pytest.fixture
+def store():
+    store = InMemoryGitHubStore()
+    RepositoryFactory.override("github", store)
+    yield store
+    RepositoryFactory.reset("github")
+
+
+PUSH = {
+    "ref": "refs/heads/main",
+    "after": "f" * 40,
+    "repository": {"full_name": "octo/repo0"},
+    "commits": [{"id": "a" * 40, "message": "Add login", "timestamp": "2024-05-02T09:00:00+02:00",
+                 "url": "http://x", "author": {"name": "Ann", "username": "ann"}}]
+}
+
+
+def test_webhook_delivery_is_idempotent(store):
+    """Test a redelivered webhook (same delivery ID) is not applied twice"""
+    assert GitHubService.handle_webhook_event("push", "d-1", PUSH) is True
+    assert GitHubService.handle_webhook_event("push", "d-1", PUSH) is False
+
+    assert len(store.commits) == 1
+    assert store.commits[("octo/repo0", "a" * 40)]["committed_at"].hour == 7  # stored as UTC
+    assert store.branches[("octo/repo0", "main")]["sha"] == "fffffff"
+    print("✅ Webhook deliveries are idempotent")
+
+
+def use_fake_github(monkeypatch, server):
+    monkeypatch.setattr(github_client, "_client",
+                        GitHubClient(base_url=server.url, cache=GitHubHTTPCache(db_path="")))
+
+
+def test_project_commits_read_from_local_store(store, monkeypatch):
+    """Test a fresh backfilled repo is served locally; GitHub is only asked whether the token can see it"""
+    GitHubService.handle_webhook_event("push", "d-2", PUSH)
+    store.mark_backfilled("octo/repo0")
+
+    routes = {"GET /repos/octo/repo0": lambda request: (200, {"full_name": "octo/repo0", "private": True})}
+    with FakeServer(routes) as server:
+        use_fake_github(monkeypatch, server)
+        commits = GitHubService.get_project_commits("token", "octo/repo0")
+        paths = [r.path for r in server.requests]
+
+    assert commits == [{"message": "Add login", "author": "Ann", "date": "2024-05-02",
+                        "url": "http://x", "sha": "aaaaaaa"}]
+    assert paths == ["/repos/octo/repo0"]
+    print("✅ Project commits served from the local store")
+
+
+def test_stored_commits_need_a_token_that_can_see_the_repo(store, monkeypatch):
+    """Test stored history of a private repo is not returned without access to it"""
+    GitHubService.handle_webhook_event("push", "d-3", PUSH)
+    store.mark_backfilled("octo/repo0")
+
+    assert GitHubService.get_project_commits(None, "octo/repo0") == []
+    with FakeServer({}) as server:      # GitHub answers 404 to tokens that can't see a private repo
+        use_fake_github(monkeypatch, server)
+        assert GitHubService.get_project_commits("other-token", "octo/repo0") == []
+    print("✅ Private history needs repo access")
+
+
+def test_dashboard_backfills_then_reads_locally(store, monkeypatch):
+    """Test the first dashboard view backfills repos and the second one only asks GitHub for the repo list"""
+    with FakeServer(fake_github_routes()) as server:
+        use_fake_github(monkeypatch, server)
+        first = GitHubService.get_dashboard_activity("token")
+        calls_after_first = len(server.requests)
+        second = GitHubService.get_dashboard_activity("token")
+        calls_in_second = len(server.requests) - calls_after_first
+
+    assert store.backfilled == {f"octo/{name}" for name in REPOS}
+    assert calls_in_second == 1
+    assert first["stats"] == second["stats"]
+    assert first["commits"] == second["commits"]
+    print("✅ Dashboard backfills once, then reads the local store")
+
+
+def test_stale_store_is_backfilled_again(store, monkeypatch):
+    """Test a repo whose stored copy is older than the TTL (no webhook events) is fetched from GitHub again"""
+    from services import github_service
+
+    with FakeServer(fake_github_routes()) as server:
+        use_fake_github(monkeypatch, server)
+        GitHubService.get_dashboard_activity("token")
+        for repo in store.synced_at:
+            store.synced_at[repo] -= github_service.GITHUB_STORE_TTL + 1
+        store.synced_at["octo/repo0"] = time.time()     # a recent webhook event keeps repo0 local
+        calls_before = len(server.requests)
+        GitHubService.get_dashboard_activity("token")
+        refetched = {r.path.split("/")[3] for r in server.requests[calls_before:] if r.path.startswith("/repos/")}
+
+    assert refetched == set(REPOS) - {"repo0"}
+    print("✅ Stale stored repos are backfilled again")
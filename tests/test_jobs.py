@@ -0,0 +1,205 @@
+"""Test the background job queue: workers, retries with backoff, secrets and the polling endpoint"""
+import time
+from datetime import datetime, timedelta
+import pytest
+from flask import Flask
+from core import jobs
+from core.jobs import JobQueue, JobError, PermanentJobError, job_handler
+
+
+class InMemoryJobs:
+    """Same interface as JobRepository, backed by a dict"""
+
+    def __init__(self):
+        self.rows = {}
+
+    def create(self, job_id, job_type, payload, max_attempts, owner=None, requester=None):
+        now = datetime.utcnow()
+        self.rows[job_id] = {"job_id": job_id, "job_type": job_type, "payload": payload, "status": "queued",
+                             "attempts": 0, "max_attempts": max_attempts, "owner": owner, "requester": requester,
+                             "run_after": now, "result": None, "error": None, "created_at": now, "updated_at": now}
+
+    def get(self, job_id):
+        row = self.rows.get(job_id)
+        return dict(row) if row else None
+
+    @staticmethod
+    def _claimable(row, stale_after_seconds, owner):
+        now = datetime.utcnow()
+        return (row["status"] == "queued" and row["run_after"] <= now
+                and (row["owner"] in (None, owner) or row["run_after"] < now - timedelta(seconds=stale_after_seconds)))
+
+    def claim(self, job_id, stale_after_seconds, owner=None):
+        row = self.rows[job_id]
+        if not self._claimable(row, stale_after_seconds, owner):
+            return False
+        row.update(status="running", attempts=row["attempts"] + 1)
+        return True
+
+    def list_due(self, limit, stale_after_seconds, owner=None):
+        return [r["job_id"] for r in self.rows.values() if self._claimable(r, stale_after_seconds, owner)][:limit]
+
+    def mark_succeeded(self, job_id, result):
+        self.rows[job_id].update(status="succeeded", result=result, error=None)
+
+    def schedule_retry(self, job_id, delay_seconds, error):
+        self.rows[job_id].update(status="queued", error=error,
+                                 run_after=datetime.utcnow() + timedelta(seconds=delay_seconds))
+
+    def mark_failed(self, job_id, error):
+        self.rows[job_id].update(status="failed", error=error)
+
+
+calls = []
+
+
+@job_handler("test.echo")
+def echo(payload):
+    calls.append(payload)
+    return {"echo": payload["value"]}
+
+
+@job_handler("test.flaky", max_attempts=3)
+def flaky(payload):
+    calls.append(time.monotonic())
+    if len(calls) < 3:
+        raise ConnectionError("upstream timed out")
+    return "ok"
+
+
+@job_handler("test.broken", max_attempts=2)
+def broken(payload):
+    calls.append(payload)
+    raise ConnectionError("still down")
+
+
+@job_handler("test.permanent", max_attempts=5)
+def permanent(payload):
+    calls.append(payload)
+    raise PermanentJobError("bad input")
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_POLL_INTERVAL", 0.02)
+    monkeypatch.setattr(jobs, "JOB_RETRY_DELAY", 0.05)
+    calls.clear()
+    q = JobQueue(repository=InMemoryJobs(), workers=2)
+    yield q
+    q.stop()
+
+
+def wait_for(queue, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get(job_id)
+        if job["status"] in ("succeeded", "failed"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job still {queue.get(job_id)['status']}")
+
+
+def test_enqueue_returns_at_once_and_worker_runs_job(queue):
+    """enqueue() only records the job; a worker produces the result"""
+    job_id = queue.enqueue("test.echo", {"value": 42})
+    job = wait_for(queue, job_id)
+
+    assert job["status"] == "succeeded"
+    assert job["result"] == {"echo": 42}
+    assert job["attempts"] == 1
+    print("✅ Job enqueued and run")
+
+
+def test_failures_are_retried_with_backoff(queue):
+    """Transient errors are retried after a growing delay until the handler succeeds"""
+    job = wait_for(queue, queue.enqueue("test.flaky"))
+
+    assert job["status"] == "succeeded" and job["attempts"] == 3
+    first_gap, second_gap = calls[1] - calls[0], calls[2] - calls[1]
+    assert first_gap >= 0.05 and second_gap >= 0.1
+    print("✅ Retried with exponential backoff")
+
+
+def test_job_fails_after_max_attempts(queue):
+    job = wait_for(queue, queue.enqueue("test.broken"))
+
+    assert job["status"] == "failed"
+    assert job["attempts"] == 2 and len(calls) == 2
+    assert "still down" in job["error"]
+    print("✅ Gave up after max attempts")
+
+
+def test_permanent_error_is_not_retried(queue):
+    job = wait_for(queue, queue.enqueue("test.permanent"))
+
+    assert job["status"] == "failed" and job["attempts"] == 1
+    print("✅ Permanent error not retried")
+
+
+def test_secrets_reach_the_handler_but_not_the_table(queue):
+    """Tokens passed as secrets are merged into the payload in memory only"""
+    job_id = queue.enqueue("test.echo", {"value": 1}, secrets={"access_token": "gho_secret"})
+    wait_for(queue, job_id)
+
+    assert calls[0]["access_token"] == "gho_secret"
+    assert "gho_secret" not in queue.repository.rows[job_id]["payload"]
+    print("✅ Secrets kept out of the job table")
+
+
+@job_handler("test.token_once", max_attempts=3)
+def token_once(payload):
+    calls.append(payload.get("access_token"))
+    if len(calls) == 1:
+        raise ConnectionError("GitHub timed out")
+    return "ok"
+
+
+def test_jobs_with_secrets_stay_with_their_process(queue):
+    """Another process's poller never claims a job (or its retry) whose secrets it does not hold"""
+    other = JobQueue(repository=queue.repository, workers=1)
+    job_id = queue.enqueue("test.token_once", secrets={"access_token": "gho_secret"})
+    queue.stop()
+    deadline = time.time() + 5
+    while queue.get(job_id)["status"] != "queued" or not calls:
+        assert time.time() < deadline
+        time.sleep(0.01)
+    assert queue.repository.rows[job_id]["owner"] == queue.owner
+
+    other.start()
+    time.sleep(0.2)     # the retry is due, but only for the owning process
+    assert queue.get(job_id)["status"] == "queued" and calls == ["gho_secret"]
+
+    queue.run(job_id)
+    other.stop()
+    assert queue.get(job_id)["status"] == "succeeded" and calls == ["gho_secret", "gho_secret"]
+    print("✅ Secret-bearing jobs pinned to their owner")
+
+
+def test_unknown_job_type_is_rejected(queue):
+    with pytest.raises(JobError):
+        queue.enqueue("test.nope")
+    print("✅ Unknown job type rejected")
+
+
+def test_jobs_endpoint_reports_status(queue, monkeypatch):
+    """GET /api/v1/jobs/<id> returns the job to the session that queued it; other sessions and unknown ids get 404"""
+    from controllers.job_controller import job_bp, accepted
+    monkeypatch.setattr(jobs, "_queue", queue)
+    app = Flask(__name__)
+    app.secret_key = "test"
+    app.register_blueprint(job_bp)
+
+    @app.route("/echo", methods=["POST"])
+    def echo():
+        return accepted(queue.enqueue("test.echo", {"value": "hi"}))
+
+    client, other = app.test_client(), app.test_client()
+    status_url = client.post("/echo").get_json()["status_url"]
+    wait_for(queue, status_url.rsplit("/", 1)[1])
+
+    response = client.get(status_url)
+    assert response.status_code == 200
+    assert response.get_json()["result"] == {"echo": "hi"}
+    assert other.get(status_url).status_code == 404
+    assert client.get("/api/v1/jobs/missing").status_code == 404
+    print("✅ Job status endpoint")
@@ -0,0 +1,165 @@
+"""Test the content-addressed LLM response cache and its use by the Ollama client"""
+import pytest
+from flask import Flask
+from clients import ollama_client
+from clients.llm_cache import LLMResponseCache
+from clients.ollama_client import OllamaClient
+from tests.fake_servers import FakeServer
+from tests.test_ollama_stream import FakeOllama, TOKENS
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_key_depends_on_model_prompt_and_options():
+    key = LLMResponseCache.make_key("llama3.2", "sum up", {"temperature": 0.2})
+
+    assert key == LLMResponseCache.make_key("llama3.2", "sum up", {"temperature": 0.2})
+    assert key != LLMResponseCache.make_key("llama3.2", "sum up!", {"temperature": 0.2})
+    assert key != LLMResponseCache.make_key("mistral", "sum up", {"temperature": 0.2})
+    assert key != LLMResponseCache.make_key("llama3.2", "sum up", {"temperature": 0.7})
+    print("✅ Keys are content-addressed")
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = LLMResponseCache(ttl_seconds=60, clock=clock)
+    cache.put("k", "summary")
+
+    clock.now += 59
+    assert cache.get("k") == "summary"
+    clock.now += 2
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+    print("✅ TTL expiry")
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    """Least recently used entries go first when either budget is exceeded"""
+    cache = LLMResponseCache(ttl_seconds=60, max_entries=2, max_bytes=100)
+    cache.put("a", "x" * 10)
+    cache.put("b", "x" * 10)
+    cache.get("a")
+    cache.put("c", "x" * 10)
+
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c")
+
+    cache.put("big", "x" * 95)
+    assert cache.stats()["entries"] == 1 and cache.stats()["bytes"] == 95
+    assert cache.stats()["evictions"] == 3
+    print("✅ LRU eviction")
+
+
+def test_hit_rate_metrics():
+    cache = LLMResponseCache(ttl_seconds=60)
+    cache.put("k", "summary")
+    cache.get("k")
+    cache.get("k")
+    cache.get("k")
+    cache.get("missing")
+
+    stats = cache.stats()
+    assert stats["hits"] == 3 and stats["misses"] == 1
+    assert stats["hit_rate"] == 0.75
+    print("✅ Hit rate reported")
+
+
+def test_disk_tier_survives_a_new_instance(tmp_path):
+    """A fresh process (new instance, same SQLite file) still gets the cached text"""
+    db = str(tmp_path / "llm_cache.db")
+    LLMResponseCache(ttl_seconds=60, db_path=db).put("k", "summary")
+
+    cache = LLMResponseCache(ttl_seconds=60, db_path=db)
+    assert cache.get("k") == "summary"
+    assert cache.stats()["disk_hits"] == 1
+    assert cache.get("k") == "summary"
+    assert cache.stats()["disk_hits"] == 1      # promoted to memory
+    print("✅ SQLite tier persists")
+
+
+def test_disk_tier_closes_its_connections(tmp_path, monkeypatch):
+    """Every SQLite connection the cache opens is closed again, not just committed"""
+    import sqlite3
+    from clients import llm_cache
+    opened, connect = [], sqlite3.connect
+
+    class TrackedConnection(sqlite3.Connection):
+        closed = False
+
+        def close(self):
+            self.closed = True
+            super().close()
+
+    def tracked_connect(*args, **kwargs):
+        opened.append(connect(*args, factory=TrackedConnection, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(llm_cache.sqlite3, "connect", tracked_connect)
+    cache = LLMResponseCache(ttl_seconds=60, db_path=str(tmp_path / "llm_cache.db"))
+    cache.put("k", "summary")
+    LLMResponseCache(ttl_seconds=60, db_path=cache.db_path).get("k")
+
+    assert len(opened) >= 3
+    assert all(conn.closed for conn in opened)
+    print("✅ SQLite handles closed")
+
+
+@pytest.fixture
+def ollama():
+    fake = FakeOllama(token_delay=0)
+    calls = []
+    with FakeServer(fake.routes()) as server:
+        server.routes["POST /api/generate"] = lambda request: calls.append(request) or fake.generate(request)
+        client = OllamaClient(generate_url=f"{server.url}/api/generate", read_timeout=2,
+                              cache=LLMResponseCache(ttl_seconds=60))
+        yield client, calls
+
+
+def test_repeated_prompt_is_served_from_cache(ollama):
+    """The second identical request never reaches Ollama; refresh=True regenerates"""
+    client, calls = ollama
+    assert client.generate("sum up") == "".join(TOKENS)
+    assert client.generate("sum up") == "".join(TOKENS)
+    assert len(calls) == 1
+
+    assert client.generate("sum up", refresh=True) == "".join(TOKENS)
+    assert len(calls) == 2
+    assert client.cache_stats()["refreshes"] == 1
+    print("✅ Cache hit skips Ollama, refresh bypasses it")
+
+
+def test_stream_is_cached_only_when_complete(ollama):
+    """A stream closed early caches nothing; a finished one is replayed in one fragment"""
+    client, calls = ollama
+    fragments = client.stream("sum up")
+    next(fragments)
+    fragments.close()
+    assert client.cache_stats()["entries"] == 0
+
+    assert "".join(client.stream("sum up")) == "".join(TOKENS)
+    assert list(client.stream("sum up")) == ["".join(TOKENS)]
+    assert client.generate("sum up") == "".join(TOKENS)
+    assert len(calls) == 2
+    print("✅ Only complete streams are cached")
+
+
+def test_cache_metrics_endpoint(ollama, monkeypatch):
+    from controllers.documentation_controller import documentation_bp
+    client, _ = ollama
+    monkeypatch.setattr(ollama_client, "_client", client)
+    app = Flask(__name__)
+    app.register_blueprint(documentation_bp)
+
+    client.generate("sum up")
+    client.generate("sum up")
+    response = app.test_client().get("/api/v1/documentation/ai/cache-metrics")
+
+    assert response.status_code == 200
+    assert response.get_json()["hit_rate"] == 0.5
+    print("✅ Cache metrics endpoint")
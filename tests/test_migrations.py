@@ -0,0 +1,105 @@
+"""Test the migration runner ordering and the EXPLAIN query capture (no real database needed)"""
+from types import SimpleNamespace
+from migrations.runner import MIGRATIONS, pending_migrations
+
+
+def test_pending_migrations_in_version_order():
+    """Test only unapplied migrations are returned, sorted by version"""
+    m1 = SimpleNamespace(VERSION=1, NAME="one")
+    m2 = SimpleNamespace(VERSION=2, NAME="two")
+    m3 = SimpleNamespace(VERSION=3, NAME="three")
+
+    pending = pending_migrations({1}, [m3, m1, m2])
+    assert [m.VERSION for m in pending] == [2, 3]
+    print("✅ Pending migrations returned in order")
+
+
+def test_duplicate_versions_rejected():
+    """Test two migrations with the same version are refused"""
+    try:
+        pending_migrations(set(), [SimpleNamespace(VERSION=1, NAME="a"), SimpleNamespace(VERSION=1, NAME="b")])
+        assert False, "Should have raised ValueError"
+    except ValueError:
+        pass
+    assert len({m.VERSION for m in MIGRATIONS}) == len(MIGRATIONS)
+    print("✅ Duplicate migration versions rejected")
+
+
+def test_explain_captures_repository_sql():
+    """Test repository SQL is captured without touching the database"""
+    from explain_queries import _capture
+    from repositories.task_repository import TaskRepository
+
+    statements = _capture(TaskRepository, "get_user_overdue_tasks", 7)
+    assert len(statements) == 1
+    query, params = statements[0]
+    assert "assigned_id" in query and params[0] == 7
+    print("✅ Repository SQL captured for EXPLAIN")
+
+
+class SchemaCursor:
+    """Answers the information_schema lookups from `tables` / `indexes` and records the DDL"""
+
+    def __init__(self, tables, indexes=None):
+        self.tables = set(tables)
+        self.indexes = indexes or {}        # (table, index) -> [(column, collation), ...]
+        self.ddl = []
+        self._result = []
+
+    def execute(self, query, params=None):
+        if "information_schema.tables" in query:
+            self._result = [(int(params[0] in self.tables),)]
+        elif "information_schema.statistics" in query and "COUNT(*)" in query:
+            self._result = [(int(tuple(params) in self.indexes),)]
+        elif "information_schema.statistics" in query:
+            self._result = self.indexes.get(tuple(params), [])
+        else:
+            self.ddl.append(" ".join(query.split()))
+            if query.startswith("DROP INDEX"):
+                _, _, name, _, table = query.split()
+                self.indexes.pop((table, name), None)
+
+    def fetchone(self):
+        return self._result[0]
+
+    def fetchall(self):
+        return self._result
+
+
+def test_create_index_fails_when_table_is_missing():
+    """Test a missing table stops the migration instead of recording it without the index"""
+    from migrations.schema_helpers import create_index
+
+    try:
+        create_index(SchemaCursor(tables=[]), "time_tracking", "idx_time_date", ["date_worked"])
+        assert False, "Should have raised RuntimeError"
+    except RuntimeError as e:
+        assert "time_tracking" in str(e)
+    print("✅ Missing table fails the migration")
+
+
+def test_time_tracking_migration_creates_table_and_rebuilds_ascending_index():
+    """Test m0009 creates time_tracking before its indexes and makes priority descending"""
+    from migrations import m0009_time_tracking
+
+    cursor = SchemaCursor(
+        tables=["task"],
+        indexes={("task", "idx_task_sprint_priority_due"): [("sprint_id", "A"), ("priority", "A"), ("due_date", "A")]}
+    )
+    real_execute = cursor.execute
+
+    def execute(query, params=None):
+        real_execute(query, params)
+        if query.strip().startswith("CREATE TABLE IF NOT EXISTS time_tracking"):
+            cursor.tables.add("time_tracking")
+    cursor.execute = execute
+
+    m0009_time_tracking.upgrade(cursor)
+
+    assert cursor.ddl[0].startswith("CREATE TABLE IF NOT EXISTS time_tracking")
+    assert "CREATE INDEX idx_time_user_date ON time_tracking (user_id, date_worked, start_time)" in cursor.ddl
+    assert cursor.ddl[-2:] == [
+        "DROP INDEX idx_task_sprint_priority_due ON task",
+        "CREATE INDEX idx_task_sprint_priority_due ON task (sprint_id, priority DESC, due_date)",
+    ]
+    print("✅ time_tracking created and sprint priority index rebuilt")
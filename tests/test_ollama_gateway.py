@@ -0,0 +1,143 @@
+"""Test the Ollama gateway: bounded concurrency, FIFO queue positions, coalescing and keep-alive"""
+import threading
+import pytest
+from clients.llm_cache import LLMResponseCache
+from clients.ollama_client import OllamaClient
+from clients.ollama_gateway import OllamaGateway, OllamaBusyError
+from tests.fake_servers import FakeServer
+from tests.test_ollama_stream import FakeOllama, TOKENS
+
+
+class CountingOllama(FakeOllama):
+    """FakeOllama that remembers how many generations ran at the same time"""
+
+    def __init__(self, token_delay=0.002):
+        super().__init__(token_delay)
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+        self.prompts = []
+
+    def generate(self, request):
+        body = request.json()
+        self.prompts.append(body)
+        if "prompt" not in body:
+            return 200, {"model": body["model"], "response": "", "done": True}     # model load only
+        return super().generate(request)
+
+    def _stream(self):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            yield from super()._stream()
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+@pytest.fixture
+def ollama():
+    fake = CountingOllama()
+    with FakeServer(fake.routes()) as server:
+        client = OllamaClient(generate_url=f"{server.url}/api/generate", read_timeout=2,
+                              cache=LLMResponseCache(ttl_seconds=0), keep_alive="1h")
+        yield client, fake
+
+
+def run_all(gateway, prompts):
+    results = {}
+    threads = [threading.Thread(target=lambda p=p: results.__setitem__(p, gateway.generate(p))) for p in prompts]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(10)
+    return results
+
+
+def test_generations_are_bounded(ollama):
+    """Parallel summaries never run more than max_concurrent at once, and all finish"""
+    client, fake = ollama
+    gateway = OllamaGateway(client, max_concurrent=2)
+    results = run_all(gateway, [f"prompt {i}" for i in range(5)])
+
+    assert len(results) == 5 and set(results.values()) == {"".join(TOKENS)}
+    assert fake.max_running == 2
+    assert gateway.stats()["started"] == 5 and gateway.stats()["active"] == 0
+    print("✅ Concurrency bounded")
+
+
+def test_waiting_callers_see_their_queue_position(ollama):
+    """Queued streams report ('queued', position) in FIFO order until a slot frees up"""
+    client, _ = ollama
+    gateway = OllamaGateway(client, max_concurrent=1)
+    first = gateway.stream("first")
+    assert next(first) == "word0 "
+
+    second, third = gateway.stream("second"), gateway.stream("third")
+    assert next(second) == ("queued", {"position": 1})
+    assert next(third) == ("queued", {"position": 2})
+
+    assert "".join(first) == "".join(TOKENS[1:])
+    assert next(third) == ("queued", {"position": 1})
+    assert "".join(second) == "".join(TOKENS)
+    assert "".join(f for f in third if isinstance(f, str)) == "".join(TOKENS)
+    print("✅ FIFO positions reported")
+
+
+def test_identical_prompts_share_one_generation(ollama):
+    """Callers asking for the same prompt while it is in flight follow the same generation"""
+    client, fake = ollama
+    gateway = OllamaGateway(client, max_concurrent=1)
+    leader = gateway.stream("same")
+    assert next(leader) == "word0 "
+
+    results = run_all(gateway, ["same"])
+    assert results["same"] == "".join(TOKENS)
+    assert "".join(leader) == "".join(TOKENS[1:])
+    assert len(fake.prompts) == 1
+    assert gateway.stats()["coalesced"] == 1
+    print("✅ Identical prompts coalesced")
+
+
+def test_leaving_the_queue_cancels_the_request(ollama):
+    """A caller that gives up while queued never reaches the model"""
+    client, fake = ollama
+    gateway = OllamaGateway(client, max_concurrent=1)
+    first = gateway.stream("first")
+    next(first)
+    queued = gateway.stream("second")
+    next(queued)
+    queued.close()
+    "".join(first)
+
+    assert [p["prompt"] for p in fake.prompts] == ["first"]
+    assert gateway.stats()["cancelled"] == 1 and gateway.stats()["queued"] == 0
+    print("✅ Abandoned queue entry dropped")
+
+
+def test_full_queue_rejects_quickly(ollama):
+    client, _ = ollama
+    gateway = OllamaGateway(client, max_concurrent=1, max_queue=1)
+    first = gateway.stream("first")
+    next(first)
+    second = gateway.stream("second")
+    next(second)
+
+    with pytest.raises(OllamaBusyError):
+        next(gateway.stream("third"))
+    first.close()
+    second.close()
+    print("✅ Busy error when the queue is full")
+
+
+def test_keep_alive_sent_with_every_request(ollama):
+    """keep_alive keeps the model loaded; warm_up loads it without a prompt"""
+    client, fake = ollama
+    OllamaGateway(client).generate("hello")
+    assert client.warm_up()
+
+    assert [p.get("keep_alive") for p in fake.prompts] == ["1h", "1h"]
+    assert "prompt" not in fake.prompts[1]
+    assert OllamaClient(keep_alive="-1").keep_alive == -1
+    print("✅ keep_alive sent")
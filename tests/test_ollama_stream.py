@@ -0,0 +1,143 @@
+"""Test streaming AI summaries over SSE against a local fake Ollama server"""
+import json
+import threading
+import time
+import pytest
+from flask import Flask
+from clients import ollama_client, ollama_gateway
+from clients.ollama_gateway import OllamaGateway
+from clients.ollama_client import OllamaClient, OllamaTimeoutError, OllamaUnavailableError
+from tests.fake_servers import FakeServer
+
+TOKENS = [f"word{i} " for i in range(200)]
+
+
+class FakeOllama:
+    """POST /api/generate: NDJSON stream (one token per line) or one JSON body"""
+
+    def __init__(self, token_delay=0.005):
+        self.token_delay = token_delay
+        self.sent = 0
+        self.stopped = threading.Event()     # set when the stream ends, finished or not
+
+    def routes(self):
+        return {"POST /api/generate": self.generate}
+
+    def generate(self, request):
+        body = request.json()
+        if not body["stream"]:
+            time.sleep(self.token_delay)
+            return 200, {"model": body["model"], "response": "".join(TOKENS), "done": True}
+        return 200, self._stream(), {"Content-Type": "application/x-ndjson"}
+
+    def _stream(self):
+        try:
+            for token in TOKENS:
+                self.sent += 1
+                yield json.dumps({"response": token, "done": False}) + "\n"
+                time.sleep(self.token_delay)
+            yield json.dumps({"response": "", "done": True}) + "\n"
+        finally:
+            self.stopped.set()
+
+
+@pytest.fixture
+def ollama(monkeypatch):
+    fake = FakeOllama()
+    with FakeServer(fake.routes()) as server:
+        client = OllamaClient(generate_url=f"{server.url}/api/generate", read_timeout=2)
+        monkeypatch.setattr(ollama_client, "_client", client)
+        monkeypatch.setattr(ollama_gateway, "_gateway", OllamaGateway(client))
+        yield client, fake
+
+
+def sse_frames(chunks):
+    """Parse SSE bytes into (event, data) pairs"""
+    frames = []
+    for frame in b"".join(chunks).decode().split("\n\n"):
+        if frame.strip():
+            fields = dict(line.split(": ", 1) for line in frame.split("\n"))
+            frames.append((fields.get("event"), json.loads(fields["data"])))
+    return frames
+
+
+def test_first_token_arrives_before_generation_ends(ollama):
+    """Fragments are yielded as Ollama produces them, not after the whole answer"""
+    client, fake = ollama
+    fragments = client.stream("summarize")
+
+    assert next(fragments) == "word0 "
+    assert fake.sent < len(TOKENS)
+    assert "".join(fragments) == "".join(TOKENS[1:])
+    print("✅ Tokens streamed incrementally")
+
+
+def test_closing_the_stream_stops_ollama(ollama):
+    """Abandoning the generator closes the connection, so generation stops upstream"""
+    client, fake = ollama
+    fragments = client.stream("summarize")
+    next(fragments)
+    fragments.close()
+
+    assert fake.stopped.wait(3)
+    assert fake.sent < len(TOKENS)
+    print("✅ Upstream generation cancelled")
+
+
+def test_generate_has_timeouts(ollama):
+    """Non-streaming calls return the whole text, and time out instead of hanging"""
+    client, fake = ollama
+    assert client.generate("summarize") == "".join(TOKENS)
+
+    fake.token_delay = 0.5
+    slow = OllamaClient(generate_url=client.generate_url, read_timeout=0.1)
+    with pytest.raises(OllamaTimeoutError):
+        slow.generate("summarize")
+    with pytest.raises(OllamaUnavailableError):
+        OllamaClient(generate_url="http://127.0.0.1:9/api/generate").generate("summarize")
+    print("✅ Timeouts enforced")
+
+
+@pytest.fixture
+def app():
+    from controllers.documentation_controller import documentation_bp
+    app = Flask(__name__)
+    app.register_blueprint(documentation_bp)
+    return app
+
+
+def test_sprint_summary_streams_sse(ollama, app):
+    """Accept: text/event-stream gets token events and a final 'done' with the full text"""
+    response = app.test_client().post("/api/v1/documentation/sprint/7/ai-summary", json={"prompt": "sum up"},
+                                      headers={"Accept": "text/event-stream"})
+
+    assert response.mimetype == "text/event-stream"
+    frames = sse_frames(response.response)
+    assert [e for e, _ in frames[:2]] == ["token", "token"]
+    assert frames[-1] == ("done", {"text": "".join(TOKENS), "sprint_id": 7})
+    print("✅ Summary streamed as SSE")
+
+
+def test_client_disconnect_cancels_generation(ollama, app):
+    """Closing the SSE response (client went away) closes the Ollama stream"""
+    _, fake = ollama
+    response = app.test_client().post("/api/v1/documentation/sprint/7/ai-summary", json={"prompt": "sum up"},
+                                      headers={"Accept": "text/event-stream"}, buffered=False)
+    first = next(iter(response.response))
+    response.close()
+
+    assert first.startswith(b"event: token")
+    assert fake.stopped.wait(3)
+    assert fake.sent < len(TOKENS)
+    print("✅ Disconnect cancels generation")
+
+
+def test_unreachable_ollama_sends_error_event(app, monkeypatch):
+    monkeypatch.setattr(ollama_gateway, "_gateway",
+                        OllamaGateway(OllamaClient(generate_url="http://127.0.0.1:9/api/generate")))
+    response = app.test_client().post("/api/v1/documentation/sprint/7/ai-summary", json={"prompt": "sum up"},
+                                      headers={"Accept": "text/event-stream"})
+
+    event, data = sse_frames(response.response)[0]
+    assert event == "error" and "Could not reach Ollama" in data["error"]
+    print("✅ Error event when Ollama is down")
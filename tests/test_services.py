@@ -50,3 +50,47 @@ def test_task_service_get_by_project():
     
     assert isinstance(tasks, list)
     print(f"✅ TaskService project filter test passed")
+
+
+def test_task_service_page_cursor():
+    """Test TaskService.get_tasks_page round-trips the keyset cursor"""
+    from unittest.mock import MagicMock
+    service = TaskService()
+    service.task_repo = MagicMock()
+    service.task_repo.get_page.return_value = ([], 42)
+
+    _, next_cursor = service.get_tasks_page(limit=10, status="TODO")
+    assert next_cursor
+
+    service.task_repo.get_page.return_value = ([], None)
+    _, last_cursor = service.get_tasks_page(limit=10, cursor=next_cursor)
+    assert service.task_repo.get_page.call_args.kwargs["after_id"] == 42
+    assert last_cursor is None
+    print("✅ TaskService keyset cursor test passed")
+
+
+def test_task_service_dashboard_summary():
+    """Test TaskService.get_dashboard_summary pushes the project filter and limit to the repository"""
+    from unittest.mock import MagicMock
+    service = TaskService()
+    service.task_repo = MagicMock()
+    service.task_repo.get_upcoming.return_value = []
+    service.task_repo.get_assignee_task_counts.return_value = {7: 3}
+
+    summary = service.get_dashboard_summary(project_id=2, limit=5)
+    assert service.task_repo.get_upcoming.call_args.kwargs == {"limit": 5, "project_id": 2, "user_id": None}
+    assert service.task_repo.get_assignee_task_counts.call_args.kwargs == {"project_id": 2}
+    assert summary["assignees"] == {7: 3}
+    print("✅ TaskService dashboard summary test passed")
+
+
+def test_task_service_page_rejects_bad_filters():
+    """Test TaskService.get_tasks_page validates filters and cursor"""
+    service = TaskService()
+    for kwargs in ({"status": "NOPE"}, {"limit": 0}, {"cursor": "not-a-cursor"}):
+        try:
+            service.get_tasks_page(**kwargs)
+            assert False, f"Should have rejected {kwargs}"
+        except ValueError:
+            pass
+    print("✅ TaskService page validation test passed")
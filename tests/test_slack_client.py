@@ -0,0 +1,176 @@
+"""Test the rate-limit-aware Slack client against a local fake Slack Web API"""
+import threading
+import time
+import pytest
+from urllib.parse import parse_qs
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
+from clients.slack_client import SlackClient, SlackRateLimitError, paginate, iter_items
+from tests.fake_servers import FakeServer
+
+
+class FakeSlackAPI:
+    """users.list / users.info / chat.postMessage; queue 429s with rate_limit(method, retry_after)"""
+
+    def __init__(self):
+        self.limited = {}               # method -> list of Retry-After values still to send
+        self.gate = threading.Event()   # clear it to hold users.list until set()
+        self.gate.set()
+
+    def rate_limit(self, method, *retry_after):
+        self.limited.setdefault(method, []).extend(retry_after)
+
+    def _respond(self, method, body):
+        def handler(request):
+            if self.limited.get(method):
+                retry_after = self.limited[method].pop(0)
+                return 429, {"ok": False, "error": "ratelimited"}, {"Retry-After": str(retry_after)}
+            if method == "users.list":
+                self.gate.wait(3)
+            return 200, {"ok": True, **body(request)}
+        return handler
+
+    def routes(self):
+        methods = {
+            "users.list": lambda r: {"members": [{"id": "U1", "real_name": "Alice"}],
+                                     "response_metadata": {"next_cursor": ""}},
+            "users.info": lambda r: {"user": {"id": {**r.query, **parse_qs(r.body.decode())}["user"][0]}},
+            "chat.postMessage": lambda r: {"ts": "1700000000.000100"},
+        }
+        routes = {}
+        for method, body in methods.items():
+            for verb in ("GET", "POST"):
+                routes[f"{verb} /api/{method}"] = self._respond(method, body)
+        return routes
+
+
+class FakeClock:
+    """monotonic() and sleep() that only move when the client sleeps"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(round(seconds, 3))
+        self.now += seconds
+
+
+@pytest.fixture
+def slack():
+    api = FakeSlackAPI()
+    with FakeServer(api.routes()) as server:
+        web = WebClient(token="xoxb-test", base_url=server.url + "/api/")
+        yield api, server, web
+
+
+def calls(server, method):
+    return len([r for r in server.requests if r.path == f"/api/{method}"])
+
+
+def test_retry_after_is_honoured(slack):
+    """A 429 is retried after exactly Retry-After seconds"""
+    api, server, web = slack
+    clock = FakeClock()
+    client = SlackClient(client=web, clock=clock, sleep=clock.sleep)
+    api.rate_limit("users.info", 7)
+
+    assert client.users_info(user="U1")["user"]["id"] == "U1"
+    assert clock.sleeps == [7.0]
+    assert calls(server, "users.info") == 2
+    stats = client.stats()["users.info"]
+    assert stats["rate_limited"] == 1 and stats["retries"] == 1
+    print("✅ Retry-After honoured")
+
+
+def test_long_retry_after_blocks_the_method_without_calling_slack(slack):
+    """Retry-After beyond max_wait fails at once; later calls fail fast until it expires"""
+    api, server, web = slack
+    clock = FakeClock()
+    client = SlackClient(client=web, max_wait=10, clock=clock, sleep=clock.sleep)
+    api.rate_limit("users.info", 60)
+
+    with pytest.raises(SlackApiError):
+        client.users_info(user="U1")
+    with pytest.raises(SlackRateLimitError) as e:
+        client.users_info(user="U2")
+    assert e.value.response["error"] == "ratelimited"
+    assert calls(server, "users.info") == 1
+    assert client.stats()["users.info"]["blocked_for"] == 60
+
+    clock.now += 60
+    assert client.users_info(user="U2")["ok"]
+    assert clock.sleeps == []
+    print("✅ Blocked method fails fast")
+
+
+def test_token_bucket_spaces_out_calls(slack):
+    """Once the per-minute budget is spent, calls wait for the next token instead of getting a 429"""
+    _, server, web = slack
+    clock = FakeClock()
+    client = SlackClient(client=web, limits={"chat.postMessage": 2}, clock=clock, sleep=clock.sleep)
+
+    for _ in range(3):
+        client.chat_postMessage(channel="C1", text="hi")
+
+    assert clock.sleeps == [30.0]
+    assert calls(server, "chat.postMessage") == 3
+    stats = client.stats()["chat.postMessage"]
+    assert stats["remaining"] == 0 and stats["waited"] == 1 and stats["rate_limited"] == 0
+    print("✅ Token bucket respected")
+
+
+def test_identical_reads_in_flight_are_coalesced(slack):
+    """Five concurrent users_list calls with the same params make one HTTP request"""
+    api, server, web = slack
+    client = SlackClient(client=web)
+    api.gate.clear()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(client.users_list(limit=200))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    deadline = time.time() + 3
+    while client.stats().get("users.list", {}).get("coalesced", 0) < 4 and time.time() < deadline:
+        time.sleep(0.01)
+    api.gate.set()
+    for t in threads:
+        t.join(3)
+
+    assert len(results) == 5 and all(r["members"][0]["real_name"] == "Alice" for r in results)
+    assert calls(server, "users.list") == 1
+    assert client.stats()["users.list"]["calls"] == 1
+    print("✅ In-flight reads coalesced")
+
+
+def test_writes_are_not_coalesced(slack):
+    _, server, web = slack
+    client = SlackClient(client=web)
+    threads = [threading.Thread(target=client.chat_postMessage, kwargs={"channel": "C1", "text": "hi"})
+               for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(3)
+    assert calls(server, "chat.postMessage") == 2
+    print("✅ Writes sent every time")
+
+
+def test_paginate_fetches_one_page_at_a_time():
+    """paginate() only calls the API when the caller asks for the next page"""
+    requested = []
+
+    def conversations_list(limit, cursor=None):
+        requested.append(cursor)
+        start = int(cursor or 0)
+        return {"channels": list(range(start, min(start + limit, 5))),
+                "response_metadata": {"next_cursor": str(start + limit) if start + limit < 5 else ""}}
+
+    pages = paginate(conversations_list, limit=2)
+    assert next(pages)["channels"] == [0, 1] and requested == [None]
+    assert list(iter_items(conversations_list, "channels", limit=2, cursor="2")) == [2, 3, 4]
+    assert requested == [None, "2", "4"]
+    print("✅ Lazy pagination")
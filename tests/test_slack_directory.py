@@ -0,0 +1,157 @@
+"""Test the process-wide Slack users/channels directory: pagination, sharing, background refresh and events"""
+import hmac
+import json
+import time
+import hashlib
+import threading
+import pytest
+from flask import Flask
+from clients import slack_directory
+from clients.slack_directory import SlackDirectory
+from services.slack_integration_service import SlackService
+
+
+class FakeSlackWebClient:
+    """users_list / conversations_list with cursor pagination, like slack_sdk's WebClient"""
+
+    def __init__(self, users=450, channels=3):
+        self.members = [{"id": f"U{i:04d}", "name": f"user{i}", "real_name": f"User {i}",
+                         "profile": {"email": f"user{i}@example.com"}} for i in range(users)]
+        self.channel_list = [{"id": f"C{i:03d}", "name": f"channel-{i}", "is_member": True} for i in range(channels)]
+        self.calls = []
+        self.gate = threading.Event()       # clear it to hold list calls until set()
+        self.gate.set()
+
+    def _page(self, method, items, key, limit, cursor):
+        self.gate.wait(3)
+        self.calls.append((method, cursor))
+        start = int(cursor or 0)
+        end = start + limit
+        return {key: items[start:end], "response_metadata": {"next_cursor": str(end) if end < len(items) else ""}}
+
+    def users_list(self, limit, cursor=None):
+        return self._page("users_list", self.members, "members", limit, cursor)
+
+    def conversations_list(self, types, limit, cursor=None):
+        return self._page("conversations_list", self.channel_list, "channels", limit, cursor)
+
+    def users_info(self, user):
+        self.calls.append(("users_info", user))
+        return {"user": {"id": user, "real_name": "Late Joiner"}}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def directory(monkeypatch):
+    monkeypatch.setenv("SLACK_BOT_TOKEN", "xoxb-test")
+    clock = FakeClock()
+    d = SlackDirectory(ttl_seconds=3600, db_path="", page_size=200, clock=clock)
+    monkeypatch.setattr(slack_directory, "_directory", d)
+    return d, clock
+
+
+def service(client):
+    s = SlackService()
+    s.client = client
+    return s
+
+
+def test_users_list_is_loaded_page_by_page(directory):
+    """All pages are followed through next_cursor"""
+    d, _ = directory
+    client = FakeSlackWebClient(users=450)
+    d.ensure_users(client)
+
+    assert client.calls == [("users_list", None), ("users_list", "200"), ("users_list", "400")]
+    assert d.user("U0449")["real_name"] == "User 449"
+    assert d.stats()["users"] == 450
+    print("✅ users_list paginated")
+
+
+def test_directory_is_shared_by_service_instances(directory):
+    """Every request builds a new SlackService; only the first one calls users_list"""
+    client = FakeSlackWebClient(users=10)
+    for _ in range(3):
+        s = service(client)
+        s._preload_users_cache()
+        assert s._get_user_from_cache("U0003")["real_name"] == "User 3"
+
+    assert [c for c in client.calls if c[0] == "users_list"] == [("users_list", None)]
+    assert [c["name"] for c in service(client).get_channels()] == ["channel-0", "channel-1", "channel-2"]
+    print("✅ Directory shared across requests")
+
+
+def test_stale_directory_is_served_while_refreshing(directory):
+    d, clock = directory
+    client = FakeSlackWebClient(users=5)
+    d.ensure_users(client)
+    client.members[0]["real_name"] = "Renamed"
+    client.gate.clear()
+
+    clock.now += 3600
+    d.ensure_users(client)
+    assert d.user("U0000")["real_name"] == "User 0"      # returned at once, old data
+    client.gate.set()
+
+    deadline = time.time() + 3
+    while d.user("U0000")["real_name"] != "Renamed" and time.time() < deadline:
+        time.sleep(0.01)
+    assert d.user("U0000")["real_name"] == "Renamed"
+    assert d.stats()["background_refreshes"] == 1
+    print("✅ Stale entries refreshed in the background")
+
+
+def test_user_lookup_miss_is_cached(directory):
+    """users_info results land in the shared directory"""
+    client = FakeSlackWebClient(users=0)
+    assert service(client).get_user_info("U9999")["real_name"] == "Late Joiner"
+    assert service(client).get_user_info("U9999")["real_name"] == "Late Joiner"
+    assert client.calls.count(("users_info", "U9999")) == 1
+    print("✅ users_info cached")
+
+
+def test_sqlite_tier_is_shared_between_workers(tmp_path, monkeypatch):
+    """A second worker uses what the first one loaded, and sees its incremental updates"""
+    monkeypatch.setattr(slack_directory, "DISK_SYNC_INTERVAL", 0)
+    db = str(tmp_path / "slack.db")
+    client = FakeSlackWebClient(users=5)
+    first = SlackDirectory(ttl_seconds=3600, db_path=db)
+    second = SlackDirectory(ttl_seconds=3600, db_path=db)
+
+    first.ensure_users(client)
+    second.ensure_users(client)
+    assert len(client.calls) == 1
+    assert second.user("U0004")["real_name"] == "User 4"
+
+    first.apply_user({"id": "U0004", "real_name": "Changed"})
+    second.ensure_users(client)
+    assert second.user("U0004")["real_name"] == "Changed"
+    print("✅ SQLite tier shared")
+
+
+def test_user_change_event_updates_directory(directory, monkeypatch):
+    d, _ = directory
+    d.ensure_users(FakeSlackWebClient(users=5))
+    monkeypatch.setenv("SLACK_SIGNING_SECRET", "secret")
+    from controllers.slack_integration_controller import slack_bp
+    app = Flask(__name__)
+    app.register_blueprint(slack_bp)
+
+    body = json.dumps({"event": {"type": "user_change",
+                                 "user": {"id": "U0001", "real_name": "New Name", "profile": {}}}})
+    timestamp = str(int(time.time()))
+    signature = "v0=" + hmac.new(b"secret", f"v0:{timestamp}:{body}".encode(), hashlib.sha256).hexdigest()
+    response = app.test_client().post("/api/v1/slack/events", data=body, content_type="application/json",
+                                      headers={"X-Slack-Request-Timestamp": timestamp,
+                                               "X-Slack-Signature": signature})
+
+    assert response.status_code == 200
+    assert d.user("U0001")["real_name"] == "New Name"
+    print("✅ user_change applied")
@@ -0,0 +1,279 @@
+"""Test the local Slack message store: event ingestion, keyset reads, threads and the backfill job"""
+import pytest
+from slack_sdk.errors import SlackApiError
+from clients import slack_directory
+from clients.slack_directory import SlackDirectory
+from repositories.repository_factory import RepositoryFactory
+from services.slack_integration_service import SlackService
+
+
+class InMemorySlackMessages:
+    """Same interface as SlackMessageRepository, backed by a dict"""
+
+    def __init__(self):
+        self.rows = {}
+        self.sync = {}
+
+    def _upsert(self, channel_id, m):
+        key = (channel_id, m['ts'])
+        row = self.rows.get(key)
+        if row is None:
+            self.rows[key] = {**m, 'channel_id': channel_id, 'deleted': False,
+                              'reply_count': m.get('reply_count') or 0}
+            return True
+        if (m.get('edited_ts') or '') >= (row.get('edited_ts') or ''):
+            row.update(text=m['text'], edited_ts=m.get('edited_ts') or row.get('edited_ts'))
+        row['reply_count'] = max(row['reply_count'], m.get('reply_count') or 0)
+        return False
+
+    def upsert_messages(self, channel_id, messages):
+        for m in messages:
+            self._upsert(channel_id, m)
+        return len(messages)
+
+    def upsert_event_message(self, channel_id, message):
+        is_new = self._upsert(channel_id, message)
+        parent = self.rows.get((channel_id, message.get('thread_ts')))
+        if is_new and parent and message['thread_ts'] != message['ts']:
+            parent['reply_count'] += 1
+        return is_new
+
+    def mark_deleted(self, channel_id, ts):
+        if (channel_id, ts) in self.rows:
+            self.rows[(channel_id, ts)]['deleted'] = True
+
+    def get_messages(self, channel_id, limit=50, before_ts=None):
+        rows = sorted((r for (c, _), r in self.rows.items()
+                       if c == channel_id and not r['deleted'] and r.get('thread_ts') in (None, r['ts'])
+                       and (before_ts is None or r['ts'] < before_ts)), key=lambda r: r['ts'], reverse=True)
+        page = rows[:limit]
+        return page, (page[-1]['ts'] if len(rows) > limit else None)
+
+    def get_replies(self, channel_id, thread_ts, limit=100, after_ts=None):
+        rows = sorted((r for (c, _), r in self.rows.items()
+                       if c == channel_id and r.get('thread_ts') == thread_ts and r['ts'] != thread_ts),
+                      key=lambda r: r['ts'])
+        return rows[:limit], None
+
+    def is_backfilled(self, channel_id):
+        return bool(self.sync.get(channel_id, {}).get('backfilled_at'))
+
+    def get_sync_state(self, channel_id):
+        return self.sync.get(channel_id)
+
+    def request_backfill(self, channel_id, retry_after_seconds):
+        state = self.sync.setdefault(channel_id, {})
+        if state.get('backfilled_at') or state.get('backfill_requested_at'):
+            return False
+        state['backfill_requested_at'] = 'now'
+        return True
+
+    def save_backfill_cursor(self, channel_id, next_cursor):
+        self.sync.setdefault(channel_id, {})['backfill_cursor'] = next_cursor
+
+    def mark_backfilled(self, channel_id):
+        self.sync.setdefault(channel_id, {}).update(backfilled_at='now', backfill_cursor=None)
+
+
+def ts(n):
+    return f"1700000{n:03d}.000100"
+
+
+class FakeHistoryClient:
+    """conversations_history / conversations_replies with cursors; can fail once on a given cursor"""
+
+    def __init__(self, count=450, fail_on_cursor=None):
+        self.history = [{"ts": ts(n), "user": "U1", "text": f"message {n}"} for n in range(count, 0, -1)]
+        self.history[0].update(reply_count=2, thread_ts=self.history[0]["ts"])
+        self.replies = [{"ts": ts(count + i), "user": "U1", "text": f"reply {i}", "thread_ts": self.history[0]["ts"]}
+                        for i in (1, 2)]
+        self.fail_on_cursor = fail_on_cursor
+        self.calls = []
+
+    def conversations_history(self, channel, limit, cursor=None, latest=None):
+        self.calls.append(("history", cursor))
+        if cursor and cursor == self.fail_on_cursor:
+            self.fail_on_cursor = None
+            raise SlackApiError("ratelimited", {"ok": False, "error": "ratelimited"})
+        # `latest` is exclusive; cursors are offsets into the (filtered) history
+        history = [m for m in self.history if latest is None or m["ts"] < latest]
+        start = int(cursor or 0)
+        end = start + limit
+        return {"messages": history[start:end],
+                "response_metadata": {"next_cursor": str(end) if end < len(history) else ""}}
+
+    def conversations_replies(self, channel, ts, limit, cursor=None):
+        self.calls.append(("replies", ts))
+        return {"messages": [self.history[0]] + self.replies, "response_metadata": {"next_cursor": ""}}
+
+    def users_list(self, limit, cursor=None):
+        return {"members": [{"id": "U1", "real_name": "Alice"}], "response_metadata": {"next_cursor": ""}}
+
+
+@pytest.fixture
+def store(monkeypatch):
+    monkeypatch.setenv("SLACK_BOT_TOKEN", "xoxb-test")
+    monkeypatch.setattr(slack_directory, "_directory", SlackDirectory(ttl_seconds=3600, db_path=""))
+    fake = InMemorySlackMessages()
+    RepositoryFactory.override("slack_message", fake)
+    yield fake
+    RepositoryFactory.reset("slack_message")
+
+
+def service(client):
+    s = SlackService()
+    s.client = client
+    return s
+
+
+def test_events_are_upserted_idempotently(store):
+    """New, retried, edited, out-of-order edited and deleted messages"""
+    event = {"type": "message", "channel": "C1", "user": "U1", "text": "hello", "ts": ts(1)}
+    SlackService.store_event(event)
+    SlackService.store_event(event)              # Slack retry
+    assert len(store.rows) == 1
+
+    edit = {"type": "message", "subtype": "message_changed", "channel": "C1",
+            "message": {"ts": ts(1), "user": "U1", "text": "hello v3", "edited": {"ts": ts(3)}}}
+    SlackService.store_event(edit)
+    older = {**edit, "message": {**edit["message"], "text": "hello v2", "edited": {"ts": ts(2)}}}
+    SlackService.store_event(older)
+    assert store.rows[("C1", ts(1))]["text"] == "hello v3"
+
+    SlackService.store_event({"type": "message", "subtype": "message_deleted", "channel": "C1",
+                              "deleted_ts": ts(1)})
+    assert store.get_messages("C1") == ([], None)
+    print("✅ Events upserted idempotently")
+
+
+def test_thread_replies_bump_parent_once(store):
+    SlackService.store_event({"channel": "C1", "user": "U1", "text": "parent", "ts": ts(1)})
+    reply = {"channel": "C1", "user": "U1", "text": "reply", "ts": ts(2), "thread_ts": ts(1)}
+    SlackService.store_event(reply)
+    SlackService.store_event(reply)
+
+    top, _ = store.get_messages("C1")
+    assert [m["text"] for m in top] == ["parent"] and top[0]["reply_count"] == 1
+    assert [m["text"] for m in store.get_replies("C1", ts(1))[0]] == ["reply"]
+    print("✅ Thread replies stored")
+
+
+def test_backfilled_channel_is_read_locally_with_keyset_pages(store):
+    """No conversations_history call once a channel is backfilled; before= pages back in time"""
+    client = FakeHistoryClient(count=120)
+    slack = service(client)
+    slack.backfill_channel("C1")
+    client.calls.clear()
+
+    first = slack.get_channel_messages("C1", limit=50)
+    second = slack.get_channel_messages("C1", limit=50, before=first[-1]["timestamp"])
+
+    assert not [c for c in client.calls if c[0] == "history"]
+    assert first[0]["text"] == "message 120" and first[0]["user"] == "Alice"
+    assert first[0]["reply_count"] == 2
+    assert second[0]["text"] == "message 70" and len(second) == 50
+    print("✅ Local keyset pages")
+
+
+def test_unknown_channel_is_served_live_and_backfill_requested_once(store):
+    client = FakeHistoryClient(count=5)
+    slack = service(client)
+
+    assert slack.needs_backfill("C9") is True
+    assert slack.needs_backfill("C9") is False
+    assert [m["text"] for m in slack.get_channel_messages("C9")][:2] == ["message 5", "message 4"]
+    assert client.calls == [("history", None)]
+    print("✅ Live fallback until backfilled")
+
+
+def test_backfilled_channel_view_does_not_write(store, monkeypatch):
+    """Opening a channel that is already backfilled only reads its sync state"""
+    requests = []
+    monkeypatch.setattr(store, "request_backfill", lambda *args: requests.append(args) or True)
+    store.mark_backfilled("C1")
+    slack = service(FakeHistoryClient(count=5))
+
+    assert slack.needs_backfill("C1") is False
+    assert requests == []
+    assert slack.needs_backfill("C9") is True
+    assert [r[0] for r in requests] == ["C9"]
+    print("✅ No backfill claim for backfilled channels")
+
+
+def test_backfill_pages_history_threads_and_resumes(store):
+    """A failed page keeps the saved cursor; the retried job continues from it"""
+    client = FakeHistoryClient(count=450, fail_on_cursor="400")
+    slack = service(client)
+
+    with pytest.raises(SlackApiError):
+        slack.backfill_channel("C1")
+    assert store.get_sync_state("C1")["backfill_cursor"] == "400"
+    assert not store.is_backfilled("C1")
+
+    client.calls.clear()
+    slack.backfill_channel("C1")
+    assert client.calls == [("history", "400")]
+    assert store.is_backfilled("C1")
+    assert len([r for r in store.rows.values() if r.get("thread_ts") in (None, r["ts"])]) == 450
+    assert len(store.get_replies("C1", ts(450))[0]) == 2
+    print("✅ Backfill paginated and resumable")
+
+
+def test_live_pages_follow_slack_cursor_and_survive_backfill(store):
+    """The opaque cursor carries Slack's next_cursor while live, and still works once the channel is local"""
+    client = FakeHistoryClient(count=120)
+    slack = service(client)
+
+    first, cursor = slack.get_channel_messages_page("C1", limit=50)
+    second, cursor = slack.get_channel_messages_page("C1", limit=50, cursor=cursor)
+    assert client.calls == [("history", None), ("history", "50")]
+    assert second[0]["text"] == "message 70"
+
+    slack.backfill_channel("C1")
+    client.calls.clear()
+    third, cursor = slack.get_channel_messages_page("C1", limit=50, cursor=cursor)
+    # The store ran out: one live call confirms there is nothing older
+    assert client.calls == [("history", None)]
+    assert [m["text"] for m in third][:1] == ["message 20"] and len(third) == 20
+    assert cursor is None
+    print("✅ Cursor pages across live and local reads")
+
+
+def test_messages_endpoint_returns_next_cursor(store, monkeypatch):
+    from flask import Flask
+    from controllers.slack_integration_controller import slack_bp
+    app = Flask(__name__)
+    app.register_blueprint(slack_bp)
+    client = FakeHistoryClient(count=60)
+    service(client).backfill_channel("C1")
+
+    monkeypatch.setattr("services.slack_integration_service.get_slack_client", lambda token=None: client)
+    http = app.test_client()
+    page = http.get("/api/v1/slack/messages/C1?limit=50").get_json()
+    rest = http.get(f"/api/v1/slack/messages/C1?limit=50&cursor={page['next_cursor']}").get_json()
+
+    assert page["count"] == 50 and page["messages"][0]["text"] == "message 60"
+    assert rest["count"] == 10 and rest["next_cursor"] is None
+    assert http.get("/api/v1/slack/messages/C1?cursor=not-a-cursor").status_code == 400
+    print("✅ Endpoint pages with next_cursor")
+
+
+def test_history_older_than_the_backfill_is_read_live(store, monkeypatch):
+    """The backfill stops at SLACK_BACKFILL_MAX_MESSAGES; scrolling past it continues from Slack"""
+    from services import slack_integration_service
+    monkeypatch.setattr(slack_integration_service, "SLACK_BACKFILL_MAX_MESSAGES", 100)
+    client = FakeHistoryClient(count=250)
+    slack = service(client)
+    slack.backfill_channel("C1")
+    assert len([r for r in store.rows.values() if r.get("thread_ts") in (None, r["ts"])]) == 200
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        page, cursor = slack.get_channel_messages_page("C1", limit=60, cursor=cursor)
+        seen += [m["text"] for m in page]
+        pages += 1
+        if not cursor:
+            break
+    assert seen == [f"message {n}" for n in range(250, 0, -1)]
+    assert pages == 5
+    print("✅ Paging continues live past the stored history")
@@ -0,0 +1,218 @@
+"""Test the live Slack message stream: pub/sub broker, Last-Event-ID resume, back-pressure and the SSE endpoint"""
+import hmac
+import json
+import time
+import hashlib
+import threading
+import pytest
+from flask import Flask
+from core import pubsub
+from core.pubsub import MessageBroker, BrokerFullError
+from clients import slack_directory
+from clients.slack_directory import SlackDirectory
+from repositories.repository_factory import RepositoryFactory
+
+
+class FakeStore:
+    """Just enough of SlackMessageRepository for the events endpoint"""
+
+    def __init__(self):
+        self.rows = []
+
+    def upsert_event_message(self, channel_id, message):
+        self.rows.append((channel_id, message))
+        return True
+
+    def mark_deleted(self, channel_id, ts):
+        self.rows = [(c, m) for c, m in self.rows if (c, m["ts"]) != (channel_id, ts)]
+
+
+def drain(subscription):
+    events = []
+    while (event := subscription.get(timeout=0)) is not None:
+        events.append(event)
+    return events
+
+
+def test_published_events_fan_out_per_topic():
+    broker = MessageBroker()
+    a, b, other = broker.subscribe("C1"), broker.subscribe("C1"), broker.subscribe("C2")
+    broker.publish("C1", "message", {"text": "hi"})
+
+    assert [e.data for e in drain(a)] == [{"text": "hi"}]
+    assert [e.type for e in drain(b)] == ["message"]
+    assert drain(other) == []
+    a.close()
+    assert broker.stats()["subscribers"] == 2
+    print("✅ Fan-out per channel")
+
+
+def test_last_event_id_replays_missed_events():
+    """A reconnect gets exactly the events after its Last-Event-ID"""
+    broker = MessageBroker()
+    first = broker.publish("C1", "message", {"n": 1})
+    broker.publish("C1", "message", {"n": 2})
+    broker.publish("C1", "message", {"n": 3})
+
+    subscription = broker.subscribe("C1", last_event_id=first)
+    assert [e.data["n"] for e in drain(subscription)] == [2, 3]
+    assert broker.stats()["replayed"] == 2
+    print("✅ Missed events replayed")
+
+
+def test_unreplayable_last_event_id_gets_reset():
+    """Too old for the history, or from another process: one 'reset' and the client reloads"""
+    broker = MessageBroker(history=2)
+    old = broker.publish("C1", "message", {"n": 1})
+    for n in range(2, 5):
+        broker.publish("C1", "message", {"n": n})
+
+    for last_event_id in (old, "otherproc-3"):
+        events = drain(broker.subscribe("C1", last_event_id=last_event_id))
+        assert [e.type for e in events] == ["reset"]
+        assert events[0].id == f"{broker.epoch}-4"
+    print("✅ Reset when history can't be replayed")
+
+
+def test_slow_subscriber_is_reset_without_blocking_publishers():
+    broker = MessageBroker(queue_size=3)
+    slow, fast = broker.subscribe("C1"), broker.subscribe("C1")
+    for n in range(3):
+        broker.publish("C1", "message", {"n": n})
+    drain(fast)
+
+    started = time.monotonic()
+    broker.publish("C1", "message", {"n": 3})
+    assert time.monotonic() - started < 0.1
+
+    assert [e.type for e in drain(slow)] == ["reset"]
+    assert [e.data["n"] for e in drain(fast)] == [3]
+    assert slow.dropped == 1 and broker.stats()["resets"] == 1
+    print("✅ Back-pressure: slow client reset, others unaffected")
+
+
+def test_subscriptions_are_capped():
+    broker = MessageBroker(max_subscribers=1)
+    broker.subscribe("C1")
+    with pytest.raises(BrokerFullError):
+        broker.subscribe("C2")
+    print("✅ Subscriber cap")
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setenv("SLACK_BOT_TOKEN", "xoxb-test")
+    monkeypatch.setenv("SLACK_SIGNING_SECRET", "secret")
+    monkeypatch.setattr(pubsub, "_broker", MessageBroker())
+    directory = SlackDirectory(ttl_seconds=3600, db_path="")
+    directory.apply_user({"id": "U1", "real_name": "Alice"})
+    monkeypatch.setattr(slack_directory, "_directory", directory)
+    monkeypatch.setattr("services.slack_integration_service.get_slack_client", lambda token=None: None)
+    RepositoryFactory.override("slack_message", FakeStore())
+    from controllers import slack_integration_controller
+    from controllers.slack_integration_controller import slack_bp
+    monkeypatch.setattr(slack_integration_controller, "STREAM_HEARTBEAT", 0.05)
+    app = Flask(__name__)
+    app.register_blueprint(slack_bp)
+    yield app
+    RepositoryFactory.reset("slack_message")
+
+
+def post_event(http, event):
+    body = json.dumps({"event": event})
+    timestamp = str(int(time.time()))
+    signature = "v0=" + hmac.new(b"secret", f"v0:{timestamp}:{body}".encode(), hashlib.sha256).hexdigest()
+    return http.post("/api/v1/slack/events", data=body, content_type="application/json",
+                     headers={"X-Slack-Request-Timestamp": timestamp, "X-Slack-Signature": signature})
+
+
+def read_frames(response, count):
+    """The first `count` non-comment SSE frames as dicts of their fields"""
+    frames = []
+    for chunk in response.response:
+        text = chunk.decode()
+        if text.startswith(":") or text.startswith("retry:"):
+            continue
+        frames.append(dict(line.split(": ", 1) for line in text.strip().split("\n")))
+        if len(frames) == count:
+            break
+    response.close()
+    return frames
+
+
+def test_events_reach_connected_browsers(app):
+    """A message event is pushed to an open stream, formatted like /messages"""
+    http = app.test_client()
+    response = http.get("/api/v1/slack/stream/C1", buffered=False)
+    assert response.mimetype == "text/event-stream"
+    chunks = iter(response.response)
+    assert next(chunks).startswith(b"retry:")
+
+    def deliver():
+        time.sleep(0.1)
+        post_event(app.test_client(), {"type": "message", "channel": "C1", "user": "U1",
+                                       "text": "hello", "ts": "1700000001.000100"})
+
+    threading.Thread(target=deliver).start()
+    frames = read_frames(response, 1)
+
+    assert frames[0]["event"] == "message"
+    data = json.loads(frames[0]["data"])
+    assert data["text"] == "hello" and data["user"] == "Alice" and data["timestamp"] == "1700000001.000100"
+    assert pubsub.get_broker().stats()["subscribers"] == 0
+    print("✅ Live message pushed over SSE")
+
+
+def test_stream_resumes_from_last_event_id(app):
+    http = app.test_client()
+    for n in (1, 2):
+        assert post_event(http, {"type": "message", "channel": "C1", "user": "U1", "text": f"m{n}",
+                                 "ts": f"170000000{n}.000100"}).status_code == 200
+    assert post_event(http, {"type": "message", "subtype": "message_deleted", "channel": "C1",
+                             "deleted_ts": "1700000001.000100"}).status_code == 200
+    first_id = f"{pubsub.get_broker().epoch}-1"
+
+    response = http.get("/api/v1/slack/stream/C1", headers={"Last-Event-ID": first_id}, buffered=False)
+    frames = read_frames(response, 2)
+
+    assert [f["event"] for f in frames] == ["message", "deleted"]
+    assert json.loads(frames[0]["data"])["text"] == "m2"
+    assert frames[1]["id"] == f"{pubsub.get_broker().epoch}-3"
+    print("✅ Stream resumed from Last-Event-ID")
+
+
+def test_events_are_published_after_the_store_write_commits(app):
+    """Nothing reaches the stream before the request's transaction commits, or if the commit fails"""
+    from core import unit_of_work
+    from core.db_pool import ConnectionPool
+    from tests.test_unit_of_work import FakeConnection
+
+    class CheckedConnection(FakeConnection):
+        fail = False
+
+        def commit(self):
+            published_at_commit.append(pubsub.get_broker().stats()["published"])
+            if self.fail:
+                raise ConnectionError("commit lost")
+            super().commit()
+
+    class TransactionalStore(FakeStore):
+        def upsert_event_message(self, channel_id, message):
+            unit_of_work.get_connection().commit()      # deferred to the end of the request
+            return super().upsert_event_message(channel_id, message)
+
+    published_at_commit = []
+    unit_of_work.init_app(app, pool=ConnectionPool(min_size=0, max_size=2, timeout=0.2, connect=CheckedConnection))
+    RepositoryFactory.override("slack_message", TransactionalStore())
+    http = app.test_client()
+    subscription = pubsub.get_broker().subscribe("C1")
+
+    assert post_event(http, {"type": "message", "channel": "C1", "user": "U1", "text": "kept",
+                             "ts": "1700000001.000100"}).status_code == 200
+    CheckedConnection.fail = True
+    assert post_event(http, {"type": "message", "channel": "C1", "user": "U1", "text": "lost",
+                             "ts": "1700000002.000100"}).status_code == 500
+
+    assert published_at_commit == [0, 1]
+    assert [e.data["text"] for e in drain(subscription)] == ["kept"]
+    print("✅ Live events published only after commit")
@@ -0,0 +1,101 @@
+"""Test the incremental project/user stats deltas (no real database needed)"""
+from repositories.stats_repository import task_stats_deltas, apply_task_change
+
+
+def state(**overrides):
+    base = {"status": "TODO", "priority": "MEDIUM", "assigned_id": 5,
+            "title": "Write docs", "project_id": 1}
+    base.update(overrides)
+    return base
+
+
+def test_insert_and_delete_are_symmetric():
+    """Test creating a task adds exactly what deleting it removes"""
+    task = state(priority="HIGH", assigned_id=None, title="Train AI model")
+    added = task_stats_deltas(None, task)
+    removed = task_stats_deltas(task, None)
+
+    assert added == ({1: (1, 0, 1)}, {})
+    assert removed == ({1: (-1, 0, -1)}, {})
+    print("✅ Insert and delete deltas are symmetric")
+
+
+def test_status_and_assignee_transitions():
+    """Test only the counters that changed get a delta"""
+    projects, users = task_stats_deltas(state(), state(status="DONE"))
+    assert projects == {1: (0, 1, 0)}
+    assert users == {5: (0, 1, 0)}
+
+    # Reassigning moves the task between users, the project is untouched
+    projects, users = task_stats_deltas(state(), state(assigned_id=6))
+    assert projects == {}
+    assert users == {5: (-1, 0, 0), 6: (1, 0, 0)}
+
+    # No relevant change, no writes
+    assert task_stats_deltas(state(), state()) == ({}, {})
+    print("✅ Status and assignee transitions produce exact deltas")
+
+
+def test_apply_task_change_upserts_each_delta():
+    """Test deltas are written as upserts on the caller's cursor"""
+    class RecordingCursor:
+        def __init__(self):
+            self.calls = []
+
+        def execute(self, query, params=None):
+            self.calls.append((query, params))
+
+    cursor = RecordingCursor()
+    apply_task_change(cursor, state(project_id=1), state(project_id=2))
+
+    tables = sorted(q.split("INTO")[1].split()[0] for q, _ in cursor.calls)
+    assert tables == ["project_stats", "project_stats"]
+    assert sorted(p for _, p in cursor.calls) == [(1, -1, 0, 0), (2, 1, 0, 0)]
+    print("✅ Stats deltas applied as upserts")
+
+
+def test_release_user_moves_counters_and_invalidates_dashboards(monkeypatch):
+    """Test unassigning a deleted user's tasks applies the stats delta and drops the cached dashboards"""
+    from repositories import task_repository
+    from repositories.task_repository import TaskRepository
+
+    class FakeCursor:
+        def __init__(self):
+            self.calls = []
+            self.rowcount = 0
+
+        def execute(self, query, params=None):
+            self.calls.append((" ".join(query.split()), params))
+            self.rowcount = 2
+
+        def fetchall(self):
+            return [("TODO", "HIGH", 5, "Ship", 1), ("DONE", "LOW", 5, "AI notes", 2)]
+
+        def close(self):
+            pass
+
+    class FakeConnection:
+        def __init__(self):
+            self.cursor_ = FakeCursor()
+            self.committed = False
+
+        def cursor(self):
+            return self.cursor_
+
+        def commit(self):
+            self.committed = True
+
+        def close(self):
+            pass
+
+    conn = FakeConnection()
+    invalidated = []
+    monkeypatch.setattr(task_repository, "invalidate_project_dashboard", lambda *ids: invalidated.extend(ids))
+    repo = TaskRepository()
+    monkeypatch.setattr(repo, "db_manager", type("DB", (), {"get_connection": lambda self: conn})())
+
+    assert repo.release_user(5) == 2
+    upserts = [p for q, p in conn.cursor_.calls if q.startswith("INSERT")]
+    assert sorted(upserts) == [(1, 0, 0, 1), (5, -1, -1, -1), (5, -1, 0, 0)]
+    assert conn.committed and sorted(invalidated) == [1, 2]
+    print("✅ Deleting a user keeps task counters and dashboards in step")
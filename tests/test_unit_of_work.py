@@ -0,0 +1,192 @@
+"""Test the per-request unit of work (no real database needed)"""
+from flask import Flask, jsonify
+from core import unit_of_work
+from core.db_pool import ConnectionPool
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, statement, params=None):
+        if statement.startswith("ROLLBACK TO") and self.conn.savepoints_lost:
+            raise ConnectionError("SAVEPOINT does not exist")
+        self.conn.statements.append(statement)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.in_transaction = False
+        self.commits = 0
+        self.rollbacks = 0
+        self.statements = []
+        self.savepoints_lost = False
+
+    def cursor(self, *args, **kwargs):
+        return FakeCursor(self)
+
+    def start_transaction(self, consistent_snapshot=False):
+        self.in_transaction = True
+
+    def commit(self):
+        self.commits += 1
+        self.in_transaction = False
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.in_transaction = False
+
+    def ping(self, reconnect=False):
+        pass
+
+    def close(self):
+        pass
+
+
+def make_app():
+    created = []
+
+    def connect():
+        conn = FakeConnection()
+        created.append(conn)
+        return conn
+
+    pool = ConnectionPool(min_size=0, max_size=2, timeout=0.2, connect=connect)
+    app = Flask(__name__)
+    unit_of_work.init_app(app, pool=pool)
+
+    @app.route("/write")
+    def write():
+        for _ in range(5):
+            conn = unit_of_work.get_connection()
+            conn.commit()
+            conn.close()
+        return jsonify({"ok": True})
+
+    @app.route("/fail")
+    def fail():
+        conn = unit_of_work.get_connection()
+        conn.commit()
+        conn.rollback()
+        conn.close()
+        return jsonify({"error": "boom"}), 500
+
+    return app, pool, created
+
+
+def test_request_shares_one_connection_and_commits_once():
+    """Test all repository calls in a request share one connection and one commit"""
+    app, pool, created = make_app()
+    response = app.test_client().get("/write")
+
+    assert response.status_code == 200
+    assert len(created) == 1
+    assert created[0].commits == 1
+    assert pool.stats()["checked_out"] == 0
+    print("✅ Request shares one connection and commits once")
+
+
+def test_failed_request_rolls_back():
+    """Test a rollback or 5xx response rolls back the request transaction"""
+    app, pool, created = make_app()
+    response = app.test_client().get("/fail")
+
+    assert response.status_code == 500
+    assert created[0].commits == 0
+    assert created[0].rollbacks == 1
+    assert pool.stats()["checked_out"] == 0
+    print("✅ Failed request rolls back")
+
+
+def test_after_commit_callbacks_wait_for_commit():
+    """Test after_commit callbacks run only once the request has committed"""
+    app, pool, created = make_app()
+    calls = []
+
+    @app.route("/write-and-notify")
+    def write_and_notify():
+        conn = unit_of_work.get_connection()
+        conn.commit()
+        unit_of_work.after_commit(lambda: calls.append("ok"))
+        assert calls == []
+        return jsonify({"ok": True})
+
+    @app.route("/fail-and-notify")
+    def fail_and_notify():
+        unit_of_work.get_connection()
+        unit_of_work.after_commit(lambda: calls.append("failed"))
+        return jsonify({"error": "boom"}), 500
+
+    client = app.test_client()
+    client.get("/write-and-notify")
+    client.get("/fail-and-notify")
+
+    assert calls == ["ok"]
+    print("✅ after_commit callbacks wait for commit")
+
+
+def test_failed_commit_returns_500_and_skips_callbacks():
+    """Test a commit that fails at the end of the request answers 500 and drops after_commit callbacks"""
+    app, pool, created = make_app()
+    calls = []
+
+    @app.route("/commit-fails")
+    def commit_fails():
+        conn = unit_of_work.get_connection()
+        conn._conn.commit = lambda: (_ for _ in ()).throw(ConnectionError("lost"))
+        unit_of_work.after_commit(lambda: calls.append("published"))
+        return jsonify({"ok": True})
+
+    response = app.test_client().get("/commit-fails")
+
+    assert response.status_code == 500
+    assert response.get_json() == {"error": "Database commit failed"}
+    assert calls == []
+    assert pool.stats()["checked_out"] == 0
+    print("✅ Failed commit answers 500")
+
+
+def test_rollback_undoes_only_its_own_repository_call():
+    """Test a repository that rolls back its own failed write keeps the other writes of the request"""
+    app, pool, created = make_app()
+
+    @app.route("/partial")
+    def partial():
+        kept = unit_of_work.get_connection()
+        kept.commit()
+        failed = unit_of_work.get_connection()
+        failed.rollback()
+        return jsonify({"ok": True})
+
+    response = app.test_client().get("/partial")
+
+    assert response.status_code == 200
+    assert created[0].statements == ["SAVEPOINT uow_1", "SAVEPOINT uow_2", "ROLLBACK TO SAVEPOINT uow_2"]
+    assert created[0].commits == 1
+    assert created[0].rollbacks == 0
+    print("✅ Rollback limited to its savepoint")
+
+
+def test_lost_transaction_turns_success_into_500():
+    """Test a rollback that cannot stop at its savepoint fails the request instead of answering 200"""
+    app, pool, created = make_app()
+
+    @app.route("/lost")
+    def lost():
+        conn = unit_of_work.get_connection()
+        conn.commit()
+        created[0].savepoints_lost = True
+        conn.rollback()
+        return jsonify({"ok": True})
+
+    response = app.test_client().get("/lost")
+
+    assert response.status_code == 500
+    assert response.get_json() == {"error": "Database transaction was rolled back"}
+    assert created[0].commits == 0
+    assert created[0].rollbacks == 1
+    assert pool.stats()["checked_out"] == 0
+    print("✅ Lost transaction answers 500")